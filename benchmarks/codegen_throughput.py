@@ -0,0 +1,103 @@
+"""
+Benchmark the throughput of the code generator.
+
+Generate a large program (about a million AST Nodes by default), parse it, and
+measure how many Nodes per second `CodeGenerator.generate_code` translates into
+instructions.
+
+Usage: `python -m benchmarks.codegen_throughput [--statements N] [--repeat N]`
+"""
+
+import argparse
+from time import perf_counter
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.code_generator import CodeGenerator
+from src.lexer import Lexer
+from src.node import Node
+
+
+# Mixes expressions, assignments and every control flow statement. Its AST has
+# 37 Nodes.
+STATEMENT = """
+if (a < 10) { b = b + (c = a - 1); } else { c = 0; }
+while (i < 3) { do i = i + 1; while (i < b); }
+"""
+
+
+def generate_source_code(statement_count: int) -> str:
+    """
+    Generate a program by repeating `STATEMENT`.
+
+    Parameters
+    ----------
+    statement_count : int
+        How many times to repeat `STATEMENT`.
+
+    Returns
+    -------
+    : str
+        The source code of the program.
+    """
+
+    return "{" + STATEMENT * statement_count + "}"
+
+
+def count_nodes(node: Node) -> int:
+    """
+    Count the Nodes of a tree.
+
+    Parameters
+    ----------
+    node : Node
+        The root of the tree.
+
+    Returns
+    -------
+    node_count : int
+        The number of Nodes in the tree.
+    """
+
+    node_count = 0
+    pending_nodes = [node]
+
+    while pending_nodes:
+        node_count += 1
+        pending_nodes.extend(pending_nodes.pop().children)
+
+    return node_count
+
+
+def main() -> None:
+    """Run the benchmark and print its results."""
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--statements", type=int, default=27000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source_code = generate_source_code(args.statements)
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+    ast.build()
+
+    node_count = count_nodes(ast.root)
+    elapsed_time = float("inf")
+
+    # Keep the best run, as it is the least disturbed by the rest of the system.
+    for _ in range(args.repeat):
+        generator = CodeGenerator()
+
+        start = perf_counter()
+        generator.generate_code(ast.root)
+        elapsed_time = min(elapsed_time, perf_counter() - start)
+
+    print(f"{'nodes':>12}{'instructions':>16}{'seconds':>10}{'nodes/s':>14}")
+    print(
+        f"{node_count:>12,}{len(generator.code_collection):>16,}"
+        f"{elapsed_time:>10.2f}{node_count / elapsed_time:>14,.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark the throughput of the lexer.
+
+Generate Tiny-C sources of a few megabytes and measure how fast
+`Lexer.parse_source_code` turns them into tokens, in MB/s.
+
+Usage: `python -m benchmarks.lexer_throughput [--sizes MB [MB ...]]`
+"""
+
+import argparse
+from time import perf_counter
+
+from src.lexer import Lexer
+
+
+# Mixes every kind of token, with spaces, tabs and CRLF line breaks.
+STATEMENT = "if (a < 10)\tb = b + 125; else {c = c - (b < a);}\r\n"
+
+
+def generate_source_code(size: int) -> str:
+    """
+    Generate a program of approximately `size` bytes.
+
+    Parameters
+    ----------
+    size : int
+        The size of the program, in bytes.
+
+    Returns
+    -------
+    : str
+        The source code of the program.
+    """
+
+    return "{\n" + STATEMENT * (size // len(STATEMENT)) + "}\n"
+
+
+def measure(source_code: str) -> tuple[float, int]:
+    """
+    Measure the throughput of the lexer on a source code.
+
+    Parameters
+    ----------
+    source_code : str
+        The source code to scan.
+
+    Returns
+    -------
+    throughput : float
+        The scanned megabytes per second.
+    token_count : int
+        The number of tokens in the source code.
+    """
+
+    start = perf_counter()
+    token_count = sum(1 for _ in Lexer.parse_source_code(source_code))
+    elapsed_time = perf_counter() - start
+
+    return len(source_code) / elapsed_time / 1e6, token_count
+
+
+def main() -> None:
+    """Run the benchmark and print its results."""
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    print(f"{'size (MB)':<12}{'tokens':>14}{'MB/s':>10}")
+
+    for size in args.sizes:
+        throughput, token_count = measure(generate_source_code(size * 10 ** 6))
+
+        print(f"{size:<12}{token_count:>14,}{throughput:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
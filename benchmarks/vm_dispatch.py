@@ -0,0 +1,123 @@
+"""
+Benchmark the instruction dispatch of the virtual machine.
+
+Compare the instructions per second of `VirtualMachine.step`, which dispatches
+each instruction to a handler method (the original execution loop), and of
+`VirtualMachine.run`, which dispatches integer opcodes in a single loop with
+the top of the stack cached in a local variable. The `tiered` column also lets
+`run` compile hot loops into Python functions.
+
+Usage: `python -m benchmarks.vm_dispatch [--repeat N]`
+"""
+
+import argparse
+from time import perf_counter
+
+from src.interpreter import create_virtual_machine
+
+
+# The GCD and Fibonacci programs from `tests/integration`.
+PROGRAMS = {
+    "gcd": """
+    {
+        i = 125;
+        j = 100;
+        while (i - j) {
+            if (i < j) {
+                j = j - i;
+            }
+            else {
+                i = i - j;
+            }
+        }
+    }
+    """,
+    "fibonacci": """
+    {
+        i = 1;
+        a = 0;
+        b = 1;
+        while (i < 10) {
+            c = a;
+            a = b;
+            b = c + a;
+            i = i + 1;
+        }
+    }
+    """
+}
+
+
+def _run(vm) -> None:
+    vm.hot_loop_threshold = None
+    vm.run()
+
+
+def _tiered(vm) -> None:
+    vm.run()
+
+
+def _step(vm) -> None:
+    while vm.step():
+        pass
+
+
+def measure(source_code: str, execute, repeat: int) -> float:
+    """
+    Measure the instructions per second of a program.
+
+    Parameters
+    ----------
+    source_code : str
+        The program to run.
+    execute : callable
+        Function that runs a loaded Virtual Machine until it halts.
+    repeat : int
+        How many times to run the program.
+
+    Returns
+    -------
+    : float
+        The executed instructions per second.
+    """
+
+    instruction_count = 0
+    elapsed_time = 0.0
+
+    for _ in range(repeat):
+        vm = create_virtual_machine(source_code)
+
+        start = perf_counter()
+        execute(vm)
+        elapsed_time += perf_counter() - start
+
+        instruction_count += vm.instruction_count
+
+    return instruction_count / elapsed_time
+
+
+def main() -> None:
+    """Run the benchmark and print its results."""
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        f"{'program':<12}{'step (instr/s)':>18}{'run (instr/s)':>18}"
+        f"{'speedup':>10}{'tiered (instr/s)':>20}{'speedup':>10}"
+    )
+
+    for name, source_code in PROGRAMS.items():
+        before = measure(source_code, _step, args.repeat)
+        after = measure(source_code, _run, args.repeat)
+        tiered = measure(source_code, _tiered, args.repeat)
+
+        print(
+            f"{name:<12}{before:>18,.0f}{after:>18,.0f}{after / before:>9.1f}x"
+            f"{tiered:>20,.0f}{tiered / before:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
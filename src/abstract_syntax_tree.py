@@ -1,8 +1,11 @@
 """Implement the Abstract Syntax Tree (AST)."""
 
-from typing import Generator, Union
+import gc
+from typing import Generator, Iterator, Union
 
 from src.node import Node
+from src.node_arena import ArenaNode, NodeArena
+from src.shared_node import NodeTable, SharedNode
 
 
 class AbstractSyntaxTree:
@@ -13,7 +16,18 @@ class AbstractSyntaxTree:
     ----------
     source_code : Generator
         A Generator created by the `Lexer` that contains the representation of
-        the source code in (`symbol`, `value`) format.
+        the source code in (`symbol`, `value`) format. Symbols are consumed
+        from it as the tree is built, one at a time.
+    use_arena : bool, optional (default = False)
+        Whether to store the Nodes in a `NodeArena` instead of creating a
+        `Node` object for each one of them. The tree is then made of
+        `ArenaNode` handles, whose IDs are their indexes in the `arena`.
+    hash_consing : bool, optional (default = False)
+        Whether to intern identical pure expression subtrees -- e.g., every
+        `i + 1` in the source code -- in a `NodeTable`, so they are built
+        only once and shared. The tree, made of `SharedNode` objects, then
+        becomes a directed acyclic graph. The IDs of duplicated Nodes are
+        not reused.
     """
 
     node_kinds = [
@@ -30,22 +44,55 @@ class AbstractSyntaxTree:
         "IFELSE",
         "WHILE",
         "DO",
-        "SEQ"
+        "SEQ",
+        "BLOCK"
     ]
 
-    def __init__(self, source_code: Generator) -> None:
+    def __init__(
+        self,
+        source_code: Generator,
+        use_arena: bool = False,
+        hash_consing: bool = False
+    ) -> None:
+        if use_arena and hash_consing:
+            raise ValueError("A NodeArena can not hold shared Nodes.")
+
         self.node_id_manager: int = 1
-        self.source_code = list(source_code)
+        self.source_code: Iterator = iter(source_code)
         self.current_symbol = None
         self.current_value = None
-        self.root = Node(id=0, kind="PROG")
+        self.arena: Union[NodeArena, None] = None
+        self.node_table: Union[NodeTable, None] = None
+
+        if use_arena:
+            self.arena = NodeArena(kinds=self.node_kinds)
+            self.root = self.arena.node(self.arena.add_node(kind="PROG"))
+        elif hash_consing:
+            self.node_table = NodeTable()
+            self.root = SharedNode(id=0, kind="PROG")
+        else:
+            self.root = Node(id=0, kind="PROG")
 
     def build(self) -> None:
-        """Build the Abstract Syntax Tree from the source code."""
+        """
+        Build the Abstract Syntax Tree from the source code.
+
+        Nodes reference their parents, so every Node is part of a reference
+        cycle and is tracked by the garbage collector. The collector is paused
+        while the tree is built, as its collections would otherwise traverse
+        the whole (growing) tree time and again.
+        """
+
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            self._next_symbol()
+            program_node = self._statement()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
 
-        self._next_symbol()
-        program_node = self._statement()
-        
         self.root.add_child(program_node)
         program_node.add_parent(self.root)
 
@@ -192,7 +239,10 @@ class AbstractSyntaxTree:
     
     def _brackets(self) -> Node:
         """
-        Parse a statement embraced by brackets: `{ <statement> }`.
+        Parse a block of statements embraced by brackets: `{ <statement> ... }`.
+
+        All the statements of the block are children of a single `BLOCK` Node,
+        in order. An empty block has no children.
 
         Returns
         -------
@@ -200,17 +250,11 @@ class AbstractSyntaxTree:
             The parent node of the statement representation.
         """
 
-        statement_node = self._create_node(kind="EMPTY")
-    
+        statement_node = self._create_node(kind="BLOCK")
+
         self._next_symbol()
 
         while self.current_symbol != "RBRA":
-            temp_node = statement_node
-            statement_node = self._create_node(kind="SEQ")
-
-            temp_node.add_parent(statement_node)
-            statement_node.add_child(temp_node)
-
             child_statement = self._statement()
 
             child_statement.add_parent(statement_node)
@@ -219,7 +263,7 @@ class AbstractSyntaxTree:
         self._next_symbol()
 
         return statement_node
-        
+
     def _handle_eol(self) -> Node:
         """
         Parse an expression terminated by a semicolon: `<expression> ;`
@@ -335,6 +379,8 @@ class AbstractSyntaxTree:
             right_operand.add_parent(comparison_node)
             comparison_node.add_child(right_operand)
 
+            comparison_node = self._intern(comparison_node)
+
         return comparison_node
 
     def _sum(self) -> Node:
@@ -370,6 +416,8 @@ class AbstractSyntaxTree:
             other_term.add_parent(sum_node)
             sum_node.add_child(other_term)
 
+            sum_node = self._intern(sum_node)
+
         return sum_node
 
     def _term(self) -> Node:
@@ -402,14 +450,53 @@ class AbstractSyntaxTree:
     def _next_symbol(self) -> None:
         """Get the next symbol to evaluate."""
 
-        if len(self.source_code) > 0:
-            self.current_symbol, self.current_value = self.source_code.pop(0)
-        else:
-            self.current_symbol, self.current_value = ("EOI", None)
+        self.current_symbol, self.current_value = next(
+            self.source_code, ("EOI", None)
+        )
 
-    def _create_node(self, kind: str, value: Union[None, int] = None) -> Node:
+    def _create_node(
+        self, kind: str, value: Union[None, int] = None
+    ) -> Union[Node, ArenaNode, SharedNode]:
         
-        new_node = Node(id=self.node_id_manager, kind=kind, value=value)
+        if self.arena is not None:
+            new_node = self.arena.node(self.arena.add_node(kind, value))
+        elif self.node_table is not None:
+            # Leaves are looked up first, so their duplicates take no ID.
+            if kind in self.node_table.leaf_kinds:
+                interned_node = self.node_table.lookup(kind, value)
+
+                if interned_node is not None:
+                    return interned_node
+
+            new_node = SharedNode(id=self.node_id_manager, kind=kind, value=value)
+
+            if kind in self.node_table.leaf_kinds:
+                new_node = self.node_table.intern(new_node)
+        else:
+            new_node = Node(id=self.node_id_manager, kind=kind, value=value)
+
         self.node_id_manager += 1
 
         return new_node
+
+    def _intern(
+        self, node: Union[Node, ArenaNode, SharedNode]
+    ) -> Union[Node, ArenaNode, SharedNode]:
+        """
+        Intern a Node once its children are set, if hash consing is enabled.
+
+        Parameters
+        ----------
+        node : Node, ArenaNode or SharedNode
+            The Node.
+
+        Returns
+        -------
+        : Node, ArenaNode or SharedNode
+            The Node that represents its subtree.
+        """
+
+        if self.node_table is None:
+            return node
+
+        return self.node_table.intern(node)
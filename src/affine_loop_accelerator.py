@@ -0,0 +1,602 @@
+"""Implement the acceleration of hot loops that apply affine updates."""
+
+from typing import Callable, Union
+
+from src.bytecode import Bytecode
+from src.loop_compiler import CompiledLoop
+
+
+class AffineLoopAccelerator:
+    """
+    Accelerator that runs loops whose iterations are affine transformations
+    of the variables in a logarithmic number of steps.
+
+    The loop, between its header and its backward jump, must run a single
+    path: either a test that leaves it at the top and a `JMP` back to the
+    header, or a conditional jump back to the header at the bottom (as
+    inverted loops do). Its instructions are run symbolically over affine
+    forms -- integer combinations of the values of the variables at the
+    start of an iteration, plus a constant -- so an iteration is a map `M`
+    from forms to forms. E.g., the body of the Fibonacci loop, `c = a;
+    a = b; b = c + a; i = i + 1;`, is `(a, b, c, i) -> (b, a + b, a, i + 1)`.
+
+    The loop runs while a condition holds: `L < R`, or `D != 0`, for forms
+    `L`, `R` and `D` (with `D = R - L` for the former). If `D` after an
+    iteration is `x * D + y` for integers `x >= 0` and `y`, the values of
+    `D` along the iterations are monotonic, so the first iteration where
+    the condition fails is found by exponential search, composing the map
+    of `D` with itself. The variables at that iteration are computed by
+    exponentiating `M` likewise, so a loop of `n` iterations runs in
+    `O(log n)` steps instead of `n`.
+
+    Only loops over integers are accelerated (so the values, and their
+    types, are exactly the ones the interpreter would compute), and loops
+    that never end are left to the compiled loop.
+
+    Parameters
+    ----------
+    program : list of tuples
+        The (`opcode`, `operand`) pairs decoded by the `VirtualMachine`.
+    """
+
+    opcodes = Bytecode.opcodes
+
+    def __init__(self, program: list) -> None:
+        self.program: list = program
+
+    def accelerate(
+        self, header: int, back_jump: int, compiled_loop: CompiledLoop
+    ) -> CompiledLoop:
+        """
+        Accelerate a compiled loop, if it is affine.
+
+        Parameters
+        ----------
+        header : int
+            The index of the first instruction of the loop.
+        back_jump : int
+            The index of the backward jump that closes the loop.
+        compiled_loop : CompiledLoop
+            The loop, as compiled by the `LoopCompiler`. The accelerated
+            loop falls back to it if its variables are not all integers, or
+            if it never ends.
+
+        Returns
+        -------
+        : CompiledLoop
+            The accelerated loop, or `compiled_loop` if it is not affine.
+        """
+
+        analysis = self._analyze(header, back_jump)
+
+        if analysis is None:
+            return compiled_loop
+
+        function = self._get_function(*analysis, compiled_loop.function)
+
+        if function is None:
+            return compiled_loop
+
+        return CompiledLoop(
+            function=function,
+            read_variables=compiled_loop.read_variables,
+            source=compiled_loop.source
+        )
+
+    def _analyze(self, header: int, back_jump: int) -> Union[tuple, None]:
+        """
+        Get the affine maps of a loop.
+
+        Parameters
+        ----------
+        header : int
+            The index of the first instruction of the loop.
+        back_jump : int
+            The index of the backward jump that closes the loop.
+
+        Returns
+        -------
+        : tuple or None
+            The map of an iteration, the condition (see `_run`) and the map
+            of the last, partial iteration, along with the index to resume
+            the interpretation at and the number of instructions of an
+            iteration and of the last one. `None` if the loop is not affine.
+        """
+
+        opcodes = self.opcodes
+        jumps = [
+            index
+            for index in range(header, back_jump + 1)
+            if self.program[index][0] in self._jump_opcodes
+        ]
+        back_opcode = self.program[back_jump][0]
+        length = back_jump - header + 1
+
+        # while (...) { ... }: the test jumps out at the top.
+        if back_opcode == opcodes["JMP"] and len(jumps) == 2:
+            exit_jump = jumps[0]
+            exit_opcode, exit_operand = self.program[exit_jump]
+            target = (
+                exit_operand[-1] if isinstance(exit_operand, tuple)
+                else exit_operand
+            )
+
+            if exit_opcode not in [opcodes["JZ"], opcodes["JGE"]]:
+                return None
+
+            if header <= target <= back_jump:
+                return None
+
+            test = self._run(header, exit_jump, {})
+
+            if test is None:
+                return None
+
+            last_map, condition = test
+            body = self._run(exit_jump + 1, back_jump, last_map)
+
+            if body is None or body[1] is not None:
+                return None
+
+            return (body[0], condition, last_map, target, length,
+                    exit_jump - header + 1)
+
+        # do { ... } while (...): the test jumps back at the bottom.
+        is_bottom_test = back_opcode in [opcodes["JNZ"], opcodes["JLT"]]
+
+        if is_bottom_test and jumps == [back_jump]:
+            body = self._run(header, back_jump, {})
+
+            if body is None or body[1] is None:
+                return None
+
+            iteration_map, condition = body
+
+            return (iteration_map, condition, iteration_map, back_jump + 1,
+                    length, length)
+
+        return None
+
+    @property
+    def _jump_opcodes(self) -> list:
+        """
+        Get the opcodes of the jump instructions.
+
+        Returns
+        -------
+        : list of int
+            The opcodes.
+        """
+
+        return [
+            self.opcodes[instruction]
+            for instruction in ["JMP", "JZ", "JNZ", "JGE", "JLT"]
+        ]
+
+    def _run(self, start: int, end: int, state: dict) -> Union[tuple, None]:
+        """
+        Run instructions symbolically, over affine forms.
+
+        A form is a dict that maps the slot of each variable to its (nonzero)
+        coefficient, and `None` to the constant term.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first instruction.
+        end : int
+            The index right after the last instruction. If it is a conditional
+            jump, it is run as well, to get its condition.
+        state : dict
+            Maps the slots of the variables set so far to their forms.
+
+        Returns
+        -------
+        : tuple or None
+            The state after the instructions, and the condition to keep
+            looping -- either (`"lt"`, `difference`) for `L < R` or
+            (`"nonzero"`, `difference`) for `D != 0`, with the difference as
+            a form -- or `None` if there is no conditional jump. `None` if
+            the instructions are not affine, or leave values on the stack.
+        """
+
+
+        opcodes = self.opcodes
+        state = dict(state)
+        stack = []
+
+        def _fetch(slot: int) -> dict:
+            return state.get(slot, {slot: 1})
+
+        def _pop_forms() -> Union[tuple, None]:
+            if len(stack) < 2 or any(isinstance(form, tuple) for form in stack[-2:]):
+                return None
+
+            rhs, lhs = stack.pop(), stack.pop()
+
+            return lhs, rhs
+
+        for index in range(start, end):
+            opcode, operand = self.program[index]
+
+            if opcode == opcodes["IFETCH"]:
+                stack.append(_fetch(operand))
+
+            elif opcode == opcodes["IPUSH"]:
+                # Booleans would keep their type when copied.
+                if type(operand) is not int:
+                    return None
+
+                stack.append({None: operand} if operand else {})
+
+            elif opcode == opcodes["ISTORE"]:
+                if not stack or isinstance(stack[-1], tuple):
+                    return None
+
+                state[operand] = stack[-1]
+
+            elif opcode == opcodes["IPOP"]:
+                if not stack:
+                    return None
+
+                stack.pop()
+
+            elif opcode in [opcodes["IADD"], opcodes["ISUB"], opcodes["ILT"]]:
+                operands = _pop_forms()
+
+                if operands is None:
+                    return None
+
+                lhs, rhs = operands
+
+                if opcode == opcodes["IADD"]:
+                    stack.append(self._combine(lhs, rhs))
+                elif opcode == opcodes["ISUB"]:
+                    stack.append(self._combine(lhs, rhs, -1))
+                else:
+                    stack.append(("lt", self._combine(rhs, lhs, -1)))
+
+            elif opcode == opcodes["INC"]:
+                variable, constant = operand
+
+                if type(constant) is not int:
+                    return None
+
+                state[variable] = self._combine(_fetch(variable), {None: constant})
+
+            elif opcode == opcodes["SUBVV"]:
+                lhs, rhs = operand
+                stack.append(self._combine(_fetch(lhs), _fetch(rhs), -1))
+
+            elif opcode != opcodes["EMPTY"]:
+                return None
+
+        opcode, operand = self.program[end] if end < len(self.program) else (None, None)
+
+        if opcode in [opcodes["JZ"], opcodes["JNZ"]]:
+            if len(stack) != 1:
+                return None
+
+            condition = stack.pop()
+
+            if not isinstance(condition, tuple):
+                condition = ("nonzero", condition)
+
+            return state, condition
+
+        if opcode in [opcodes["JGE"], opcodes["JLT"]] and not stack:
+            lhs, rhs, _ = operand
+
+            return state, ("lt", self._combine(_fetch(rhs), _fetch(lhs), -1))
+
+        if opcode == opcodes["JMP"] and not stack:
+            return state, None
+
+        return None
+
+    @staticmethod
+    def _combine(form: dict, other_form: dict, factor: int = 1) -> dict:
+        """
+        Add a multiple of an affine form to another one.
+
+        Parameters
+        ----------
+        form : dict
+            The form.
+        other_form : dict
+            The form to add.
+        factor : int, optional (default = 1)
+            The multiple of `other_form` to add.
+
+        Returns
+        -------
+        combination : dict
+            The new form, without null coefficients.
+        """
+
+        combination = dict(form)
+
+        for slot, coefficient in other_form.items():
+            combination[slot] = combination.get(slot, 0) + factor * coefficient
+
+            if not combination[slot]:
+                del combination[slot]
+
+        return combination
+
+    @classmethod
+    def _substitute(cls, form: dict, state: dict) -> dict:
+        """
+        Substitute the variables of an affine form with their forms.
+
+        Parameters
+        ----------
+        form : dict
+            The form.
+        state : dict
+            Maps slots to their forms. The slots not in it are kept.
+
+        Returns
+        -------
+        substitution : dict
+            The new form.
+        """
+
+        substitution = {None: form[None]} if None in form else {}
+
+        for slot, coefficient in form.items():
+            if slot is not None:
+                substitution = cls._combine(
+                    substitution, state.get(slot, {slot: 1}), coefficient
+                )
+
+        return substitution
+
+    @classmethod
+    def _compose(cls, state: dict, other_state: dict) -> dict:
+        """
+        Compose two affine maps.
+
+        Parameters
+        ----------
+        state : dict
+            The map that runs first, from slots to their forms.
+        other_state : dict
+            The map that runs next.
+
+        Returns
+        -------
+        composition : dict
+            The map that runs both.
+        """
+
+        composition = dict(state)
+
+        for slot, form in other_state.items():
+            composition[slot] = cls._substitute(form, state)
+
+        return composition
+
+    @classmethod
+    def _get_recurrence(
+        cls, difference: dict, iteration_map: dict
+    ) -> Union[tuple, None]:
+        """
+        Get the recurrence of the difference of the condition of a loop.
+
+        The variables the loop doesn't set are constants along it, so they
+        may be part of the recurrence (e.g., in `while (i < n) i = i + i;`,
+        `n - i` is `2 * (n - i) - n` after an iteration).
+
+        Parameters
+        ----------
+        difference : dict
+            The form `D` of the condition.
+        iteration_map : dict
+            The map of an iteration.
+
+        Returns
+        -------
+        : tuple or None
+            The integer `x >= 0` and the form `y`, over the variables the loop
+            doesn't set, such that `D` is `x * D + y` after an iteration, or
+            `None` if there are none (or if `D` is constant along the loop).
+        """
+
+        next_difference = cls._substitute(difference, iteration_map)
+        set_slots = [
+            slot
+            for slot in set(difference) | set(next_difference)
+            if slot is not None and iteration_map.get(slot, {slot: 1}) != {slot: 1}
+        ]
+
+        if not any(slot in difference for slot in set_slots):
+            return None
+
+        slot = next(slot for slot in set_slots if slot in difference)
+        ratio, remainder = divmod(next_difference.get(slot, 0), difference[slot])
+
+        if remainder or ratio < 0:
+            return None
+
+        if any(
+            next_difference.get(slot, 0) != ratio * difference.get(slot, 0)
+            for slot in set_slots
+        ):
+            return None
+
+        return ratio, cls._combine(next_difference, difference, -ratio)
+
+    @staticmethod
+    def _find_exit(
+        kind: str, difference: int, ratio: int, offset: int
+    ) -> Union[int, None]:
+        """
+        Find the first iteration of a loop where its condition fails.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of the condition: `"lt"` (`D > 0`) or `"nonzero"`
+            (`D != 0`).
+        difference : int
+            The value of `D` at the first iteration.
+        ratio : int
+            The `x` of the recurrence of `D` (see `_get_recurrence`).
+        offset : int
+            The value of its `y`.
+
+        Returns
+        -------
+        : int or None
+            The number of iterations before the condition fails, or `None` if
+            it never does.
+        """
+
+        def _holds(value: int) -> bool:
+            return value > 0 if kind == "lt" else value != 0
+
+        if not _holds(difference):
+            return 0
+
+        next_difference = ratio * difference + offset
+
+        # `D` is constant after the first iteration.
+        if not ratio:
+            return None if _holds(next_difference) else 1
+
+        # Otherwise, it moves in the same direction along the iterations, so
+        # the condition fails for good once `D` reaches (or crosses) 0.
+        sign = 1 if difference > 0 else -1
+
+        if sign * (next_difference - difference) >= 0:
+            return None
+
+        # Closed form: `D` is `difference + offset * n` after `n` iterations.
+        if ratio == 1:
+            if kind == "lt":
+                return -(difference // offset)
+
+            return None if difference % offset else -(difference // offset)
+
+        # Exponential search, over the `2 ** n`-th powers of `D -> x * D + y`.
+        powers = [(ratio, offset)]
+
+        def _apply(power: tuple, value: int) -> int:
+            return power[0] * value + power[1]
+
+        while sign * _apply(powers[-1], difference) > 0:
+            power_ratio, power_offset = powers[-1]
+            powers.append((power_ratio ** 2, power_ratio * power_offset + power_offset))
+
+        iteration_count = 0
+
+        for exponent, power in reversed(list(enumerate(powers))):
+            value = _apply(power, difference)
+
+            if sign * value > 0:
+                difference = value
+                iteration_count += 2 ** exponent
+
+        difference = _apply(powers[0], difference)
+
+        if kind == "nonzero" and difference:
+            return None
+
+        return iteration_count + 1
+
+    def _get_function(
+        self,
+        iteration_map: dict,
+        condition: tuple,
+        last_map: dict,
+        exit_index: int,
+        length: int,
+        last_length: int,
+        fallback: Callable
+    ) -> Union[Callable, None]:
+        """
+        Get the function that runs an affine loop.
+
+        Parameters
+        ----------
+        iteration_map : dict
+            The map of an iteration.
+        condition : tuple
+            The condition to keep looping.
+        last_map : dict
+            The map of the last iteration, up to the failed test.
+        exit_index : int
+            The index of the instruction to resume the interpretation at.
+        length : int
+            The number of instructions of an iteration.
+        last_length : int
+            The number of instructions of the last iteration.
+        fallback : Callable
+            The function of the compiled loop.
+
+        Returns
+        -------
+        : Callable or None
+            The function (see `CompiledLoop`), or `None` if the condition is
+            not monotonic.
+        """
+
+        kind, difference = condition
+        recurrence = self._get_recurrence(difference, iteration_map)
+
+        if recurrence is None:
+            return None
+
+        ratio, offset = recurrence
+
+        # The slots read before they are set, in any iteration.
+        read_slots = sorted({
+            slot
+            for form in [difference, *iteration_map.values(), *last_map.values()]
+            for slot in form
+            if slot is not None
+        })
+
+        def _evaluate(form: dict, slots: list) -> int:
+            return form.get(None, 0) + sum(
+                coefficient * slots[slot]
+                for slot, coefficient in form.items()
+                if slot is not None
+            )
+
+        def accelerated_loop(slots: list) -> tuple[int, int]:
+            if any(type(slots[slot]) is not int for slot in read_slots):
+                return fallback(slots)
+
+            iteration_count = self._find_exit(
+                kind,
+                _evaluate(difference, slots),
+                ratio,
+                _evaluate(offset, slots)
+            )
+
+            if iteration_count is None:
+                return fallback(slots)
+
+            # Square-and-multiply, over the powers of the map.
+            state, power, exponent = {}, iteration_map, iteration_count
+
+            while exponent:
+                if exponent & 1:
+                    state = self._compose(state, power)
+
+                exponent >>= 1
+
+                if exponent:
+                    power = self._compose(power, power)
+
+            state = self._compose(state, last_map)
+            values = {slot: _evaluate(form, slots) for slot, form in state.items()}
+
+            for slot, value in values.items():
+                slots[slot] = value
+
+            return exit_index, iteration_count * length + last_length
+
+        return accelerated_loop
@@ -0,0 +1,250 @@
+"""Implement a compact, array-backed executable image for the virtual machine."""
+
+from array import array
+from typing import Generator
+
+from src.code_generator import CodeGenerator
+
+
+class Bytecode:
+    """
+    Executable image assembled from the instructions of the `CodeGenerator`.
+
+    Instructions are packed in an `array` of integers: each one is made of its
+    opcode, followed by its operands (see `operand_kinds`). Variables and
+    constants are referenced by their index in the `variables` and `constants`
+    tables, and jumps by the address of their target in `code`. Hence, the
+    image holds no reference to the Abstract Syntax Tree, and can be pickled.
+
+    Parameters
+    ----------
+    code : array
+        The packed instructions.
+    constants : list
+        The constants table, referenced by `IPUSH` and `INC`.
+    variables : list
+        The variables table, referenced by `IFETCH`, `ISTORE` and the fused
+        instructions.
+    """
+
+    opcodes = {
+        instruction: opcode
+        for opcode, instruction in enumerate(CodeGenerator.instructions)
+    }
+
+    instructions = {opcode: instruction for instruction, opcode in opcodes.items()}
+
+    # The kind of the operands of each instruction: `variable` and `constant`
+    # operands index the corresponding tables, and `address` operands index
+    # the `code` array.
+    operand_kinds = {
+        "IFETCH": ("variable",),
+        "ISTORE": ("variable",),
+        "IPUSH": ("constant",),
+        "JMP": ("address",),
+        "JZ": ("address",),
+        "JNZ": ("address",),
+        "INC": ("variable", "constant"),
+        "JGE": ("variable", "variable", "address"),
+        "SUBVV": ("variable", "variable"),
+        "JLT": ("variable", "variable", "address")
+    }
+
+    def __init__(
+        self, code: array, constants: list, variables: list
+    ) -> None:
+        self.code: array = code
+        self.constants: list = constants
+        self.variables: list = variables
+
+    def __eq__(self, other: "Bytecode") -> bool:
+        """
+        Implement the equality comparison between Bytecode objects.
+
+        Parameters
+        ----------
+        other : Bytecode
+            The right hand side Bytecode of the comparison.
+
+        Returns
+        -------
+        is_equal : bool
+            `True` if the code and both tables are equal, `False` otherwise.
+        """
+
+        is_equal = (
+            self.code == other.code
+            and self.constants == other.constants
+            and self.variables == other.variables
+        )
+
+        return is_equal
+
+    def __len__(self) -> int:
+        """
+        Get the size of the image, in words.
+
+        Returns
+        -------
+        : int
+            The length of the `code` array.
+        """
+
+        return len(self.code)
+
+    def __str__(self) -> str:
+        """
+        Implement a string representation of a Bytecode object.
+
+        This method is internally invoked when using `print(bytecode_obj)`.
+
+        Returns
+        -------
+        _str : str
+            The disassembled image.
+        """
+
+        return self.disassemble()
+
+    @classmethod
+    def assemble(cls, code_collection: list) -> "Bytecode":
+        """
+        Assemble the instructions generated by the `CodeGenerator`.
+
+        Parameters
+        ----------
+        code_collection : list
+            List of (`instruction`, `argument`) tuples, where `argument` is
+            either a `Node` or, for jumps, the index of the target instruction.
+            Instructions with several operands have a tuple of those.
+
+        Returns
+        -------
+        : Bytecode
+            The executable image.
+        """
+
+        # First pass: compute the address of each instruction, so jumps can be
+        # translated from indexes in the `code_collection` to addresses.
+        addresses = []
+        address = 0
+
+        for instruction, _ in code_collection:
+            addresses.append(address)
+            address += 1 + len(cls.operand_kinds.get(instruction, ()))
+
+        # Jumps may target the position right after the last instruction.
+        addresses.append(address)
+
+        code = array("i")
+        constants = []
+        constants_index = {}
+        variables = []
+        variables_index = {}
+
+        for instruction, argument in code_collection:
+            code.append(cls.opcodes[instruction])
+
+            operand_kinds = cls.operand_kinds.get(instruction, ())
+            arguments = argument if len(operand_kinds) > 1 else (argument,)
+
+            for operand_kind, argument in zip(operand_kinds, arguments):
+                if operand_kind == "address":
+                    code.append(addresses[argument])
+
+                elif operand_kind == "variable":
+                    if argument.value not in variables_index:
+                        variables_index[argument.value] = len(variables)
+                        variables.append(argument.value)
+
+                    code.append(variables_index[argument.value])
+
+                else:
+                    # `True == 1`, so the type is part of the key to avoid
+                    # mixing up booleans and integers.
+                    key = (type(argument.value), argument.value)
+
+                    if key not in constants_index:
+                        constants_index[key] = len(constants)
+                        constants.append(argument.value)
+
+                    code.append(constants_index[key])
+
+        return cls(code=code, constants=constants, variables=variables)
+
+    def decode(self) -> Generator:
+        """
+        Decode the image instruction by instruction.
+
+        Returns
+        -------
+        : Generator
+            Generator of (`address`, `instruction`, `operands`) tuples, where
+            `operands` is a tuple of the raw integer operands.
+        """
+
+        address = 0
+
+        while address < len(self.code):
+            instruction = self.instructions[self.code[address]]
+            operand_count = len(self.operand_kinds.get(instruction, ()))
+
+            operands = tuple(self.code[address + 1:address + 1 + operand_count])
+
+            yield address, instruction, operands
+
+            address += 1 + operand_count
+
+    def resolve(self, instruction: str, operands: tuple) -> tuple:
+        """
+        Resolve the raw operands of an instruction to the values they reference.
+
+        Parameters
+        ----------
+        instruction : str
+            The instruction the operands belong to.
+        operands : tuple of int
+            The raw operands, as stored in `code`.
+
+        Returns
+        -------
+        : tuple
+            The variable names, constants and addresses referenced.
+        """
+
+        tables = {
+            "variable": self.variables,
+            "constant": self.constants
+        }
+
+        return tuple(
+            tables[operand_kind][operand] if operand_kind in tables else operand
+            for operand_kind, operand in zip(
+                self.operand_kinds.get(instruction, ()), operands
+            )
+        )
+
+    def disassemble(self) -> str:
+        """
+        Disassemble the image into a human readable listing.
+
+        Returns
+        -------
+        : str
+            One line per instruction, with its address, name and the values
+            its operands reference.
+        """
+
+        lines = []
+
+        for address, instruction, operands in self.decode():
+            resolved_operands = self.resolve(instruction, operands)
+
+            line = f"{address:>6} {instruction}"
+
+            if resolved_operands:
+                line += " " + ", ".join(map(str, resolved_operands))
+
+            lines.append(line)
+
+        return "\n".join(lines)
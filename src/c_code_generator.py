@@ -0,0 +1,579 @@
+"""Implement a code generator that translates the AST into native code."""
+
+import ctypes
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Callable, Union
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.interpreter import create_virtual_machine
+from src.lexer import Lexer
+from src.node import Node
+
+
+class CCodeGenerator:
+    """
+    Code Generator that generates the source code of a C function from
+    Abstract Syntax Tree (AST) Nodes.
+
+    Expressions are lowered into a sequence of C statements over temporaries,
+    so they are evaluated from left to right as in the virtual machine. Each
+    Tiny-C variable is held in a 64-bit integer and a `kind` (unset, integer
+    or boolean), so the function returns exactly the values the virtual
+    machine produces. Reading an unset variable or overflowing an integer
+    makes the function fail, so the caller can fall back to the virtual
+    machine.
+    """
+
+    function_name = "tinyc_program"
+    indentation = "    "
+
+    # The kinds of values a variable may hold.
+    unset_kind = 0
+    integer_kind = 1
+    boolean_kind = 2
+
+    operators = {"ADD": "add", "SUB": "sub"}
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.variables: list = []
+        self.depth: int = 1
+        self.temporary_count: int = 0
+
+    def __str__(self) -> str:
+        """
+        Implement a string representation of a CCodeGenerator object.
+
+        This method is internally invoked when using `print(codegen_obj)`.
+
+        Returns
+        -------
+        _str : str
+            The generated C source code.
+        """
+
+        return self.source
+
+    @property
+    def source(self) -> str:
+        """
+        Get the source code of the generated C translation unit.
+
+        The unit exports the `tinyc_program` function, which receives arrays
+        to write the values and kinds of the variables to, and returns 0 on
+        success or 1 on failure; and the `tinyc_variables` array, with the
+        names of the variables.
+
+        Returns
+        -------
+        : str
+            The source code.
+        """
+
+        indentation = self.indentation
+        variable_count = len(self.variables)
+
+        # C does not allow empty arrays, so an unused name is added instead.
+        names = ", ".join(f'"{variable}"' for variable in self.variables)
+
+        declarations = [
+            f"{indentation}long long v{index} = 0; "
+            f"unsigned char k{index} = {self.unset_kind};"
+            for index in range(variable_count)
+        ]
+
+        results = [
+            f"{indentation}values[{index}] = v{index}; kinds[{index}] = k{index};"
+            for index in range(variable_count)
+        ]
+
+        return "\n".join([
+            f"const int tinyc_variable_count = {variable_count};",
+            f"const char *tinyc_variables[] = {{{names or '0'}}};",
+            "",
+            f"int {self.function_name}(long long *values, unsigned char *kinds)",
+            "{",
+            *declarations,
+            *self.lines,
+            *results,
+            f"{indentation}return 0;",
+            "fault:",
+            f"{indentation}return 1;",
+            "}",
+            ""
+        ])
+
+    def generate_code(self, node: Node) -> None:
+        """
+        Generate code from a statement Node in the Abstract Syntax Tree.
+
+        Parameters
+        ----------
+        node : Node
+            The initial Node from the AST. (i.e., its `root`.)
+        """
+
+        statement_map = {
+            "PROG": self.parse_sequence,
+            "SEQ": self.parse_sequence,
+            "BLOCK": self.parse_sequence,
+            "EMPTY": self.parse_sequence,
+            "EXPR": self.parse_expression_statement,
+            "IF": self.parse_if_node,
+            "IFELSE": self.parse_if_node,
+            "WHILE": self.parse_while_node,
+            "DO": self.parse_do_while_node
+        }
+
+        handler = statement_map[node.kind]
+
+        handler(node=node)
+
+    def generate_expression(self, node: Node) -> tuple[str, str]:
+        """
+        Generate the statements that compute an expression Node.
+
+        Parameters
+        ----------
+        node : Node
+            The expression Node to translate.
+
+        Returns
+        -------
+        value : str
+            The temporary (or literal) that holds the value of the expression.
+        kind : str
+            The C expression of the kind of the value.
+
+        Raises
+        ------
+        OverflowError
+            Raised if a constant does not fit in 64 bits.
+        """
+
+        # Nodes are kept in an explicit stack, so the depth of the expression
+        # is not bound by the recursion limit. Each operation is visited
+        # twice: first to push its operands, then to compute its value from
+        # theirs, which are kept in another stack.
+        results = []
+        pending_nodes = [(node, False)]
+
+        while pending_nodes:
+            current, is_evaluated = pending_nodes.pop()
+
+            if current.kind == "CST":
+                if not -2 ** 63 <= current.value < 2 ** 63:
+                    raise OverflowError(
+                        f"Constant out of range: {current.value}."
+                    )
+
+                # Folded comparisons leave boolean constants in the tree.
+                if isinstance(current.value, bool):
+                    results.append(
+                        (f"{int(current.value)}LL", str(self.boolean_kind))
+                    )
+                else:
+                    results.append(
+                        (f"{current.value}LL", str(self.integer_kind))
+                    )
+            elif current.kind == "VAR":
+                index = self._get_variable_index(current.value)
+                value = self._new_temporary()
+                kind = self._new_temporary()
+
+                self._add_line(f"if (!k{index}) goto fault;")
+                self._add_line(f"long long {value} = v{index};")
+                self._add_line(f"unsigned char {kind} = k{index};")
+
+                results.append((value, kind))
+            elif current.kind == "SET":
+                index, expression = self._get_set_operands(current)
+
+                if is_evaluated:
+                    value, kind = results[-1]
+                    self._add_line(f"v{index} = {value}; k{index} = {kind};")
+                else:
+                    pending_nodes.append((current, True))
+                    pending_nodes.append((expression, False))
+            elif not is_evaluated:
+                lhs, rhs = current.children
+
+                pending_nodes.append((current, True))
+                pending_nodes.append((rhs, False))
+                pending_nodes.append((lhs, False))
+            else:
+                rhs_value, _ = results.pop()
+                lhs_value, _ = results.pop()
+
+                value = self._new_temporary()
+                self._add_line(f"long long {value};")
+
+                if current.kind == "LT":
+                    self._add_line(f"{value} = {lhs_value} < {rhs_value};")
+                    results.append((value, str(self.boolean_kind)))
+                else:
+                    # Python integers never overflow: the virtual machine must
+                    # run them.
+                    self._add_line(
+                        f"if (__builtin_{self.operators[current.kind]}"
+                        f"_overflow({lhs_value}, {rhs_value}, &{value})) "
+                        "goto fault;"
+                    )
+                    results.append((value, str(self.integer_kind)))
+
+        return results.pop()
+
+    def parse_sequence(self, node: Node) -> None:
+        """
+        Generate code from a sequence of statements.
+
+        Parameters
+        ----------
+        node : Node
+            The `PROG`, `SEQ`, `BLOCK` or `EMPTY` Node to parse.
+        """
+
+        for child in node.children:
+            self.generate_code(child)
+
+    def parse_expression_statement(self, node: Node) -> None:
+        """
+        Generate code from an `EXPR` Node.
+
+        The expression is computed in its own block, and its value discarded.
+
+        Parameters
+        ----------
+        node : Node
+            The `EXPR` Node to parse.
+        """
+
+        (expression,) = node.children
+
+        self._add_line("{")
+        self.depth += 1
+        self.generate_expression(expression)
+        self.depth -= 1
+        self._add_line("}")
+
+    def parse_if_node(self, node: Node) -> None:
+        """
+        Generate code from an `IF` or an `IFELSE` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `IF` or `IFELSE` Node to parse.
+        """
+
+        expr, if_statement, *else_statement = node.children
+
+        self._add_line("{")
+        self.depth += 1
+
+        condition, _ = self.generate_expression(expr)
+        self._add_line(f"if ({condition}) {{")
+        self._add_block(if_statement)
+
+        if else_statement:
+            self._add_line("} else {")
+            self._add_block(else_statement[0])
+
+        self._add_line("}")
+
+        self.depth -= 1
+        self._add_line("}")
+
+    def parse_while_node(self, node: Node) -> None:
+        """
+        Generate code from a `WHILE` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `WHILE` Node to parse.
+        """
+
+        expr, statement = node.children
+
+        self._add_line("for (;;) {")
+        self.depth += 1
+
+        condition, _ = self.generate_expression(expr)
+        self._add_line(f"if (!{condition}) break;")
+        self.generate_code(statement)
+
+        self.depth -= 1
+        self._add_line("}")
+
+    def parse_do_while_node(self, node: Node) -> None:
+        """
+        Generate code from a `DO` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `DO` Node to parse.
+        """
+
+        statement, expr = node.children
+
+        self._add_line("for (;;) {")
+        self.depth += 1
+
+        self.generate_code(statement)
+        condition, _ = self.generate_expression(expr)
+        self._add_line(f"if (!{condition}) break;")
+
+        self.depth -= 1
+        self._add_line("}")
+
+    def _add_line(self, line: str) -> None:
+        """
+        Add a line of code at the current indentation depth.
+
+        Parameters
+        ----------
+        line : str
+            The line to add.
+        """
+
+        self.lines.append(f"{self.indentation * self.depth}{line}")
+
+    def _add_block(self, node: Node) -> None:
+        """
+        Add an indented block of code generated from a statement Node.
+
+        Parameters
+        ----------
+        node : Node
+            The statement Node to generate the block from.
+        """
+
+        self.depth += 1
+        self.generate_code(node)
+        self.depth -= 1
+
+    def _new_temporary(self) -> str:
+        """
+        Get the name of a new temporary.
+
+        Returns
+        -------
+        : str
+            A C identifier that is not used yet.
+        """
+
+        self.temporary_count += 1
+
+        return f"t{self.temporary_count}"
+
+    def _get_variable_index(self, variable: str) -> int:
+        """
+        Get the index of a variable, registering it if needed.
+
+        Parameters
+        ----------
+        variable : str
+            The name of the variable.
+
+        Returns
+        -------
+        : int
+            The index of the variable in the `values` and `kinds` arrays.
+        """
+
+        if variable not in self.variables:
+            self.variables.append(variable)
+
+        return self.variables.index(variable)
+
+    def _get_set_operands(self, node: Node) -> tuple[int, Node]:
+        """
+        Get the variable and the expression of a `SET` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `SET` Node.
+
+        Returns
+        -------
+        index : int
+            The index of the variable to set.
+        expression : Node
+            The Node of the expression to assign.
+        """
+
+        # Making the Code Generator compatible with AST Merging optimization.
+        if node.value is not None:
+            variable = node.value
+            (expression,) = node.children
+        else:
+            lhs, expression = node.children
+            variable = lhs.value
+
+        return self._get_variable_index(variable), expression
+
+
+def find_c_compiler() -> Union[str, None]:
+    """
+    Find the system C compiler.
+
+    The `CC` environment variable takes precedence over `cc`, `clang` and
+    `gcc`, in this order.
+
+    Returns
+    -------
+    : str or None
+        The path to the compiler, or `None` if there is none.
+    """
+
+    candidates = [os.environ.get("CC"), "cc", "clang", "gcc"]
+
+    for candidate in candidates:
+        if candidate and shutil.which(candidate):
+            return shutil.which(candidate)
+
+    return None
+
+
+def create_c_function(
+    source_code: str,
+    cache_dir: Union[str, None] = None,
+    compiler: Union[str, None] = None
+) -> Callable[[], dict]:
+    """
+    Compile the input `source_code` into native code, loaded with `ctypes`.
+
+    If the program can not be compiled -- e.g., there is no C compiler -- or
+    if the native code fails at run time, the program runs on the virtual
+    machine instead. Either way, the results are the same.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code to compile.
+    cache_dir : str or None, optional (default = None)
+        Directory where compiled programs are cached as shared objects, keyed
+        by the hash of their source code. If `None`, nothing is cached.
+    compiler : str or None, optional (default = None)
+        The C compiler to use. If `None`, `find_c_compiler` picks one.
+
+    Returns
+    -------
+    function : Callable
+        A function that runs the program and returns its variables.
+    """
+
+    def run_virtual_machine() -> dict:
+        vm = create_virtual_machine(source_code)
+        vm.run()
+
+        return dict(vm.variables)
+
+    compiler = compiler or find_c_compiler()
+
+    if compiler is None:
+        return run_virtual_machine
+
+    if cache_dir is None:
+        with tempfile.TemporaryDirectory() as temporary_dir:
+            library = _load_library(source_code, compiler, temporary_dir)
+    else:
+        library = _load_library(source_code, compiler, cache_dir)
+
+    if library is None:
+        return run_virtual_machine
+
+    variable_count = ctypes.c_int.in_dll(library, "tinyc_variable_count").value
+    names = (ctypes.c_char_p * max(variable_count, 1)).in_dll(
+        library, "tinyc_variables"
+    )
+    variables = [name.decode() for name in names[:variable_count]]
+
+    program = getattr(library, CCodeGenerator.function_name)
+    program.restype = ctypes.c_int
+
+    def run_native_code() -> dict:
+        values = (ctypes.c_longlong * max(variable_count, 1))()
+        kinds = (ctypes.c_ubyte * max(variable_count, 1))()
+
+        if program(values, kinds) != 0:
+            return run_virtual_machine()
+
+        return {
+            variable: (
+                bool(value) if kind == CCodeGenerator.boolean_kind else value
+            )
+            for variable, value, kind in zip(variables, values, kinds)
+            if kind != CCodeGenerator.unset_kind
+        }
+
+    return run_native_code
+
+
+def _load_library(
+    source_code: str, compiler: str, cache_dir: str
+) -> Union[ctypes.CDLL, None]:
+    """
+    Load the shared object of a program, compiling it if it is not cached.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code to compile.
+    compiler : str
+        The C compiler to use.
+    cache_dir : str
+        Directory where the shared object is stored.
+
+    Returns
+    -------
+    : ctypes.CDLL or None
+        The loaded shared object, or `None` if the program can't be compiled.
+    """
+
+    key = hashlib.sha256(f"{compiler}\0{source_code}".encode()).hexdigest()
+    library_path = os.path.join(os.path.abspath(cache_dir), f"{key}.so")
+
+    if not os.path.exists(library_path):
+        ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+        ast.build()
+
+        generator = CCodeGenerator()
+
+        # Deeply nested statements may still run out of stack.
+        try:
+            generator.generate_code(node=ast.root)
+        except (OverflowError, RecursionError):
+            return None
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Compile to temporary files first, so concurrent runs never load a
+        # partially written shared object.
+        temporary_path = f"{library_path}.{os.getpid()}.tmp"
+        c_path = f"{temporary_path}.c"
+
+        with open(c_path, "w") as c_file:
+            c_file.write(generator.source)
+
+        try:
+            subprocess.run(
+                [compiler, "-O2", "-shared", "-fPIC", "-o", temporary_path, c_path],
+                check=True,
+                capture_output=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        finally:
+            os.remove(c_path)
+
+        os.replace(temporary_path, library_path)
+
+    return ctypes.CDLL(library_path)
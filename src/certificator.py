@@ -158,20 +158,31 @@ class Certificator:
         }
 
     def traverse_ast(self):
-        """Traverse the AST and annotate each node with its relative position."""
+        """
+        Traverse the AST and annotate each node with its relative position.
 
-        # Using a list to avoid issues with variable scoping in nested function
-        current_prime = [1]
+        Nodes are annotated in post-order (children first, from left to
+        right). The traversal uses an explicit stack, so it is not bound by
+        the recursion limit.
+        """
 
-        def traverse(node: Node) -> None:
-            if node is None:
-                return
+        current_prime = 1
+
+        # Pairs of (`node`, `children_visited`).
+        pending_nodes = [(self.frontend_code, False)]
 
-            for child in node.children:
-                traverse(child)
+        while pending_nodes:
+            node, children_visited = pending_nodes.pop()
 
-            current_prime[0] = next_prime(current_prime[0])
-            
-            node.set_position_in_tree(current_prime[0])
+            if node is None:
+                continue
 
-        traverse(self.frontend_code)
+            if children_visited:
+                current_prime = next_prime(current_prime)
+                node.set_position_in_tree(current_prime)
+                continue
+
+            pending_nodes.append((node, True))
+            pending_nodes.extend(
+                (child, False) for child in reversed(node.children)
+            )
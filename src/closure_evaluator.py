@@ -0,0 +1,450 @@
+"""Implement an evaluator that compiles the AST into nested Python closures."""
+
+import operator
+from typing import Callable
+
+from src.node import Node
+
+
+class ClosureEvaluator:
+    """
+    Evaluator that runs a program as a tree of nested Python closures.
+
+    The Abstract Syntax Tree is walked once, and each Node is compiled into a
+    closure that computes it by calling the closures of its children. Running
+    the program is then a single call to the closure of the root, without
+    generating code for the virtual machine or using a stack.
+
+    Closures call each other, so the depth of the tree is bound by the
+    recursion limit, except for long chains of operations such as long sums
+    (see `max_nested_operations`).
+
+    Parameters
+    ----------
+    node : Node
+        The initial Node from the AST. (i.e., its `root`.)
+
+    Raises
+    ------
+    ValueError
+        Raised if the program is nested too deeply to be compiled.
+    """
+
+    # Chains of operations on their left hand side (e.g., `a + b - c + d`)
+    # longer than this are computed by a loop rather than by nested closures,
+    # which are faster but take a Python frame each.
+    max_nested_operations = 64
+
+    operators = {"ADD": operator.add, "SUB": operator.sub, "LT": operator.lt}
+
+    def __init__(self, node: Node) -> None:
+        self.variables = {}
+
+        try:
+            self.program: Callable = self.compile(node)
+        except RecursionError as error:
+            raise ValueError(
+                "Unsupported program: nested too deeply for the closure engine."
+            ) from error
+
+    def run(self) -> None:
+        """
+        Run the program.
+
+        Raises
+        ------
+        ValueError
+            Raised if the program is nested too deeply to be run.
+        """
+
+        try:
+            self.program()
+        except RecursionError as error:
+            raise ValueError(
+                "Unsupported program: nested too deeply for the closure engine."
+            ) from error
+
+    def compile(self, node: Node) -> Callable:
+        """
+        Compile a Node of the Abstract Syntax Tree into a closure.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A function without parameters that computes the Node. Expression
+            closures return the value of the expression.
+        """
+
+        compiler_map = {
+            "VAR": self.compile_variable,
+            "CST": self.compile_constant,
+            "ADD": self.compile_operation,
+            "SUB": self.compile_operation,
+            "LT": self.compile_operation,
+            "SET": self.compile_set_node,
+            "EXPR": self.compile_expression_statement,
+            "IF": self.compile_if_node,
+            "IFELSE": self.compile_if_else_node,
+            "WHILE": self.compile_while_node,
+            "DO": self.compile_do_while_node,
+            "SEQ": self.compile_sequence,
+            "BLOCK": self.compile_sequence,
+            "EMPTY": self.compile_sequence,
+            "PROG": self.compile_sequence
+        }
+
+        compiler = compiler_map[node.kind]
+
+        return compiler(node=node)
+
+    def compile_variable(self, node: Node) -> Callable:
+        """
+        Compile a `VAR` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `VAR` Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A closure that returns the value of the variable.
+        """
+
+        variables = self.variables
+        name = node.value
+
+        def variable() -> int:
+            return variables[name]
+
+        return variable
+
+    def compile_constant(self, node: Node) -> Callable:
+        """
+        Compile a `CST` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `CST` Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A closure that returns the constant.
+        """
+
+        value = node.value
+
+        def constant() -> int:
+            return value
+
+        return constant
+
+    def compile_operation(self, node: Node) -> Callable:
+        """
+        Compile an `ADD`, `SUB` or `LT` Node.
+
+        Operations whose operands are variables or constants are specialized,
+        so their operands are computed without calling other closures. Long
+        chains of operations are compiled by `compile_operation_chain`.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A closure that returns the result of the operation.
+        """
+
+        lhs, rhs = node.children
+        variables = self.variables
+
+        if lhs.kind == "VAR" and rhs.kind == "CST":
+            name, value = lhs.value, rhs.value
+
+            if node.kind == "ADD":
+                return lambda: variables[name] + value
+            if node.kind == "SUB":
+                return lambda: variables[name] - value
+            return lambda: variables[name] < value
+
+        if lhs.kind == "VAR" and rhs.kind == "VAR":
+            lhs_name, rhs_name = lhs.value, rhs.value
+
+            if node.kind == "ADD":
+                return lambda: variables[lhs_name] + variables[rhs_name]
+            if node.kind == "SUB":
+                return lambda: variables[lhs_name] - variables[rhs_name]
+            return lambda: variables[lhs_name] < variables[rhs_name]
+
+        chain = [node]
+
+        while (
+            chain[-1].children[0].kind in self.operators
+            and len(chain) <= self.max_nested_operations
+        ):
+            chain.append(chain[-1].children[0])
+
+        if len(chain) > self.max_nested_operations:
+            return self.compile_operation_chain(node)
+
+        lhs_closure = self.compile(lhs)
+        rhs_closure = self.compile(rhs)
+
+        if node.kind == "ADD":
+            return lambda: lhs_closure() + rhs_closure()
+        if node.kind == "SUB":
+            return lambda: lhs_closure() - rhs_closure()
+        return lambda: lhs_closure() < rhs_closure()
+
+    def compile_operation_chain(self, node: Node) -> Callable:
+        """
+        Compile a chain of operations on their left hand side into a loop.
+
+        The first operation of the chain is the deepest one whose left hand
+        side is not an operation, and each of the following ones combines the
+        value so far with its right hand side, from left to right as in the
+        virtual machine.
+
+        Parameters
+        ----------
+        node : Node
+            The last `ADD`, `SUB` or `LT` Node of the chain.
+
+        Returns
+        -------
+        : Callable
+            A closure that returns the result of the chain.
+        """
+
+        chain = [node]
+
+        while chain[-1].children[0].kind in self.operators:
+            chain.append(chain[-1].children[0])
+
+        first_closure = self.compile_operation(chain.pop())
+        operations = [
+            (self.operators[operation.kind], self.compile(operation.children[1]))
+            for operation in reversed(chain)
+        ]
+
+        def operation_chain() -> int:
+            value = first_closure()
+
+            for function, rhs_closure in operations:
+                value = function(value, rhs_closure())
+
+            return value
+
+        return operation_chain
+
+    def compile_set_node(self, node: Node) -> Callable:
+        """
+        Compile a `SET` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `SET` Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A closure that assigns the variable and returns its new value.
+        """
+
+        # Making the evaluator compatible with AST Merging optimization.
+        if node.value is not None:
+            name = node.value
+            (expression,) = node.children
+        else:
+            lhs, expression = node.children
+            name = lhs.value
+
+        variables = self.variables
+        expression_closure = self.compile(expression)
+
+        def set_variable() -> int:
+            value = variables[name] = expression_closure()
+            return value
+
+        return set_variable
+
+    def compile_expression_statement(self, node: Node) -> Callable:
+        """
+        Compile an `EXPR` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `EXPR` Node to compile.
+
+        Returns
+        -------
+        : Callable
+            The closure of the expression, whose result is discarded.
+        """
+
+        (expression,) = node.children
+
+        return self.compile(expression)
+
+    def compile_if_node(self, node: Node) -> Callable:
+        """
+        Compile an `IF` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `IF` Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A closure that runs the statement if the condition holds.
+        """
+
+        expr, statement = node.children
+
+        condition = self.compile(expr)
+        if_statement = self.compile(statement)
+
+        def if_closure() -> None:
+            if condition():
+                if_statement()
+
+        return if_closure
+
+    def compile_if_else_node(self, node: Node) -> Callable:
+        """
+        Compile an `IFELSE` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `IFELSE` Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A closure that runs one of the statements, depending on the
+            condition.
+        """
+
+        expr, if_node, else_node = node.children
+
+        condition = self.compile(expr)
+        if_statement = self.compile(if_node)
+        else_statement = self.compile(else_node)
+
+        def if_else_closure() -> None:
+            if condition():
+                if_statement()
+            else:
+                else_statement()
+
+        return if_else_closure
+
+    def compile_while_node(self, node: Node) -> Callable:
+        """
+        Compile a `WHILE` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `WHILE` Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A closure that runs the loop.
+        """
+
+        expr, statement = node.children
+
+        condition = self.compile(expr)
+        body = self.compile(statement)
+
+        def while_closure() -> None:
+            while condition():
+                body()
+
+        return while_closure
+
+    def compile_do_while_node(self, node: Node) -> Callable:
+        """
+        Compile a `DO` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `DO` Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A closure that runs the loop.
+        """
+
+        statement, expr = node.children
+
+        condition = self.compile(expr)
+        body = self.compile(statement)
+
+        def do_while_closure() -> None:
+            body()
+
+            while condition():
+                body()
+
+        return do_while_closure
+
+    def compile_sequence(self, node: Node) -> Callable:
+        """
+        Compile a `PROG`, `SEQ`, `BLOCK` or `EMPTY` Node.
+
+        Nested sequences are flattened and empty statements are dropped, so
+        the statements run from a single loop.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to compile.
+
+        Returns
+        -------
+        : Callable
+            A closure that runs the statements in order.
+        """
+
+        statements = []
+        pending_nodes = [node]
+
+        while pending_nodes:
+            current_node = pending_nodes.pop()
+
+            if current_node.kind in ["PROG", "SEQ", "BLOCK", "EMPTY"]:
+                pending_nodes.extend(reversed(current_node.children))
+            else:
+                statements.append(self.compile(current_node))
+
+        if len(statements) == 1:
+            return statements[0]
+
+        statements = tuple(statements)
+
+        def sequence() -> None:
+            for statement in statements:
+                statement()
+
+        return sequence
@@ -1,5 +1,9 @@
 """Implement a code generator for the virtual machine."""
 
+import gc
+from string import ascii_lowercase
+from typing import Generator, Union
+
 from src.node import Node
 
 
@@ -7,6 +11,20 @@ class CodeGenerator:
     """
     Code Generator that generates instructions for the virtual machine from
     Abstract Syntax Tree (AST) Nodes.
+
+    Parameters
+    ----------
+    superinstructions : bool, optional (default = False)
+        Whether to emit fused instructions for common sequences: `INC x, k`
+        for `x = x + k;` (or `x = x - k;`), `SUBVV a, b` for `a - b`, and
+        `JGE a, b, target` for conditions `a < b` that skip code when false
+        (and `JLT a, b, target` for the ones that repeat a loop when true).
+        Each one replaces up to five instructions, so fewer are dispatched.
+    loop_inversion : bool, optional (default = False)
+        Whether to generate `while` loops as a `do`/`while` loop guarded by
+        the condition, which is then tested at the bottom of the loop. Each
+        iteration runs a single jump instead of a conditional jump and a
+        `JMP` back to the top, at the cost of generating the condition twice.
     """
 
     instructions = [
@@ -21,11 +39,56 @@ class CodeGenerator:
         "EMPTY",
         "JMP",
         "JZ",
-        "JNZ"
+        "JNZ",
+        "INC",
+        "JGE",
+        "SUBVV",
+        "JLT"
     ]
 
-    def __init__(self) -> None:
+    jump_instructions = ["JMP", "JZ", "JNZ", "JGE", "JLT"]
+
+    # Fused instructions, emitted if `superinstructions` is enabled. Their
+    # argument is a tuple with one element per operand: `INC` takes a `VAR`
+    # and a `CST` Node, `SUBVV` two `VAR` Nodes, and `JGE` and `JLT` two `VAR`
+    # Nodes and their target.
+    fused_instructions = ["INC", "JGE", "SUBVV", "JLT"]
+
+    # The fixed slot of each of the 26 variables of Tiny-C, where the virtual
+    # machines hold their values.
+    variable_slots = {
+        variable: slot for slot, variable in enumerate(ascii_lowercase)
+    }
+
+    # The name of the method that handles each Node kind, and the keyword
+    # arguments it is called with.
+    node_handlers = {
+        "VAR": ("parse_simple_node", {"instruction": "IFETCH"}),
+        "CST": ("parse_simple_node", {"instruction": "IPUSH"}),
+        "ADD": ("parse_simple_node", {"instruction": "IADD"}),
+        "SUB": ("parse_subtraction_node", {}),
+        "LT": ("parse_simple_node", {"instruction": "ILT"}),
+        "EXPR": ("parse_expression_node", {}),
+        "PROG": (
+            "parse_simple_node",
+            {"instruction": "HALT", "children_first": True}
+        ),
+        "EMPTY": ("parse_simple_node", {"instruction": "EMPTY"}),
+        "SET": ("parse_set_node", {}),
+        "IF": ("parse_if_node", {}),
+        "IFELSE": ("parse_if_else_node", {}),
+        "WHILE": ("parse_while_node", {}),
+        "DO": ("parse_do_while_node", {}),
+        "SEQ": ("parse_sequence", {}),
+        "BLOCK": ("parse_sequence", {})
+    }
+
+    def __init__(
+        self, superinstructions: bool = False, loop_inversion: bool = False
+    ) -> None:
         self.code_collection: list = []
+        self.superinstructions: bool = superinstructions
+        self.loop_inversion: bool = loop_inversion
 
     def __str__(self) -> str:
         """
@@ -40,50 +103,196 @@ class CodeGenerator:
         """
 
         return "\n".join(
-            f"Instruction: {instruction}, Node: ({node})"
-            for instruction, node in self.code_collection
+            f"Instruction: {instruction}, Target: {argument}"
+            if instruction in self.jump_instructions
+            else f"Instruction: {instruction}, Node: ({argument})"
+            for instruction, argument in self.code_collection
+        )
+
+    @property
+    def here(self) -> int:
+        """
+        Get the address of the next instruction to be generated.
+
+        Returns
+        -------
+        : int
+            The index in the `code_collection` where the next instruction
+            will be placed.
+        """
+
+        return len(self.code_collection)
+
+    def hole(self, instruction: str, operands: tuple = ()) -> int:
+        """
+        Add a jump instruction whose target is not known yet.
+
+        The target must be set later with `fix`, once the address it points to
+        has been generated.
+
+        Parameters
+        ----------
+        instruction : str
+            The jump instruction to add (i.e., `JMP`, `JZ`, `JNZ`, `JGE` or
+            `JLT`).
+        operands : tuple, optional (default = ())
+            The operands of the jump, other than its target. (i.e., the
+            `VAR` Nodes compared by `JGE` or `JLT`.)
+
+        Returns
+        -------
+        address : int
+            The address of the jump instruction in the `code_collection`.
+        """
+
+        address = self.here
+        argument = (*operands, None) if operands else None
+
+        self.code_collection.append((instruction, argument))
+
+        return address
+
+    def fix(self, source: int, destination: int) -> None:
+        """
+        Set the target of the jump instruction at `source` to `destination`.
+
+        Parameters
+        ----------
+        source : int
+            The address of the jump instruction, as returned by `hole`.
+        destination : int
+            The address of the instruction to jump to.
+        """
+
+        instruction, argument = self.code_collection[source]
+        self.code_collection[source] = (
+            instruction, self.set_target(argument, destination)
         )
 
+    @staticmethod
+    def get_target(argument: object) -> int:
+        """
+        Get the target of a jump instruction.
+
+        Parameters
+        ----------
+        argument : int or tuple
+            The argument of the jump: its target or, for jumps with other
+            operands, a tuple that ends with it.
+
+        Returns
+        -------
+        : int
+            The target.
+        """
+
+        return argument[-1] if isinstance(argument, tuple) else argument
+
+    @staticmethod
+    def set_target(argument: object, target: int) -> object:
+        """
+        Set the target of a jump instruction.
+
+        Parameters
+        ----------
+        argument : int, tuple or None
+            The argument of the jump.
+        target : int
+            The new target.
+
+        Returns
+        -------
+        : int or tuple
+            The new argument of the jump.
+        """
+
+        return (*argument[:-1], target) if isinstance(argument, tuple) else target
+
     def generate_code(self, node: Node) -> None:
         """
         Generate code from a Node in the Abstract Syntax Tree.
 
+        The handler of each Node (see `node_handlers`) is a generator that
+        yields the children to generate code from, in order, and emits its own
+        instructions around them. Handlers are kept in an explicit stack, so
+        the depth of the tree is not bound by the recursion limit.
+
+        As in `AbstractSyntaxTree.build`, the garbage collector is paused
+        meanwhile, since none of the instructions appended can be collected.
+
         Parameters
         ----------
         node : Node
             The initial Node from the AST. (i.e., its `root`.)
         """
 
-        instruction_map = {
-            "VAR": (self.parse_simple_node, {"instruction": "IFETCH"}),
-            "CST": (self.parse_simple_node, {"instruction": "IPUSH"}),
-            "ADD": (self.parse_simple_node, {"instruction": "IADD"}),
-            "SUB": (self.parse_simple_node, {"instruction": "ISUB"}),
-            "LT": (self.parse_simple_node, {"instruction": "ILT"}),
-            "EXPR": (
-                self.parse_simple_node,
-                {"instruction": "IPOP", "children_first": True},
-            ),
-            "PROG": (
-                self.parse_simple_node,
-                {"instruction": "HALT", "children_first": True},
-            ),
-            "EMPTY": (self.parse_simple_node, {"instruction": "EMPTY"}),
-            "SET": (self.parse_set_node, {}),
-            "IF": (self.parse_if_node, {}),
-            "IFELSE": (self.parse_if_else_node, {}),
-            "WHILE": (self.parse_while_node, {}),
-            "DO": (self.parse_do_while_node, {}),
-            "SEQ": (self.parse_sequence, {})
-        }
-
-        handler, kwargs = instruction_map[node.kind]
-
-        handler(node=node, **kwargs)
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            pending_handlers = [self._get_handler(node)]
+
+            while pending_handlers:
+                child = next(pending_handlers[-1], None)
+
+                if child is None:
+                    pending_handlers.pop()
+                else:
+                    pending_handlers.append(self._get_handler(child))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def generate_jump(self, expr: Node, jump_if: bool) -> int:
+        """
+        Generate code that evaluates a condition and jumps on its value.
+
+        Conditions `a < b` on two variables become a single `JGE` or `JLT`
+        instruction if `superinstructions` is enabled.
+
+        Parameters
+        ----------
+        expr : Node
+            The condition.
+        jump_if : bool
+            Whether to jump if the condition is true, or if it is false.
+
+        Returns
+        -------
+        : int
+            The address of the jump, to be set with `fix`.
+        """
+
+        handler = self._jump_if(expr) if jump_if else self._jump_unless(expr)
+
+        while True:
+            try:
+                self.generate_code(next(handler))
+            except StopIteration as stop:
+                return stop.value
+
+    def _get_handler(self, node: Node) -> Generator:
+        """
+        Start the handler of a Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to generate code from.
+
+        Returns
+        -------
+        : Generator
+            The handler, which yields the children to generate code from.
+        """
+
+        handler_name, kwargs = self.node_handlers[node.kind]
+
+        return getattr(self, handler_name)(node=node, **kwargs)
 
     def parse_simple_node(
         self, node: Node, instruction: str, children_first: bool = True, **kwargs
-    ) -> None:
+    ) -> Generator:
         """
         Generate code from a simple Node.
 
@@ -103,13 +312,57 @@ class CodeGenerator:
         if not children_first:
             self.code_collection.append((instruction, node))
 
-        for child in node.children:
-            self.generate_code(child)
+        yield from node.children
 
         if children_first:
             self.code_collection.append((instruction, node))
 
-    def parse_set_node(self, node: Node, **kwargs) -> None:
+    def parse_subtraction_node(self, node: Node, **kwargs) -> Generator:
+        """
+        Generate code from a `SUB` kind Node.
+
+        Subtractions of two variables become a single `SUBVV` instruction if
+        `superinstructions` is enabled.
+
+        Parameters
+        ----------
+        node : Node
+            The `SUB` Node to parse.
+        """
+
+        lhs, rhs = node.children
+
+        if self.superinstructions and lhs.kind == rhs.kind == "VAR":
+            self.code_collection.append(("SUBVV", (lhs, rhs)))
+            return
+
+        yield from self.parse_simple_node(node=node, instruction="ISUB")
+
+    def parse_expression_node(self, node: Node, **kwargs) -> Generator:
+        """
+        Generate code from an `EXPR` kind Node.
+
+        Increments -- i.e., `x = x + k;` or `x = x - k;` -- become a single
+        `INC` instruction if `superinstructions` is enabled.
+
+        Parameters
+        ----------
+        node : Node
+            The `EXPR` Node to parse.
+        """
+
+        increment = None
+
+        if self.superinstructions:
+            increment = self._get_increment(node.children[0])
+
+        if increment is not None:
+            self.code_collection.append(("INC", increment))
+            return
+
+        yield from self.parse_simple_node(node=node, instruction="IPOP")
+
+    def parse_set_node(self, node: Node, **kwargs) -> Generator:
         """
         Generate code from a `SET` kind Node.
 
@@ -119,18 +372,13 @@ class CodeGenerator:
             The `SET` Node to parse.
         """
 
-        # Making the Code Generator compatible with AST Merging optimization.
-        if node.value is not None:
-            lhs = Node(id=-1, kind="VAR", value=node.value)
-            rhs = node.children[0]
-        else:
-            lhs, rhs = node.children
+        lhs, rhs = self._get_set_operands(node)
 
-        self.generate_code(rhs)
+        yield rhs
 
         self.code_collection.append(("ISTORE", lhs))
 
-    def parse_if_node(self, node: Node, **kwargs) -> None:
+    def parse_if_node(self, node: Node, **kwargs) -> Generator:
         """
         Generate code from an `IF` kind Node.
 
@@ -142,14 +390,12 @@ class CodeGenerator:
 
         expr, if_statement = node.children
 
-        self.generate_code(expr)
-
-        last_if_command = if_statement.children[-1]
-        self.code_collection.append(("JZ", last_if_command))
+        skip_if = yield from self._jump_unless(expr)
 
-        self.generate_code(if_statement)
+        yield if_statement
+        self.fix(skip_if, self.here)
 
-    def parse_if_else_node(self, node: Node, **kwargs) -> None:
+    def parse_if_else_node(self, node: Node, **kwargs) -> Generator:
         """
         Generate code from an `IFELSE` kind Node.
 
@@ -161,21 +407,22 @@ class CodeGenerator:
 
         expr, if_statement, else_statement = node.children
 
-        self.generate_code(expr)
+        skip_if = yield from self._jump_unless(expr)
 
-        first_else_command = else_statement.children[0]
-        self.code_collection.append(("JZ", first_else_command))
+        yield if_statement
+        skip_else = self.hole("JMP")
 
-        self.generate_code(if_statement)
+        self.fix(skip_if, self.here)
+        yield else_statement
+        self.fix(skip_else, self.here)
 
-        last_else_command = else_statement.children[-1]
-        self.code_collection.append(("JMP", last_else_command))
-        self.generate_code(else_statement)
-
-    def parse_while_node(self, node: Node, **kwargs) -> None:
+    def parse_while_node(self, node: Node, **kwargs) -> Generator:
         """
         Generate code from a `WHILE` Node.
 
+        If `loop_inversion` is enabled, the loop is generated as
+        `if (expr) do statement while (expr);`.
+
         Parameters
         ----------
         node : Node
@@ -184,18 +431,25 @@ class CodeGenerator:
 
         expr, statement = node.children
 
-        self.generate_code(expr)
+        if self.loop_inversion:
+            exit_loop = yield from self._jump_unless(expr)
 
-        dummy_node = Node(id=-1, kind="EMPTY")
-        self.code_collection.append(("JZ", dummy_node))
+            loop_start = self.here
+            yield statement
 
-        self.generate_code(statement)
+            repeat_loop = yield from self._jump_if(expr)
+            self.fix(repeat_loop, loop_start)
+            self.fix(exit_loop, self.here)
+            return
 
-        first_expression_node = expr.children[0]
-        self.code_collection.append(("JMP", first_expression_node))
-        self.code_collection.append(("EMPTY", dummy_node))
+        loop_start = self.here
+        exit_loop = yield from self._jump_unless(expr)
 
-    def parse_do_while_node(self, node: Node, **kwargs) -> None:
+        yield statement
+        self.fix(self.hole("JMP"), loop_start)
+        self.fix(exit_loop, self.here)
+
+    def parse_do_while_node(self, node: Node, **kwargs) -> Generator:
         """
         Generate code from a `DOWHILE` Node.
 
@@ -207,16 +461,15 @@ class CodeGenerator:
 
         statement, expr = node.children
 
-        self.generate_code(statement)
-        self.generate_code(expr)
-
-        first_statement_node = statement.children[0]
+        loop_start = self.here
+        yield statement
+        yield expr
 
-        self.code_collection.append(("JNZ", first_statement_node))
+        self.fix(self.hole("JNZ"), loop_start)
 
-    def parse_sequence(self, node: Node, **kwargs) -> None:
+    def parse_sequence(self, node: Node, **kwargs) -> Generator:
         """
-        Generate code from a sequence of commands.
+        Generate code from a sequence of commands (i.e., a `SEQ` or a `BLOCK`).
 
         Parameters
         ----------
@@ -224,5 +477,132 @@ class CodeGenerator:
             The Node object to parse.
         """
 
-        for child in node.children:
-            self.generate_code(child)
+        yield from node.children
+
+    def _jump_unless(self, expr: Node) -> Generator:
+        """
+        Generate code that evaluates a condition and jumps if it is false.
+
+        Conditions `a < b` on two variables become a single `JGE` instruction
+        if `superinstructions` is enabled.
+
+        Parameters
+        ----------
+        expr : Node
+            The condition.
+
+        Returns
+        -------
+        : Generator
+            Generator that yields the Nodes to generate code from, and returns
+            the address of the jump, to be set with `fix`.
+        """
+
+        if self.superinstructions and expr.kind == "LT":
+            lhs, rhs = expr.children
+
+            if lhs.kind == rhs.kind == "VAR":
+                return self.hole("JGE", (lhs, rhs))
+
+        yield expr
+
+        return self.hole("JZ")
+
+    def _jump_if(self, expr: Node) -> Generator:
+        """
+        Generate code that evaluates a condition and jumps if it is true.
+
+        Conditions `a < b` on two variables become a single `JLT` instruction
+        if `superinstructions` is enabled.
+
+        Parameters
+        ----------
+        expr : Node
+            The condition.
+
+        Returns
+        -------
+        : Generator
+            Generator that yields the Nodes to generate code from, and returns
+            the address of the jump, to be set with `fix`.
+        """
+
+        if self.superinstructions and expr.kind == "LT":
+            lhs, rhs = expr.children
+
+            if lhs.kind == rhs.kind == "VAR":
+                return self.hole("JLT", (lhs, rhs))
+
+        yield expr
+
+        return self.hole("JNZ")
+
+    def _get_increment(self, node: Node) -> Union[tuple, None]:
+        """
+        Get the operands of the `INC` instruction that computes an expression.
+
+        Parameters
+        ----------
+        node : Node
+            The expression of an `EXPR` statement.
+
+        Returns
+        -------
+        : tuple or None
+            The `VAR` Node to increment and the `CST` Node to add to it, or
+            `None` if the expression is not `x = x + k` (or `x = x - k`, with
+            an integer `k`).
+        """
+
+        if node.kind != "SET":
+            return None
+
+        lhs, rhs = self._get_set_operands(node)
+
+        if rhs.kind not in ["ADD", "SUB"]:
+            return None
+
+        variable, constant = rhs.children
+
+        is_increment = (
+            variable.kind == "VAR"
+            and variable.value == lhs.value
+            and constant.kind == "CST"
+        )
+
+        if not is_increment:
+            return None
+
+        if rhs.kind == "SUB":
+            if type(constant.value) is not int:
+                return None
+
+            constant = Node(id=constant.id, kind="CST", value=-constant.value)
+
+        return lhs, constant
+
+    @staticmethod
+    def _get_set_operands(node: Node) -> tuple[Node, Node]:
+        """
+        Get the operands of a `SET` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `SET` Node.
+
+        Returns
+        -------
+        lhs : Node
+            The `VAR` Node of the variable that is set.
+        rhs : Node
+            The expression whose value is assigned.
+        """
+
+        # Making the Code Generator compatible with AST Merging optimization.
+        if node.value is not None:
+            return Node(id=-1, kind="VAR", value=node.value), node.children[0]
+
+        lhs, rhs = node.children
+
+        return lhs, rhs
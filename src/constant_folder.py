@@ -0,0 +1,512 @@
+"""Implement a constant folding pass over the Abstract Syntax Tree."""
+
+from typing import Generator, Union
+
+from src.node import Node
+
+
+class ConstantFolder:
+    """
+    Optimization pass that folds constant expressions in the Abstract Syntax
+    Tree (AST), in place.
+
+    It runs between `AbstractSyntaxTree.build` and
+    `CodeGenerator.generate_code`, and:
+
+    * folds `ADD`, `SUB` and `LT` Nodes whose operands are constants;
+    * reassociates chains of additions and subtractions of constants -- e.g.,
+      `a + 1 + 1 + 1` into `a + 3`, and `a + (b + 1) + 1` into `a + b + 2`;
+    * simplifies the identities `x + 0`, `0 + x` and `x - 0` into `x`, when
+      `x` is known to be an integer (`True + 0` is `1`); and `x - x` into `0`
+      and `x < x` into `False`, when `x` has no assignments and all of its
+      variables are known to be set (reading an unset variable raises).
+
+    The folded program computes the same values, of the same types, as the
+    original. Nodes are rewritten with the `Node` mutation API, so the pass
+    only works on trees of `Node` objects: the `ArenaNode` handles of a
+    `NodeArena` can not be rewritten, and the `SharedNode` objects of a
+    hash-consed tree may be shared by several parents.
+    """
+
+    # The name of the method that handles each Node kind.
+    node_handlers = {
+        "VAR": "fold_variable",
+        "CST": "fold_leaf",
+        "EMPTY": "fold_leaf",
+        "ADD": "fold_operation",
+        "SUB": "fold_operation",
+        "LT": "fold_operation",
+        "SET": "fold_set_node",
+        "IF": "fold_if_node",
+        "IFELSE": "fold_if_else_node",
+        "WHILE": "fold_while_node",
+        "DO": "fold_sequence",
+        "EXPR": "fold_sequence",
+        "SEQ": "fold_sequence",
+        "BLOCK": "fold_sequence",
+        "PROG": "fold_sequence"
+    }
+
+    # The sign of the right operand of each arithmetic operation.
+    signs = {"ADD": 1, "SUB": -1}
+
+    def __init__(self) -> None:
+        # The variables that are surely set at the Node being folded.
+        self.assigned_variables: set = set()
+        self.folded_count: int = 0
+
+    def fold(self, node: Node) -> None:
+        """
+        Fold the constant expressions in the tree rooted at `node`.
+
+        As the `CodeGenerator`, the tree is walked with an explicit stack of
+        handlers, each one a generator that yields the children to visit, in
+        evaluation order.
+
+        Parameters
+        ----------
+        node : Node
+            The initial Node from the AST. (i.e., its `root`.)
+
+        Raises
+        ------
+        ValueError
+            Raised if the tree is not made of `Node` objects -- e.g., if it
+            was built with `use_arena` or `hash_consing`.
+        """
+
+        if not isinstance(node, Node):
+            raise ValueError(
+                "The ConstantFolder can only rewrite trees of Node objects, "
+                f"not of {type(node).__name__} objects."
+            )
+
+        pending_handlers = [self._get_handler(node)]
+
+        while pending_handlers:
+            child = next(pending_handlers[-1], None)
+
+            if child is None:
+                pending_handlers.pop()
+            else:
+                pending_handlers.append(self._get_handler(child))
+
+    def _get_handler(self, node: Node) -> Generator:
+        """
+        Start the handler of a Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to fold.
+
+        Returns
+        -------
+        : Generator
+            The handler, which yields the children to fold.
+        """
+
+        return getattr(self, self.node_handlers[node.kind])(node=node)
+
+    def fold_leaf(self, node: Node) -> Generator:
+        """
+        Fold a `CST` or `EMPTY` Node, which has nothing to fold.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to fold.
+        """
+
+        yield from ()
+
+    def fold_variable(self, node: Node) -> Generator:
+        """
+        Fold a `VAR` Node.
+
+        Reading a variable that is not set raises, so every variable is known
+        to be set after it is read.
+
+        Parameters
+        ----------
+        node : Node
+            The `VAR` Node to fold.
+        """
+
+        self.assigned_variables.add(node.value)
+
+        yield from ()
+
+    def fold_sequence(self, node: Node) -> Generator:
+        """
+        Fold the children of a Node, in order.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to fold.
+        """
+
+        yield from node.children
+
+    def fold_set_node(self, node: Node) -> Generator:
+        """
+        Fold a `SET` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `SET` Node to fold.
+        """
+
+        variable, expression = self._get_set_operands(node)
+
+        yield expression
+
+        self.assigned_variables.add(variable)
+
+    def fold_if_node(self, node: Node) -> Generator:
+        """
+        Fold an `IF` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `IF` Node to fold.
+        """
+
+        expr, if_statement = node.children
+
+        yield expr
+
+        assigned_variables = set(self.assigned_variables)
+
+        yield if_statement
+
+        self.assigned_variables = assigned_variables
+
+    def fold_if_else_node(self, node: Node) -> Generator:
+        """
+        Fold an `IFELSE` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `IFELSE` Node to fold.
+        """
+
+        expr, if_statement, else_statement = node.children
+
+        yield expr
+
+        assigned_variables = set(self.assigned_variables)
+
+        yield if_statement
+
+        if_assigned_variables = self.assigned_variables
+        self.assigned_variables = assigned_variables
+
+        yield else_statement
+
+        self.assigned_variables &= if_assigned_variables
+
+    def fold_while_node(self, node: Node) -> Generator:
+        """
+        Fold a `WHILE` Node.
+
+        The body may not run, but the condition is evaluated at least once.
+
+        Parameters
+        ----------
+        node : Node
+            The `WHILE` Node to fold.
+        """
+
+        expr, statement = node.children
+
+        yield expr
+
+        assigned_variables = set(self.assigned_variables)
+
+        yield statement
+
+        self.assigned_variables = assigned_variables
+
+    def fold_operation(self, node: Node) -> Generator:
+        """
+        Fold an `ADD`, `SUB` or `LT` Node, after its operands.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to fold.
+        """
+
+        lhs, rhs = node.children
+
+        # `x - x` and `x < x` are constant. Reading the operands sets their
+        # variables, so this is checked before folding them.
+        is_same_expression = (
+            node.kind != "ADD" and self._is_same_expression(lhs, rhs)
+        )
+
+        yield lhs
+        yield rhs
+
+        lhs, rhs = node.children
+
+        if lhs.kind == "CST" and rhs.kind == "CST":
+            self._set_constant(node, self._evaluate(node.kind, lhs.value, rhs.value))
+
+        elif is_same_expression:
+            self._set_constant(node, 0 if node.kind == "SUB" else False)
+
+        elif node.kind in self.signs:
+            self._fold_arithmetic(node)
+
+    def _fold_arithmetic(self, node: Node) -> None:
+        """
+        Reassociate the constants of an `ADD` or `SUB` Node with at least
+        one non-constant operand.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to fold.
+        """
+
+        lhs, rhs = node.children
+
+        # x + (y + c) is (x + y) + c, and x - (y + c) is (x - y) - c.
+        if rhs.kind in self.signs and rhs.children[1].kind == "CST":
+            y, constant = rhs.children
+            sign = self.signs[node.kind] * self.signs[rhs.kind]
+
+            self._set_children(rhs, node.kind, [lhs, y])
+            self._set_children(node, "ADD" if sign > 0 else "SUB", [rhs, constant])
+            self.folded_count += 1
+
+            lhs, rhs = rhs, constant
+
+        if rhs.kind == "CST":
+            offset = self.signs[node.kind] * rhs.value
+            x = lhs
+
+            # (x + c1) + c2 is x + (c1 + c2).
+            if lhs.kind in self.signs and lhs.children[1].kind == "CST":
+                x, constant = lhs.children
+                offset += self.signs[lhs.kind] * constant.value
+
+            # (c1 - x) + c2 is (c1 + c2) - x.
+            elif lhs.kind in self.signs and lhs.children[0].kind == "CST":
+                constant, x = lhs.children
+                offset += constant.value
+
+                if lhs.kind == "SUB":
+                    rhs.value = offset
+                    self._set_children(node, "SUB", [rhs, x])
+                    self.folded_count += 1
+                    return
+
+            self._set_offset(node, x, rhs, offset)
+
+        elif lhs.kind == "CST" and lhs.value == 0 and node.kind == "ADD":
+            if self._is_integer(rhs):
+                node.replace(rhs)
+                self.folded_count += 1
+
+    def _set_offset(self, node: Node, x: Node, constant: Node, offset: int) -> None:
+        """
+        Rewrite an `ADD` or `SUB` Node into `x + offset`.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to rewrite.
+        x : Node
+            The non-constant operand.
+        constant : Node
+            The `CST` Node to hold the offset.
+        offset : int
+            The constant to add to `x`.
+        """
+
+        if offset == 0 and self._is_integer(x):
+            node.replace(x)
+            self.folded_count += 1
+            return
+
+        is_unchanged = (
+            node.children[0] is x
+            and constant.value == abs(offset)
+            and (offset == 0 or node.kind == ("SUB" if offset < 0 else "ADD"))
+        )
+
+        if is_unchanged:
+            return
+
+        constant.value = abs(offset)
+        self._set_children(node, "SUB" if offset < 0 else "ADD", [x, constant])
+        self.folded_count += 1
+
+    def _set_constant(self, node: Node, value: Union[int, bool]) -> None:
+        """
+        Turn a Node into a `CST` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to turn into a constant.
+        value : int or bool
+            The value of the constant.
+        """
+
+        self._set_children(node, "CST", [])
+        node.value = value
+        self.folded_count += 1
+
+    def _is_same_expression(self, lhs: Node, rhs: Node) -> bool:
+        """
+        Check whether two expressions surely evaluate to the same value,
+        without side effects or errors.
+
+        Parameters
+        ----------
+        lhs : Node
+            The left hand side expression.
+        rhs : Node
+            The right hand side expression.
+
+        Returns
+        -------
+        : bool
+            `True` if both expressions are equal, have no assignments, and
+            read only variables that are set.
+        """
+
+        pending_pairs = [(lhs, rhs)]
+
+        while pending_pairs:
+            lhs, rhs = pending_pairs.pop()
+
+            if lhs.kind != rhs.kind or lhs.value != rhs.value:
+                return False
+
+            if type(lhs.value) is not type(rhs.value) or lhs.kind == "SET":
+                return False
+
+            if lhs.kind == "VAR" and lhs.value not in self.assigned_variables:
+                return False
+
+            lhs_children, rhs_children = lhs.children, rhs.children
+
+            if len(lhs_children) != len(rhs_children):
+                return False
+
+            pending_pairs.extend(zip(lhs_children, rhs_children))
+
+        return True
+
+    @classmethod
+    def _is_integer(cls, node: Node) -> bool:
+        """
+        Check whether an expression surely evaluates to an integer (and not
+        to a boolean).
+
+        Parameters
+        ----------
+        node : Node
+            The expression.
+
+        Returns
+        -------
+        : bool
+            The verdict.
+        """
+
+        while node.kind == "SET":
+            _, node = cls._get_set_operands(node)
+
+        if node.kind == "CST":
+            return type(node.value) is int
+
+        return node.kind in cls.signs
+
+    @staticmethod
+    def _evaluate(
+        kind: str, lhs: Union[int, bool], rhs: Union[int, bool]
+    ) -> Union[int, bool]:
+        """
+        Evaluate an operation, as the virtual machine does.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of the operation: `ADD`, `SUB` or `LT`.
+        lhs : int or bool
+            The left hand side operand.
+        rhs : int or bool
+            The right hand side operand.
+
+        Returns
+        -------
+        : int or bool
+            The result.
+        """
+
+        if kind == "ADD":
+            return lhs + rhs
+
+        if kind == "SUB":
+            return lhs - rhs
+
+        return lhs < rhs
+
+    @staticmethod
+    def _set_children(node: Node, kind: str, children: list[Node]) -> None:
+        """
+        Set the kind and the children of a Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to rewrite.
+        kind : str
+            The new kind.
+        children : list of Node
+            The new children, in order. They are detached from their former
+            parents.
+        """
+
+        for child in node.children:
+            child.detach()
+
+        for child in children:
+            node.add_child(child)
+
+        node.set_kind(kind)
+
+    @staticmethod
+    def _get_set_operands(node: Node) -> tuple[str, Node]:
+        """
+        Get the variable and the expression of a `SET` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `SET` Node.
+
+        Returns
+        -------
+        variable : str
+            The name of the variable that is set.
+        expression : Node
+            The expression whose value is assigned.
+        """
+
+        if node.value is not None:
+            return node.value, node.children[0]
+
+        variable, expression = node.children
+
+        return variable.value, expression
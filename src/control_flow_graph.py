@@ -0,0 +1,750 @@
+"""Implement a control flow graph of basic blocks built from the AST."""
+
+from typing import Generator, Union
+
+from src.code_generator import CodeGenerator
+from src.node import Node
+
+
+class BasicBlock:
+    """
+    A sequence of statements that run one after the other, and the
+    terminator that ends them.
+
+    The terminator depends on the `successors`: a block with two of them
+    branches on its `condition` (to the first one if it is true, and to the
+    second one otherwise), a block with a single one jumps to it, and a
+    block with none halts the program.
+
+    Parameters
+    ----------
+    index : int
+        The number of the block, in the order the blocks were created.
+    """
+
+    def __init__(self, index: int) -> None:
+        self.index: int = index
+        self.statements: list = []
+        self.condition: Union[Node, None] = None
+        self.successors: list = []
+        self.predecessors: list = []
+
+        # Set by `ControlFlowGraph.compute_dominators`.
+        self.immediate_dominator: Union[BasicBlock, None] = None
+        self.dominance_frontier: set = set()
+
+    def __str__(self) -> str:
+        """
+        Implement a string representation of a BasicBlock object.
+
+        Returns
+        -------
+        _str : str
+            The index of the block, its number of statements and the blocks
+            it ends in.
+        """
+
+        successors = ", ".join(f"B{block.index}" for block in self.successors)
+
+        return (
+            f"B{self.index}: {len(self.statements)} statements, "
+            f"{self.terminator} {successors}".rstrip()
+        )
+
+    @property
+    def terminator(self) -> str:
+        """
+        Get the kind of the terminator of the block.
+
+        Returns
+        -------
+        : str
+            Either `branch`, `jump` or `halt`.
+        """
+
+        return ["halt", "jump", "branch"][len(self.successors)]
+
+    @property
+    def positions(self) -> list:
+        """
+        Get the positions of the statements of the block, and of its
+        condition (see `get_tree`).
+
+        Returns
+        -------
+        positions : list
+            The index of each statement, and `None` for the condition, if any.
+        """
+
+        positions = list(range(len(self.statements)))
+
+        if self.condition is not None:
+            positions.append(None)
+
+        return positions
+
+    def get_tree(self, position: Union[int, None]) -> Node:
+        """
+        Get a statement of the block, or its condition.
+
+        Parameters
+        ----------
+        position : int or None
+            The index of the statement, or `None` for the condition.
+
+        Returns
+        -------
+        : Node
+            The root of the statement (or condition).
+        """
+
+        return self.condition if position is None else self.statements[position]
+
+    def get_nodes(self) -> Generator:
+        """
+        Get the Nodes of the statements and the condition of the block, in
+        evaluation order (see `ControlFlowGraph.get_evaluation_order`).
+
+        Returns
+        -------
+        : Generator
+            Generator that yields the Nodes.
+        """
+
+        for position in self.positions:
+            yield from ControlFlowGraph.get_evaluation_order(
+                self.get_tree(position)
+            )
+
+    def replace(
+        self, position: Union[int, None], node: Node, new_node: Node
+    ) -> None:
+        """
+        Replace a Node of a statement (or condition) with another one.
+
+        Parameters
+        ----------
+        position : int or None
+            The index of the statement, or `None` for the condition.
+        node : Node
+            The Node to replace.
+        new_node : Node
+            Its replacement.
+        """
+
+        if position is None and node is self.condition:
+            new_node.detach()
+            self.condition = new_node
+        else:
+            node.replace(new_node)
+
+    def get_size(
+        self, position: Union[int, None], superinstructions: bool = False
+    ) -> int:
+        """
+        Get the number of instructions generated for a statement (or for the
+        jump on the condition).
+
+        Parameters
+        ----------
+        position : int or None
+            The index of the statement, or `None` for the condition.
+        superinstructions : bool, optional (default = False)
+            Whether to emit fused instructions (see `CodeGenerator`).
+
+        Returns
+        -------
+        : int
+            The number of instructions.
+        """
+
+        generator = CodeGenerator(superinstructions=superinstructions)
+
+        if position is None:
+            generator.generate_jump(self.condition, jump_if=False)
+        else:
+            generator.generate_code(self.statements[position])
+
+        return len(generator.code_collection)
+
+
+class ControlFlowGraph:
+    """
+    Control Flow Graph (CFG) that splits a program into basic blocks.
+
+    Statements become `EXPR` Nodes in the blocks, and the conditions of `if`,
+    `while` and `do` statements become the terminators of the blocks they
+    end. Expressions are copied from the Abstract Syntax Tree (AST), so the
+    AST is left untouched and the CFG can be rewritten in place by the
+    optimization passes (see `SSAOptimizer`).
+
+    `generate_code` lowers the CFG back into instructions for the virtual
+    machine, with the code generator's own handlers for the statements and
+    the conditions.
+    """
+
+    # The name of the method that handles each statement Node kind.
+    node_handlers = {
+        "PROG": "build_sequence",
+        "BLOCK": "build_sequence",
+        "SEQ": "build_sequence",
+        "EMPTY": "build_empty_statement",
+        "EXPR": "build_expression_statement",
+        "IF": "build_if_node",
+        "IFELSE": "build_if_else_node",
+        "WHILE": "build_while_node",
+        "DO": "build_do_while_node"
+    }
+
+    def __init__(self) -> None:
+        self.blocks: list = []
+        self.entry: BasicBlock = self._new_block()
+        self.current_block: BasicBlock = self.entry
+
+    def __str__(self) -> str:
+        """
+        Implement a string representation of a ControlFlowGraph object.
+
+        Returns
+        -------
+        _str : str
+            One line per block.
+        """
+
+        return "\n".join(str(block) for block in self.blocks)
+
+    def build(self, node: Node) -> None:
+        """
+        Build the CFG of a program.
+
+        As the `CodeGenerator`, the tree is walked with an explicit stack of
+        handlers, each one a generator that yields the statements to visit,
+        in order.
+
+        Parameters
+        ----------
+        node : Node
+            The initial Node from the AST. (i.e., its `root`.)
+        """
+
+        pending_handlers = [self._get_handler(node)]
+
+        while pending_handlers:
+            child = next(pending_handlers[-1], None)
+
+            if child is None:
+                pending_handlers.pop()
+            else:
+                pending_handlers.append(self._get_handler(child))
+
+        self.remove_unreachable_blocks()
+
+    def _get_handler(self, node: Node) -> Generator:
+        """
+        Start the handler of a statement Node.
+
+        Parameters
+        ----------
+        node : Node
+            The statement.
+
+        Returns
+        -------
+        : Generator
+            The handler, which yields the statements to visit.
+        """
+
+        return getattr(self, self.node_handlers[node.kind])(node=node)
+
+    def build_sequence(self, node: Node) -> Generator:
+        """
+        Build a sequence of statements (i.e., a `PROG`, `SEQ` or `BLOCK`).
+
+        Parameters
+        ----------
+        node : Node
+            The Node whose children are the statements.
+        """
+
+        yield from node.children
+
+    def build_empty_statement(self, node: Node) -> Generator:
+        """
+        Build an `EMPTY` statement, which runs nothing.
+
+        Parameters
+        ----------
+        node : Node
+            The `EMPTY` Node.
+        """
+
+        yield from ()
+
+    def build_expression_statement(self, node: Node) -> Generator:
+        """
+        Add an `EXPR` statement to the current block.
+
+        Parameters
+        ----------
+        node : Node
+            The `EXPR` Node.
+        """
+
+        self.current_block.statements.append(self.copy_expression(node))
+
+        yield from ()
+
+    def build_if_node(self, node: Node) -> Generator:
+        """
+        Build an `IF` statement.
+
+        Parameters
+        ----------
+        node : Node
+            The `IF` Node.
+        """
+
+        expr, statement = node.children
+
+        branch_block = self.current_block
+        branch_block.condition = self.copy_expression(expr)
+
+        self.current_block = self._new_block(predecessor=branch_block)
+        yield statement
+
+        join_block = self._new_block(predecessor=self.current_block)
+        self._link(branch_block, join_block)
+
+        self.current_block = join_block
+
+    def build_if_else_node(self, node: Node) -> Generator:
+        """
+        Build an `IFELSE` statement.
+
+        Parameters
+        ----------
+        node : Node
+            The `IFELSE` Node.
+        """
+
+        expr, if_statement, else_statement = node.children
+
+        branch_block = self.current_block
+        branch_block.condition = self.copy_expression(expr)
+
+        self.current_block = self._new_block(predecessor=branch_block)
+        yield if_statement
+        if_block = self.current_block
+
+        self.current_block = self._new_block(predecessor=branch_block)
+        yield else_statement
+
+        join_block = self._new_block(predecessor=if_block)
+        self._link(self.current_block, join_block)
+
+        self.current_block = join_block
+
+    def build_while_node(self, node: Node) -> Generator:
+        """
+        Build a `WHILE` statement.
+
+        Parameters
+        ----------
+        node : Node
+            The `WHILE` Node.
+        """
+
+        expr, statement = node.children
+
+        header_block = self._new_block(predecessor=self.current_block)
+        header_block.condition = self.copy_expression(expr)
+
+        self.current_block = self._new_block(predecessor=header_block)
+        yield statement
+
+        self._link(self.current_block, header_block)
+        self.current_block = self._new_block(predecessor=header_block)
+
+    def build_do_while_node(self, node: Node) -> Generator:
+        """
+        Build a `DO` statement.
+
+        Parameters
+        ----------
+        node : Node
+            The `DO` Node.
+        """
+
+        statement, expr = node.children
+
+        body_block = self._new_block(predecessor=self.current_block)
+
+        self.current_block = body_block
+        yield statement
+
+        self.current_block.condition = self.copy_expression(expr)
+        self._link(self.current_block, body_block)
+
+        self.current_block = self._new_block(predecessor=self.current_block)
+
+    @staticmethod
+    def copy_expression(node: Node) -> Node:
+        """
+        Copy an expression tree.
+
+        `SET` Nodes are copied with both their `VAR` and their value as
+        children, whichever form they had in the AST.
+
+        Parameters
+        ----------
+        node : Node
+            The root of the expression.
+
+        Returns
+        -------
+        : Node
+            The root of the copy.
+        """
+
+        def _copy_node(node: Node) -> Node:
+            return Node(id=node.id, kind=node.kind, value=node.value)
+
+        root = _copy_node(node)
+        pending_nodes = [(node, root)]
+
+        while pending_nodes:
+            original, copy = pending_nodes.pop()
+            children = original.children
+
+            if original.kind == "SET":
+                copy.value = None
+                children = CodeGenerator._get_set_operands(original)
+
+            for child in children:
+                child_copy = _copy_node(child)
+                copy.add_child(child_copy)
+                pending_nodes.append((child, child_copy))
+
+        return root
+
+    @staticmethod
+    def get_evaluation_order(node: Node) -> Generator:
+        """
+        Get the Nodes of an expression in the order they are evaluated: each
+        one after its operands, from left to right.
+
+        The `VAR` Node set by a `SET` Node is not read, so it is left out.
+
+        Parameters
+        ----------
+        node : Node
+            The root of the expression.
+
+        Returns
+        -------
+        : Generator
+            Generator that yields the Nodes.
+        """
+
+        pending_nodes = [(node, False)]
+
+        while pending_nodes:
+            node, is_evaluated = pending_nodes.pop()
+
+            if is_evaluated:
+                yield node
+                continue
+
+            pending_nodes.append((node, True))
+            pending_nodes.extend(
+                (operand, False)
+                for operand in reversed(ControlFlowGraph.get_operands(node))
+            )
+
+    @staticmethod
+    def get_operands(node: Node) -> list:
+        """
+        Get the Nodes a Node evaluates: its children, but the `VAR` Node set
+        by a `SET` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node.
+
+        Returns
+        -------
+        : list of Node
+            The operands.
+        """
+
+        children = node.children
+
+        return children[1:] if node.kind == "SET" else children
+
+    @staticmethod
+    def get_assignments(node: Node) -> set:
+        """
+        Get the Nodes of an expression that have an assignment among them or
+        their descendants.
+
+        Parameters
+        ----------
+        node : Node
+            The root of the expression.
+
+        Returns
+        -------
+        assignments : set of int
+            The `id` of the Nodes.
+        """
+
+        assignments = set()
+
+        for node in ControlFlowGraph.get_evaluation_order(node):
+            if node.kind == "SET" or any(
+                id(child) in assignments for child in node.children
+            ):
+                assignments.add(id(node))
+
+        return assignments
+
+    def remove_unreachable_blocks(self) -> None:
+        """
+        Remove the blocks that can not be reached from the `entry`.
+
+        The remaining blocks keep their order.
+        """
+
+        reachable_blocks = set(self.reverse_postorder())
+
+        for block in self.blocks:
+            if block not in reachable_blocks:
+                for successor in block.successors:
+                    successor.predecessors.remove(block)
+
+        self.blocks = [block for block in self.blocks if block in reachable_blocks]
+
+    def reverse_postorder(self) -> list:
+        """
+        Sort the blocks that can be reached from the `entry` in reverse
+        postorder, so every block comes before its successors, except along
+        the backward edges of loops.
+
+        Returns
+        -------
+        : list of BasicBlock
+            The blocks.
+        """
+
+        postorder = []
+        visited_blocks = {self.entry}
+        pending_blocks = [(self.entry, iter(self.entry.successors))]
+
+        while pending_blocks:
+            block, successors = pending_blocks[-1]
+            successor = next(successors, None)
+
+            if successor is None:
+                pending_blocks.pop()
+                postorder.append(block)
+
+            elif successor not in visited_blocks:
+                visited_blocks.add(successor)
+                pending_blocks.append((successor, iter(successor.successors)))
+
+        return postorder[::-1]
+
+    def compute_dominators(self) -> None:
+        """
+        Compute the `immediate_dominator` and the `dominance_frontier` of
+        every block.
+
+        It implements the iterative algorithm by Cooper, Harvey and Kennedy,
+        which intersects the dominators of the predecessors of each block
+        until they converge.
+        """
+
+        order = self.reverse_postorder()
+        positions = {block: position for position, block in enumerate(order)}
+
+        def _intersect(block: BasicBlock, other_block: BasicBlock) -> BasicBlock:
+            while block is not other_block:
+                while positions[block] > positions[other_block]:
+                    block = block.immediate_dominator
+                while positions[other_block] > positions[block]:
+                    other_block = other_block.immediate_dominator
+
+            return block
+
+        for block in order:
+            block.immediate_dominator = None
+            block.dominance_frontier = set()
+
+        self.entry.immediate_dominator = self.entry
+        is_changed = True
+
+        while is_changed:
+            is_changed = False
+
+            for block in order[1:]:
+                immediate_dominator = None
+
+                for predecessor in block.predecessors:
+                    if predecessor.immediate_dominator is None:
+                        continue
+
+                    if immediate_dominator is None:
+                        immediate_dominator = predecessor
+                    else:
+                        immediate_dominator = _intersect(
+                            predecessor, immediate_dominator
+                        )
+
+                if block.immediate_dominator is not immediate_dominator:
+                    block.immediate_dominator = immediate_dominator
+                    is_changed = True
+
+        for block in order:
+            if len(block.predecessors) < 2:
+                continue
+
+            for predecessor in block.predecessors:
+                runner = predecessor
+
+                while runner is not block.immediate_dominator:
+                    runner.dominance_frontier.add(block)
+                    runner = runner.immediate_dominator
+
+    def dominator_tree(self) -> dict:
+        """
+        Get the dominator tree, as computed by `compute_dominators`.
+
+        Returns
+        -------
+        children : dict
+            Maps each block to the blocks it immediately dominates, in order.
+        """
+
+        children = {block: [] for block in self.blocks}
+
+        for block in self.blocks:
+            if block is not self.entry:
+                children[block.immediate_dominator].append(block)
+
+        return children
+
+    def generate_code(self, superinstructions: bool = False) -> list:
+        """
+        Lower the CFG into instructions for the virtual machine.
+
+        Blocks are laid out in order, and a jump to the next block is left
+        out. A jump to a block that only tests a condition -- the header of a
+        `while` loop -- tests the condition in place, so loops run a single
+        jump per iteration (as in `CodeGenerator(loop_inversion=True)`).
+
+        Parameters
+        ----------
+        superinstructions : bool, optional (default = False)
+            Whether to emit fused instructions (see `CodeGenerator`).
+
+        Returns
+        -------
+        : list
+            The `code_collection`.
+        """
+
+        generator = CodeGenerator(superinstructions=superinstructions)
+        addresses = {}
+        jumps = []
+
+        def _branch(
+            condition: Node,
+            successors: list,
+            next_block: Union[BasicBlock, None]
+        ) -> None:
+            if_block, else_block = successors
+
+            if if_block is next_block:
+                hole = generator.generate_jump(condition, jump_if=False)
+                jumps.append((hole, else_block))
+                return
+
+            hole = generator.generate_jump(condition, jump_if=True)
+            jumps.append((hole, if_block))
+
+            if else_block is not next_block:
+                jumps.append((generator.hole("JMP"), else_block))
+
+        for position, block in enumerate(self.blocks):
+            addresses[block] = generator.here
+            next_block = None
+
+            if position + 1 < len(self.blocks):
+                next_block = self.blocks[position + 1]
+
+            for statement in block.statements:
+                generator.generate_code(statement)
+
+            if block.terminator == "halt":
+                generator.code_collection.append(("HALT", None))
+
+            elif block.terminator == "branch":
+                _branch(block.condition, block.successors, next_block)
+
+            else:
+                successor, = block.successors
+
+                if successor is next_block:
+                    continue
+
+                if successor.terminator == "branch" and not successor.statements:
+                    _branch(successor.condition, successor.successors, next_block)
+                else:
+                    jumps.append((generator.hole("JMP"), successor))
+
+        for hole, block in jumps:
+            generator.fix(hole, addresses[block])
+
+        return generator.code_collection
+
+    def _new_block(
+        self, predecessor: Union[BasicBlock, None] = None
+    ) -> BasicBlock:
+        """
+        Add a block to the CFG.
+
+        Parameters
+        ----------
+        predecessor : BasicBlock or None, optional (default = None)
+            A block that ends in the new one.
+
+        Returns
+        -------
+        block : BasicBlock
+            The new block.
+        """
+
+        block = BasicBlock(index=len(self.blocks))
+        self.blocks.append(block)
+
+        if predecessor is not None:
+            self._link(predecessor, block)
+
+        return block
+
+    @staticmethod
+    def _link(source: BasicBlock, destination: BasicBlock) -> None:
+        """
+        Add an edge between two blocks.
+
+        Parameters
+        ----------
+        source : BasicBlock
+            The block the edge leaves from.
+        destination : BasicBlock
+            The block the edge ends in.
+        """
+
+        source.successors.append(destination)
+        destination.predecessors.append(source)
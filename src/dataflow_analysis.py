@@ -0,0 +1,433 @@
+"""Implement dataflow analyses over a control flow graph."""
+
+from typing import Generator
+
+from src.control_flow_graph import BasicBlock, ControlFlowGraph
+from src.node import Node
+
+
+class DataflowAnalysis:
+    """
+    Base class of the analyses that compute a set of facts at each point of
+    a `ControlFlowGraph`, before and after each of its Nodes (in evaluation
+    order; see `ControlFlowGraph.get_evaluation_order`).
+
+    The facts flow along the edges of the CFG, either forward (from the
+    entry) or backward (from the blocks that halt), and are found by
+    iterating over the blocks until they no longer change. Each analysis
+    defines:
+
+    * `is_forward`, the direction of the flow;
+    * `meet`, which combines the facts of several edges;
+    * `get_boundary_facts`, the facts at the entry (or at the end of the
+      blocks that halt, for backward analyses);
+    * `get_initial_facts`, the facts of the edges not evaluated yet;
+    * `transfer`, which gets the facts after a Node (or before it, for
+      backward analyses) from the facts on its other side.
+
+    Parameters
+    ----------
+    cfg : ControlFlowGraph
+        The CFG.
+    """
+
+    is_forward = True
+
+    def __init__(self, cfg: ControlFlowGraph) -> None:
+        self.cfg: ControlFlowGraph = cfg
+
+        # The variables of the CFG, read or set.
+        self.variables: set = {
+            node.children[0].value if node.kind == "SET" else node.value
+            for block in cfg.blocks
+            for node in block.get_nodes()
+            if node.kind in ["VAR", "SET"]
+        }
+
+        # The facts at the start and at the end of each block, in the
+        # direction of the flow, set by `solve`.
+        self.inputs: dict = {}
+        self.outputs: dict = {}
+
+    def solve(self) -> None:
+        """Compute the facts at the start and at the end of each block."""
+
+        order = self.cfg.reverse_postorder()
+
+        if not self.is_forward:
+            order.reverse()
+
+        self.inputs = {}
+        self.outputs = {block: self.get_initial_facts() for block in order}
+        is_changed = True
+
+        while is_changed:
+            is_changed = False
+
+            for block in order:
+                if self.is_forward:
+                    edges = block.predecessors
+                    is_boundary = block is self.cfg.entry
+                else:
+                    edges = block.successors
+                    is_boundary = not block.successors
+
+                facts = [
+                    self.outputs[other_block]
+                    for other_block in edges
+                    if other_block in self.outputs
+                ]
+
+                if is_boundary:
+                    facts.append(self.get_boundary_facts())
+
+                facts = self.inputs[block] = self.meet(facts)
+
+                for _, node in self._get_nodes(block):
+                    facts = self.transfer(node, facts)
+
+                if facts != self.outputs[block]:
+                    self.outputs[block] = facts
+                    is_changed = True
+
+    def get_node_facts(self, block: BasicBlock) -> Generator:
+        """
+        Get the facts before each Node of a block, in the direction of the
+        flow (i.e., after each Node, for backward analyses).
+
+        Parameters
+        ----------
+        block : BasicBlock
+            The block, after `solve`.
+
+        Returns
+        -------
+        : Generator
+            Generator that yields the position of each Node in the block (see
+            `BasicBlock.get_tree`), the Node and the facts.
+        """
+
+        facts = self.inputs[block]
+
+        for position, node in self._get_nodes(block):
+            yield position, node, facts
+            facts = self.transfer(node, facts)
+
+    def _get_nodes(self, block: BasicBlock) -> Generator:
+        """
+        Get the Nodes of a block, in the direction of the flow.
+
+        Parameters
+        ----------
+        block : BasicBlock
+            The block.
+
+        Returns
+        -------
+        : Generator
+            Generator that yields the position of each Node in the block, and
+            the Node.
+        """
+
+        nodes = [
+            (position, node)
+            for position in block.positions
+            for node in ControlFlowGraph.get_evaluation_order(
+                block.get_tree(position)
+            )
+        ]
+
+        yield from nodes if self.is_forward else reversed(nodes)
+
+    def meet(self, facts: list) -> frozenset:
+        """
+        Combine the facts of several edges: their union, by default.
+
+        Parameters
+        ----------
+        facts : list of frozenset
+            The facts of each edge.
+
+        Returns
+        -------
+        : frozenset
+            The combined facts.
+        """
+
+        return frozenset().union(*facts)
+
+    def get_boundary_facts(self) -> frozenset:
+        """
+        Get the facts at the boundary of the CFG: none, by default.
+
+        Returns
+        -------
+        : frozenset
+            The facts.
+        """
+
+        return frozenset()
+
+    def get_initial_facts(self) -> frozenset:
+        """
+        Get the facts of the edges not evaluated yet: none, by default.
+
+        Returns
+        -------
+        : frozenset
+            The facts.
+        """
+
+        return frozenset()
+
+    def transfer(self, node: Node, facts: frozenset) -> frozenset:
+        """
+        Get the facts on one side of a Node from the ones on the other side.
+
+        Parameters
+        ----------
+        node : Node
+            The Node.
+        facts : frozenset
+            The facts before the Node, in the direction of the flow.
+
+        Returns
+        -------
+        : frozenset
+            The facts after it.
+        """
+
+        raise NotImplementedError
+
+
+class ReachingDefinitions(DataflowAnalysis):
+    """
+    Analysis of the assignments that may have set the value of each variable
+    at each point.
+
+    The facts are (`variable`, `definition`) pairs, where `definition` is the
+    `id` of a `SET` Node, or `None` if the variable may not have been set
+    since the start of the program.
+
+    Parameters
+    ----------
+    cfg : ControlFlowGraph
+        The CFG.
+    """
+
+    def get_boundary_facts(self) -> frozenset:
+        """
+        Get the facts at the entry: no variable is set.
+
+        Returns
+        -------
+        : frozenset
+            The facts.
+        """
+
+        return frozenset((variable, None) for variable in self.variables)
+
+    def transfer(self, node: Node, facts: frozenset) -> frozenset:
+        """
+        Get the definitions that reach the point after a Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node.
+        facts : frozenset
+            The definitions that reach it.
+
+        Returns
+        -------
+        : frozenset
+            The definitions after it: a `SET` Node replaces the ones of its
+            variable.
+        """
+
+        if node.kind != "SET":
+            return facts
+
+        variable = node.children[0].value
+
+        return frozenset(
+            fact for fact in facts if fact[0] != variable
+        ) | {(variable, id(node))}
+
+    def get_unset_reads(self) -> set:
+        """
+        Get the reads of variables that may not be set, which raise.
+
+        Returns
+        -------
+        unset_reads : set of int
+            The `id` of the `VAR` Nodes.
+        """
+
+        unset_reads = set()
+
+        for block in self.cfg.reverse_postorder():
+            for _, node, facts in self.get_node_facts(block):
+                if node.kind == "VAR" and (node.value, None) in facts:
+                    unset_reads.add(id(node))
+
+        return unset_reads
+
+
+class Liveness(DataflowAnalysis):
+    """
+    Analysis of the variables that may be read before they are set again,
+    after each point.
+
+    The end of the program reads all of the variables (but the hidden
+    temporaries; see `SSAOptimizer`), as they are left in the `variables` of
+    the virtual machine. So does every read that may raise, which ends the
+    program as well.
+
+    Parameters
+    ----------
+    cfg : ControlFlowGraph
+        The CFG.
+    unset_reads : set of int, optional (default = None)
+        The `id` of the `VAR` Nodes that may read unset variables (see
+        `ReachingDefinitions.get_unset_reads`).
+    """
+
+    is_forward = False
+
+    def __init__(self, cfg: ControlFlowGraph, unset_reads: set = None) -> None:
+        super().__init__(cfg)
+        self.unset_reads: set = unset_reads or set()
+
+    def get_boundary_facts(self) -> frozenset:
+        """
+        Get the facts at the end of the blocks that halt: every variable is
+        read.
+
+        Returns
+        -------
+        : frozenset
+            The facts.
+        """
+
+        return frozenset(
+            variable for variable in self.variables
+            if not variable.startswith("$")
+        )
+
+    def transfer(self, node: Node, facts: frozenset) -> frozenset:
+        """
+        Get the variables that are live before a Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node.
+        facts : frozenset
+            The variables that are live after it.
+
+        Returns
+        -------
+        : frozenset
+            The variables that are live before it.
+        """
+
+        if node.kind == "SET":
+            return facts - {node.children[0].value}
+
+        if node.kind != "VAR":
+            return facts
+
+        if id(node) in self.unset_reads:
+            return facts | self.get_boundary_facts() | {node.value}
+
+        return facts | {node.value}
+
+
+class AvailableCopies(DataflowAnalysis):
+    """
+    Analysis of the copies of a variable into another one (`x = y`) that
+    surely ran, with neither variable set since, at each point.
+
+    The facts are the `id` of the `SET` Nodes of the copies, and they meet
+    by intersection: a copy is available after a block if it is available
+    after all of its predecessors.
+
+    Parameters
+    ----------
+    cfg : ControlFlowGraph
+        The CFG.
+    """
+
+    def __init__(self, cfg: ControlFlowGraph) -> None:
+        super().__init__(cfg)
+
+        # Maps the `id` of each copy to the variables it sets and reads.
+        self.copies: dict = {
+            id(node): (node.children[0].value, node.children[1].value)
+            for block in cfg.blocks
+            for node in block.get_nodes()
+            if node.kind == "SET"
+            and node.children[1].kind == "VAR"
+            and node.children[1].value != node.children[0].value
+        }
+
+    def meet(self, facts: list) -> frozenset:
+        """
+        Combine the facts of several edges by intersection.
+
+        Parameters
+        ----------
+        facts : list of frozenset
+            The facts of each edge.
+
+        Returns
+        -------
+        : frozenset
+            The combined facts.
+        """
+
+        return frozenset.intersection(*facts) if facts else frozenset()
+
+    def get_initial_facts(self) -> frozenset:
+        """
+        Get the facts of the edges not evaluated yet: all of the copies.
+
+        Returns
+        -------
+        : frozenset
+            The facts.
+        """
+
+        return frozenset(self.copies)
+
+    def transfer(self, node: Node, facts: frozenset) -> frozenset:
+        """
+        Get the copies that are available after a Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node.
+        facts : frozenset
+            The copies that are available before it.
+
+        Returns
+        -------
+        : frozenset
+            The copies after it: a `SET` Node removes the ones that set or
+            read its variable, and adds itself if it is a copy.
+        """
+
+        if node.kind != "SET":
+            return facts
+
+        variable = node.children[0].value
+        facts = frozenset(
+            copy for copy in facts if variable not in self.copies[copy]
+        )
+
+        if id(node) in self.copies:
+            facts |= {id(node)}
+
+        return facts
@@ -0,0 +1,151 @@
+"""Implement optimizations over the dataflow analyses of a CFG."""
+
+from src.control_flow_graph import ControlFlowGraph
+from src.dataflow_analysis import AvailableCopies, Liveness, ReachingDefinitions
+from src.node import Node
+
+
+class DataflowOptimizer:
+    """
+    Optimization pass that rewrites a `ControlFlowGraph` in place, with the
+    help of its dataflow analyses (see `DataflowAnalysis`):
+
+    * copy propagation: a read of `x` where a copy `x = y` is available
+      (see `AvailableCopies`) reads `y` instead, so the copy may no longer
+      be read -- e.g., `c = a; b = c + 1;` becomes `c = a; b = a + 1;`;
+    * dead-store elimination: an assignment to a variable that is not live
+      after it (see `Liveness`) -- i.e., that is set again before it is read
+      on every path -- is replaced with its value, and the statements left
+      without effects are removed. E.g., `c = a;` is removed if `c = 5;`
+      always runs after it.
+
+    The end of the program reads all of the variables, so every variable it
+    sets is still in the `variables` of the virtual machine, with its last
+    value. So do the reads that may raise (see `ReachingDefinitions`), so
+    the variables are the same when a program stops at one of them, and no
+    such read is removed.
+
+    Copies are propagated unless it makes the code longer, as generated by
+    the `CodeGenerator` (it is usually as long, but the copies it leaves
+    unread are then removed).
+
+    Parameters
+    ----------
+    superinstructions : bool, optional (default = False)
+        Whether the code is generated with fused instructions (see
+        `CodeGenerator`), which changes the size of the code.
+    """
+
+    def __init__(self, superinstructions: bool = False) -> None:
+        self.superinstructions: bool = superinstructions
+        self.propagated_copy_count: int = 0
+        self.removed_store_count: int = 0
+
+    def optimize(self, cfg: ControlFlowGraph) -> None:
+        """
+        Propagate the copies of a CFG and remove its dead stores.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG.
+        """
+
+        self._propagate_copies(cfg)
+
+        # Removing a store may leave the ones its value reads dead.
+        while self._eliminate_dead_stores(cfg):
+            pass
+
+    def _propagate_copies(self, cfg: ControlFlowGraph) -> None:
+        """
+        Replace the reads of copied variables with reads of their sources.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG.
+        """
+
+        available_copies = AvailableCopies(cfg)
+        available_copies.solve()
+
+        for block in cfg.reverse_postorder():
+            replacements = {}
+
+            for position, node, copies in available_copies.get_node_facts(block):
+                if node.kind != "VAR":
+                    continue
+
+                for copy in copies:
+                    variable, source = available_copies.copies[copy]
+
+                    if variable == node.value:
+                        replacements.setdefault(position, []).append(
+                            (node, Node(id=node.id, kind="VAR", value=source))
+                        )
+                        break
+
+            for position, position_replacements in replacements.items():
+                size = block.get_size(position, self.superinstructions)
+
+                for node, new_node in position_replacements:
+                    block.replace(position, node, new_node)
+
+                if block.get_size(position, self.superinstructions) > size:
+                    for node, new_node in reversed(position_replacements):
+                        block.replace(position, new_node, node)
+                else:
+                    self.propagated_copy_count += len(position_replacements)
+
+    def _eliminate_dead_stores(self, cfg: ControlFlowGraph) -> bool:
+        """
+        Replace the assignments to dead variables with their values, and
+        remove the statements left without effects.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG.
+
+        Returns
+        -------
+        : bool
+            Whether any assignment was removed.
+        """
+
+        reaching_definitions = ReachingDefinitions(cfg)
+        reaching_definitions.solve()
+        unset_reads = reaching_definitions.get_unset_reads()
+
+        liveness = Liveness(cfg, unset_reads)
+        liveness.solve()
+
+        is_changed = False
+
+        for block in cfg.reverse_postorder():
+            dead_stores = [
+                (position, node)
+                for position, node, live_variables in liveness.get_node_facts(block)
+                if node.kind == "SET"
+                and node.children[0].value not in live_variables
+            ]
+
+            for position, node in dead_stores:
+                block.replace(position, node, node.children[1])
+
+            self.removed_store_count += len(dead_stores)
+            is_changed |= bool(dead_stores)
+
+            changed_positions = {position for position, _ in dead_stores}
+            block.statements = [
+                statement
+                for position, statement in enumerate(block.statements)
+                if position not in changed_positions
+                or any(
+                    node.kind == "SET" or id(node) in unset_reads
+                    for node in ControlFlowGraph.get_evaluation_order(statement)
+                )
+            ]
+
+        return is_changed
@@ -0,0 +1,350 @@
+"""Implement a dead code elimination pass over the Abstract Syntax Tree."""
+
+from typing import Generator
+
+from src.node import Node
+
+
+class DeadCodeEliminator:
+    """
+    Optimization pass that removes statements that never run, or that do
+    nothing, from the Abstract Syntax Tree (AST), in place.
+
+    It runs after the `ConstantFolder`, whose constant conditions it relies
+    on, and:
+
+    * replaces `IF` and `IFELSE` Nodes whose condition is a constant with the
+      arm that runs, if any;
+    * removes `WHILE` loops whose condition is constantly false, and replaces
+      `DO` loops whose condition is constantly false with their body;
+    * removes `EMPTY` statements, empty blocks, statements that only compute
+      a constant, and the `SEQ` wrappers left around a single statement;
+    * turns `if (x) ;` into the statement `x;`, and drops empty `else` arms;
+    * removes the statements after a loop that never ends -- i.e., whose
+      condition is constantly true, as Tiny-C has no `break`.
+
+    Nodes are rewritten with the `Node` mutation API, so the pass only works
+    on trees of `Node` objects, as the `ConstantFolder`.
+    """
+
+    # The name of the method that handles each statement kind. Expressions
+    # are not visited.
+    node_handlers = {
+        "EXPR": "eliminate_expression_statement",
+        "EMPTY": "eliminate_empty_statement",
+        "IF": "eliminate_if_node",
+        "IFELSE": "eliminate_if_else_node",
+        "WHILE": "eliminate_while_node",
+        "DO": "eliminate_do_while_node",
+        "SEQ": "eliminate_sequence",
+        "BLOCK": "eliminate_sequence",
+        "PROG": "eliminate_sequence"
+    }
+
+    # Statements whose children may simply be detached.
+    sequence_kinds = ["SEQ", "BLOCK", "PROG"]
+
+    def __init__(self) -> None:
+        # The statements that never complete, by `id`. They are kept here so
+        # their `id` is not reused by new Nodes.
+        self.diverging_statements: dict = {}
+        self.removed_count: int = 0
+
+    def eliminate(self, node: Node) -> None:
+        """
+        Remove the dead code in the tree rooted at `node`.
+
+        As the `CodeGenerator`, the tree is walked with an explicit stack of
+        handlers. Each statement is simplified after its children.
+
+        Parameters
+        ----------
+        node : Node
+            The initial Node from the AST. (i.e., its `root`.)
+
+        Raises
+        ------
+        ValueError
+            Raised if the tree is not made of `Node` objects -- e.g., if it
+            was built with `use_arena` or `hash_consing`.
+        """
+
+        if not isinstance(node, Node):
+            raise ValueError(
+                "The DeadCodeEliminator can only rewrite trees of Node "
+                f"objects, not of {type(node).__name__} objects."
+            )
+
+        pending_handlers = [self._get_handler(node)]
+
+        while pending_handlers:
+            child = next(pending_handlers[-1], None)
+
+            if child is None:
+                pending_handlers.pop()
+            else:
+                pending_handlers.append(self._get_handler(child))
+
+    def _get_handler(self, node: Node) -> Generator:
+        """
+        Start the handler of a statement.
+
+        Parameters
+        ----------
+        node : Node
+            The statement.
+
+        Returns
+        -------
+        : Generator
+            The handler, which yields the nested statements.
+        """
+
+        return getattr(self, self.node_handlers[node.kind])(node=node)
+
+    def eliminate_empty_statement(self, node: Node) -> Generator:
+        """
+        Remove an `EMPTY` statement, which generates an `EMPTY` instruction.
+
+        Parameters
+        ----------
+        node : Node
+            The `EMPTY` statement.
+        """
+
+        self._remove(node)
+
+        yield from ()
+
+    def eliminate_expression_statement(self, node: Node) -> Generator:
+        """
+        Remove an `EXPR` statement that only computes a constant.
+
+        Parameters
+        ----------
+        node : Node
+            The `EXPR` statement.
+        """
+
+        (expression,) = node.children
+
+        if expression.kind == "CST":
+            self._remove(node)
+
+        yield from ()
+
+    def eliminate_if_node(self, node: Node) -> Generator:
+        """
+        Simplify an `IF` statement.
+
+        Parameters
+        ----------
+        node : Node
+            The `IF` statement.
+        """
+
+        expr, if_statement = node.children
+
+        yield if_statement
+
+        # The body may have been replaced.
+        expr, if_statement = node.children
+
+        if expr.kind == "CST":
+            if expr.value:
+                node.replace(if_statement)
+                self.removed_count += 1
+            else:
+                self._remove(node)
+
+        elif self._is_empty(if_statement):
+            self._set_expression_statement(node, expr)
+
+    def eliminate_if_else_node(self, node: Node) -> Generator:
+        """
+        Simplify an `IFELSE` statement.
+
+        Parameters
+        ----------
+        node : Node
+            The `IFELSE` statement.
+        """
+
+        expr, if_statement, else_statement = node.children
+
+        yield if_statement
+        yield else_statement
+
+        expr, if_statement, else_statement = node.children
+
+        if expr.kind == "CST":
+            node.replace(if_statement if expr.value else else_statement)
+            self.removed_count += 1
+
+        elif self._is_empty(else_statement):
+            else_statement.detach()
+            node.set_kind("IF")
+            self.removed_count += 1
+
+            if self._is_empty(if_statement):
+                self._set_expression_statement(node, expr)
+
+        elif self._is_diverging(if_statement) and self._is_diverging(else_statement):
+            self.diverging_statements[id(node)] = node
+
+    def eliminate_while_node(self, node: Node) -> Generator:
+        """
+        Simplify a `WHILE` statement.
+
+        Parameters
+        ----------
+        node : Node
+            The `WHILE` statement.
+        """
+
+        expr, statement = node.children
+
+        yield statement
+
+        if expr.kind == "CST":
+            if expr.value:
+                self.diverging_statements[id(node)] = node
+            else:
+                self._remove(node)
+
+    def eliminate_do_while_node(self, node: Node) -> Generator:
+        """
+        Simplify a `DO` statement.
+
+        Parameters
+        ----------
+        node : Node
+            The `DO` statement.
+        """
+
+        statement, expr = node.children
+
+        yield statement
+
+        statement, expr = node.children
+
+        if self._is_diverging(statement):
+            self.diverging_statements[id(node)] = node
+
+        elif expr.kind == "CST":
+            if expr.value:
+                self.diverging_statements[id(node)] = node
+            else:
+                # The body runs exactly once.
+                node.replace(statement)
+                self.removed_count += 1
+
+    def eliminate_sequence(self, node: Node) -> Generator:
+        """
+        Simplify a `SEQ`, `BLOCK` or `PROG` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to simplify.
+        """
+
+        yield from node.children
+
+        is_diverging = False
+
+        for child in node.children:
+            if is_diverging or self._is_empty(child):
+                child.detach()
+                self.removed_count += 1
+
+            elif self._is_diverging(child):
+                is_diverging = True
+
+        if is_diverging:
+            self.diverging_statements[id(node)] = node
+
+        if node.kind == "SEQ":
+            children = node.children
+
+            if len(children) == 1 and node.parent is not None:
+                node.replace(children[0])
+                self.removed_count += 1
+            elif not children:
+                node.set_kind("BLOCK")
+
+    def _is_diverging(self, node: Node) -> bool:
+        """
+        Check whether a statement surely never completes.
+
+        Parameters
+        ----------
+        node : Node
+            The statement, already simplified.
+
+        Returns
+        -------
+        : bool
+            The verdict.
+        """
+
+        return id(node) in self.diverging_statements
+
+    def _remove(self, node: Node) -> None:
+        """
+        Remove a statement from its parent.
+
+        Statements that are children of a sequence are detached. Otherwise --
+        e.g., the body of a loop --, they are replaced with an empty block.
+
+        Parameters
+        ----------
+        node : Node
+            The statement to remove.
+        """
+
+        if node.parent.kind in self.sequence_kinds:
+            node.detach()
+        else:
+            node.replace(Node(id=node.id, kind="BLOCK"))
+
+        self.removed_count += 1
+
+    def _set_expression_statement(self, node: Node, expr: Node) -> None:
+        """
+        Replace an `IF` statement that does nothing with its condition, which
+        is still evaluated.
+
+        Parameters
+        ----------
+        node : Node
+            The `IF` statement.
+        expr : Node
+            Its condition.
+        """
+
+        expression_statement = Node(id=node.id, kind="EXPR")
+
+        node.replace(expression_statement)
+        expression_statement.add_child(expr)
+        self.removed_count += 1
+
+    @staticmethod
+    def _is_empty(node: Node) -> bool:
+        """
+        Check whether a statement does nothing.
+
+        Parameters
+        ----------
+        node : Node
+            The statement, already simplified.
+
+        Returns
+        -------
+        : bool
+            `True` if it is an `EMPTY` statement, or an empty block.
+        """
+
+        return node.kind == "EMPTY" or (
+            node.kind in ["SEQ", "BLOCK"] and node.first_child is None
+        )
@@ -1,12 +1,30 @@
 """Implement the Tiny C interpreter."""
 
+from typing import Union
+
 from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.bytecode import Bytecode
+from src.closure_evaluator import ClosureEvaluator
 from src.code_generator import CodeGenerator
+from src.constant_folder import ConstantFolder
+from src.control_flow_graph import ControlFlowGraph
+from src.dataflow_optimizer import DataflowOptimizer
+from src.dead_code_eliminator import DeadCodeEliminator
 from src.lexer import Lexer
+from src.loop_invariant_hoister import LoopInvariantHoister
+from src.peephole_optimizer import PeepholeOptimizer
+from src.register_code_generator import RegisterCodeGenerator
+from src.register_virtual_machine import RegisterVirtualMachine
+from src.ssa_optimizer import SSAOptimizer
 from src.virtual_machine import VirtualMachine
 
 
-def create_virtual_machine(source_code: str) -> VirtualMachine:
+engines = ["bytecode", "closure", "register"]
+
+
+def create_virtual_machine(
+    source_code: str, engine: str = "bytecode", optimize: bool = False
+) -> Union[VirtualMachine, ClosureEvaluator, RegisterVirtualMachine]:
     """
     Create a Virtual Machine that runs the input `source_code`.
 
@@ -14,22 +32,79 @@ def create_virtual_machine(source_code: str) -> VirtualMachine:
     ----------
     source_code : str
         The source code to parse and load on the Virtual Machine.
+    engine : str, optional (default = "bytecode")
+        The execution engine. `bytecode` generates code for the stack-based
+        `VirtualMachine`, `closure` compiles the AST into nested closures
+        with the `ClosureEvaluator`, which starts faster but rejects programs
+        nested deeper than the recursion limit, and `register` generates
+        three address code for the `RegisterVirtualMachine`. Every engine has
+        a `run` method and a `variables` attribute.
+    optimize : bool, optional (default = False)
+        Whether to run the optimization passes over the AST (see
+        `ConstantFolder` and `DeadCodeEliminator`) before handing it to the
+        engine. For the `bytecode` engine, it also optimizes the program in
+        SSA form over its control flow graph, moves loop invariants out of
+        their loops, propagates copies and removes dead stores (see
+        `ControlFlowGraph`, `SSAOptimizer`, `LoopInvariantHoister` and
+        `DataflowOptimizer`), emits fused instructions and inverted loops
+        (see `CodeGenerator`) and optimizes the generated code (see
+        `PeepholeOptimizer`).
 
     Returns
     -------
-    vm : VirtualMachine
+    vm : VirtualMachine, ClosureEvaluator or RegisterVirtualMachine
         A Virtual Machine instance loaded with the source code.
+
+    Raises
+    ------
+    ValueError
+        Raised if the `engine` is not supported, or if the program is nested
+        too deeply for the `closure` engine.
     """
 
+    if engine not in engines:
+        raise ValueError(f"Unsupported engine: {engine}.")
+
     parsed_source = Lexer.parse_source_code(source_code)
 
     ast = AbstractSyntaxTree(source_code=parsed_source)
     ast.build()
 
-    generator = CodeGenerator()
-    generator.generate_code(node=ast.root)
+    if optimize:
+        ConstantFolder().fold(ast.root)
+        DeadCodeEliminator().eliminate(ast.root)
 
-    vm = VirtualMachine(code_collection=generator.code_collection)
+    if engine == "closure":
+        return ClosureEvaluator(node=ast.root)
 
-    return vm
+    if engine == "register":
+        register_generator = RegisterCodeGenerator()
+        register_generator.generate_code(node=ast.root)
+
+        return RegisterVirtualMachine(
+            code_collection=register_generator.code_collection,
+            register_count=register_generator.register_count
+        )
 
+    if optimize:
+        cfg = ControlFlowGraph()
+        cfg.build(node=ast.root)
+
+        SSAOptimizer(superinstructions=True).optimize(cfg)
+        LoopInvariantHoister(superinstructions=True).hoist(cfg)
+        DataflowOptimizer(superinstructions=True).optimize(cfg)
+
+        code_collection = cfg.generate_code(superinstructions=True)
+        code_collection = PeepholeOptimizer().optimize(code_collection)
+    else:
+        generator = CodeGenerator()
+        generator.generate_code(node=ast.root)
+
+        code_collection = generator.code_collection
+
+    # Only the packed image is handed to the VM, so the AST can be freed.
+    bytecode = Bytecode.assemble(code_collection)
+
+    vm = VirtualMachine(code_collection=bytecode)
+
+    return vm
@@ -1,5 +1,6 @@
 """Implement a lexer for the Tiny C compiler."""
 
+import re
 from string import ascii_lowercase
 
 from typing import Generator
@@ -42,10 +43,31 @@ class Lexer:
         **literals
     }
 
+    # The (`symbol`, `value`) token of every lexeme but integers, so most
+    # lexemes are resolved by a single lookup.
+    tokens = {
+        lexeme: (symbol, lexeme if symbol == "ID" else None)
+        for lexeme, symbol in {**reserved_words, **symbols, **variables}.items()
+    }
+
+    # Whitespace is skipped between lexemes, which are either a word (as in
+    # `next_sym` of the C reference, words start with a letter and may contain
+    # underscores), an integer or any other character, which must be a symbol.
+    token_pattern = re.compile(r"[a-z][a-z_]*|[0-9]+|\S")
+
+    whitespace_pattern = re.compile(r"\s")
+
+    # The source code is scanned in chunks of about this many characters, cut
+    # at whitespace so no lexeme is split.
+    chunk_size = 1 << 16
+
     @classmethod
     def parse_source_code(cls, source_code: str) -> Generator:
         """
-        Parse the reserved words first, and then character by character.
+        Scan the source code in a single pass, yielding one symbol at a time.
+
+        The lexemes are matched by `token_pattern`, a chunk at a time, so
+        the memory used does not depend on the size of the source code.
 
         Parameters
         ----------
@@ -56,9 +78,35 @@ class Lexer:
         -------
         : Generator
             Generator of symbols that represent the source code.
+
+        Raises
+        ------
+        SyntaxError
+            Raised, once it is reached, if the input has an unsupported word
+            or character.
         """
 
-        return map(Lexer.parse_word, Lexer.preprocess_source_code(source_code))
+        get_token = cls.tokens.get
+        find_lexemes = cls.token_pattern.findall
+
+        start = 0
+        source_size = len(source_code)
+
+        while start < source_size:
+            whitespace = cls.whitespace_pattern.search(
+                source_code, start + cls.chunk_size
+            )
+            end = whitespace.start() if whitespace else source_size
+
+            for lexeme in find_lexemes(source_code, start, end):
+                token = get_token(lexeme)
+
+                if token is None:
+                    token = cls.parse_word(lexeme)
+
+                yield token
+
+            start = end
 
     @classmethod
     def parse_word(cls, word: str) -> tuple[str, int]:
@@ -88,11 +136,11 @@ class Lexer:
         try:
             symbol = cls.lexer_tokens[word]
         except KeyError:
-            if (word >= "0") and (word <= "9"):
+            if word.isascii() and word.isdigit():
                 symbol = "INT"
             else:
                 raise SyntaxError("The given input is not supported.")
-            
+
         if symbol == "ID":
             value = word
         elif symbol == "INT":
@@ -105,8 +153,8 @@ class Lexer:
         """
         Preprocess the source code and return its of words and characters.
 
-        This method is intended to handle reserved words, spaces, line breaks
-        and other style-related issues.
+        Words and symbols don't have to be separated by whitespace, and any
+        whitespace (spaces, tabs, line breaks) is discarded.
 
         Parameters
         ----------
@@ -120,21 +168,4 @@ class Lexer:
             code.
         """
 
-        # Remove line breaks
-        source_code = source_code.replace("\n", "")
-
-        # Tweak braces, parenthesis and semicolons before splitting the string
-        # by blank spaces
-        tokens_to_tweak = ["(", ")", "{", "}", ";"]
-        for token in tokens_to_tweak:
-            source_code = source_code.replace(token, f" {token} ")
-
-        # Split the code word by word (or character by character)
-        source_code = source_code.split(" ")
-
-        # Remove empty tokens
-        preprocessed_source = list(
-            filter(lambda x: x if len(x) > 0 else None, source_code)
-        )
-
-        return preprocessed_source
+        return cls.token_pattern.findall(source_code)
@@ -0,0 +1,410 @@
+"""Implement a compiler of hot loops for the tiered virtual machine."""
+
+from typing import Callable, Union
+
+from src.bytecode import Bytecode
+from src.variable_slots import VariableSlots
+
+
+class CompiledLoop:
+    """
+    A loop of the virtual machine compiled into a Python function.
+
+    Parameters
+    ----------
+    function : Callable
+        Function that receives the variable slots of the VM, runs the loop
+        from its header, and returns the index of the instruction to resume
+        the interpretation at and the number of instructions it executed.
+    read_variables : list
+        The slots of the variables the loop reads. They must be set before
+        entering it.
+    source : str
+        The source code of the function.
+    """
+
+    def __init__(
+        self, function: Callable, read_variables: list, source: str
+    ) -> None:
+        self.function: Callable = function
+        self.read_variables: list = read_variables
+        self.source: str = source
+
+    def can_enter(self, slots: list) -> bool:
+        """
+        Check whether the loop can run with the current variable `slots`.
+
+        Parameters
+        ----------
+        slots : list
+            The variable slots of the VM.
+
+        Returns
+        -------
+        : bool
+            `True` if all the variables the loop reads are set.
+        """
+
+        return all(
+            slots[variable] is not VariableSlots.unset
+            for variable in self.read_variables
+        )
+
+
+class LoopCompiler:
+    """
+    Compiler that translates a loop of decoded VM instructions into a Python
+    function.
+
+    The loop is the region of instructions between its header (the target of
+    a backward jump) and the backward jump itself. Its basic blocks become the
+    branches of a dispatch loop, the stack is resolved at compile time into
+    Python expressions, and the variables become local variables of the
+    function.
+
+    Parameters
+    ----------
+    program : list of tuples
+        The (`opcode`, `operand`) pairs decoded by the `VirtualMachine`.
+    """
+
+    indentation = "    "
+
+    opcodes = Bytecode.opcodes
+
+    operators = {
+        opcodes["IADD"]: "+",
+        opcodes["ISUB"]: "-",
+        opcodes["ILT"]: "<"
+    }
+
+    jump_opcodes = [
+        opcodes["JMP"],
+        opcodes["JZ"],
+        opcodes["JNZ"],
+        opcodes["JGE"],
+        opcodes["JLT"]
+    ]
+
+    def __init__(self, program: list) -> None:
+        self.program: list = program
+
+    def compile(self, header: int, back_jump: int) -> Union[CompiledLoop, None]:
+        """
+        Compile the loop between `header` and `back_jump`.
+
+        Parameters
+        ----------
+        header : int
+            The index of the first instruction of the loop.
+        back_jump : int
+            The index of the backward jump that closes the loop.
+
+        Returns
+        -------
+        : CompiledLoop or None
+            The compiled loop, or `None` if the loop can not be compiled --
+            i.e., it does not leave the stack as it found it at the boundaries
+            of its basic blocks, or Python can not compile its code.
+        """
+
+        blocks = self._split_blocks(header, back_jump)
+
+        if blocks is None:
+            return None
+
+        block_index = {start: index for index, start in enumerate(blocks)}
+
+        variables = []
+        read_variables = []
+        lines = []
+
+        for index, (start, end) in enumerate(blocks.items()):
+            block_lines = self._compile_block(
+                start, end, header, back_jump, block_index, variables,
+                read_variables
+            )
+
+            if block_lines is None:
+                return None
+
+            keyword = "if" if index == 0 else "elif"
+            lines.append(f"{keyword} block == {index}:")
+            lines.extend(f"{self.indentation}{line}" for line in block_lines)
+
+        source = self._assemble_function(lines, variables)
+
+        namespace = {}
+
+        # Python limits how deep the expressions it compiles are nested (e.g.,
+        # long sums in the loop), so those loops keep being interpreted.
+        try:
+            exec(compile(source, "<tinyc-loop>", "exec"), namespace)
+        except (SyntaxError, RecursionError, MemoryError):
+            return None
+
+        return CompiledLoop(
+            function=namespace["compiled_loop"],
+            read_variables=read_variables,
+            source=source
+        )
+
+    def _split_blocks(self, header: int, back_jump: int) -> Union[dict, None]:
+        """
+        Split the loop into basic blocks.
+
+        Parameters
+        ----------
+        header : int
+            The index of the first instruction of the loop.
+        back_jump : int
+            The index of the backward jump that closes the loop.
+
+        Returns
+        -------
+        blocks : dict or None
+            Maps the index of the first instruction of each block to the index
+            right after its last one, in order. `None` if the loop halts.
+        """
+
+        leaders = {header}
+
+        for index in range(header, back_jump + 1):
+            opcode, operand = self.program[index]
+
+            if opcode == self.opcodes["HALT"]:
+                return None
+
+            if opcode in self.jump_opcodes:
+                target = operand[-1] if isinstance(operand, tuple) else operand
+                leaders.add(index + 1)
+
+                if header <= target <= back_jump:
+                    leaders.add(target)
+
+        leaders.discard(back_jump + 1)
+        starts = sorted(leaders)
+        ends = [*starts[1:], back_jump + 1]
+
+        return dict(zip(starts, ends))
+
+    def _compile_block(
+        self,
+        start: int,
+        end: int,
+        header: int,
+        back_jump: int,
+        block_index: dict,
+        variables: list,
+        read_variables: list
+    ) -> Union[list, None]:
+        """
+        Compile a basic block into lines of Python code.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first instruction of the block.
+        end : int
+            The index right after the last instruction of the block.
+        header : int
+            The index of the first instruction of the loop.
+        back_jump : int
+            The index of the backward jump that closes the loop.
+        block_index : dict
+            Maps the first instruction of each block to its number.
+        variables : list
+            The variables used by the loop. Updated in place.
+        read_variables : list
+            The variables read by the loop. Updated in place.
+
+        Returns
+        -------
+        lines : list of str or None
+            The lines of code, or `None` if the block does not leave the stack
+            as it found it.
+        """
+
+        def _goto(target: int) -> str:
+            if header <= target <= back_jump:
+                return f"block = {block_index[target]}"
+
+            return f"exit_index = {target}; break"
+
+        lines = [f"executed += {end - start}"]
+        stack = []
+        temporary_count = [0]
+
+        def _materialize(variable: int) -> None:
+            # Values computed from `variable` must be saved before it changes.
+            for position, expression in enumerate(stack):
+                if variable in expression[1]:
+                    temporary = f"_t{start}_{temporary_count[0]}"
+                    temporary_count[0] += 1
+
+                    lines.append(f"{temporary} = {expression[0]}")
+                    stack[position] = (temporary, set())
+
+        def _fetch(variable: int) -> str:
+            if variable not in variables:
+                variables.append(variable)
+            if variable not in read_variables:
+                read_variables.append(variable)
+
+            return self._local(variable, variables)
+
+        opcodes = self.opcodes
+
+        for index in range(start, end):
+            opcode, operand = self.program[index]
+
+            if opcode == opcodes["IFETCH"]:
+                stack.append((_fetch(operand), {operand}))
+
+            elif opcode == opcodes["SUBVV"]:
+                lhs, rhs = operand
+                stack.append((f"({_fetch(lhs)} - {_fetch(rhs)})", {lhs, rhs}))
+
+            elif opcode == opcodes["INC"]:
+                variable, constant = operand
+                local = _fetch(variable)
+
+                _materialize(variable)
+                lines.append(f"{local} = {local} + {constant!r}")
+
+            elif opcode == opcodes["IPUSH"]:
+                stack.append((repr(operand), set()))
+
+            elif opcode == opcodes["ISTORE"]:
+                if not stack:
+                    return None
+
+                if operand not in variables:
+                    variables.append(operand)
+
+                local = self._local(operand, variables)
+                expression, _ = stack.pop()
+
+                _materialize(operand)
+                lines.append(f"{local} = {expression}")
+                stack.append((local, {operand}))
+
+            elif opcode == opcodes["IPOP"]:
+                if not stack:
+                    return None
+                stack.pop()
+
+            elif opcode in self.operators:
+                if len(stack) < 2:
+                    return None
+
+                rhs, rhs_variables = stack.pop()
+                lhs, lhs_variables = stack.pop()
+
+                stack.append((
+                    f"({lhs} {self.operators[opcode]} {rhs})",
+                    lhs_variables | rhs_variables
+                ))
+
+            elif opcode == opcodes["JMP"]:
+                if stack:
+                    return None
+                lines.append(_goto(operand))
+                return lines
+
+            elif opcode in [opcodes["JZ"], opcodes["JNZ"]]:
+                if len(stack) != 1:
+                    return None
+
+                condition, _ = stack.pop()
+                negation = "not " if opcode == opcodes["JZ"] else ""
+
+                lines.append(f"if {negation}{condition}:")
+                lines.append(f"{self.indentation}{_goto(operand)}")
+                lines.append("else:")
+                lines.append(f"{self.indentation}{_goto(end)}")
+                return lines
+
+            elif opcode in [opcodes["JGE"], opcodes["JLT"]]:
+                if stack:
+                    return None
+
+                lhs, rhs, target = operand
+                negation = "not " if opcode == opcodes["JGE"] else ""
+
+                lines.append(f"if {negation}{_fetch(lhs)} < {_fetch(rhs)}:")
+                lines.append(f"{self.indentation}{_goto(target)}")
+                lines.append("else:")
+                lines.append(f"{self.indentation}{_goto(end)}")
+                return lines
+
+        if stack:
+            return None
+
+        lines.append(_goto(end))
+
+        return lines
+
+    def _assemble_function(self, lines: list, variables: list) -> str:
+        """
+        Assemble the source code of the function that runs the loop.
+
+        Parameters
+        ----------
+        lines : list of str
+            The lines of the dispatch loop.
+        variables : list
+            The variables used by the loop.
+
+        Returns
+        -------
+        : str
+            The source code of the function.
+        """
+
+        indentation = self.indentation
+        locals_ = [self._local(variable, variables) for variable in variables]
+
+        # Variables that are not set hold `VariableSlots.unset`, which is
+        # written back as is: the loop never reads them.
+        prologue = [
+            f"{local} = slots[{variable!r}]"
+            for local, variable in zip(locals_, variables)
+        ]
+
+        epilogue = [
+            f"slots[{variable!r}] = {local}"
+            for local, variable in zip(locals_, variables)
+        ]
+
+        return "\n".join([
+            "def compiled_loop(slots):",
+            *(f"{indentation}{line}" for line in prologue),
+            f"{indentation}executed = 0",
+            f"{indentation}block = 0",
+            f"{indentation}while True:",
+            *(f"{indentation * 2}{line}" for line in lines),
+            *(f"{indentation}{line}" for line in epilogue),
+            f"{indentation}return exit_index, executed",
+            ""
+        ])
+
+    @staticmethod
+    def _local(variable: int, variables: list) -> str:
+        """
+        Get the name of the local variable that holds a VM variable.
+
+        Parameters
+        ----------
+        variable : int
+            The slot of the variable in the VM.
+        variables : list
+            The variables used by the loop.
+
+        Returns
+        -------
+        : str
+            A valid Python identifier.
+        """
+
+        return f"v{variables.index(variable)}"
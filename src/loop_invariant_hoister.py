@@ -0,0 +1,343 @@
+"""Implement a loop-invariant code motion pass over a control flow graph."""
+
+from src.control_flow_graph import BasicBlock, ControlFlowGraph
+from src.node import Node
+
+
+class LoopInvariantHoister:
+    """
+    Optimization pass that moves the operations whose value does not change
+    along a loop out of it, in a `ControlFlowGraph`, in place.
+
+    Loops are found from their backward edges -- i.e., edges to a block that
+    dominates their source, the header of the loop -- so both `while` and
+    `do` loops are handled, and outer loops are visited before the loops
+    nested in them. An operation without assignments is invariant in a loop
+    if none of its variables is set in the loop, and if all of them are
+    surely set before it: operations don't raise on their own, so computing
+    it before the loop is safe even if the loop never runs it.
+
+    Each invariant operation (and every copy of it in the loop) is computed
+    once, in the block that jumps to the header from outside the loop, and
+    stored in a hidden temporary (`$0`, `$1`, ..., after the ones already in
+    the CFG; see `SSAOptimizer`), which the loop reads instead. It is only
+    moved if that shortens the code of the loop, as generated by the
+    `CodeGenerator` (e.g., `a - b` is a single `SUBVV` instruction).
+
+    Parameters
+    ----------
+    superinstructions : bool, optional (default = False)
+        Whether the code is generated with fused instructions (see
+        `CodeGenerator`), which changes the size of the code.
+    """
+
+    operation_kinds = ["ADD", "SUB", "LT"]
+
+    def __init__(self, superinstructions: bool = False) -> None:
+        self.superinstructions: bool = superinstructions
+        self.temporaries: list = []
+        self.hoisted_count: int = 0
+
+    def hoist(self, cfg: ControlFlowGraph) -> None:
+        """
+        Move the loop-invariant operations of a CFG out of their loops.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG.
+        """
+
+        cfg.compute_dominators()
+
+        temporary_count = 1 + max(
+            [
+                int(node.value[1:])
+                for block in cfg.blocks
+                for node in block.get_nodes()
+                if node.kind == "VAR" and node.value.startswith("$")
+            ],
+            default=-1
+        )
+        self.temporaries = []
+
+        set_variables = self._find_set_variables(cfg)
+
+        for header, blocks in self._find_loops(cfg):
+            preheaders = [
+                block for block in header.predecessors if block not in blocks
+            ]
+
+            if len(preheaders) != 1 or len(preheaders[0].successors) != 1:
+                continue
+
+            preheader, = preheaders
+            assigned_variables = {
+                node.children[0].value
+                for block in blocks
+                for node in block.get_nodes()
+                if node.kind == "SET"
+            }
+
+            invariants = self._find_invariants(
+                [block for block in cfg.blocks if block in blocks],
+                assigned_variables,
+                set_variables[preheader]
+            )
+
+            for occurrences in invariants.values():
+                temporary = f"${temporary_count + len(self.temporaries)}"
+
+                if self._move(occurrences, preheader, temporary):
+                    self.temporaries.append(temporary)
+                    self.hoisted_count += len(occurrences)
+
+    def _find_loops(self, cfg: ControlFlowGraph) -> list:
+        """
+        Find the loops of a CFG.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG, with its dominators computed.
+
+        Returns
+        -------
+        : list of tuples
+            The header of each loop and the set of its blocks, outer loops
+            first.
+        """
+
+        loops = {}
+
+        for block in cfg.blocks:
+            for successor in block.successors:
+                if not self._dominates(successor, block):
+                    continue
+
+                # The blocks that reach the backward edge without going
+                # through the header.
+                blocks = loops.setdefault(successor, {successor})
+                pending_blocks = [block]
+
+                while pending_blocks:
+                    loop_block = pending_blocks.pop()
+
+                    if loop_block not in blocks:
+                        blocks.add(loop_block)
+                        pending_blocks.extend(loop_block.predecessors)
+
+        order = cfg.reverse_postorder()
+
+        return sorted(loops.items(), key=lambda loop: order.index(loop[0]))
+
+    @staticmethod
+    def _dominates(block: BasicBlock, other_block: BasicBlock) -> bool:
+        """
+        Check whether a block dominates another one.
+
+        Parameters
+        ----------
+        block : BasicBlock
+            The block that may dominate `other_block`.
+        other_block : BasicBlock
+            The other block.
+
+        Returns
+        -------
+        : bool
+            The verdict.
+        """
+
+        while other_block is not block:
+            if other_block.immediate_dominator is other_block:
+                return False
+
+            other_block = other_block.immediate_dominator
+
+        return True
+
+    @staticmethod
+    def _find_set_variables(cfg: ControlFlowGraph) -> dict:
+        """
+        Find the variables that are surely set at the end of each block.
+
+        A variable is set after a block that sets or reads it (reading an
+        unset variable raises), and before a block if it is set after all of
+        its predecessors.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG.
+
+        Returns
+        -------
+        set_variables : dict
+            Maps each block to the set of variables.
+        """
+
+        used_variables = {
+            block: {
+                node.children[0].value if node.kind == "SET" else node.value
+                for node in block.get_nodes()
+                if node.kind in ["VAR", "SET"]
+            }
+            for block in cfg.blocks
+        }
+
+        # Blocks not evaluated yet are left out of the intersections.
+        set_variables = {}
+        order = cfg.reverse_postorder()
+        is_changed = True
+
+        while is_changed:
+            is_changed = False
+
+            for block in order:
+                variables = set()
+
+                if block is not cfg.entry:
+                    predecessor_variables = [
+                        set_variables[predecessor]
+                        for predecessor in block.predecessors
+                        if predecessor in set_variables
+                    ]
+                    variables = set.intersection(*predecessor_variables)
+
+                variables |= used_variables[block]
+
+                if set_variables.get(block) != variables:
+                    set_variables[block] = variables
+                    is_changed = True
+
+        return set_variables
+
+    def _find_invariants(
+        self, blocks: list, assigned_variables: set, set_variables: set
+    ) -> dict:
+        """
+        Find the invariant operations of a loop.
+
+        Parameters
+        ----------
+        blocks : list of BasicBlock
+            The blocks of the loop.
+        assigned_variables : set of str
+            The variables set in the loop.
+        set_variables : set of str
+            The variables surely set before the loop.
+
+        Returns
+        -------
+        invariants : dict
+            Maps each invariant operation (as the kinds and values of its
+            Nodes, in evaluation order) to the list of its occurrences: the
+            Node, with its block and position (see `BasicBlock.get_tree`).
+        """
+
+        invariants = {}
+
+        for block in blocks:
+            for position in block.positions:
+                tree = block.get_tree(position)
+
+                # The `id` of the Nodes whose value is invariant.
+                invariant_nodes = set()
+
+                for node in ControlFlowGraph.get_evaluation_order(tree):
+                    if node.kind == "VAR":
+                        is_invariant = (
+                            node.value in set_variables
+                            and node.value not in assigned_variables
+                        )
+                    else:
+                        is_invariant = node.kind != "SET" and all(
+                            id(child) in invariant_nodes
+                            for child in node.children
+                        )
+
+                    if is_invariant:
+                        invariant_nodes.add(id(node))
+
+                pending_nodes = [tree]
+
+                while pending_nodes:
+                    node = pending_nodes.pop()
+
+                    is_invariant = (
+                        node.kind in self.operation_kinds
+                        and id(node) in invariant_nodes
+                    )
+
+                    if not is_invariant:
+                        pending_nodes.extend(ControlFlowGraph.get_operands(node))
+                        continue
+
+                    key = tuple(
+                        (operand.kind, type(operand.value), operand.value)
+                        for operand in ControlFlowGraph.get_evaluation_order(node)
+                    )
+                    invariants.setdefault(key, []).append((node, block, position))
+
+        return invariants
+
+    def _move(
+        self, occurrences: list, preheader: BasicBlock, temporary: str
+    ) -> bool:
+        """
+        Move an invariant operation before its loop, if it shortens the code
+        of the loop.
+
+        Parameters
+        ----------
+        occurrences : list of tuples
+            The occurrences of the operation in the loop, as returned by
+            `_find_invariants`.
+        preheader : BasicBlock
+            The block that jumps to the header of the loop.
+        temporary : str
+            The hidden temporary to store the value of the operation in.
+
+        Returns
+        -------
+        : bool
+            Whether the operation was moved.
+        """
+
+        locations = list(dict.fromkeys(
+            (block, position) for _, block, position in occurrences
+        ))
+
+        def _get_size() -> int:
+            return sum(
+                block.get_size(position, self.superinstructions)
+                for block, position in locations
+            )
+
+        size = _get_size()
+        replacements = []
+
+        for node, block, position in occurrences:
+            variable = Node(id=node.id, kind="VAR", value=temporary)
+            block.replace(position, node, variable)
+            replacements.append((block, position, variable, node))
+
+        if _get_size() >= size:
+            for block, *replacement in reversed(replacements):
+                block.replace(*replacement)
+
+            return False
+
+        node = occurrences[0][0]
+
+        set_node = Node(id=node.id, kind="SET")
+        set_node.add_child(Node(id=node.id, kind="VAR", value=temporary))
+        set_node.add_child(node)
+
+        statement = Node(id=node.id, kind="EXPR")
+        statement.add_child(set_node)
+
+        preheader.statements.append(statement)
+
+        return True
@@ -17,12 +17,29 @@ class Node:
         The value the Node holds, if any. Defaults to None.
     """
 
+    # Children are kept in a doubly linked list of siblings, so Nodes can be
+    # attached, detached and replaced in constant time.
+    __slots__ = (
+        "id",
+        "kind",
+        "value",
+        "parent",
+        "first_child",
+        "last_child",
+        "previous_sibling",
+        "next_sibling",
+        "position_in_tree"
+    )
+
     def __init__(self, id: int, kind: str, value: Union[int, None] = None) -> None:
         self.id: int = id
         self.kind: str = kind
         self.value: Union[int, None] = value
         self.parent: Node = None
-        self.children: list[Node] = []
+        self.first_child: Union[Node, None] = None
+        self.last_child: Union[Node, None] = None
+        self.previous_sibling: Union[Node, None] = None
+        self.next_sibling: Union[Node, None] = None
         self.position_in_tree: Union[int, None] = None
 
     def __eq__(self, other: "Node") -> bool:
@@ -107,20 +124,48 @@ class Node:
 
         return self.kind
 
+    @property
+    def children(self) -> list["Node"]:
+        """
+        Get the children of the Node.
+
+        Returns
+        -------
+        children : list of Node
+            The children, in order. Changing the list does not change the
+            tree: use `add_child`, `replace`, `splice` and `detach` instead.
+        """
+
+        children = []
+        child = self.first_child
+
+        while child is not None:
+            children.append(child)
+            child = child.next_sibling
+
+        return children
+
     def add_child(self, child: "Node") -> None:
         """
-        Add a Node to the `self.children` list.
+        Append a Node to the children of this one.
+
+        The `child` is detached from its former parent, if any, and its
+        `parent` is set to this Node.
 
         Parameters
         ----------
         child : Node
             The Node to be added.
         """
-        self.children.append(child)
+
+        child.detach()
+        child._link(parent=self, next_sibling=None)
 
     def remove_child(self, child_node: "Node") -> None:
         """
-        Remove the `child_node` from the the `self.children` list.
+        Remove the `child_node` from the children of this Node.
+
+        Nodes are compared by identity, so this takes constant time.
 
         Parameters
         ----------
@@ -128,15 +173,87 @@ class Node:
             The Node to remove.
         """
 
-        if child_node in self.children:
-            self.children.remove(child_node)
-            child_node.parent = None
+        if child_node.parent is self:
+            child_node.detach()
 
     def remove_from_tree(self) -> None:
         """Remove itself from the tree."""
 
-        if self.parent:
-            self.parent.remove_child(self)
+        self.detach()
+
+    def detach(self) -> None:
+        """
+        Detach the Node from its parent, keeping its own children.
+
+        This takes constant time.
+        """
+
+        if self._is_linked():
+            parent = self.parent
+
+            if self.previous_sibling is None:
+                parent.first_child = self.next_sibling
+            else:
+                self.previous_sibling.next_sibling = self.next_sibling
+
+            if self.next_sibling is None:
+                parent.last_child = self.previous_sibling
+            else:
+                self.next_sibling.previous_sibling = self.previous_sibling
+
+        self.parent = None
+        self.previous_sibling = None
+        self.next_sibling = None
+
+    def replace(self, new_node: "Node") -> None:
+        """
+        Replace the Node with `new_node` in the children of its parent.
+
+        The Node is detached, and `new_node` is detached from its former
+        parent, if any. This takes constant time.
+
+        Parameters
+        ----------
+        new_node : Node
+            The Node that takes the place of this one.
+
+        Raises
+        ------
+        ValueError
+            If this Node is not a child of another one.
+        """
+
+        self.splice([new_node])
+
+    def splice(self, nodes: list["Node"]) -> None:
+        """
+        Replace the Node with a sequence of Nodes in the children of its parent.
+
+        For instance, `node.splice(node.children)` replaces a Node with its
+        children, and `node.splice([])` removes it. Each Node in `nodes` is
+        detached from its former parent, if any. This takes constant time
+        per Node in `nodes`.
+
+        Parameters
+        ----------
+        nodes : list of Node
+            The Nodes that take the place of this one, in order. It must not
+            contain this Node or its ancestors.
+
+        Raises
+        ------
+        ValueError
+            If this Node is not a child of another one.
+        """
+
+        if not self._is_linked():
+            raise ValueError("Only a child Node can be replaced.")
+
+        for node in nodes:
+            node.detach()
+            node._link(parent=self.parent, next_sibling=self)
+
+        self.detach()
 
     def merge(self, merge_target: 'Node', attribute_absortion: dict = {}) -> None:
         """
@@ -160,18 +277,16 @@ class Node:
         if absorb_value:
             self.value = merge_target.value
 
-        for child in merge_target.children:
-            child.add_parent(self)
-
         parent_children_first = attribute_absortion.get(
             "parent_children_first",
             True
         )
 
-        if parent_children_first:
-            self.children.extend(merge_target.children)
-        else:
-            self.children = [*merge_target.children, *self.children]
+        next_sibling = None if parent_children_first else self.first_child
+
+        for child in merge_target.children:
+            child.detach()
+            child._link(parent=self, next_sibling=next_sibling)
 
         merge_target.remove_from_tree()
 
@@ -179,9 +294,63 @@ class Node:
         """
         Set a Node as this object's parent.
 
+        The Node only becomes one of the `children` of `parent` with
+        `parent.add_child`, which also sets the `parent`.
+
         Parameters
         ----------
         parent : Node
             A Node object to be set as the parent of `this`.
         """
+
+        if parent is not self.parent:
+            self.detach()
+
+        self.parent = parent
+
+    def _is_linked(self) -> bool:
+        """
+        Check whether the Node is one of the `children` of its `parent`.
+
+        A Node may have a `parent` without being one of its children, if it
+        was set by `add_parent` alone.
+
+        Returns
+        -------
+        : bool
+            The verdict.
+        """
+
+        return self.parent is not None and (
+            self.previous_sibling is not None
+            or self.parent.first_child is self
+        )
+
+    def _link(self, parent: "Node", next_sibling: Union["Node", None]) -> None:
+        """
+        Insert the (detached) Node in the children of `parent`.
+
+        Parameters
+        ----------
+        parent : Node
+            The new parent of the Node.
+        next_sibling : Node or None
+            The child of `parent` to insert the Node before. If `None`, the
+            Node becomes the last child.
+        """
+
+        if next_sibling is None:
+            previous_sibling = parent.last_child
+            parent.last_child = self
+        else:
+            previous_sibling = next_sibling.previous_sibling
+            next_sibling.previous_sibling = self
+
+        if previous_sibling is None:
+            parent.first_child = self
+        else:
+            previous_sibling.next_sibling = self
+
         self.parent = parent
+        self.previous_sibling = previous_sibling
+        self.next_sibling = next_sibling
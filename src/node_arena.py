@@ -0,0 +1,406 @@
+"""Implement a compact, array-backed store for the Abstract Syntax Tree."""
+
+from array import array
+from typing import Union
+
+
+class NodeArena:
+    """
+    Store the Nodes of an Abstract Syntax Tree in parallel typed arrays.
+
+    Each Node is an index in the arrays, which hold its kind (as a code in
+    `kinds`), its value (as an index in the `constants` table), its parent,
+    its first and last children and its next sibling. Hence, a Node takes a
+    few dozen bytes instead of a full Python object with a `children` list,
+    and the whole tree can be pickled as is.
+
+    The Nodes are accessed through `ArenaNode` handles, which implement the
+    same interface as `Node`. See `AbstractSyntaxTree(..., use_arena=True)`.
+
+    Parameters
+    ----------
+    kinds : list of str
+        The Node kinds that may be stored.
+    """
+
+    # Marks the absence of a Node or of a value.
+    none = -1
+
+    def __init__(self, kinds: list) -> None:
+        self.kinds: list = kinds
+        self.kind_codes: dict = {kind: code for code, kind in enumerate(kinds)}
+
+        self.kind: array = array("B")
+        self.value: array = array("i")
+        self.parent: array = array("i")
+        self.first_child: array = array("i")
+        self.last_child: array = array("i")
+        self.next_sibling: array = array("i")
+
+        # Positions are only set by the `Certificator`. 0 means none.
+        self.position_in_tree: array = array("q")
+
+        # Values are interned: `True == 1`, so the type is part of the key.
+        self.constants: list = []
+        self.constants_index: dict = {}
+
+    def __len__(self) -> int:
+        """
+        Get the number of Nodes in the arena.
+
+        Returns
+        -------
+        : int
+            The number of Nodes.
+        """
+
+        return len(self.kind)
+
+    def add_node(self, kind: str, value: Union[int, str, None] = None) -> int:
+        """
+        Add a Node, without parent or children, to the arena.
+
+        Parameters
+        ----------
+        kind : str
+            The Node kind.
+        value : int, str or None, optional (default = None)
+            The value the Node holds, if any.
+
+        Returns
+        -------
+        index : int
+            The index of the new Node.
+        """
+
+        index = len(self.kind)
+
+        self.kind.append(self.kind_codes[kind])
+        self.value.append(self._intern(value))
+        self.parent.append(self.none)
+        self.first_child.append(self.none)
+        self.last_child.append(self.none)
+        self.next_sibling.append(self.none)
+        self.position_in_tree.append(0)
+
+        return index
+
+    def append_child(self, parent: int, child: int) -> None:
+        """
+        Append a Node to the children of another one.
+
+        Parameters
+        ----------
+        parent : int
+            The index of the parent Node.
+        child : int
+            The index of the Node to append. It must not have a parent yet.
+        """
+
+        if self.last_child[parent] == self.none:
+            self.first_child[parent] = child
+        else:
+            self.next_sibling[self.last_child[parent]] = child
+
+        self.last_child[parent] = child
+        self.parent[child] = parent
+
+    def children(self, index: int) -> list[int]:
+        """
+        Get the children of a Node.
+
+        Parameters
+        ----------
+        index : int
+            The index of the Node.
+
+        Returns
+        -------
+        children : list of int
+            The indexes of the children, in order.
+        """
+
+        children = []
+        child = self.first_child[index]
+
+        while child != self.none:
+            children.append(child)
+            child = self.next_sibling[child]
+
+        return children
+
+    def get_value(self, index: int) -> Union[int, str, None]:
+        """
+        Get the value of a Node.
+
+        Parameters
+        ----------
+        index : int
+            The index of the Node.
+
+        Returns
+        -------
+        : int, str or None
+            The value the Node holds, if any.
+        """
+
+        constant = self.value[index]
+
+        return None if constant == self.none else self.constants[constant]
+
+    def node(self, index: int) -> "ArenaNode":
+        """
+        Get a handle to a Node.
+
+        Parameters
+        ----------
+        index : int
+            The index of the Node.
+
+        Returns
+        -------
+        : ArenaNode
+            The handle.
+        """
+
+        return ArenaNode(arena=self, index=index)
+
+    def _intern(self, value: Union[int, str, None]) -> int:
+        """
+        Get the index of a value in the `constants` table, adding it if needed.
+
+        Parameters
+        ----------
+        value : int, str or None
+            The value.
+
+        Returns
+        -------
+        : int
+            The index of the value, or `none` if the value is `None`.
+        """
+
+        if value is None:
+            return self.none
+
+        key = (type(value), value)
+
+        if key not in self.constants_index:
+            self.constants_index[key] = len(self.constants)
+            self.constants.append(value)
+
+        return self.constants_index[key]
+
+
+class ArenaNode:
+    """
+    Handle to a Node stored in a `NodeArena`.
+
+    It implements the interface of `Node` on top of the arrays of the arena,
+    so the `CodeGenerator` and the `Certificator` can consume the arena as
+    they consume a tree of `Node` objects. Handles are created on demand and
+    hold no state of their own: the `id` of a Node is its index.
+
+    Parameters
+    ----------
+    arena : NodeArena
+        The arena that stores the Node.
+    index : int
+        The index of the Node in the arena.
+    """
+
+    __slots__ = ("arena", "index")
+
+    def __init__(self, arena: NodeArena, index: int) -> None:
+        self.arena: NodeArena = arena
+        self.index: int = index
+
+    def __eq__(self, other: "ArenaNode") -> bool:
+        """
+        Implement the equality comparison between Nodes.
+
+        As in `Node`, the `parent` and `children` are ignored.
+
+        Parameters
+        ----------
+        other : ArenaNode or Node
+            The right hand side Node of the comparison.
+
+        Returns
+        -------
+        is_equal : bool
+            `True` if all the attributes are equal, `False` otherwise.
+        """
+
+        is_equal = (
+            self.id == other.id
+            and self.kind == other.kind
+            and self.value == other.value
+        )
+
+        return is_equal
+
+    def __str__(self) -> str:
+        """
+        Implement a string representation of an ArenaNode object.
+
+        The representation is the same as the one of `Node`.
+
+        Returns
+        -------
+        _str : str
+            The string representation of the Node.
+        """
+
+        _str = f"ID: {self.id}, Kind: {self.kind}, Value: {self.value}"
+
+        if self.parent:
+            _str += f", Parent ID: {self.parent.id}"
+
+        if self.position_in_tree is not None:
+            _str += f", Position in Tree: {self.position_in_tree}"
+
+        return _str
+
+    @property
+    def id(self) -> int:
+        """
+        Get the ID of the Node, i.e., its index in the arena.
+
+        Returns
+        -------
+        : int
+            The ID of the Node.
+        """
+
+        return self.index
+
+    @property
+    def kind(self) -> str:
+        """
+        Get the `kind` of the Node.
+
+        Returns
+        -------
+        : str
+            The `kind` of the Node.
+        """
+
+        return self.arena.kinds[self.arena.kind[self.index]]
+
+    @property
+    def value(self) -> Union[int, str, None]:
+        """
+        Get the value the Node holds.
+
+        Returns
+        -------
+        : int, str or None
+            The value, if any.
+        """
+
+        return self.arena.get_value(self.index)
+
+    @property
+    def parent(self) -> Union["ArenaNode", None]:
+        """
+        Get the parent of the Node.
+
+        Returns
+        -------
+        : ArenaNode or None
+            The parent, if any.
+        """
+
+        parent = self.arena.parent[self.index]
+
+        return None if parent == self.arena.none else self.arena.node(parent)
+
+    @property
+    def children(self) -> list["ArenaNode"]:
+        """
+        Get the children of the Node.
+
+        Returns
+        -------
+        : list of ArenaNode
+            The children, in order.
+        """
+
+        return [self.arena.node(child) for child in self.arena.children(self.index)]
+
+    @property
+    def position_in_tree(self) -> Union[int, None]:
+        """
+        Get the position of the Node in the tree, set by the `Certificator`.
+
+        Returns
+        -------
+        : int or None
+            The position, if set.
+        """
+
+        return self.arena.position_in_tree[self.index] or None
+
+    def set_position_in_tree(self, position_in_tree: int) -> None:
+        """
+        Set the `position_in_tree` of the Node.
+
+        Parameters
+        ----------
+        position_in_tree : int
+            The new `position_in_tree` to set.
+        """
+
+        self.arena.position_in_tree[self.index] = position_in_tree
+
+    def set_kind(self, kind: str) -> None:
+        """
+        Set the `kind` of the Node.
+
+        Parameters
+        ----------
+        kind : str
+            The new `kind` to set.
+        """
+
+        self.arena.kind[self.index] = self.arena.kind_codes[kind]
+
+    def get_kind(self) -> str:
+        """
+        Get the `kind` of the Node.
+
+        Returns
+        -------
+        kind : str
+            The `kind` of this node.
+        """
+
+        return self.kind
+
+    def add_child(self, child: "ArenaNode") -> None:
+        """
+        Append a Node to the children of this one.
+
+        Parameters
+        ----------
+        child : ArenaNode
+            The Node to be added.
+        """
+
+        self.arena.append_child(self.index, child.index)
+
+    def add_parent(self, parent: "ArenaNode") -> None:
+        """
+        Set a Node as this object's parent.
+
+        The Node is only attached to the children of its `parent` by
+        `add_child`, as with `Node`.
+
+        Parameters
+        ----------
+        parent : ArenaNode
+            The Node to be set as the parent of this one.
+        """
+
+        self.arena.parent[self.index] = parent.index
@@ -0,0 +1,321 @@
+"""Implement a peephole optimizer for the code of the virtual machine."""
+
+from typing import Union
+
+from src.code_generator import CodeGenerator
+
+
+class PeepholeOptimizer:
+    """
+    Optimizer that rewrites short sequences of instructions generated by the
+    `CodeGenerator` into cheaper ones.
+
+    It works on a `code_collection` -- i.e., (`instruction`, `argument`)
+    tuples, where the argument of a jump is the index of its target -- and:
+
+    * removes `EMPTY` instructions;
+    * turns `ISTORE x; IPOP; IFETCH x` into `ISTORE x`, which leaves the value
+      of `x` on the stack;
+    * removes `IPUSH c; IPOP` pairs;
+    * threads jumps to `JMP` instructions to their final target;
+    * removes `JMP` instructions to the next instruction, and turns `JZ` and
+      `JNZ` instructions to the next instruction into `IPOP`;
+    * removes the instructions after a `JMP` or a `HALT` that no jump targets.
+
+    Instructions that are the target of a jump are never merged with the ones
+    before them. Rewrites are applied until none is possible, and the result
+    is checked by `verify`.
+    """
+
+    jump_instructions = CodeGenerator.jump_instructions
+
+    # The number of values each instruction pops from the stack, and pushes
+    # onto it.
+    stack_effects = {
+        "IFETCH": (0, 1),
+        "IPUSH": (0, 1),
+        "ISTORE": (1, 1),
+        "IPOP": (1, 0),
+        "IADD": (2, 1),
+        "ISUB": (2, 1),
+        "ILT": (2, 1),
+        "HALT": (0, 0),
+        "EMPTY": (0, 0),
+        "JMP": (0, 0),
+        "JZ": (1, 0),
+        "JNZ": (1, 0),
+        "INC": (0, 0),
+        "JGE": (0, 0),
+        "JLT": (0, 0),
+        "SUBVV": (0, 1)
+    }
+
+    def __init__(self) -> None:
+        self.removed_count: int = 0
+
+    def optimize(self, code_collection: list) -> list:
+        """
+        Optimize a `code_collection`.
+
+        Parameters
+        ----------
+        code_collection : list
+            The (`instruction`, `argument`) tuples generated by the
+            `CodeGenerator`. It is not changed.
+
+        Returns
+        -------
+        code_collection : list
+            The optimized instructions, with their jump targets updated.
+
+        Raises
+        ------
+        ValueError
+            Raised by `verify` if the optimized code is not valid.
+        """
+
+        rewritten_code = list(code_collection)
+
+        while rewritten_code is not None:
+            code_collection = rewritten_code
+            rewritten_code = self._rewrite(code_collection)
+
+        self.verify(code_collection)
+
+        return code_collection
+
+    @classmethod
+    def verify(cls, code_collection: list) -> None:
+        """
+        Verify that a `code_collection` is well formed.
+
+        Every jump must target an instruction (or the end of the code), and
+        the stack must have the same size whenever an instruction runs, with
+        enough values for the instruction to pop.
+
+        Parameters
+        ----------
+        code_collection : list
+            The (`instruction`, `argument`) tuples to verify.
+
+        Raises
+        ------
+        ValueError
+            Raised if the code is not well formed.
+        """
+
+        code_size = len(code_collection)
+
+        for index, (instruction, argument) in enumerate(code_collection):
+            if instruction not in cls.stack_effects:
+                raise ValueError(f"Unknown instruction at {index}: {instruction}.")
+
+            if instruction not in cls.jump_instructions:
+                continue
+
+            target = CodeGenerator.get_target(argument)
+
+            if not isinstance(target, int) or not 0 <= target <= code_size:
+                raise ValueError(f"Invalid jump target at {index}: {target}.")
+
+        # The size of the stack before each instruction, found by following
+        # every path from the first instruction.
+        stack_sizes = {0: 0}
+        pending_indexes = [0]
+
+        while pending_indexes:
+            index = pending_indexes.pop()
+
+            if index == code_size:
+                continue
+
+            instruction, argument = code_collection[index]
+            popped, pushed = cls.stack_effects[instruction]
+            stack_size = stack_sizes[index]
+
+            if stack_size < popped:
+                raise ValueError(f"Stack underflow at {index}: {instruction}.")
+
+            stack_size += pushed - popped
+            successors = []
+
+            if instruction not in ["JMP", "HALT"]:
+                successors.append(index + 1)
+
+            if instruction in cls.jump_instructions:
+                successors.append(CodeGenerator.get_target(argument))
+
+            for successor in successors:
+                if successor not in stack_sizes:
+                    stack_sizes[successor] = stack_size
+                    pending_indexes.append(successor)
+
+                elif stack_sizes[successor] != stack_size:
+                    raise ValueError(
+                        f"Inconsistent stack size at {successor}: "
+                        f"{stack_sizes[successor]} and {stack_size}."
+                    )
+
+    def _rewrite(self, code_collection: list) -> Union[list, None]:
+        """
+        Apply one round of rewrites to a `code_collection`.
+
+        Parameters
+        ----------
+        code_collection : list
+            The instructions.
+
+        Returns
+        -------
+        : list or None
+            The rewritten instructions, or `None` if none was rewritten.
+        """
+
+        code_size = len(code_collection)
+        targets = {
+            CodeGenerator.get_target(argument)
+            for instruction, argument in code_collection
+            if instruction in self.jump_instructions
+        }
+
+        is_removed = [False] * code_size
+        rewritten_instructions = {}
+
+        def _next_instruction(index: int) -> tuple:
+            # Instructions that are jumped to can't be merged.
+            if index >= code_size or index in targets or is_removed[index]:
+                return None, None
+
+            return code_collection[index]
+
+        for index, (instruction, argument) in enumerate(code_collection):
+            if is_removed[index]:
+                continue
+
+            next_instruction, _ = _next_instruction(index + 1)
+
+            if instruction == "EMPTY":
+                is_removed[index] = True
+
+            elif instruction == "IPUSH" and next_instruction == "IPOP":
+                is_removed[index] = is_removed[index + 1] = True
+
+            elif instruction == "ISTORE" and next_instruction == "IPOP":
+                fetch, variable = _next_instruction(index + 2)
+
+                if fetch == "IFETCH" and variable.value == argument.value:
+                    is_removed[index + 1] = is_removed[index + 2] = True
+
+            elif instruction in self.jump_instructions:
+                original_target = CodeGenerator.get_target(argument)
+                target = self._thread_jump(code_collection, original_target)
+
+                # `JGE` and `JLT` read their variables, which may not be set,
+                # so they are kept.
+                if target == index + 1 and instruction == "JMP":
+                    is_removed[index] = True
+
+                elif target == index + 1 and instruction in ["JZ", "JNZ"]:
+                    rewritten_instructions[index] = ("IPOP", None)
+
+                elif target != original_target:
+                    rewritten_instructions[index] = (
+                        instruction, CodeGenerator.set_target(argument, target)
+                    )
+
+        self._remove_unreachable_code(code_collection, targets, is_removed)
+
+        if not any(is_removed) and not rewritten_instructions:
+            return None
+
+        # Jumps to removed instructions land on the next one that is kept:
+        # the new index of both is the number of instructions kept before.
+        new_indexes = []
+        kept_count = 0
+
+        for index in range(code_size):
+            new_indexes.append(kept_count)
+            kept_count += not is_removed[index]
+
+        new_indexes.append(kept_count)
+
+        rewritten_code = []
+
+        for index, (instruction, argument) in enumerate(code_collection):
+            if is_removed[index]:
+                continue
+
+            instruction, argument = rewritten_instructions.get(
+                index, (instruction, argument)
+            )
+
+            if instruction in self.jump_instructions:
+                argument = CodeGenerator.set_target(
+                    argument, new_indexes[CodeGenerator.get_target(argument)]
+                )
+
+            rewritten_code.append((instruction, argument))
+
+        self.removed_count += code_size - len(rewritten_code)
+
+        return rewritten_code
+
+    def _remove_unreachable_code(
+        self, code_collection: list, targets: set, is_removed: list
+    ) -> None:
+        """
+        Mark the instructions after a `JMP` or a `HALT` as removed, up to the
+        next jump target.
+
+        Parameters
+        ----------
+        code_collection : list
+            The instructions.
+        targets : set
+            The indexes of the instructions that are jumped to.
+        is_removed : list of bool
+            Whether each instruction is removed. Updated in place.
+        """
+
+        is_reachable = True
+
+        for index, (instruction, _) in enumerate(code_collection):
+            if index in targets:
+                is_reachable = True
+
+            if not is_reachable:
+                is_removed[index] = True
+
+            elif instruction in ["JMP", "HALT"] and not is_removed[index]:
+                is_reachable = False
+
+    @staticmethod
+    def _thread_jump(code_collection: list, target: int) -> int:
+        """
+        Follow a chain of `JMP` instructions to its final target.
+
+        Parameters
+        ----------
+        code_collection : list
+            The instructions.
+        target : int
+            The target of a jump.
+
+        Returns
+        -------
+        target : int
+            The first instruction of the chain that is not a `JMP` -- or the
+            last `JMP` before the chain loops.
+        """
+
+        visited_targets = set()
+
+        while (
+            target < len(code_collection)
+            and code_collection[target][0] == "JMP"
+            and target not in visited_targets
+        ):
+            visited_targets.add(target)
+            target = code_collection[target][1]
+
+        return target
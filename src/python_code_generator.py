@@ -0,0 +1,408 @@
+"""Implement a code generator that translates the AST into Python functions."""
+
+import hashlib
+import marshal
+import os
+import sys
+from typing import Callable, Union
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.interpreter import create_virtual_machine
+from src.lexer import Lexer
+from src.node import Node
+
+
+class PythonCodeGenerator:
+    """
+    Code Generator that generates the source code of a Python function from
+    Abstract Syntax Tree (AST) Nodes.
+
+    Tiny-C variables become local variables of the function, and `while`,
+    `do/while` and `if` statements map to Python control flow. The function
+    returns the same `variables` dict as `VirtualMachine.run` produces.
+    Reading an unset variable raises a `NameError` instead of a `KeyError`,
+    and Python may not compile programs with deeply nested expressions or
+    statements, so `create_python_function` runs these programs on the
+    virtual machine instead.
+    """
+
+    function_name = "tinyc_program"
+    indentation = "    "
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.variables: list = []
+        self.depth: int = 1
+
+    def __str__(self) -> str:
+        """
+        Implement a string representation of a PythonCodeGenerator object.
+
+        This method is internally invoked when using `print(codegen_obj)`.
+
+        Returns
+        -------
+        _str : str
+            The generated Python source code.
+        """
+
+        return self.source
+
+    @property
+    def source(self) -> str:
+        """
+        Get the source code of the generated Python function.
+
+        Returns
+        -------
+        : str
+            The source code of a module that defines the function.
+        """
+
+        variables = ", ".join(repr(variable) for variable in self.variables)
+
+        # A 1-tuple needs a trailing comma.
+        if len(self.variables) == 1:
+            variables += ","
+
+        return "\n".join([
+            f"def {self.function_name}():",
+            *self.lines,
+            f"{self.indentation}_locals = locals()",
+            f"{self.indentation}return {{",
+            f"{self.indentation * 2}name: _locals[name]",
+            f"{self.indentation * 2}for name in ({variables})",
+            f"{self.indentation * 2}if name in _locals",
+            f"{self.indentation}}}",
+            ""
+        ])
+
+    def generate_code(self, node: Node) -> None:
+        """
+        Generate code from a statement Node in the Abstract Syntax Tree.
+
+        Parameters
+        ----------
+        node : Node
+            The initial Node from the AST. (i.e., its `root`.)
+        """
+
+        statement_map = {
+            "PROG": self.parse_sequence,
+            "SEQ": self.parse_sequence,
+            "BLOCK": self.parse_sequence,
+            "EMPTY": self.parse_sequence,
+            "EXPR": self.parse_expression_statement,
+            "IF": self.parse_if_node,
+            "IFELSE": self.parse_if_node,
+            "WHILE": self.parse_while_node,
+            "DO": self.parse_do_while_node
+        }
+
+        handler = statement_map[node.kind]
+
+        handler(node=node)
+
+    def generate_expression(self, node: Node) -> str:
+        """
+        Generate the Python expression that computes an expression Node.
+
+        Parameters
+        ----------
+        node : Node
+            The expression Node to translate.
+
+        Returns
+        -------
+        : str
+            The Python expression.
+        """
+
+        operators = {"ADD": "+", "SUB": "-", "LT": "<"}
+
+        # Nodes are kept in an explicit stack, so the depth of the expression
+        # is not bound by the recursion limit. Each operation is visited
+        # twice: first to push its operands, then to combine their
+        # expressions, which are kept in another stack.
+        expressions = []
+        pending_nodes = [(node, False)]
+
+        while pending_nodes:
+            current, is_evaluated = pending_nodes.pop()
+
+            if current.kind == "VAR":
+                expressions.append(current.value)
+            elif current.kind == "CST":
+                expressions.append(repr(current.value))
+            elif current.kind == "SET":
+                variable, expression = self._get_set_operands(current)
+
+                if is_evaluated:
+                    expressions.append(f"({variable} := {expressions.pop()})")
+                else:
+                    pending_nodes.append((current, True))
+                    pending_nodes.append((expression, False))
+            elif not is_evaluated:
+                lhs, rhs = current.children
+
+                pending_nodes.append((current, True))
+                pending_nodes.append((rhs, False))
+                pending_nodes.append((lhs, False))
+            else:
+                lhs, rhs = current.children
+                rhs_expression = expressions.pop()
+                lhs_expression = expressions.pop()
+
+                # Sums are left-associative, so only a sum on the right hand
+                # side needs parenthesis. Comparisons must never be chained.
+                if lhs.kind == "LT":
+                    lhs_expression = f"({lhs_expression})"
+
+                if rhs.kind == "LT" or (
+                    current.kind != "LT" and rhs.kind in operators
+                ):
+                    rhs_expression = f"({rhs_expression})"
+
+                operator = operators[current.kind]
+                expressions.append(f"{lhs_expression} {operator} {rhs_expression}")
+
+        return expressions.pop()
+
+    def parse_sequence(self, node: Node) -> None:
+        """
+        Generate code from a sequence of statements.
+
+        Parameters
+        ----------
+        node : Node
+            The `PROG`, `SEQ`, `BLOCK` or `EMPTY` Node to parse.
+        """
+
+        for child in node.children:
+            self.generate_code(child)
+
+    def parse_expression_statement(self, node: Node) -> None:
+        """
+        Generate code from an `EXPR` Node.
+
+        Assignments become assignment statements, and other expressions are
+        still evaluated, as the virtual machine does.
+
+        Parameters
+        ----------
+        node : Node
+            The `EXPR` Node to parse.
+        """
+
+        (expression,) = node.children
+
+        if expression.kind == "SET":
+            variable, rhs = self._get_set_operands(expression)
+            self._add_line(f"{variable} = {self.generate_expression(rhs)}")
+        else:
+            self._add_line(self.generate_expression(expression))
+
+    def parse_if_node(self, node: Node) -> None:
+        """
+        Generate code from an `IF` or an `IFELSE` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `IF` or `IFELSE` Node to parse.
+        """
+
+        expr, if_statement, *else_statement = node.children
+
+        self._add_line(f"if {self.generate_expression(expr)}:")
+        self._add_block(if_statement)
+
+        if else_statement:
+            self._add_line("else:")
+            self._add_block(else_statement[0])
+
+    def parse_while_node(self, node: Node) -> None:
+        """
+        Generate code from a `WHILE` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `WHILE` Node to parse.
+        """
+
+        expr, statement = node.children
+
+        self._add_line(f"while {self.generate_expression(expr)}:")
+        self._add_block(statement)
+
+    def parse_do_while_node(self, node: Node) -> None:
+        """
+        Generate code from a `DO` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `DO` Node to parse.
+        """
+
+        statement, expr = node.children
+
+        self._add_line("while True:")
+
+        self.depth += 1
+        self.generate_code(statement)
+        self._add_line(f"if not ({self.generate_expression(expr)}):")
+        self._add_line(f"{self.indentation}break")
+        self.depth -= 1
+
+    def _add_line(self, line: str) -> None:
+        """
+        Add a line of code at the current indentation depth.
+
+        Parameters
+        ----------
+        line : str
+            The line to add.
+        """
+
+        self.lines.append(f"{self.indentation * self.depth}{line}")
+
+    def _add_block(self, node: Node) -> None:
+        """
+        Add an indented block of code generated from a statement Node.
+
+        Parameters
+        ----------
+        node : Node
+            The statement Node to generate the block from.
+        """
+
+        self.depth += 1
+
+        line_count = len(self.lines)
+        self.generate_code(node)
+
+        if len(self.lines) == line_count:
+            self._add_line("pass")
+
+        self.depth -= 1
+
+    def _get_set_operands(self, node: Node) -> tuple[str, Node]:
+        """
+        Get the variable and the expression of a `SET` Node.
+
+        The variable is also registered to be returned by the function.
+
+        Parameters
+        ----------
+        node : Node
+            The `SET` Node.
+
+        Returns
+        -------
+        variable : str
+            The name of the variable to set.
+        expression : Node
+            The Node of the expression to assign.
+        """
+
+        # Making the Code Generator compatible with AST Merging optimization.
+        if node.value is not None:
+            variable = node.value
+            (expression,) = node.children
+        else:
+            lhs, expression = node.children
+            variable = lhs.value
+
+        if variable not in self.variables:
+            self.variables.append(variable)
+
+        return variable, expression
+
+
+def create_python_function(
+    source_code: str, cache_dir: Union[str, None] = None
+) -> Callable[[], dict]:
+    """
+    Compile the input `source_code` into a native Python function.
+
+    If Python can not compile the program -- e.g., its expressions are too
+    deep -- or if the function reads an unset variable, the program runs on
+    the virtual machine instead, which raises the same `KeyError` as the other
+    engines. Either way, the results are the same.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code to compile.
+    cache_dir : str or None, optional (default = None)
+        Directory where compiled programs are cached, keyed by the hash of
+        their source code. If `None`, nothing is cached.
+
+    Returns
+    -------
+    function : Callable
+        A function that runs the program and returns its variables.
+    """
+
+    def run_virtual_machine() -> dict:
+        vm = create_virtual_machine(source_code)
+        vm.run()
+
+        return dict(vm.variables)
+
+    cache_path = None
+    code_object = None
+
+    if cache_dir is not None:
+        key = hashlib.sha256(
+            f"{sys.implementation.cache_tag}\0{source_code}".encode()
+        ).hexdigest()
+
+        cache_path = os.path.join(cache_dir, f"{key}.marshal")
+
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as cache_file:
+                code_object = marshal.load(cache_file)
+
+    if code_object is None:
+        ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+        ast.build()
+
+        generator = PythonCodeGenerator()
+
+        # Python limits how deep the code it compiles is nested (e.g., 20
+        # nested loops), and may run out of stack on long expressions.
+        try:
+            generator.generate_code(node=ast.root)
+            code_object = compile(generator.source, "<tinyc>", "exec")
+        except (SyntaxError, RecursionError):
+            return run_virtual_machine
+
+        if cache_path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+            # Write to a temporary file first, so concurrent runs never read a
+            # partially written program.
+            temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+
+            with open(temporary_path, "wb") as cache_file:
+                marshal.dump(code_object, cache_file)
+
+            os.replace(temporary_path, cache_path)
+
+    namespace = {}
+    exec(code_object, namespace)
+
+    program = namespace[PythonCodeGenerator.function_name]
+
+    def run_python_code() -> dict:
+        try:
+            return program()
+        except NameError:
+            # Reading an unset variable: the virtual machine raises a
+            # `KeyError` with its name instead.
+            return run_virtual_machine()
+
+    return run_python_code
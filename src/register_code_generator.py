@@ -0,0 +1,664 @@
+"""Implement a code generator for the register-based virtual machine."""
+
+from typing import Generator, NamedTuple, Union
+
+from src.code_generator import CodeGenerator
+from src.node import Node
+
+
+class Constant(NamedTuple):
+    """
+    The result of an expression that is a constant, and not a register.
+
+    Parameters
+    ----------
+    value : int or bool
+        The value of the constant.
+    """
+
+    value: Union[int, bool]
+
+
+class RegisterCodeGenerator:
+    """
+    Code Generator that lowers the Abstract Syntax Tree (AST) to a three
+    address code for the `RegisterVirtualMachine`.
+
+    Each of the 26 Tiny-C variables has a fixed register (`a` is register 0,
+    `z` is register 25), and the values of subexpressions are held in
+    temporary registers, after those. Instructions are tuples of the
+    instruction name and its operands, which are either registers, constants
+    or jump targets, and write their result to their first operand:
+
+    * `MOV dst, src` and `LOADK dst, k` copy a register and a constant;
+    * `ADD`, `SUB` and `LT dst, lhs, rhs` operate on two registers, and
+      `ADDK`, `SUBK` and `LTK dst, lhs, k` on a register and a constant;
+    * `JMP target`, `JZ reg, target` and `JNZ reg, target` jump, and
+      `JGE lhs, rhs, target` and `JGEK lhs, k, target` jump if `lhs < rhs`
+      (or `lhs < k`) is false;
+    * `CHECK reg` raises a `KeyError` if the variable of `reg` is not set, and
+      is only emitted where the variable may not be set yet;
+    * `HALT` halts the machine.
+
+    Hence, `a = b + c;` is a single `ADD` instruction.
+    """
+
+    instructions = [
+        "MOV",
+        "LOADK",
+        "ADD",
+        "ADDK",
+        "SUB",
+        "SUBK",
+        "LT",
+        "LTK",
+        "JMP",
+        "JZ",
+        "JNZ",
+        "JGE",
+        "JGEK",
+        "CHECK",
+        "HALT"
+    ]
+
+    jump_instructions = ["JMP", "JZ", "JNZ", "JGE", "JGEK"]
+
+    # The register of each variable: its slot, so the first registers are laid
+    # out as the variables of the `VirtualMachine`.
+    variable_registers = CodeGenerator.variable_slots
+
+    # The instructions of each operation, on two registers and on a register
+    # and a constant.
+    operations = {
+        "ADD": ("ADD", "ADDK"),
+        "SUB": ("SUB", "SUBK"),
+        "LT": ("LT", "LTK")
+    }
+
+    # The name of the method that handles each Node kind.
+    node_handlers = {
+        "VAR": "parse_variable",
+        "CST": "parse_constant",
+        "ADD": "parse_operation",
+        "SUB": "parse_operation",
+        "LT": "parse_operation",
+        "SET": "parse_set_node",
+        "EXPR": "parse_expression_node",
+        "IF": "parse_if_node",
+        "IFELSE": "parse_if_else_node",
+        "WHILE": "parse_while_node",
+        "DO": "parse_do_while_node",
+        "EMPTY": "parse_sequence",
+        "SEQ": "parse_sequence",
+        "BLOCK": "parse_sequence",
+        "PROG": "parse_program"
+    }
+
+    def __init__(self) -> None:
+        self.code_collection: list = []
+        self.register_count: int = len(self.variable_registers)
+
+        # Temporaries are allocated and released in LIFO order.
+        self.next_temporary: int = len(self.variable_registers)
+
+        # The variables that are surely set at the Node being generated.
+        self.assigned_variables: set = set()
+
+        # The `id` of the Nodes whose subtree has an assignment.
+        self.assigning_nodes: set = set()
+
+    def __str__(self) -> str:
+        """
+        Implement a string representation of a RegisterCodeGenerator object.
+
+        Returns
+        -------
+        _str : str
+            One line per instruction, with its index and operands.
+        """
+
+        lines = []
+
+        for index, (instruction, *operands) in enumerate(self.code_collection):
+            line = f"{index:>6} {instruction}"
+
+            if operands:
+                line += " " + ", ".join(map(str, operands))
+
+            lines.append(line)
+
+        return "\n".join(lines)
+
+    @property
+    def here(self) -> int:
+        """
+        Get the index of the next instruction to be generated.
+
+        Returns
+        -------
+        : int
+            The index in the `code_collection` where the next instruction
+            will be placed.
+        """
+
+        return len(self.code_collection)
+
+    def hole(self, instruction: str, *operands: object) -> int:
+        """
+        Add a jump instruction whose target is not known yet.
+
+        Parameters
+        ----------
+        instruction : str
+            The jump instruction to add.
+        operands : object
+            The operands of the jump, other than its target.
+
+        Returns
+        -------
+        address : int
+            The index of the jump instruction in the `code_collection`.
+        """
+
+        address = self.here
+        self.code_collection.append((instruction, *operands, None))
+
+        return address
+
+    def fix(self, source: int, destination: int) -> None:
+        """
+        Set the target of the jump instruction at `source` to `destination`.
+
+        Parameters
+        ----------
+        source : int
+            The index of the jump instruction, as returned by `hole`.
+        destination : int
+            The index of the instruction to jump to.
+        """
+
+        *instruction, _ = self.code_collection[source]
+        self.code_collection[source] = (*instruction, destination)
+
+    def generate_code(self, node: Node) -> None:
+        """
+        Generate code from a Node in the Abstract Syntax Tree.
+
+        As in the `CodeGenerator`, each handler is a generator that yields
+        the children to generate code from, and the handlers are kept in an
+        explicit stack. The register (or `Constant`) that holds the value of
+        each child is sent back to the handler of its parent.
+
+        Parameters
+        ----------
+        node : Node
+            The initial Node from the AST. (i.e., its `root`.)
+        """
+
+        self._find_assigning_nodes(node)
+
+        pending_handlers = [self._get_handler(node)]
+        result = None
+
+        while pending_handlers:
+            try:
+                child = pending_handlers[-1].send(result)
+            except StopIteration as stop:
+                pending_handlers.pop()
+                result = stop.value
+            else:
+                pending_handlers.append(self._get_handler(child))
+                result = None
+
+    def _get_handler(self, node: Node) -> Generator:
+        """
+        Start the handler of a Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to generate code from.
+
+        Returns
+        -------
+        : Generator
+            The handler, which yields the children to generate code from and
+            returns the register that holds the value of the Node, if any.
+        """
+
+        return getattr(self, self.node_handlers[node.kind])(node=node)
+
+    def parse_variable(self, node: Node) -> Generator:
+        """
+        Generate code from a `VAR` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `VAR` Node to parse.
+
+        Returns
+        -------
+        : int
+            The register of the variable.
+        """
+
+        register = self.variable_registers[node.value]
+
+        if node.value not in self.assigned_variables:
+            self.code_collection.append(("CHECK", register))
+            self.assigned_variables.add(node.value)
+
+        yield from ()
+
+        return register
+
+    def parse_constant(self, node: Node) -> Generator:
+        """
+        Generate code from a `CST` Node, which emits no instruction.
+
+        Parameters
+        ----------
+        node : Node
+            The `CST` Node to parse.
+
+        Returns
+        -------
+        : Constant
+            The value of the Node.
+        """
+
+        yield from ()
+
+        return Constant(node.value)
+
+    def parse_operation(self, node: Node) -> Generator:
+        """
+        Generate code from an `ADD`, `SUB` or `LT` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to parse.
+
+        Returns
+        -------
+        : int
+            The temporary register that holds the result.
+        """
+
+        lhs_node, rhs_node = node.children
+
+        lhs = yield lhs_node
+
+        if self._is_clobbered(lhs, rhs_node):
+            lhs = self._materialize(lhs)
+
+        rhs = yield rhs_node
+
+        register_instruction, constant_instruction = self.operations[node.kind]
+
+        # `k + x` is `x + k`, for integers and booleans.
+        if isinstance(lhs, Constant) and node.kind == "ADD":
+            lhs, rhs = rhs, lhs
+
+        if isinstance(lhs, Constant):
+            lhs = self._materialize(lhs)
+
+        self._release(rhs)
+        self._release(lhs)
+
+        destination = self._allocate()
+
+        if isinstance(rhs, Constant):
+            self.code_collection.append(
+                (constant_instruction, destination, lhs, rhs.value)
+            )
+        else:
+            self.code_collection.append(
+                (register_instruction, destination, lhs, rhs)
+            )
+
+        return destination
+
+    def parse_set_node(self, node: Node) -> Generator:
+        """
+        Generate code from a `SET` Node.
+
+        The instruction that computes the assigned value writes it to the
+        register of the variable directly, if it can.
+
+        Parameters
+        ----------
+        node : Node
+            The `SET` Node to parse.
+
+        Returns
+        -------
+        : int
+            The register of the variable.
+        """
+
+        if node.value is not None:
+            variable, (rhs_node,) = node.value, node.children
+        else:
+            lhs_node, rhs_node = node.children
+            variable = lhs_node.value
+
+        register = self.variable_registers[variable]
+        rhs = yield rhs_node
+
+        if isinstance(rhs, Constant):
+            self.code_collection.append(("LOADK", register, rhs.value))
+
+        elif self._is_temporary(rhs) and self.code_collection[-1][1] == rhs:
+            self._release(rhs)
+            self.code_collection[-1] = (
+                self.code_collection[-1][0], register, *self.code_collection[-1][2:]
+            )
+
+        elif rhs != register:
+            self.code_collection.append(("MOV", register, rhs))
+
+        self.assigned_variables.add(variable)
+
+        return register
+
+    def parse_expression_node(self, node: Node) -> Generator:
+        """
+        Generate code from an `EXPR` Node, whose value is discarded.
+
+        Parameters
+        ----------
+        node : Node
+            The `EXPR` Node to parse.
+        """
+
+        (expression,) = node.children
+
+        self._release((yield expression))
+
+    def parse_if_node(self, node: Node) -> Generator:
+        """
+        Generate code from an `IF` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `IF` Node to parse.
+        """
+
+        expr, if_statement = node.children
+
+        skip_if = yield from self._jump_unless(expr)
+        assigned_variables = set(self.assigned_variables)
+
+        yield if_statement
+
+        self.fix(skip_if, self.here)
+        self.assigned_variables = assigned_variables
+
+    def parse_if_else_node(self, node: Node) -> Generator:
+        """
+        Generate code from an `IFELSE` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `IFELSE` Node to parse.
+        """
+
+        expr, if_statement, else_statement = node.children
+
+        skip_if = yield from self._jump_unless(expr)
+        assigned_variables = set(self.assigned_variables)
+
+        yield if_statement
+
+        skip_else = self.hole("JMP")
+        self.fix(skip_if, self.here)
+
+        if_assigned_variables = self.assigned_variables
+        self.assigned_variables = assigned_variables
+
+        yield else_statement
+
+        self.fix(skip_else, self.here)
+        self.assigned_variables &= if_assigned_variables
+
+    def parse_while_node(self, node: Node) -> Generator:
+        """
+        Generate code from a `WHILE` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `WHILE` Node to parse.
+        """
+
+        expr, statement = node.children
+
+        loop_start = self.here
+        exit_loop = yield from self._jump_unless(expr)
+        assigned_variables = set(self.assigned_variables)
+
+        yield statement
+
+        self.fix(self.hole("JMP"), loop_start)
+        self.fix(exit_loop, self.here)
+        self.assigned_variables = assigned_variables
+
+    def parse_do_while_node(self, node: Node) -> Generator:
+        """
+        Generate code from a `DO` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `DO` Node to parse.
+        """
+
+        statement, expr = node.children
+
+        # The body runs at least once, so the variables it sets are kept.
+        loop_start = self.here
+
+        yield statement
+
+        condition = yield expr
+
+        if isinstance(condition, Constant):
+            condition = self._materialize(condition)
+
+        self._release(condition)
+        self.fix(self.hole("JNZ", condition), loop_start)
+
+    def parse_sequence(self, node: Node) -> Generator:
+        """
+        Generate code from a `SEQ`, `BLOCK` or `EMPTY` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The Node to parse.
+        """
+
+        for child in node.children:
+            yield child
+
+    def parse_program(self, node: Node) -> Generator:
+        """
+        Generate code from the `PROG` Node.
+
+        Parameters
+        ----------
+        node : Node
+            The `PROG` Node to parse.
+        """
+
+        yield from self.parse_sequence(node=node)
+
+        self.code_collection.append(("HALT",))
+
+    def _jump_unless(self, expr: Node) -> Generator:
+        """
+        Generate code that evaluates a condition and jumps if it is false.
+
+        Parameters
+        ----------
+        expr : Node
+            The condition.
+
+        Returns
+        -------
+        : Generator
+            Generator that yields the Nodes to generate code from, and returns
+            the index of the jump, to be set with `fix`.
+        """
+
+        if expr.kind == "LT":
+            lhs_node, rhs_node = expr.children
+
+            lhs = yield lhs_node
+
+            if self._is_clobbered(lhs, rhs_node):
+                lhs = self._materialize(lhs)
+
+            rhs = yield rhs_node
+
+            if isinstance(lhs, Constant):
+                lhs = self._materialize(lhs)
+
+            self._release(rhs)
+            self._release(lhs)
+
+            if isinstance(rhs, Constant):
+                return self.hole("JGEK", lhs, rhs.value)
+
+            return self.hole("JGE", lhs, rhs)
+
+        condition = yield expr
+
+        if isinstance(condition, Constant):
+            condition = self._materialize(condition)
+
+        self._release(condition)
+
+        return self.hole("JZ", condition)
+
+    def _materialize(self, operand: Union[int, Constant]) -> int:
+        """
+        Copy an operand to a new temporary register.
+
+        Parameters
+        ----------
+        operand : int or Constant
+            The register or the constant to copy.
+
+        Returns
+        -------
+        : int
+            The temporary register.
+        """
+
+        register = self._allocate()
+
+        if isinstance(operand, Constant):
+            self.code_collection.append(("LOADK", register, operand.value))
+        else:
+            self.code_collection.append(("MOV", register, operand))
+
+        return register
+
+    def _allocate(self) -> int:
+        """
+        Allocate a temporary register.
+
+        Returns
+        -------
+        register : int
+            The register.
+        """
+
+        register = self.next_temporary
+        self.next_temporary += 1
+        self.register_count = max(self.register_count, self.next_temporary)
+
+        return register
+
+    def _release(self, operand: Union[int, Constant, None]) -> None:
+        """
+        Release an operand, if it is a temporary register.
+
+        Parameters
+        ----------
+        operand : int, Constant or None
+            The register (or constant) that held a value no longer needed.
+        """
+
+        if self._is_temporary(operand):
+            self.next_temporary -= 1
+
+    def _is_temporary(self, operand: Union[int, Constant, None]) -> bool:
+        """
+        Check whether an operand is a temporary register.
+
+        Parameters
+        ----------
+        operand : int, Constant or None
+            The operand.
+
+        Returns
+        -------
+        : bool
+            The verdict.
+        """
+
+        return isinstance(operand, int) and operand >= len(self.variable_registers)
+
+    def _is_clobbered(self, lhs: Union[int, Constant], rhs_node: Node) -> bool:
+        """
+        Check whether the register of a left hand side operand may be set
+        while the right hand side is evaluated -- e.g., `b + (b = 1)`.
+
+        Parameters
+        ----------
+        lhs : int or Constant
+            The left hand side operand.
+        rhs_node : Node
+            The right hand side expression.
+
+        Returns
+        -------
+        : bool
+            `True` if `lhs` is the register of a variable and `rhs_node` has
+            assignments, in which case `lhs` must be copied.
+        """
+
+        is_variable = isinstance(lhs, int) and not self._is_temporary(lhs)
+
+        return is_variable and id(rhs_node) in self.assigning_nodes
+
+    def _find_assigning_nodes(self, node: Node) -> None:
+        """
+        Find the Nodes whose subtree has an assignment.
+
+        Parameters
+        ----------
+        node : Node
+            The root of the tree.
+        """
+
+        pending_nodes = [(node, False)]
+
+        while pending_nodes:
+            node, is_visited = pending_nodes.pop()
+
+            if not is_visited:
+                pending_nodes.append((node, True))
+                pending_nodes.extend((child, False) for child in node.children)
+
+            elif node.kind == "SET" or any(
+                id(child) in self.assigning_nodes for child in node.children
+            ):
+                self.assigning_nodes.add(id(node))
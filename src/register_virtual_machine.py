@@ -0,0 +1,143 @@
+"""Implement a register-based virtual machine."""
+
+from src.register_code_generator import RegisterCodeGenerator
+from src.variable_slots import VariableSlots
+
+
+class RegisterVirtualMachine:
+    """
+    Virtual Machine that computes the three address code generated by the
+    `RegisterCodeGenerator`.
+
+    Variables and temporaries live in a list of registers, so no value is
+    pushed to or popped from a stack, and each instruction reads its operands
+    and writes its result directly.
+
+    Parameters
+    ----------
+    code_collection : list
+        The instructions generated by the `RegisterCodeGenerator`.
+    register_count : int, optional (default = 26)
+        The number of registers, i.e., the `register_count` of the
+        `RegisterCodeGenerator`.
+    """
+
+    opcodes = {
+        instruction: opcode
+        for opcode, instruction in enumerate(RegisterCodeGenerator.instructions)
+    }
+
+    # The name of the variable held by each of the first registers.
+    variable_names = list(RegisterCodeGenerator.variable_registers)
+
+    def __init__(self, code_collection: list, register_count: int = 26) -> None:
+        self.code_collection: list = code_collection
+        self.registers: list = VariableSlots.allocate(register_count)
+        self.variables: VariableSlots = VariableSlots(self.registers)
+        self.program_counter: int = 0
+        self.instruction_count: int = 0
+
+        self._program: list = self._decode()
+
+    def run(self) -> None:
+        """
+        Run the program on the virtual machine.
+
+        As in `VirtualMachine.run`, the instructions are dispatched by
+        comparing integer opcodes in a single loop, with the registers and
+        the program counter in local variables.
+
+        Raises
+        ------
+        KeyError
+            Raised if the program reads a variable that is not set.
+        """
+
+        opcodes = self.opcodes
+        MOV = opcodes["MOV"]
+        LOADK = opcodes["LOADK"]
+        ADD = opcodes["ADD"]
+        ADDK = opcodes["ADDK"]
+        SUB = opcodes["SUB"]
+        SUBK = opcodes["SUBK"]
+        LT = opcodes["LT"]
+        LTK = opcodes["LTK"]
+        JMP = opcodes["JMP"]
+        JZ = opcodes["JZ"]
+        JNZ = opcodes["JNZ"]
+        JGE = opcodes["JGE"]
+        JGEK = opcodes["JGEK"]
+        CHECK = opcodes["CHECK"]
+        HALT = opcodes["HALT"]
+
+        program = self._program
+        registers = self.registers
+        unset = VariableSlots.unset
+
+        pc = self.program_counter
+        instruction_count = self.instruction_count
+
+        try:
+            while True:
+                opcode, a, b, c = program[pc]
+                pc += 1
+                instruction_count += 1
+
+                if opcode == ADDK:
+                    registers[a] = registers[b] + c
+                elif opcode == JGEK:
+                    if not registers[a] < b:
+                        pc = c
+                elif opcode == JMP:
+                    pc = a
+                elif opcode == ADD:
+                    registers[a] = registers[b] + registers[c]
+                elif opcode == SUB:
+                    registers[a] = registers[b] - registers[c]
+                elif opcode == MOV:
+                    registers[a] = registers[b]
+                elif opcode == LOADK:
+                    registers[a] = b
+                elif opcode == JGE:
+                    if not registers[a] < registers[b]:
+                        pc = c
+                elif opcode == SUBK:
+                    registers[a] = registers[b] - c
+                elif opcode == LT:
+                    registers[a] = registers[b] < registers[c]
+                elif opcode == LTK:
+                    registers[a] = registers[b] < c
+                elif opcode == JZ:
+                    if not registers[a]:
+                        pc = b
+                elif opcode == JNZ:
+                    if registers[a]:
+                        pc = b
+                elif opcode == CHECK:
+                    if registers[a] is unset:
+                        raise KeyError(self.variable_names[a])
+                elif opcode == HALT:
+                    # HALT is not an executed instruction.
+                    pc -= 1
+                    instruction_count -= 1
+                    break
+
+        finally:
+            self.program_counter = pc
+            self.instruction_count = instruction_count
+
+    def _decode(self) -> list:
+        """
+        Decode the instructions into a table of (`opcode`, `a`, `b`, `c`)
+        tuples, padded with `None`.
+
+        Returns
+        -------
+        : list of tuples
+            The decoded program.
+        """
+
+        return [
+            (self.opcodes[instruction], *operands, *[None] * (3 - len(operands)))
+            for instruction, *operands in self.code_collection
+        ]
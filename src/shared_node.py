@@ -0,0 +1,296 @@
+"""Implement Nodes that can be shared by several parents in the AST."""
+
+from typing import Union
+
+
+class SharedNode:
+    """
+    Implement a Node for a hash-consed AST.
+
+    Unlike `Node`, whose children are linked to each other, a SharedNode
+    holds its children in a list, so the same SharedNode may be a child of
+    several parents -- the tree becomes a directed acyclic graph. See
+    `AbstractSyntaxTree(..., hash_consing=True)`.
+
+    Parameters
+    ----------
+    id : int
+        The ID of the Node.
+    kind : str
+        The Node kind.
+    value : int or None, optional (default = None)
+        The value the Node holds, if any. Defaults to None.
+    """
+
+    __slots__ = (
+        "id",
+        "kind",
+        "value",
+        "parent",
+        "children",
+        "position_in_tree",
+        "structural_hash"
+    )
+
+    def __init__(self, id: int, kind: str, value: Union[int, None] = None) -> None:
+        self.id: int = id
+        self.kind: str = kind
+        self.value: Union[int, None] = value
+        self.parent: Union[SharedNode, None] = None
+        self.children: list[SharedNode] = []
+        self.position_in_tree: Union[int, None] = None
+
+        # Only set for interned Nodes. See `intern`.
+        self.structural_hash: Union[int, None] = None
+
+    def __eq__(self, other: "SharedNode") -> bool:
+        """
+        Implement the equality comparison between Nodes.
+
+        As in `Node`, this method ignores the `parent` and `children`. To
+        compare whole subtrees, see `is_same_subtree`.
+
+        Parameters
+        ----------
+        other : SharedNode or Node
+            The right hand side Node of the comparison.
+
+        Returns
+        -------
+        is_equal : bool
+            `True` if all the attributes are equal, `False` otherwise.
+        """
+
+        is_equal = (
+            self.id == other.id
+            and self.kind == other.kind
+            and self.value == other.value
+        )
+
+        return is_equal
+
+    def __str__(self) -> str:
+        """
+        Implement a string representation of a SharedNode object.
+
+        The representation is the same as the one of `Node`.
+
+        Returns
+        -------
+        _str : str
+            The string representation of the Node.
+        """
+
+        _str = f"ID: {self.id}, Kind: {self.kind}, Value: {self.value}"
+
+        if self.parent:
+            _str += f", Parent ID: {self.parent.id}"
+
+        if self.position_in_tree is not None:
+            _str += f", Position in Tree: {self.position_in_tree}"
+
+        return _str
+
+    @property
+    def is_interned(self) -> bool:
+        """
+        Check whether the Node is the interned representative of its subtree.
+
+        Returns
+        -------
+        : bool
+            The verdict.
+        """
+
+        return self.structural_hash is not None
+
+    def is_same_subtree(self, other: "SharedNode") -> bool:
+        """
+        Check whether two interned Nodes represent the same subtree.
+
+        Identical subtrees are interned only once, so this takes constant
+        time.
+
+        Parameters
+        ----------
+        other : SharedNode
+            The Node to compare to.
+
+        Returns
+        -------
+        : bool
+            The verdict.
+        """
+
+        return self is other
+
+    def set_position_in_tree(self, position_in_tree: int) -> None:
+        """
+        Set the `position_in_tree` of the Node.
+
+        Parameters
+        ----------
+        position_in_tree : int
+            The new `position_in_tree` to set.
+        """
+
+        self.position_in_tree = position_in_tree
+
+    def set_kind(self, kind: str) -> None:
+        """
+        Set the `kind` of the Node.
+
+        Parameters
+        ----------
+        kind : str
+            The new `kind` to set.
+        """
+
+        self.kind = kind
+
+    def get_kind(self) -> str:
+        """
+        Get the `kind` of the Node.
+
+        Returns
+        -------
+        kind : str
+            The `kind` of this node.
+        """
+
+        return self.kind
+
+    def add_child(self, child: "SharedNode") -> None:
+        """
+        Add a Node to the `self.children` list.
+
+        Parameters
+        ----------
+        child : SharedNode
+            The Node to be added.
+        """
+
+        self.children.append(child)
+
+    def add_parent(self, parent: "SharedNode") -> None:
+        """
+        Set a Node as this object's parent.
+
+        A shared Node keeps the first parent it was added to.
+
+        Parameters
+        ----------
+        parent : SharedNode
+            A Node object to be set as the parent of `this`.
+        """
+
+        if self.parent is None:
+            self.parent = parent
+
+
+class NodeTable:
+    """
+    Table of interned `SharedNode` objects.
+
+    Pure expressions -- variables, constants and `ADD`, `SUB` and `LT` Nodes
+    whose operands are pure -- are interned: the table keeps a single Node for
+    each distinct subtree, keyed by its kind, its value and its (interned)
+    children.
+    """
+
+    leaf_kinds = ["VAR", "CST"]
+
+    pure_kinds = [*leaf_kinds, "ADD", "SUB", "LT"]
+
+    def __init__(self) -> None:
+        self.nodes: dict = {}
+
+    def __len__(self) -> int:
+        """
+        Get the number of interned Nodes.
+
+        Returns
+        -------
+        : int
+            The number of interned Nodes.
+        """
+
+        return len(self.nodes)
+
+    def lookup(
+        self, kind: str, value: Union[int, str, None] = None
+    ) -> Union[SharedNode, None]:
+        """
+        Get the interned leaf Node with the given `kind` and `value`, if any.
+
+        Parameters
+        ----------
+        kind : str
+            The Node kind.
+        value : int, str or None, optional (default = None)
+            The value the Node holds, if any.
+
+        Returns
+        -------
+        : SharedNode or None
+            The interned Node, or `None` if there is none yet.
+        """
+
+        return self.nodes.get(self._key(kind, value, []))
+
+    def intern(self, node: SharedNode) -> SharedNode:
+        """
+        Intern a Node, once all its children are set.
+
+        Parameters
+        ----------
+        node : SharedNode
+            The Node to intern.
+
+        Returns
+        -------
+        : SharedNode
+            The interned Node that represents the same subtree as `node`:
+            either `node` itself or an equivalent one, interned earlier. If
+            `node` is not a pure expression, it is returned as is.
+        """
+
+        if node.kind not in self.pure_kinds or not all(
+            child.is_interned for child in node.children
+        ):
+            return node
+
+        key = self._key(node.kind, node.value, node.children)
+        interned_node = self.nodes.get(key)
+
+        if interned_node is None:
+            node.structural_hash = hash((
+                key[:3], *(child.structural_hash for child in node.children)
+            ))
+            self.nodes[key] = interned_node = node
+
+        return interned_node
+
+    @staticmethod
+    def _key(
+        kind: str, value: Union[int, str, None], children: list
+    ) -> tuple:
+        """
+        Build the key of a subtree in the table.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of the root of the subtree.
+        value : int, str or None
+            The value of the root of the subtree.
+        children : list of SharedNode
+            The interned children of the root of the subtree.
+
+        Returns
+        -------
+        : tuple
+            The key. The type of the value is part of it, as `True == 1`.
+        """
+
+        return (kind, type(value), value, *(child.id for child in children))
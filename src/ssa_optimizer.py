@@ -0,0 +1,653 @@
+"""Implement optimizations over the static single assignment form of a CFG."""
+
+import operator
+from itertools import count
+from typing import Union
+
+from src.control_flow_graph import BasicBlock, ControlFlowGraph
+from src.node import Node
+
+
+class SSAOptimizer:
+    """
+    Optimization pass that rewrites a `ControlFlowGraph` in place, with the
+    help of its Static Single Assignment (SSA) form.
+
+    In SSA form, each assignment of a variable defines a new version of it,
+    and each read of a variable reads a single version: the one set by the
+    assignment that reaches it, or by a phi function at the start of the
+    block where several of them meet. The form is kept beside the CFG, as
+    the version of each `VAR` and `SET` Node, and it is used to:
+
+    * propagate constants along the paths that may run (i.e., Sparse
+      Conditional Constant Propagation, SCCP), which removes the branches
+      that never run and folds the operations whose value is a constant --
+      e.g., `b = a + 1` after `a = 1`, on every path that reaches it;
+    * number the values of the operations (i.e., Global Value Numbering,
+      GVN), so an operation that computes the same value as another one that
+      always runs before it -- e.g., `i - j` in the body of the GCD loop and
+      in its condition -- reads it back from a hidden temporary variable
+      instead of computing it again.
+
+    Reads of variables are only ever replaced with constants and hidden
+    temporaries, so the versions of a variable never live at the same time,
+    and leaving the SSA form takes no copies: each variable keeps its slot.
+    A rewrite is kept only if it shortens the code of the statements it
+    touches, as generated by the `CodeGenerator` (e.g., folding `x = x + 1`
+    would lose its `INC` instruction).
+
+    The hidden temporaries are named `$0`, `$1`, and so on, which no Tiny-C
+    variable can be. The `VirtualMachine` holds them in slots after the ones
+    of the variables, so they are not part of its `variables`.
+
+    Parameters
+    ----------
+    superinstructions : bool, optional (default = False)
+        Whether the code is generated with fused instructions (see
+        `CodeGenerator`), which changes the size of the code.
+    """
+
+    # The operations on two values, as computed by the virtual machine.
+    operations = {"ADD": operator.add, "SUB": operator.sub, "LT": operator.lt}
+
+    # The values of the SCCP lattice, besides the constants, which are held
+    # as (`type`, `value`) pairs so `True` and `1` are told apart. `top` is a
+    # value not known yet, `bottom` one that is not a constant, and `unset`
+    # the value of a variable that is not set (reading it raises).
+    top = object()
+    bottom = object()
+    unset = object()
+
+    def __init__(self, superinstructions: bool = False) -> None:
+        self.superinstructions: bool = superinstructions
+        self.temporaries: list = []
+        self.removed_branch_count: int = 0
+        self.folded_count: int = 0
+        self.reused_count: int = 0
+
+        # The SSA form, set by `_build_ssa_form`: the versions read by the
+        # `VAR` Nodes and set by the `SET` Nodes (by `id`), the phi functions
+        # of each block (by variable), the versions each phi function picks
+        # from (one per incoming edge), and the versions at the entry.
+        self.uses: dict = {}
+        self.definitions: dict = {}
+        self.phis: dict = {}
+        self.phi_operands: dict = {}
+        self.entry_versions: dict = {}
+        self.version_count: int = 0
+
+    def optimize(self, cfg: ControlFlowGraph) -> None:
+        """
+        Optimize the CFG of a program, in place.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG, as built by `ControlFlowGraph.build`.
+        """
+
+        cfg.compute_dominators()
+        self._build_ssa_form(cfg)
+        self._propagate_constants(cfg)
+
+        # Removed branches may change the dominators.
+        cfg.compute_dominators()
+        self._number_values(cfg)
+
+    def _build_ssa_form(self, cfg: ControlFlowGraph) -> None:
+        """
+        Compute the versions of the variables.
+
+        The phi functions are placed in the iterated dominance frontier of
+        the blocks that set each variable, and the versions are then renamed
+        along the dominator tree, in preorder.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG, with its dominators computed.
+        """
+
+        self.uses, self.definitions = {}, {}
+        self.phis = {block: {} for block in cfg.blocks}
+        self.phi_operands, self.entry_versions = {}, {}
+        self.version_count = 0
+
+        defining_blocks = {}
+
+        for block in cfg.blocks:
+            for node in block.get_nodes():
+                if node.kind == "VAR":
+                    variable = node.value
+                elif node.kind == "SET":
+                    variable = node.children[0].value
+                    defining_blocks.setdefault(variable, []).append(block)
+                else:
+                    continue
+
+                if variable not in self.entry_versions:
+                    self.entry_versions[variable] = self._new_version()
+
+        for variable, blocks in defining_blocks.items():
+            pending_blocks = list(blocks)
+
+            while pending_blocks:
+                block = pending_blocks.pop()
+
+                for frontier_block in block.dominance_frontier:
+                    if variable not in self.phis[frontier_block]:
+                        version = self._new_version()
+                        self.phis[frontier_block][variable] = version
+                        self.phi_operands[version] = []
+                        pending_blocks.append(frontier_block)
+
+        dominator_tree = cfg.dominator_tree()
+        pending_blocks = [(cfg.entry, self.entry_versions)]
+
+        while pending_blocks:
+            block, versions = pending_blocks.pop()
+            versions = {**versions, **self.phis[block]}
+
+            for node in block.get_nodes():
+                if node.kind == "VAR":
+                    self.uses[id(node)] = versions[node.value]
+                elif node.kind == "SET":
+                    version = self._new_version()
+                    self.definitions[id(node)] = version
+                    versions[node.children[0].value] = version
+
+            for successor in block.successors:
+                for variable, version in self.phis[successor].items():
+                    self.phi_operands[version].append((block, versions[variable]))
+
+            for child in reversed(dominator_tree[block]):
+                pending_blocks.append((child, versions))
+
+    def _propagate_constants(self, cfg: ControlFlowGraph) -> None:
+        """
+        Run the SCCP over the CFG, and rewrite it with its results.
+
+        Versions start as `top`, and blocks as not executable, except for the
+        `entry`. The executable blocks are evaluated over and over, in
+        reverse postorder, lowering the values of the versions they set and
+        marking the successors their terminators may branch to, until nothing
+        changes. Phi functions only take the versions that flow through the
+        edges marked so far.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG, in SSA form.
+        """
+
+        values = {version: self.unset for version in self.entry_versions.values()}
+        node_values = {}
+        executable_blocks = {cfg.entry}
+        executable_edges = set()
+        order = cfg.reverse_postorder()
+
+        is_changed = True
+
+        while is_changed:
+            is_changed = False
+
+            for block in order:
+                if block not in executable_blocks:
+                    continue
+
+                for version in self.phis[block].values():
+                    value = self.top
+
+                    for predecessor, operand in self.phi_operands[version]:
+                        if (predecessor, block) in executable_edges:
+                            value = self._meet(
+                                value, values.get(operand, self.top)
+                            )
+
+                    is_changed |= self._lower(values, version, value)
+
+                for node in block.get_nodes():
+                    value = self._evaluate(node, values, node_values)
+                    node_values[id(node)] = value
+
+                    if node.kind == "SET":
+                        is_changed |= self._lower(
+                            values, self.definitions[id(node)], value
+                        )
+
+                for successor in self._get_targets(block, node_values):
+                    if (block, successor) not in executable_edges:
+                        executable_edges.add((block, successor))
+                        executable_blocks.add(successor)
+                        is_changed = True
+
+        for block in cfg.blocks:
+            if block not in executable_blocks or block.terminator != "branch":
+                continue
+
+            targets = self._get_targets(block, node_values)
+
+            if len(targets) != 1:
+                continue
+
+            for successor in block.successors:
+                if successor is not targets[0]:
+                    successor.predecessors.remove(block)
+
+            # The condition still runs, for its assignments.
+            if ControlFlowGraph.get_assignments(block.condition):
+                statement = Node(id=block.condition.id, kind="EXPR")
+                statement.add_child(block.condition)
+                block.statements.append(statement)
+
+            block.condition = None
+            block.successors = targets
+            self.removed_branch_count += 1
+
+        cfg.remove_unreachable_blocks()
+
+        for block in cfg.blocks:
+            for position in block.positions:
+                self._fold(block, position, node_values)
+
+            block.statements = [
+                statement
+                for statement in block.statements
+                if statement.children[0].kind != "CST"
+            ]
+
+    def _fold(
+        self, block: BasicBlock, position: Union[int, None], node_values: dict
+    ) -> None:
+        """
+        Replace the operations of a statement (or condition) whose value is a
+        constant with the constant, if it shortens its code.
+
+        Operations with assignments are kept, and so are the reads of single
+        variables, which are as short as a constant.
+
+        Parameters
+        ----------
+        block : BasicBlock
+            The block of the statement.
+        position : int or None
+            The index of the statement, or `None` for the condition.
+        node_values : dict
+            The values of the Nodes, as computed by the SCCP.
+        """
+
+        tree = block.get_tree(position)
+        assignments = ControlFlowGraph.get_assignments(tree)
+
+        replacements = []
+        pending_nodes = [tree]
+
+        while pending_nodes:
+            node = pending_nodes.pop()
+            value = node_values.get(id(node), self.bottom)
+
+            is_constant = (
+                node.kind in self.operations
+                and id(node) not in assignments
+                and value not in [self.top, self.bottom]
+            )
+
+            if is_constant:
+                constant = Node(id=node.id, kind="CST", value=value[1])
+                replacements.append((node, constant))
+            else:
+                pending_nodes.extend(ControlFlowGraph.get_operands(node))
+
+        if self._rewrite(block, position, replacements):
+            self.folded_count += len(replacements)
+
+    def _number_values(self, cfg: ControlFlowGraph) -> None:
+        """
+        Run the GVN over the CFG, and reuse the values it finds twice.
+
+        Constants and operations are numbered by their kind and the numbers
+        of their operands (in any order, for `ADD`), and variables by the
+        number of the version they read. Blocks are visited along the
+        dominator tree, in preorder, so the operations computed so far are
+        the ones that dominate the block. An operation without assignments
+        whose number was computed so far is redundant: the first operation
+        with its number is stored in a hidden temporary, which it reads
+        instead.
+
+        Parameters
+        ----------
+        cfg : ControlFlowGraph
+            The CFG, in SSA form, with its dominators computed.
+        """
+
+        new_numbers = count()
+        version_numbers = {}
+        expression_numbers = {}
+
+        # Versions that come from outside the blocks get numbers of their own.
+        for version in [*self.entry_versions.values(), *self.phi_operands]:
+            version_numbers[version] = next(new_numbers)
+
+        def _get_number(key: tuple) -> int:
+            if key not in expression_numbers:
+                expression_numbers[key] = next(new_numbers)
+
+            return expression_numbers[key]
+
+        numbers = {}
+
+        # Maps each number to the first operation that computed it, and the
+        # `id` of each such operation to the operations that compute it again.
+        available = {}
+        redundancies = {}
+
+        dominator_tree = cfg.dominator_tree()
+        pending_blocks = [(cfg.entry, None)]
+
+        while pending_blocks:
+            block, computed_numbers = pending_blocks.pop()
+
+            # Leaving the block: its operations don't dominate the next ones.
+            if computed_numbers is not None:
+                for number in computed_numbers:
+                    del available[number]
+                continue
+
+            computed_numbers = []
+            pending_blocks.append((block, computed_numbers))
+
+            for position in block.positions:
+                tree = block.get_tree(position)
+
+                for node in ControlFlowGraph.get_evaluation_order(tree):
+                    if node.kind == "VAR":
+                        numbers[id(node)] = version_numbers[self.uses[id(node)]]
+                    elif node.kind == "SET":
+                        number = numbers[id(node.children[1])]
+                        version_numbers[self.definitions[id(node)]] = number
+                        numbers[id(node)] = number
+                    elif node.kind == "CST":
+                        numbers[id(node)] = _get_number(
+                            ("CST", type(node.value), node.value)
+                        )
+                    elif node.kind in self.operations:
+                        operands = [numbers[id(child)] for child in node.children]
+
+                        if node.kind == "ADD":
+                            operands.sort()
+
+                        numbers[id(node)] = _get_number((node.kind, *operands))
+
+                assignments = ControlFlowGraph.get_assignments(tree)
+                pending_nodes = [(tree, False)]
+
+                while pending_nodes:
+                    node, is_evaluated = pending_nodes.pop()
+
+                    if node.kind not in self.operations:
+                        pending_nodes.extend(
+                            (operand, False)
+                            for operand in reversed(ControlFlowGraph.get_operands(node))
+                        )
+                        continue
+
+                    number = numbers[id(node)]
+
+                    if is_evaluated:
+                        if number not in available:
+                            available[number] = (node, block, position)
+                            computed_numbers.append(number)
+
+                    elif number in available and id(node) not in assignments:
+                        first_node = available[number][0]
+                        redundancies.setdefault(
+                            id(first_node), (available[number], [])
+                        )[1].append((node, block, position))
+
+                    else:
+                        pending_nodes.append((node, True))
+                        pending_nodes.extend(
+                            (operand, False)
+                            for operand in reversed(node.children)
+                        )
+
+            for child in reversed(dominator_tree[block]):
+                pending_blocks.append((child, None))
+
+        for first, redundant in redundancies.values():
+            self._reuse_value(first, redundant)
+
+    def _reuse_value(self, first: tuple, redundant: list) -> None:
+        """
+        Store the value of an operation in a hidden temporary, and read it
+        instead of computing it again, if it shortens the code.
+
+        Parameters
+        ----------
+        first : tuple
+            The operation that computes the value first, with its block and
+            position (see `BasicBlock.get_tree`).
+        redundant : list of tuples
+            The operations that compute it again, with their blocks and
+            positions.
+        """
+
+        node, block, position = first
+        temporary = f"${len(self.temporaries)}"
+
+        locations = [(block, position)] + [
+            (redundant_block, redundant_position)
+            for _, redundant_block, redundant_position in redundant
+        ]
+        locations = list(dict.fromkeys(locations))
+
+        size = sum(
+            location_block.get_size(location_position, self.superinstructions)
+            for location_block, location_position in locations
+        )
+
+        set_node = Node(id=node.id, kind="SET")
+        block.replace(position, node, set_node)
+        set_node.add_child(Node(id=node.id, kind="VAR", value=temporary))
+        set_node.add_child(node)
+
+        replacements = []
+
+        for redundant_node, redundant_block, redundant_position in redundant:
+            variable = Node(id=redundant_node.id, kind="VAR", value=temporary)
+            redundant_block.replace(redundant_position, redundant_node, variable)
+            replacements.append(
+                (redundant_block, redundant_position, variable, redundant_node)
+            )
+
+        if sum(
+            location_block.get_size(location_position, self.superinstructions)
+            for location_block, location_position in locations
+        ) < size:
+            self.temporaries.append(temporary)
+            self.reused_count += len(redundant)
+            return
+
+        for redundant_block, *replacement in reversed(replacements):
+            redundant_block.replace(*replacement)
+
+        block.replace(position, set_node, node)
+
+    def _rewrite(
+        self, block: BasicBlock, position: Union[int, None], replacements: list
+    ) -> bool:
+        """
+        Replace Nodes of a statement (or condition), if it shortens its code.
+
+        Parameters
+        ----------
+        block : BasicBlock
+            The block of the statement.
+        position : int or None
+            The index of the statement, or `None` for the condition.
+        replacements : list of tuples
+            The Nodes to replace, and their replacements.
+
+        Returns
+        -------
+        : bool
+            Whether the Nodes were replaced.
+        """
+
+        if not replacements:
+            return False
+
+        size = block.get_size(position, self.superinstructions)
+
+        for node, new_node in replacements:
+            block.replace(position, node, new_node)
+
+        if block.get_size(position, self.superinstructions) < size:
+            return True
+
+        for node, new_node in reversed(replacements):
+            block.replace(position, new_node, node)
+
+        return False
+
+    def _evaluate(self, node: Node, values: dict, node_values: dict) -> object:
+        """
+        Get the SCCP lattice value of a Node, from its operands'.
+
+        Parameters
+        ----------
+        node : Node
+            The Node.
+        values : dict
+            The values of the versions.
+        node_values : dict
+            The values of the Nodes evaluated before, by `id`.
+
+        Returns
+        -------
+        : object
+            The value.
+        """
+
+        if node.kind == "CST":
+            return (type(node.value), node.value)
+
+        if node.kind == "VAR":
+            value = values.get(self.uses[id(node)], self.top)
+
+            # Reading an unset variable raises, so it has no value.
+            return self.bottom if value is self.unset else value
+
+        if node.kind == "SET":
+            return node_values[id(node.children[1])]
+
+        if node.kind not in self.operations:
+            return self.bottom
+
+        lhs, rhs = (node_values[id(child)] for child in node.children)
+
+        if self.bottom in [lhs, rhs]:
+            return self.bottom
+
+        if self.top in [lhs, rhs]:
+            return self.top
+
+        value = self.operations[node.kind](lhs[1], rhs[1])
+
+        return (type(value), value)
+
+    def _get_targets(self, block: BasicBlock, node_values: dict) -> list:
+        """
+        Get the successors a block may branch to, as far as the SCCP knows.
+
+        Parameters
+        ----------
+        block : BasicBlock
+            The block.
+        node_values : dict
+            The values of the Nodes, by `id`.
+
+        Returns
+        -------
+        : list of BasicBlock
+            The successors.
+        """
+
+        if block.terminator != "branch":
+            return block.successors
+
+        value = node_values[id(block.condition)]
+
+        if value is self.top:
+            return []
+
+        if value is self.bottom:
+            return block.successors
+
+        return [block.successors[0 if value[1] else 1]]
+
+    def _meet(self, value: object, other_value: object) -> object:
+        """
+        Get the meet of two SCCP lattice values.
+
+        Parameters
+        ----------
+        value : object
+            A value.
+        other_value : object
+            Another value.
+
+        Returns
+        -------
+        : object
+            `other_value` if `value` is `top` (and vice versa), the value if
+            both are equal, and `bottom` otherwise.
+        """
+
+        if value is self.top:
+            return other_value
+
+        if other_value is self.top or other_value == value:
+            return value
+
+        return self.bottom
+
+    def _lower(self, values: dict, version: int, value: object) -> bool:
+        """
+        Lower the SCCP lattice value of a version to its meet with `value`.
+
+        Parameters
+        ----------
+        values : dict
+            The values of the versions.
+        version : int
+            The version.
+        value : object
+            The value.
+
+        Returns
+        -------
+        : bool
+            Whether the value of the version changed.
+        """
+
+        old_value = values.get(version, self.top)
+        new_value = self._meet(old_value, value)
+        values[version] = new_value
+
+        return new_value is not old_value and new_value != old_value
+
+    def _new_version(self) -> int:
+        """
+        Create a version of a variable.
+
+        Returns
+        -------
+        version : int
+            The version.
+        """
+
+        version = self.version_count
+        self.version_count += 1
+
+        return version
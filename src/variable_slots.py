@@ -0,0 +1,79 @@
+"""Implement the dict view of the variables held in integer slots."""
+
+from collections.abc import MutableMapping
+from typing import Iterator
+
+from src.code_generator import CodeGenerator
+
+
+class VariableSlots(MutableMapping):
+    """
+    Dict view of the variables of a virtual machine, held in a list of slots.
+
+    Each variable has a fixed slot (see `CodeGenerator.variable_slots`), so
+    the virtual machines read and write them by indexing a list instead of
+    hashing their names. The slots of the variables that are not set hold
+    `unset`. This view translates between names and slots, and is meant for
+    the cold paths only: setting variables before running a program, and
+    inspecting them afterwards.
+
+    Parameters
+    ----------
+    slots : list
+        The slots of the virtual machine. Only the first 26 hold variables;
+        the rest (e.g., temporaries) are not part of the view.
+    """
+
+    # The value of the slots of the variables that are not set.
+    unset = object()
+
+    variable_slots = CodeGenerator.variable_slots
+
+    def __init__(self, slots: list) -> None:
+        self.slots: list = slots
+
+    @classmethod
+    def allocate(cls, size: int = len(variable_slots)) -> list:
+        """
+        Allocate a list of slots with no variable set.
+
+        Parameters
+        ----------
+        size : int, optional (default = 26)
+            The number of slots.
+
+        Returns
+        -------
+        : list
+            The slots.
+        """
+
+        return [cls.unset] * size
+
+    def __getitem__(self, variable: str) -> object:
+        value = self.slots[self.variable_slots[variable]]
+
+        if value is self.unset:
+            raise KeyError(variable)
+
+        return value
+
+    def __setitem__(self, variable: str, value: object) -> None:
+        self.slots[self.variable_slots[variable]] = value
+
+    def __delitem__(self, variable: str) -> None:
+        # Raise a `KeyError` if the variable is not set.
+        self[variable]
+
+        self.slots[self.variable_slots[variable]] = self.unset
+
+    def __iter__(self) -> Iterator[str]:
+        for variable, value in zip(self.variable_slots, self.slots):
+            if value is not self.unset:
+                yield variable
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
@@ -1,6 +1,12 @@
 """Implement a virtual machine that computes generated code."""
 
-from src.node import Node
+from typing import Union
+
+from src.affine_loop_accelerator import AffineLoopAccelerator
+from src.bytecode import Bytecode
+from src.code_generator import CodeGenerator
+from src.loop_compiler import LoopCompiler
+from src.variable_slots import VariableSlots
 
 
 class VirtualMachine:
@@ -9,77 +15,451 @@ class VirtualMachine:
 
     Parameters
     ----------
-    code_collection : list
-        List of tuples generated by the `CodeGenerator`.
+    code_collection : list or Bytecode
+        The executable image to run. A list of tuples generated by the
+        `CodeGenerator` is assembled into a `Bytecode` image.
+    stack_size : int, optional (default = 1000)
+        The size of the stack.
+    hot_loop_threshold : int or None, optional (default = 100)
+        How many times a loop must jump back to its header before `run`
+        compiles it into a Python function and switches to it. If `None`,
+        loops are always interpreted.
+
+    Attributes
+    ----------
+    variable_slots : dict
+        The slot of each variable of the image: the fixed one of each Tiny-C
+        variable (see `CodeGenerator.variable_slots`), and the ones after
+        them for hidden temporaries (see `SSAOptimizer`).
+    slots : list
+        The values of the variables, indexed by their slot, or
+        `VariableSlots.unset`.
+    variables : VariableSlots
+        Dict view of the `slots`, keyed by the name of the variables.
     """
 
-    def __init__(self, code_collection: list, stack_size: int = 1000) -> None:
+    def __init__(
+        self,
+        code_collection: Union[list, Bytecode],
+        stack_size: int = 1000,
+        hot_loop_threshold: Union[int, None] = 100
+    ) -> None:
+
+        if not isinstance(code_collection, Bytecode):
+            code_collection = Bytecode.assemble(code_collection)
 
-        self.variables = {}
+        self.variable_slots = dict(CodeGenerator.variable_slots)
+
+        for variable in code_collection.variables:
+            if variable not in self.variable_slots:
+                self.variable_slots[variable] = len(self.variable_slots)
+
+        self.slots = VariableSlots.allocate(len(self.variable_slots))
+        self.variables = VariableSlots(self.slots)
         self.stack = [None for _ in range(0, stack_size)]
-        self.code_collection = code_collection
+        self.bytecode = code_collection
         self.stack_pointer = 0
         self.program_counter = 0
+        self.instruction_count = 0
+        self.hot_loop_threshold = hot_loop_threshold
+
+        # Maps the header of each loop to how many times it was jumped back
+        # to, and to its compiled version (or `None`, if it can't be compiled)
+        self.loop_counters: dict = {}
+        self.compiled_loops: dict = {}
+
+        self._program, self._addresses = self._decode()
 
     def run(self) -> None:
-        """Run the program on the virtual machine."""
+        """
+        Run the program on the virtual machine.
+
+        The image is decoded beforehand into a table of (`opcode`, `operand`)
+        pairs, with operands already resolved to variable slots, constants
+        and instruction indexes. The instructions are then dispatched by
+        comparing integer opcodes in a single loop, with the top of the stack
+        and the stack pointer cached in local variables. No method is called
+        per instruction.
+
+        Backward jumps are counted per loop header. Once a loop is hot (see
+        `hot_loop_threshold`), it is compiled and the execution is transferred
+        to it at its header, with the current variables. When the compiled
+        loop exits, the interpretation resumes after it. Loops of affine
+        updates skip their iterations altogether (see
+        `AffineLoopAccelerator`).
+        """
+
+        program, addresses = self._program, self._addresses
+        indexes = {address: index for index, address in enumerate(addresses)}
+
+        opcodes = Bytecode.opcodes
+        IFETCH = opcodes["IFETCH"]
+        ISTORE = opcodes["ISTORE"]
+        IPUSH = opcodes["IPUSH"]
+        IPOP = opcodes["IPOP"]
+        IADD = opcodes["IADD"]
+        ISUB = opcodes["ISUB"]
+        ILT = opcodes["ILT"]
+        JMP = opcodes["JMP"]
+        JZ = opcodes["JZ"]
+        JNZ = opcodes["JNZ"]
+        HALT = opcodes["HALT"]
+        INC = opcodes["INC"]
+        JGE = opcodes["JGE"]
+        SUBVV = opcodes["SUBVV"]
+        JLT = opcodes["JLT"]
+
+        slots = self.slots
+        unset = VariableSlots.unset
+        names = list(self.variable_slots)
+        stack = self.stack
+
+        # The top of the stack lives in `tos`, and `stack` holds the elements
+        # below it. Spilling an empty `tos` writes to `stack[-1]`, which is
+        # harmless: that slot is only read after being spilled to again.
+        sp = self.stack_pointer
+        tos = stack[sp - 1] if sp > 0 else None
+        pc = indexes[self.program_counter]
+        instruction_count = self.instruction_count
+
+        # An unreachable threshold disables the tiered execution.
+        threshold = self.hot_loop_threshold
+        if threshold is None:
+            threshold = float("inf")
+
+        loop_counters = self.loop_counters
+
+        try:
+            while True:
+                opcode, operand = program[pc]
+                pc += 1
+                instruction_count += 1
+
+                if opcode == IFETCH:
+                    value = slots[operand]
+                    if value is unset:
+                        raise KeyError(names[operand])
+                    stack[sp - 1] = tos
+                    tos = value
+                    sp += 1
+                elif opcode == IPUSH:
+                    stack[sp - 1] = tos
+                    tos = operand
+                    sp += 1
+                elif opcode == ISTORE:
+                    slots[operand] = tos
+                elif opcode == IPOP:
+                    sp -= 1
+                    tos = stack[sp - 1]
+                elif opcode == INC:
+                    slot, constant = operand
+                    value = slots[slot]
+                    if value is unset:
+                        raise KeyError(names[slot])
+                    slots[slot] = value + constant
+                elif opcode == JGE:
+                    lhs, rhs, target = operand
+                    lhs, rhs = slots[lhs], slots[rhs]
+                    if lhs is unset or rhs is unset:
+                        raise KeyError(
+                            names[operand[0] if lhs is unset else operand[1]]
+                        )
+                    if not lhs < rhs:
+                        pc = target
+                elif opcode == IADD:
+                    sp -= 1
+                    tos = stack[sp - 1] + tos
+                elif opcode == SUBVV:
+                    lhs, rhs = slots[operand[0]], slots[operand[1]]
+                    if lhs is unset or rhs is unset:
+                        raise KeyError(
+                            names[operand[0] if lhs is unset else operand[1]]
+                        )
+                    stack[sp - 1] = tos
+                    tos = lhs - rhs
+                    sp += 1
+                elif opcode == ISUB:
+                    sp -= 1
+                    tos = stack[sp - 1] - tos
+                elif opcode == ILT:
+                    sp -= 1
+                    tos = stack[sp - 1] < tos
+                elif opcode == JZ:
+                    sp -= 1
+                    if not tos:
+                        pc = operand
+                    tos = stack[sp - 1]
+                elif opcode == JNZ:
+                    sp -= 1
+                    taken = tos
+                    tos = stack[sp - 1]
+                    if taken:
+                        if operand < pc:
+                            hits = loop_counters[operand] = (
+                                loop_counters.get(operand, 0) + 1
+                            )
+                            if hits >= threshold:
+                                pc, instruction_count = self._run_hot_loop(
+                                    operand, pc - 1, instruction_count
+                                )
+                                continue
+                        pc = operand
+                elif opcode == JLT:
+                    lhs, rhs, target = operand
+                    lhs, rhs = slots[lhs], slots[rhs]
+                    if lhs is unset or rhs is unset:
+                        raise KeyError(
+                            names[operand[0] if lhs is unset else operand[1]]
+                        )
+                    if lhs < rhs:
+                        if target < pc:
+                            hits = loop_counters[target] = (
+                                loop_counters.get(target, 0) + 1
+                            )
+                            if hits >= threshold:
+                                pc, instruction_count = self._run_hot_loop(
+                                    target, pc - 1, instruction_count
+                                )
+                                continue
+                        pc = target
+                elif opcode == JMP:
+                    if operand < pc:
+                        hits = loop_counters[operand] = (
+                            loop_counters.get(operand, 0) + 1
+                        )
+                        if hits >= threshold:
+                            pc, instruction_count = self._run_hot_loop(
+                                operand, pc - 1, instruction_count
+                            )
+                            continue
+                    pc = operand
+                elif opcode == HALT:
+                    # HALT is not an executed instruction.
+                    pc -= 1
+                    instruction_count -= 1
+                    break
+
+        finally:
+            if sp > 0:
+                stack[sp - 1] = tos
+
+            self.stack_pointer = sp
+            self.program_counter = addresses[pc]
+            self.instruction_count = instruction_count
+
+    def _run_hot_loop(
+        self, header: int, back_jump: int, instruction_count: int
+    ) -> tuple[int, int]:
+        """
+        Run a hot loop in its compiled version, compiling it if needed.
+
+        The loop is compiled (and accelerated, if it is affine) the first
+        time it becomes hot. If it can't be compiled, or if it reads
+        variables that are not set yet, the interpretation simply continues
+        at its header.
+
+        Parameters
+        ----------
+        header : int
+            The index of the first instruction of the loop.
+        back_jump : int
+            The index of the backward jump that closes the loop.
+        instruction_count : int
+            The number of instructions executed so far.
+
+        Returns
+        -------
+        pc : int
+            The index of the instruction to resume the interpretation at.
+        instruction_count : int
+            The updated number of executed instructions.
+        """
+
+        if header not in self.compiled_loops:
+            loop_compiler = LoopCompiler(program=self._program)
+            compiled_loop = loop_compiler.compile(header, back_jump)
+
+            if compiled_loop is not None:
+                accelerator = AffineLoopAccelerator(program=self._program)
+                compiled_loop = accelerator.accelerate(
+                    header, back_jump, compiled_loop
+                )
+
+            self.compiled_loops[header] = compiled_loop
+
+        compiled_loop = self.compiled_loops[header]
+
+        if compiled_loop is None:
+            # Never count this loop again.
+            self.loop_counters[header] = float("-inf")
+            return header, instruction_count
+
+        if not compiled_loop.can_enter(self.slots):
+            self.loop_counters[header] = 0
+            return header, instruction_count
+
+        pc, executed = compiled_loop.function(self.slots)
+
+        return pc, instruction_count + executed
+
+    def step(self) -> bool:
+        """
+        Run a single instruction, dispatching it to its handler method.
+
+        This is slower than `run`, but useful to trace the execution of a
+        program instruction by instruction.
+
+        Returns
+        -------
+        : bool
+            `False` if the program has halted, `True` otherwise.
+        """
+
+        code = self.bytecode.code
+        opcode = code[self.program_counter]
+
+        instruction = Bytecode.instructions[opcode]
+
+        if instruction == "HALT":
+            return False
+
+        operand_count = len(Bytecode.operand_kinds.get(instruction, ()))
+
+        operands = code[
+            self.program_counter + 1:self.program_counter + 1 + operand_count
+        ]
+        self.program_counter += 1 + operand_count
+        self.instruction_count += 1
+
+        instruction_handler = getattr(self, instruction.lower())
+        instruction_handler(*operands)
+
+        return True
+
+    def _decode(self) -> tuple[list, list]:
+        """
+        Decode the image into a table indexed by instruction.
+
+        Returns
+        -------
+        program : list of tuples
+            The (`opcode`, `operand`) pairs. `IFETCH` and `ISTORE` operands
+            are resolved to variable slots, `IPUSH` operands to constants and
+            jump operands to indexes in `program`. Instructions with several
+            operands have a tuple of those.
+        addresses : list of int
+            The address of each instruction in the image, plus the address
+            right after the last one.
+        """
+
+        decoded_instructions = list(self.bytecode.decode())
+
+        addresses = [address for address, _, _ in decoded_instructions]
+        addresses.append(len(self.bytecode))
+
+        indexes = {address: index for index, address in enumerate(addresses)}
+
+        program = []
+
+        for _, instruction, operands in decoded_instructions:
+            operand = None
+
+            if operands:
+                operands = tuple(
+                    self.variable_slots[operand]
+                    if operand_kind == "variable"
+                    else operand
+                    for operand_kind, operand in zip(
+                        Bytecode.operand_kinds[instruction],
+                        self.bytecode.resolve(instruction, operands)
+                    )
+                )
 
-        while True:
-            instruction, node = self.code_collection[self.program_counter]
+                if instruction in CodeGenerator.jump_instructions:
+                    operands = (*operands[:-1], indexes[operands[-1]])
 
-            if instruction == "HALT":
-                break
+                operand = operands[0] if len(operands) == 1 else operands
 
-            instruction_handler = getattr(self, instruction.lower())
-            instruction_handler(node=node)
+            program.append((Bytecode.opcodes[instruction], operand))
 
-            self.program_counter += 1
+        return program, addresses
 
-    def ifetch(self, node: Node, **kwargs) -> None:
+    def _fetch(self, slot: int) -> object:
+        """
+        Get the value of a variable.
+
+        Parameters
+        ----------
+        slot : int
+            The slot of the variable in the variables table of the image.
+
+        Returns
+        -------
+        value : object
+            The value.
+
+        Raises
+        ------
+        KeyError
+            If the variable is not set.
+        """
+
+        variable = self.bytecode.variables[slot]
+        value = self.slots[self.variable_slots[variable]]
+
+        if value is VariableSlots.unset:
+            raise KeyError(variable)
+
+        return value
+
+    def ifetch(self, slot: int) -> None:
         """
         Fetch the contents of a variable and push it to the stack.
 
         Parameters
         ----------
-        node : Node
-            The node that references the variable to be fetched.
+        slot : int
+            The slot of the variable in the variables table of the image.
         """
 
-        self.stack[self.stack_pointer] = self.variables[node.value]
+        self.stack[self.stack_pointer] = self._fetch(slot)
         self.stack_pointer += 1
 
-    def istore(self, node: Node, **kwargs) -> None:
+    def istore(self, slot: int) -> None:
         """
         Store the (n-1)th element of the stack in a variable.
 
         Parameters
         ----------
-        node : Node
-            The node that references the variable to store in.
+        slot : int
+            The slot of the variable in the variables table of the image.
         """
 
-        self.variables[node.value] = self.stack[self.stack_pointer - 1]
+        variable = self.bytecode.variables[slot]
 
-    def ipush(self, node: Node, **kwargs) -> None:
+        self.slots[self.variable_slots[variable]] = (
+            self.stack[self.stack_pointer - 1]
+        )
+
+    def ipush(self, constant: int) -> None:
         """
-        Push the contents of a node to the top of the stack.
+        Push a constant to the top of the stack.
 
         Parameters
         ----------
-        node : Node
-            The node whose contents will be pushed to the top of the stack.
+        constant : int
+            The index of the constant in the constants table of the image.
         """
 
-        self.stack[self.stack_pointer] = node.value
+        self.stack[self.stack_pointer] = self.bytecode.constants[constant]
         self.stack_pointer += 1
 
-    def ipop(self, **kwargs) -> None:
+    def ipop(self) -> None:
         """Pop a value from the stack and discard it."""
 
-        self.stack[self.stack_pointer] = None
         self.stack_pointer -= 1
 
-    def iadd(self, **kwargs) -> None:
+    def iadd(self) -> None:
         """
         Add the contents of the (n-1)th and (n-2)th elements of the stack.
         """
@@ -87,7 +467,7 @@ class VirtualMachine:
         self.stack[self.stack_pointer - 2] += self.stack[self.stack_pointer - 1]
         self.stack_pointer -= 1
 
-    def isub(self, **kwargs) -> None:
+    def isub(self) -> None:
         """
         Subtract the contents of the (n-1)th and (n-2)th elements of the stack.
         """
@@ -95,7 +475,7 @@ class VirtualMachine:
         self.stack[self.stack_pointer - 2] -= self.stack[self.stack_pointer - 1]
         self.stack_pointer -= 1
 
-    def ilt(self, **kwargs) -> None:
+    def ilt(self) -> None:
         """
         Check whether the (n-2)th element of the stack is less than the (n-1)th.
         """
@@ -105,72 +485,126 @@ class VirtualMachine:
         )
         self.stack_pointer -= 1
 
-    def jmp(self, node: Node, **kwargs) -> None:
+    def jmp(self, target: int) -> None:
         """
-        Point the program counter to the instruction referenced by a node.
+        Point the program counter to the instruction at the `target` address.
 
         Parameters
         ----------
-        node : Node
-            The node of reference.
+        target : int
+            The address of the next instruction to run.
         """
 
-        initial_program_couter = self.program_counter
+        self.program_counter = target
 
-        # Look forward (i.e., after the current instruction)
-        for _, other_node in self.code_collection[initial_program_couter + 1:]:
-            if other_node == node:
-                return
+    def jz(self, target: int) -> None:
+        """
+        Pop the result of the parenthesis expression and jump if it is `False`.
 
-            self.program_counter += 1
-            
-        self.program_counter = 0
+        If it evaluates to `True`, then the next block of code is computed.
+
+        Parameters
+        ----------
+        target : int
+            The address to jump to.
+        """
 
-        # Look backwards (i.e., before the instruction that triggered this)
-        for _, other_node in self.code_collection[:initial_program_couter]:
-            if other_node == node:
-                # Offset the default PC incrementer, to avoid dealignment
-                self.program_counter -= 1
-                return
+        self.stack_pointer -= 1
 
-            self.program_counter += 1
+        if not self.stack[self.stack_pointer]:
+            self.jmp(target)
 
-    def jz(self, node: Node) -> None:
+    def jnz(self, target: int) -> None:
         """
-        Compute the next block of code if the parenthesis expression evaluates to `True`.
+        Pop the result of the parenthesis expression and jump if it is `True`.
 
-        If it is `False`, then jump to the node of reference (i.e., `node`).
+        If it evaluates to `False`, then the next block of code is computed.
 
         Parameters
         ----------
-        node : Node
-            The node of reference.
+        target : int
+            The address to jump to.
         """
 
-        if self.stack[self.stack_pointer - 1]:
-            return
-        else:
-            self.jmp(node)
+        self.stack_pointer -= 1
+
+        if self.stack[self.stack_pointer]:
+            self.jmp(target)
 
+    def inc(self, slot: int, constant: int) -> None:
+        """
+        Add a constant to a variable.
 
-    def jnz(self, node: Node) -> None:
+        Parameters
+        ----------
+        slot : int
+            The slot of the variable in the variables table of the image.
+        constant : int
+            The index of the constant in the constants table of the image.
         """
-        Compute the next block of code if the parenthesis expression evaluates to `False`.
 
-        If it is `True`, then jump to the node of reference (i.e., `node`).
+        variable = self.bytecode.variables[slot]
+
+        self.slots[self.variable_slots[variable]] = (
+            self._fetch(slot) + self.bytecode.constants[constant]
+        )
+
+    def subvv(self, lhs_slot: int, rhs_slot: int) -> None:
+        """
+        Subtract the contents of two variables and push the result to the stack.
+
+        Parameters
+        ----------
+        lhs_slot : int
+            The slot of the left hand side variable.
+        rhs_slot : int
+            The slot of the right hand side variable.
+        """
+
+        lhs, rhs = self._fetch(lhs_slot), self._fetch(rhs_slot)
+
+        self.stack[self.stack_pointer] = lhs - rhs
+        self.stack_pointer += 1
+
+    def jge(self, lhs_slot: int, rhs_slot: int, target: int) -> None:
+        """
+        Jump if the contents of a variable are not less than those of another.
 
         Parameters
         ----------
-        node : Node
-            The node of reference.
+        lhs_slot : int
+            The slot of the left hand side variable.
+        rhs_slot : int
+            The slot of the right hand side variable.
+        target : int
+            The address to jump to.
+        """
+
+        lhs, rhs = self._fetch(lhs_slot), self._fetch(rhs_slot)
+
+        if not lhs < rhs:
+            self.jmp(target)
+
+    def jlt(self, lhs_slot: int, rhs_slot: int, target: int) -> None:
         """
+        Jump if the contents of a variable are less than those of another.
+
+        Parameters
+        ----------
+        lhs_slot : int
+            The slot of the left hand side variable.
+        rhs_slot : int
+            The slot of the right hand side variable.
+        target : int
+            The address to jump to.
+        """
+
+        lhs, rhs = self._fetch(lhs_slot), self._fetch(rhs_slot)
 
-        if not self.stack[self.stack_pointer - 1]:
-            return
-        else:
-            self.jmp(node)
+        if lhs < rhs:
+            self.jmp(target)
 
-    def empty(self, **kwargs) -> None:
+    def empty(self) -> None:
         """
         Do nothing.
         
@@ -1,6 +1,8 @@
 """Integration test that checks if the control flow works correctly."""
 
-from src.interpreter import create_virtual_machine
+import pytest
+
+from src.interpreter import create_virtual_machine, engines
 
 
 SOURCE_CODE = """
@@ -16,23 +18,29 @@ SOURCE_CODE = """
 """
 
 
-def test_if():
+@pytest.mark.parametrize("engine", engines)
+def test_if(engine):
     """Test the `if` case."""
 
     placeholder = 1
 
-    vm = create_virtual_machine(SOURCE_CODE.format(**{"placeholder": placeholder}))
+    vm = create_virtual_machine(
+        SOURCE_CODE.format(**{"placeholder": placeholder}), engine=engine
+    )
     vm.run()
 
     assert vm.variables == {"i": placeholder, "x": 1}
 
 
-def test_else():
+@pytest.mark.parametrize("engine", engines)
+def test_else(engine):
     """Test the `else` case."""
 
     placeholder = 10
 
-    vm = create_virtual_machine(SOURCE_CODE.format(**{"placeholder": placeholder}))
+    vm = create_virtual_machine(
+        SOURCE_CODE.format(**{"placeholder": placeholder}), engine=engine
+    )
 
     vm.run()
 
@@ -1,9 +1,12 @@
 """Integration test for the `do/while` statement."""
 
-from src.interpreter import create_virtual_machine
+import pytest
 
+from src.interpreter import create_virtual_machine, engines
 
-def test_do_while():
+
+@pytest.mark.parametrize("engine", engines)
+def test_do_while(engine):
     """Test the `do_while` statement."""
 
     source_code = """
@@ -14,7 +17,7 @@ def test_do_while():
     }
     """
 
-    vm = create_virtual_machine(source_code)
+    vm = create_virtual_machine(source_code, engine=engine)
     vm.run()
 
     assert vm.variables == {"i": 51}
@@ -2,10 +2,13 @@
 Test if the language correctly computes the 10th element of the Fibonacci sequence.
 """
 
-from src.interpreter import create_virtual_machine
+import pytest
 
+from src.interpreter import create_virtual_machine, engines
 
-def test_fib():
+
+@pytest.mark.parametrize("engine", engines)
+def test_fib(engine):
     """
     Test the computation of the 10th element of the Fibonacci sequence.
 
@@ -26,7 +29,7 @@ def test_fib():
     }
     """
 
-    vm = create_virtual_machine(source_code)
+    vm = create_virtual_machine(source_code, engine=engine)
     vm.run()
 
     assert vm.variables['b'] == 55
@@ -1,9 +1,12 @@
 """Test if the language correctly computes the Greatest Common Divisor."""
 
-from src.interpreter import create_virtual_machine
+import pytest
 
+from src.interpreter import create_virtual_machine, engines
 
-def test_gcd():
+
+@pytest.mark.parametrize("engine", engines)
+def test_gcd(engine):
     """Test the computation of the GCD between 100 and 125."""
 
     source_code = """
@@ -21,7 +24,7 @@ def test_gcd():
     }
     """
 
-    vm = create_virtual_machine(source_code)
+    vm = create_virtual_machine(source_code, engine=engine)
     vm.run()
 
     assert vm.variables == {"i": 25, "j": 25}
@@ -1,9 +1,12 @@
 """Test if the language correctly assigns values to variables."""
 
-from src.interpreter import create_virtual_machine
+import pytest
 
+from src.interpreter import create_virtual_machine, engines
 
-def test_gcd():
+
+@pytest.mark.parametrize("engine", engines)
+def test_gcd(engine):
     """Test the assignement of multiple variables."""
 
     source_code = """
@@ -14,7 +17,7 @@ def test_gcd():
     }
     """
 
-    vm = create_virtual_machine(source_code)
+    vm = create_virtual_machine(source_code, engine=engine)
     vm.run()
 
     assert vm.variables == {"a": 1, "b": False, "c": False}
@@ -0,0 +1,30 @@
+"""Test if the language correctly computes nested `while` loops."""
+
+import pytest
+
+from src.interpreter import create_virtual_machine, engines
+
+
+@pytest.mark.parametrize("engine", engines)
+def test_nested_while(engine):
+    """Test the computation of a product through nested loops."""
+
+    source_code = """
+    {
+        i = 0;
+        p = 0;
+        while (i < 30) {
+            j = 0;
+            while (j < 40) {
+                p = p + 1;
+                j = j + 1;
+            }
+            i = i + 1;
+        }
+    }
+    """
+
+    vm = create_virtual_machine(source_code, engine=engine)
+    vm.run()
+
+    assert vm.variables == {"i": 30, "j": 40, "p": 1200}
@@ -0,0 +1,281 @@
+"""Integration test for programs run with the optimization passes."""
+
+import pytest
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.code_generator import CodeGenerator
+from src.interpreter import create_virtual_machine, engines
+from src.lexer import Lexer
+from src.virtual_machine import VirtualMachine
+
+
+@pytest.mark.parametrize("engine", engines)
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        """
+        {
+            i = 0;
+            s = 0;
+            while (i < 9 + 1) {
+                s = s + i + 1 + 1 - 2;
+                i = i + 1;
+            }
+            t = (s - s) + (1 < 2);
+        }
+        """,
+        "{ a = 1 < 2; b = a + 0; c = a - 0 + 1 - 1; d = (b < 3) - 0; }",
+        "{ a = 5; b = a + (a + 2) - (a - 2) + (2 - a); }"
+    ]
+)
+def test_constant_folding(engine, source_code):
+    """Test that folded programs compute the same values and types."""
+
+    vm = create_virtual_machine(source_code, engine=engine)
+    vm.run()
+
+    optimized_vm = create_virtual_machine(
+        source_code, engine=engine, optimize=True
+    )
+    optimized_vm.run()
+
+    assert optimized_vm.variables == vm.variables
+    assert [type(value) for value in optimized_vm.variables.values()] == [
+        type(value) for value in vm.variables.values()
+    ]
+
+
+@pytest.mark.parametrize("engine", engines)
+def test_constant_folding_unset_variable(engine):
+    """Test that reading an unset variable still raises."""
+
+    vm = create_virtual_machine("{ a = b - b; }", engine=engine, optimize=True)
+
+    with pytest.raises(KeyError):
+        vm.run()
+
+
+@pytest.mark.parametrize("engine", engines)
+def test_dead_code_elimination(engine):
+    """Test that programs without their dead code compute the same values."""
+
+    source_code = """
+    {
+        a = 1;
+        if (2 < 1) { a = 2; } else { ; }
+        while (1 - 1) a = a + 1;
+        do { b = a + 1; ; } while (0);
+        if (a) ; else c = 1;
+        if (1 < 2) d = b < 3;
+    }
+    """
+
+    vm = create_virtual_machine(source_code, engine=engine)
+    vm.run()
+
+    optimized_vm = create_virtual_machine(
+        source_code, engine=engine, optimize=True
+    )
+    optimized_vm.run()
+
+    assert optimized_vm.variables == vm.variables == {
+        "a": 1, "b": 2, "d": True
+    }
+
+
+def test_peephole_optimization():
+    """Test that programs with optimized code compute the same values."""
+
+    source_code = """
+    {
+        i = 0;
+        s = 0;
+        while (i < 10) {
+            if (i < 5) ; else { s = s + i; }
+            i = i + 1;
+        }
+        do { t = s; 1; } while (t < s);
+    }
+    """
+
+    vm = create_virtual_machine(source_code)
+    vm.hot_loop_threshold = None
+    vm.run()
+
+    optimized_vm = create_virtual_machine(source_code, optimize=True)
+    optimized_vm.hot_loop_threshold = None
+    optimized_vm.run()
+
+    assert optimized_vm.variables == vm.variables == {"i": 10, "s": 35, "t": 35}
+    assert optimized_vm.instruction_count < vm.instruction_count
+
+
+@pytest.mark.parametrize(
+    "source_code, iterations",
+    [
+        ("{ i = 0; n = 100; while (i < n) i = i + 1; }", 100),
+        ("{ i = 100; while (i) i = i - 1; }", 100),
+        ("{ i = 0; n = 0; while (i < n) i = i + 1; }", 0)
+    ]
+)
+def test_loop_inversion(source_code, iterations):
+    """Test that inverted loops run one jump less per iteration."""
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+    ast.build()
+
+    vms = []
+
+    for loop_inversion in [False, True]:
+        generator = CodeGenerator(
+            superinstructions=True, loop_inversion=loop_inversion
+        )
+        generator.generate_code(ast.root)
+
+        vm = VirtualMachine(
+            code_collection=generator.code_collection, hot_loop_threshold=None
+        )
+        vm.run()
+        vms.append(vm)
+
+    vm, inverted_vm = vms
+
+    assert inverted_vm.variables == vm.variables
+    assert vm.instruction_count - inverted_vm.instruction_count == iterations
+
+
+def test_ssa_optimization():
+    """Test that programs optimized in SSA form compute the same values."""
+
+    source_code = """
+    {
+        n = 3;
+        i = 0;
+        s = 0;
+        while (i < 100) {
+            if (n < 5) s = s + n + 1; else s = s - 1;
+            d = i + i + 1;
+            if (i < 50) s = s + (i + i + 1);
+            i = i + 1;
+        }
+    }
+    """
+
+    vm = create_virtual_machine(source_code)
+    vm.hot_loop_threshold = None
+    vm.run()
+
+    optimized_vm = create_virtual_machine(source_code, optimize=True)
+    optimized_vm.hot_loop_threshold = None
+    optimized_vm.run()
+
+    assert optimized_vm.variables == vm.variables
+    assert "$0" in optimized_vm.variable_slots
+    assert "$0" not in optimized_vm.variables
+    assert optimized_vm.instruction_count < vm.instruction_count
+
+
+def test_loop_invariant_code_motion():
+    """Test that programs with hoisted invariants compute the same values."""
+
+    source_code = """
+    {
+        n = 0;
+        do n = n + 1; while (n < 10);
+        i = 0;
+        s = 0;
+        while (i < n - 1) {
+            j = 0;
+            while (j < n + n) { s = s + (n - 2); j = j + 1; }
+            i = i + 1;
+        }
+    }
+    """
+
+    vm = create_virtual_machine(source_code)
+    vm.hot_loop_threshold = None
+    vm.run()
+
+    optimized_vm = create_virtual_machine(source_code, optimize=True)
+    optimized_vm.hot_loop_threshold = None
+    optimized_vm.run()
+
+    assert optimized_vm.variables == vm.variables
+    assert not any(variable.startswith("$") for variable in optimized_vm.variables)
+    assert optimized_vm.instruction_count < vm.instruction_count
+
+
+def test_dead_store_elimination():
+    """Test that programs without dead stores report the same variables."""
+
+    source_code = """
+    {
+        i = 0;
+        a = 0;
+        b = 1;
+        while (i < 10) {
+            t = a + b;
+            c = a;
+            a = b;
+            b = c + a;
+            i = i + 1;
+        }
+        t = 0;
+    }
+    """
+
+    vm = create_virtual_machine(source_code)
+    vm.hot_loop_threshold = None
+    vm.run()
+
+    optimized_vm = create_virtual_machine(source_code, optimize=True)
+    optimized_vm.hot_loop_threshold = None
+    optimized_vm.run()
+
+    assert optimized_vm.variables == vm.variables
+    assert optimized_vm.instruction_count < vm.instruction_count
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_affine_loop_acceleration(optimize):
+    """Test that accelerated loops compute the same values and counts."""
+
+    source_code = """
+    {
+        i = 1;
+        a = 0;
+        b = 1;
+        while (i < 2000) {
+            c = a;
+            a = b;
+            b = c + a;
+            i = i + 1;
+        }
+    }
+    """
+
+    vm = create_virtual_machine(source_code, optimize=optimize)
+    vm.hot_loop_threshold = None
+    vm.run()
+
+    accelerated_vm = create_virtual_machine(source_code, optimize=optimize)
+    accelerated_vm.run()
+
+    assert accelerated_vm.variables == vm.variables
+    assert accelerated_vm.instruction_count == vm.instruction_count
+    assert any(
+        compiled_loop.function.__name__ == "accelerated_loop"
+        for compiled_loop in accelerated_vm.compiled_loops.values()
+    )
+
+
+def test_affine_loop_acceleration_million_iterations():
+    """Test that a loop of a million iterations runs in a few steps."""
+
+    vm = create_virtual_machine(
+        "{ i = 0; s = 0; while (i < 1000000) { s = s + i + 1; i = i + 1; } }",
+        optimize=True
+    )
+    vm.run()
+
+    assert vm.variables == {"i": 1000000, "s": 500000500000}
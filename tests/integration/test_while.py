@@ -1,9 +1,12 @@
 """Integration test for a simple `while` statement."""
 
-from src.interpreter import create_virtual_machine
+import pytest
 
+from src.interpreter import create_virtual_machine, engines
 
-def test_simple_while():
+
+@pytest.mark.parametrize("engine", engines)
+def test_simple_while(engine):
     """Test the `while` statement."""
 
     source_code = """
@@ -15,7 +18,7 @@ def test_simple_while():
     }
     """
 
-    vm = create_virtual_machine(source_code)
+    vm = create_virtual_machine(source_code, engine=engine)
     vm.run()
 
     assert vm.variables == {"i": 128}
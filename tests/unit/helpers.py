@@ -0,0 +1,212 @@
+"""Implement helpers shared by the unit tests."""
+
+import sys
+from typing import Callable, Union
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.bytecode import Bytecode
+from src.code_generator import CodeGenerator
+from src.control_flow_graph import ControlFlowGraph
+from src.lexer import Lexer
+from src.node import Node
+from src.variable_slots import VariableSlots
+from src.virtual_machine import VirtualMachine
+
+
+def get_deep_tree_depth() -> int:
+    """
+    Get a tree depth well beyond the recursion limit.
+
+    Returns
+    -------
+    : int
+        Ten times the recursion limit.
+    """
+
+    return 10 * sys.getrecursionlimit()
+
+
+def build_deep_tree(depth: Union[int, None] = None) -> Node:
+    """
+    Build the expression `a - (a - (a - ... (a - 1)))`, to test that a tree
+    deeper than the recursion limit is supported.
+
+    The `SUB` Node at depth `n` (counting from the innermost one) has `id`
+    `n`, its `VAR` Node has `id` `-n`, and the `CST` Node has `id` 0.
+
+    Parameters
+    ----------
+    depth : int or None, optional (default = None)
+        The number of subtractions. If `None`, `get_deep_tree_depth` is used.
+
+    Returns
+    -------
+    node : Node
+        The outermost `SUB` Node.
+    """
+
+    if depth is None:
+        depth = get_deep_tree_depth()
+
+    node = Node(id=0, kind="CST", value=1)
+
+    for node_id in range(1, depth + 1):
+        operation = Node(id=node_id, kind="SUB")
+        operation.add_child(Node(id=-node_id, kind="VAR", value="a"))
+        operation.add_child(node)
+        node = operation
+
+    return node
+
+
+def build_cfg(source_code: str) -> ControlFlowGraph:
+    """
+    Build the CFG of a Tiny-C program.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+
+    Returns
+    -------
+    cfg : ControlFlowGraph
+        The CFG.
+    """
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+    ast.build()
+
+    cfg = ControlFlowGraph()
+    cfg.build(ast.root)
+
+    return cfg
+
+
+def run_cfg(
+    cfg: ControlFlowGraph, superinstructions: bool = False
+) -> VirtualMachine:
+    """
+    Run the code generated from a CFG, with the hot loops interpreted.
+
+    Parameters
+    ----------
+    cfg : ControlFlowGraph
+        The CFG.
+    superinstructions : bool, optional (default = False)
+        Whether to emit fused instructions.
+
+    Returns
+    -------
+    vm : VirtualMachine
+        The Virtual Machine, after running the code.
+    """
+
+    vm = VirtualMachine(
+        code_collection=cfg.generate_code(superinstructions=superinstructions),
+        hot_loop_threshold=None
+    )
+    vm.run()
+
+    return vm
+
+
+def check_cfg_pass(
+    source_code: str,
+    run_pass: Callable[[ControlFlowGraph], None],
+    superinstructions: bool = False
+) -> tuple[ControlFlowGraph, VirtualMachine, VirtualMachine]:
+    """
+    Run a pass on the CFG of a Tiny-C program, and check that the program
+    computes the same values (and types) as before.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+    run_pass : callable
+        Runs the pass on the CFG it is given.
+    superinstructions : bool, optional (default = False)
+        Whether to emit fused instructions.
+
+    Returns
+    -------
+    cfg : ControlFlowGraph
+        The CFG, after the pass.
+    vm : VirtualMachine
+        The Virtual Machine that ran the original program.
+    optimized_vm : VirtualMachine
+        The Virtual Machine that ran the program after the pass.
+    """
+
+    vm = run_cfg(build_cfg(source_code), superinstructions)
+
+    cfg = build_cfg(source_code)
+    run_pass(cfg)
+
+    optimized_vm = run_cfg(cfg, superinstructions)
+
+    assert optimized_vm.variables == vm.variables
+    assert [type(value) for value in optimized_vm.variables.values()] == [
+        type(value) for value in vm.variables.values()
+    ]
+
+    return cfg, vm, optimized_vm
+
+
+def decode_program(instructions: list) -> list:
+    """
+    Create a decoded program, as the `VirtualMachine` holds it.
+
+    Parameters
+    ----------
+    instructions : list
+        List of (`instruction`, `operand`) tuples, where `operand` is the
+        variable name, the constant or the index of the jump target.
+
+    Returns
+    -------
+    : list
+        List of (`opcode`, `operand`) tuples, with the variable names
+        resolved to their slots.
+    """
+
+    variable_slots = CodeGenerator.variable_slots
+    program = []
+
+    for instruction, operand in instructions:
+        operand_kinds = Bytecode.operand_kinds.get(instruction, ())
+
+        if "variable" in operand_kinds:
+            operands = operand if len(operand_kinds) > 1 else (operand,)
+            operands = tuple(
+                variable_slots[operand] if operand_kind == "variable"
+                else operand
+                for operand_kind, operand in zip(operand_kinds, operands)
+            )
+            operand = operands if len(operands) > 1 else operands[0]
+
+        program.append((Bytecode.opcodes[instruction], operand))
+
+    return program
+
+
+def allocate_slots(**variables) -> list:
+    """
+    Create the variable slots of a VM.
+
+    Parameters
+    ----------
+    variables : dict
+        The variables that are set, and their values.
+
+    Returns
+    -------
+    slots : list
+        The slots.
+    """
+
+    slots = VariableSlots.allocate()
+    VariableSlots(slots).update(variables)
+
+    return slots
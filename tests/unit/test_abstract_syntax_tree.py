@@ -1,8 +1,13 @@
 """Implement unit tests for the `src.abstract_syntax_tree.AbstractSyntaxTree` class."""
 
+import gc
+from itertools import chain, repeat
+
+import pytest
 from pytest import fixture
 
 from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.lexer import Lexer
 from src.node import Node
 
 
@@ -65,56 +70,48 @@ SOURCE_CODE = [
 
 EXPECTED_DFS = """
 ID: 0, Kind: PROG, Value: None
-ID: 14, Kind: SEQ, Value: None, Parent ID: 0
-ID: 7, Kind: SEQ, Value: None, Parent ID: 14
-ID: 2, Kind: SEQ, Value: None, Parent ID: 7
-ID: 1, Kind: EMPTY, Value: None, Parent ID: 2
-ID: 3, Kind: EXPR, Value: None, Parent ID: 2
-ID: 5, Kind: SET, Value: None, Parent ID: 3
-ID: 4, Kind: VAR, Value: a, Parent ID: 5
-ID: 6, Kind: CST, Value: 5, Parent ID: 5
-ID: 8, Kind: EXPR, Value: None, Parent ID: 7
-ID: 10, Kind: SET, Value: None, Parent ID: 8
-ID: 9, Kind: VAR, Value: b, Parent ID: 10
-ID: 12, Kind: SUB, Value: None, Parent ID: 10
-ID: 11, Kind: VAR, Value: a, Parent ID: 12
-ID: 13, Kind: CST, Value: 1, Parent ID: 12
-ID: 15, Kind: DO, Value: None, Parent ID: 14
-ID: 31, Kind: SEQ, Value: None, Parent ID: 15
-ID: 24, Kind: SEQ, Value: None, Parent ID: 31
-ID: 17, Kind: SEQ, Value: None, Parent ID: 24
-ID: 16, Kind: EMPTY, Value: None, Parent ID: 17
-ID: 18, Kind: EXPR, Value: None, Parent ID: 17
-ID: 20, Kind: SET, Value: None, Parent ID: 18
-ID: 19, Kind: VAR, Value: c, Parent ID: 20
-ID: 22, Kind: SUB, Value: None, Parent ID: 20
-ID: 21, Kind: VAR, Value: a, Parent ID: 22
-ID: 23, Kind: VAR, Value: b, Parent ID: 22
-ID: 25, Kind: EXPR, Value: None, Parent ID: 24
-ID: 27, Kind: SET, Value: None, Parent ID: 25
-ID: 26, Kind: VAR, Value: b, Parent ID: 27
-ID: 29, Kind: ADD, Value: None, Parent ID: 27
-ID: 28, Kind: VAR, Value: b, Parent ID: 29
-ID: 30, Kind: CST, Value: 1, Parent ID: 29
-ID: 32, Kind: IFELSE, Value: None, Parent ID: 31
-ID: 34, Kind: LT, Value: None, Parent ID: 32
-ID: 33, Kind: VAR, Value: a, Parent ID: 34
-ID: 35, Kind: VAR, Value: c, Parent ID: 34
-ID: 37, Kind: SEQ, Value: None, Parent ID: 32
-ID: 36, Kind: EMPTY, Value: None, Parent ID: 37
-ID: 38, Kind: EXPR, Value: None, Parent ID: 37
-ID: 40, Kind: SET, Value: None, Parent ID: 38
-ID: 39, Kind: VAR, Value: d, Parent ID: 40
-ID: 41, Kind: CST, Value: 10, Parent ID: 40
-ID: 43, Kind: SEQ, Value: None, Parent ID: 32
-ID: 42, Kind: EMPTY, Value: None, Parent ID: 43
-ID: 44, Kind: EXPR, Value: None, Parent ID: 43
-ID: 46, Kind: SET, Value: None, Parent ID: 44
-ID: 45, Kind: VAR, Value: d, Parent ID: 46
-ID: 47, Kind: CST, Value: 0, Parent ID: 46
-ID: 49, Kind: LT, Value: None, Parent ID: 15
-ID: 48, Kind: VAR, Value: b, Parent ID: 49
-ID: 50, Kind: VAR, Value: a, Parent ID: 49
+ID: 1, Kind: BLOCK, Value: None, Parent ID: 0
+ID: 2, Kind: EXPR, Value: None, Parent ID: 1
+ID: 4, Kind: SET, Value: None, Parent ID: 2
+ID: 3, Kind: VAR, Value: a, Parent ID: 4
+ID: 5, Kind: CST, Value: 5, Parent ID: 4
+ID: 6, Kind: EXPR, Value: None, Parent ID: 1
+ID: 8, Kind: SET, Value: None, Parent ID: 6
+ID: 7, Kind: VAR, Value: b, Parent ID: 8
+ID: 10, Kind: SUB, Value: None, Parent ID: 8
+ID: 9, Kind: VAR, Value: a, Parent ID: 10
+ID: 11, Kind: CST, Value: 1, Parent ID: 10
+ID: 12, Kind: DO, Value: None, Parent ID: 1
+ID: 13, Kind: BLOCK, Value: None, Parent ID: 12
+ID: 14, Kind: EXPR, Value: None, Parent ID: 13
+ID: 16, Kind: SET, Value: None, Parent ID: 14
+ID: 15, Kind: VAR, Value: c, Parent ID: 16
+ID: 18, Kind: SUB, Value: None, Parent ID: 16
+ID: 17, Kind: VAR, Value: a, Parent ID: 18
+ID: 19, Kind: VAR, Value: b, Parent ID: 18
+ID: 20, Kind: EXPR, Value: None, Parent ID: 13
+ID: 22, Kind: SET, Value: None, Parent ID: 20
+ID: 21, Kind: VAR, Value: b, Parent ID: 22
+ID: 24, Kind: ADD, Value: None, Parent ID: 22
+ID: 23, Kind: VAR, Value: b, Parent ID: 24
+ID: 25, Kind: CST, Value: 1, Parent ID: 24
+ID: 26, Kind: IFELSE, Value: None, Parent ID: 13
+ID: 28, Kind: LT, Value: None, Parent ID: 26
+ID: 27, Kind: VAR, Value: a, Parent ID: 28
+ID: 29, Kind: VAR, Value: c, Parent ID: 28
+ID: 30, Kind: BLOCK, Value: None, Parent ID: 26
+ID: 31, Kind: EXPR, Value: None, Parent ID: 30
+ID: 33, Kind: SET, Value: None, Parent ID: 31
+ID: 32, Kind: VAR, Value: d, Parent ID: 33
+ID: 34, Kind: CST, Value: 10, Parent ID: 33
+ID: 35, Kind: BLOCK, Value: None, Parent ID: 26
+ID: 36, Kind: EXPR, Value: None, Parent ID: 35
+ID: 38, Kind: SET, Value: None, Parent ID: 36
+ID: 37, Kind: VAR, Value: d, Parent ID: 38
+ID: 39, Kind: CST, Value: 0, Parent ID: 38
+ID: 41, Kind: LT, Value: None, Parent ID: 12
+ID: 40, Kind: VAR, Value: b, Parent ID: 41
+ID: 42, Kind: VAR, Value: a, Parent ID: 41
 """
 
 
@@ -142,10 +139,11 @@ def test_init() -> None:
     ast = AbstractSyntaxTree(source_code=SOURCE_CODE)
 
     assert ast.node_id_manager == 1
-    assert ast.source_code == SOURCE_CODE
+    assert list(ast.source_code) == SOURCE_CODE
     assert ast.current_symbol is None
     assert ast.current_value is None
     assert ast.root == Node(id=0, kind="PROG")
+    assert ast.arena is None
 
 
 def test_build(capfd: fixture) -> None:
@@ -169,3 +167,111 @@ def test_build(capfd: fixture) -> None:
     out = "\n" + out
 
     assert out == EXPECTED_DFS
+
+
+def test_build_consumes_symbols_lazily() -> None:
+    """Test that symbols are pulled from the source code one at a time."""
+
+    # An endless source code: the tree can only be built if the symbols
+    # after the program are never requested.
+    endless_source_code = chain(
+        [("LBRA", None), ("RBRA", None)], repeat(("SEMI", None))
+    )
+
+    ast = AbstractSyntaxTree(source_code=endless_source_code)
+
+    with pytest.raises(SyntaxError):
+        ast.build()
+
+    assert next(ast.source_code) == ("SEMI", None)
+
+
+@pytest.mark.parametrize("gc_enabled", [True, False])
+@pytest.mark.parametrize(
+    "source_code, is_valid", [("{ a = 1; }", True), ("{ a = 1 }", False)]
+)
+def test_build_restores_gc(
+    gc_enabled: bool, source_code: str, is_valid: bool
+) -> None:
+    """
+    Test that the garbage collector is left as it was before building the
+    tree, even if building it fails.
+
+    Parameters
+    ----------
+    gc_enabled : bool
+        Whether the garbage collector is enabled before building the tree.
+    source_code : str
+        The source code to build the tree from.
+    is_valid : bool
+        Whether the source code is valid, or building the tree fails.
+    """
+
+    gc_was_enabled = gc.isenabled()
+
+    if gc_enabled:
+        gc.enable()
+    else:
+        gc.disable()
+
+    try:
+        ast = AbstractSyntaxTree(
+            source_code=Lexer.parse_source_code(source_code)
+        )
+
+        if is_valid:
+            ast.build()
+        else:
+            with pytest.raises(SyntaxError):
+                ast.build()
+
+        assert gc.isenabled() == gc_enabled
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        else:
+            gc.disable()
+
+
+@pytest.mark.parametrize("statement_count", [0, 1, 5000])
+def test_build_block(statement_count: int) -> None:
+    """
+    Test that the statements of a block are children of a single Node.
+
+    Parameters
+    ----------
+    statement_count : int
+        The number of statements in the block.
+    """
+
+    statement = [("ID", "a"), ("EQUAL", None), ("INT", 1), ("SEMI", None)]
+    source_code = [
+        ("LBRA", None), *statement * statement_count, ("RBRA", None)
+    ]
+
+    ast = AbstractSyntaxTree(source_code=source_code)
+    ast.build()
+
+    (block,) = ast.root.children
+
+    assert block.kind == "BLOCK"
+    assert len(block.children) == statement_count
+    assert all(
+        child.kind == "EXPR" and child.parent is block
+        for child in block.children
+    )
+
+
+def test_build_arena(capfd: fixture) -> None:
+    """Test that building into a `NodeArena` yields the same tree."""
+
+    ast = AbstractSyntaxTree(source_code=SOURCE_CODE, use_arena=True)
+    ast.build()
+
+    _dfs(ast.root)
+
+    out, _ = capfd.readouterr()
+    out = "\n" + out
+
+    assert out == EXPECTED_DFS
+    assert len(ast.arena) == ast.node_id_manager
@@ -0,0 +1,299 @@
+"""Implement unit tests for the `src.affine_loop_accelerator` module."""
+
+import pytest
+
+from src.affine_loop_accelerator import AffineLoopAccelerator
+from src.loop_compiler import CompiledLoop, LoopCompiler
+from src.variable_slots import VariableSlots
+from tests.unit.helpers import allocate_slots, decode_program
+
+
+def _accelerate(program: list, header: int, back_jump: int) -> tuple:
+    """
+    Compile and accelerate a loop.
+
+    Parameters
+    ----------
+    program : list
+        The decoded program.
+    header : int
+        The index of the first instruction of the loop.
+    back_jump : int
+        The index of the backward jump of the loop.
+
+    Returns
+    -------
+    compiled_loop : CompiledLoop
+        The loop, as compiled by the `LoopCompiler`.
+    accelerated_loop : CompiledLoop
+        The loop, as accelerated by the `AffineLoopAccelerator`.
+    """
+
+    compiled_loop = LoopCompiler(program=program).compile(header, back_jump)
+    accelerated_loop = AffineLoopAccelerator(program=program).accelerate(
+        header, back_jump, compiled_loop
+    )
+
+    return compiled_loop, accelerated_loop
+
+
+# while (i < n) { s = s + i; i = i + 1; }
+WHILE_LOOP = decode_program([
+    ("IFETCH", "i"),
+    ("IFETCH", "n"),
+    ("ILT", None),
+    ("JZ", 15),
+    ("IFETCH", "s"),
+    ("IFETCH", "i"),
+    ("IADD", None),
+    ("ISTORE", "s"),
+    ("IPOP", None),
+    ("IFETCH", "i"),
+    ("IPUSH", 1),
+    ("IADD", None),
+    ("ISTORE", "i"),
+    ("IPOP", None),
+    ("JMP", 0),
+    ("HALT", None)
+])
+
+# do { c = a; a = b; b = c + a; i = i + 1; } while (i < n);
+FIBONACCI_LOOP = decode_program([
+    ("IFETCH", "a"),
+    ("ISTORE", "c"),
+    ("IPOP", None),
+    ("IFETCH", "b"),
+    ("ISTORE", "a"),
+    ("IPOP", None),
+    ("IFETCH", "c"),
+    ("IFETCH", "a"),
+    ("IADD", None),
+    ("ISTORE", "b"),
+    ("IPOP", None),
+    ("INC", ("i", 1)),
+    ("JLT", ("i", "n", 0)),
+    ("HALT", None)
+])
+
+# while (i < n) i = i + i;
+DOUBLING_LOOP = decode_program([
+    ("JGE", ("i", "n", 7)),
+    ("IFETCH", "i"),
+    ("IFETCH", "i"),
+    ("IADD", None),
+    ("ISTORE", "i"),
+    ("IPOP", None),
+    ("JMP", 0),
+    ("HALT", None)
+])
+
+# do { i = i - 3; s = s + 1; } while (i);
+COUNTDOWN_LOOP = decode_program([
+    ("INC", ("i", -3)),
+    ("INC", ("s", 1)),
+    ("IFETCH", "i"),
+    ("JNZ", 0),
+    ("HALT", None)
+])
+
+
+def test_init() -> None:
+    """Test the instantiation of AffineLoopAccelerator objects."""
+
+    accelerator = AffineLoopAccelerator(program=WHILE_LOOP)
+
+    assert accelerator.program is WHILE_LOOP
+
+
+def test_accelerate() -> None:
+    """Test accelerating a `while` loop of a million iterations."""
+
+    compiled_loop, accelerated_loop = _accelerate(WHILE_LOOP, 0, 14)
+
+    assert accelerated_loop is not compiled_loop
+    assert accelerated_loop.read_variables == compiled_loop.read_variables
+
+    slots = allocate_slots(i=0, n=10 ** 6, s=0)
+    exit_index, executed = accelerated_loop.function(slots)
+
+    # A million iterations of 15 instructions, and the test that exits.
+    assert VariableSlots(slots) == {
+        "i": 10 ** 6, "n": 10 ** 6, "s": 10 ** 6 * (10 ** 6 - 1) // 2
+    }
+    assert exit_index == 15
+    assert executed == 10 ** 6 * 15 + 4
+
+
+@pytest.mark.parametrize(
+    "program, back_jump, variables",
+    [
+        (WHILE_LOOP, 14, {"i": 0, "n": 37, "s": 5}),
+        (WHILE_LOOP, 14, {"i": 9, "n": 3, "s": 0}),
+        (FIBONACCI_LOOP, 12, {"a": 0, "b": 1, "i": 0, "n": 10}),
+        (FIBONACCI_LOOP, 12, {"a": 0, "b": 1, "i": 0, "n": 0}),
+        (DOUBLING_LOOP, 6, {"i": 1, "n": 100}),
+        (DOUBLING_LOOP, 6, {"i": 3, "n": 10 ** 30}),
+        (DOUBLING_LOOP, 6, {"i": 100, "n": 100}),
+        (COUNTDOWN_LOOP, 3, {"i": 9, "s": 0}),
+        (COUNTDOWN_LOOP, 3, {"i": 3, "s": 7})
+    ]
+)
+def test_accelerate_results(
+    program: list, back_jump: int, variables: dict
+) -> None:
+    """
+    Test that accelerated loops compute the same values as compiled ones.
+
+    Parameters
+    ----------
+    program : list
+        The decoded program.
+    back_jump : int
+        The index of the backward jump of the loop.
+    variables : dict
+        The variables set before the loop.
+    """
+
+    compiled_loop, accelerated_loop = _accelerate(program, 0, back_jump)
+
+    assert accelerated_loop is not compiled_loop
+
+    slots = allocate_slots(**variables)
+    accelerated_slots = allocate_slots(**variables)
+
+    assert accelerated_loop.function(accelerated_slots) == (
+        compiled_loop.function(slots)
+    )
+    assert accelerated_slots == slots
+    assert [type(value) for value in accelerated_slots] == [
+        type(value) for value in slots
+    ]
+
+
+def test_accelerate_fibonacci() -> None:
+    """Test that the Fibonacci loop runs with powers of its matrix."""
+
+    _, accelerated_loop = _accelerate(FIBONACCI_LOOP, 0, 12)
+
+    slots = allocate_slots(a=0, b=1, i=0, n=1000)
+    accelerated_loop.function(slots)
+
+    a, b = 0, 1
+
+    for _ in range(1000):
+        a, b = b, a + b
+
+    assert VariableSlots(slots)["a"] == a
+    assert VariableSlots(slots)["b"] == b
+
+
+@pytest.mark.parametrize(
+    "program, back_jump, variables",
+    [
+        # `s` is a boolean, which `s + 1` turns into an integer.
+        (COUNTDOWN_LOOP, 3, {"i": 9, "s": True}),
+        # `i` skips 0.
+        (COUNTDOWN_LOOP, 3, {"i": 10, "s": 0}),
+        # `i` never reaches `n`.
+        (DOUBLING_LOOP, 6, {"i": 0, "n": 100})
+    ]
+)
+def test_accelerate_fallback(
+    program: list, back_jump: int, variables: dict
+) -> None:
+    """
+    Test that the compiled loop runs if the values are not integers, or if
+    the loop never ends.
+
+    Parameters
+    ----------
+    program : list
+        The decoded program.
+    back_jump : int
+        The index of the backward jump of the loop.
+    variables : dict
+        The variables set before the loop.
+    """
+
+    compiled_loop = LoopCompiler(program=program).compile(0, back_jump)
+    fallback_slots = []
+
+    def fallback(slots: list) -> tuple[int, int]:
+        fallback_slots.append(slots)
+        return 0, 0
+
+    accelerated_loop = AffineLoopAccelerator(program=program).accelerate(
+        0,
+        back_jump,
+        CompiledLoop(fallback, compiled_loop.read_variables, compiled_loop.source)
+    )
+
+    slots = allocate_slots(**variables)
+
+    assert accelerated_loop.function(slots) == (0, 0)
+    assert fallback_slots == [slots]
+
+
+@pytest.mark.parametrize(
+    "program, back_jump",
+    [
+        # The body branches.
+        (
+            decode_program([
+                ("IFETCH", "i"),
+                ("JZ", 2),
+                ("INC", ("i", -1)),
+                ("IFETCH", "i"),
+                ("JNZ", 0),
+                ("HALT", None)
+            ]),
+            4
+        ),
+        # `a` is set to a boolean.
+        (
+            decode_program([
+                ("IFETCH", "i"),
+                ("IFETCH", "n"),
+                ("ILT", None),
+                ("ISTORE", "a"),
+                ("IPOP", None),
+                ("INC", ("i", 1)),
+                ("JLT", ("i", "n", 0)),
+                ("HALT", None)
+            ]),
+            6
+        ),
+        # The condition doesn't depend on the variables.
+        (decode_program([("INC", ("i", 1)), ("IPUSH", 1), ("JNZ", 0)]), 2),
+        # `i < j` is not monotonic as `i` and `j` swap.
+        (
+            decode_program([
+                ("IFETCH", "i"),
+                ("IFETCH", "j"),
+                ("ISTORE", "i"),
+                ("IPOP", None),
+                ("ISTORE", "j"),
+                ("IPOP", None),
+                ("JLT", ("i", "j", 0)),
+                ("HALT", None)
+            ]),
+            6
+        )
+    ]
+)
+def test_accelerate_not_affine(program: list, back_jump: int) -> None:
+    """
+    Test that loops that are not affine are left to the compiled loop.
+
+    Parameters
+    ----------
+    program : list
+        The decoded program.
+    back_jump : int
+        The index of the backward jump of the loop.
+    """
+
+    compiled_loop, accelerated_loop = _accelerate(program, 0, back_jump)
+
+    assert compiled_loop is not None
+    assert accelerated_loop is compiled_loop
@@ -0,0 +1,144 @@
+"""Implement unit tests for the `src.bytecode.Bytecode` class."""
+
+import pickle
+from array import array
+
+from src.bytecode import Bytecode
+from src.node import Node
+
+
+CODE_COLLECTION = [
+    ("IFETCH", Node(id=1, kind="VAR", value="i")),
+    ("IPUSH", Node(id=2, kind="CST", value=1)),
+    ("IPUSH", Node(id=3, kind="CST", value=True)),
+    ("IADD", Node(id=4, kind="ADD")),
+    ("ISTORE", Node(id=5, kind="VAR", value="j")),
+    ("JZ", 7),
+    ("IPOP", Node(id=6, kind="EXPR")),
+    ("HALT", Node(id=0, kind="PROG"))
+]
+
+
+def test_init() -> None:
+    """Test the instantiation of Bytecode objects."""
+
+    code = array("i", [Bytecode.opcodes["HALT"]])
+
+    bytecode = Bytecode(code=code, constants=[], variables=[])
+
+    assert bytecode.code == code
+    assert bytecode.constants == []
+    assert bytecode.variables == []
+    assert len(bytecode) == 1
+
+
+def test_assemble() -> None:
+    """Test the `Bytecode.assemble` method."""
+
+    bytecode = Bytecode.assemble(CODE_COLLECTION)
+
+    opcodes = Bytecode.opcodes
+
+    assert bytecode.code == array("i", [
+        opcodes["IFETCH"], 0,
+        opcodes["IPUSH"], 0,
+        opcodes["IPUSH"], 1,
+        opcodes["IADD"],
+        opcodes["ISTORE"], 1,
+        opcodes["JZ"], 12,
+        opcodes["IPOP"],
+        opcodes["HALT"]
+    ])
+
+    # `True` and `1` must not be merged in the constants table.
+    assert bytecode.constants == [1, True]
+    assert type(bytecode.constants[1]) is bool
+    assert bytecode.variables == ["i", "j"]
+
+
+def test_assemble_shared_entries() -> None:
+    """Test that repeated variables and constants share their table entries."""
+
+    bytecode = Bytecode.assemble([
+        ("IPUSH", Node(id=1, kind="CST", value=2)),
+        ("ISTORE", Node(id=2, kind="VAR", value="a")),
+        ("IPUSH", Node(id=3, kind="CST", value=2)),
+        ("ISTORE", Node(id=4, kind="VAR", value="a"))
+    ])
+
+    assert bytecode.constants == [2]
+    assert bytecode.variables == ["a"]
+
+
+def test_assemble_fused_instructions() -> None:
+    """Test that instructions with several operands are assembled in order."""
+
+    a = Node(id=1, kind="VAR", value="a")
+    b = Node(id=2, kind="VAR", value="b")
+
+    bytecode = Bytecode.assemble([
+        ("INC", (b, Node(id=3, kind="CST", value=-1))),
+        ("JGE", (a, b, 3)),
+        ("SUBVV", (b, a)),
+        ("HALT", None)
+    ])
+
+    opcodes = Bytecode.opcodes
+
+    assert bytecode.code == array("i", [
+        opcodes["INC"], 0, 0,
+        opcodes["JGE"], 1, 0, 10,
+        opcodes["SUBVV"], 0, 1,
+        opcodes["HALT"]
+    ])
+    assert bytecode.constants == [-1]
+    assert bytecode.variables == ["b", "a"]
+    assert bytecode.disassemble().splitlines()[:2] == [
+        "     0 INC b, -1",
+        "     3 JGE a, b, 10"
+    ]
+
+
+def test_decode() -> None:
+    """Test the `Bytecode.decode` method."""
+
+    bytecode = Bytecode.assemble(CODE_COLLECTION)
+
+    assert list(bytecode.decode()) == [
+        (0, "IFETCH", (0,)),
+        (2, "IPUSH", (0,)),
+        (4, "IPUSH", (1,)),
+        (6, "IADD", ()),
+        (7, "ISTORE", (1,)),
+        (9, "JZ", (12,)),
+        (11, "IPOP", ()),
+        (12, "HALT", ())
+    ]
+
+
+def test_disassemble() -> None:
+    """Test the `Bytecode.disassemble` method."""
+
+    bytecode = Bytecode.assemble(CODE_COLLECTION)
+
+    expected_result = "\n".join([
+        "     0 IFETCH i",
+        "     2 IPUSH 1",
+        "     4 IPUSH True",
+        "     6 IADD",
+        "     7 ISTORE j",
+        "     9 JZ 12",
+        "    11 IPOP",
+        "    12 HALT"
+    ])
+
+    assert bytecode.disassemble() == expected_result
+    assert str(bytecode) == expected_result
+
+
+def test_pickle() -> None:
+    """Test that Bytecode objects survive a pickling round trip."""
+
+    bytecode = Bytecode.assemble(CODE_COLLECTION)
+
+    assert pickle.loads(pickle.dumps(bytecode)) == bytecode
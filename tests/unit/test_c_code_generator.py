@@ -0,0 +1,259 @@
+"""Implement unit tests for the `src.c_code_generator` module."""
+
+import os
+
+import pytest
+
+# Just to annotate functions with fixtures.
+from pytest_mock.plugin import MockerFixture
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.c_code_generator import (
+    CCodeGenerator,
+    create_c_function,
+    find_c_compiler
+)
+from src.interpreter import create_virtual_machine
+from src.lexer import Lexer
+from src.node import Node
+from tests.unit.helpers import build_deep_tree, get_deep_tree_depth
+
+
+requires_compiler = pytest.mark.skipif(
+    find_c_compiler() is None, reason="There is no C compiler."
+)
+
+
+def _generate(source_code: str) -> CCodeGenerator:
+    """
+    Generate C code from a Tiny-C source code.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+
+    Returns
+    -------
+    generator : CCodeGenerator
+        The code generator, after generating code from the source code.
+    """
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+    ast.build()
+
+    generator = CCodeGenerator()
+    generator.generate_code(ast.root)
+
+    return generator
+
+
+def test_init() -> None:
+    """Test the instantiation of CCodeGenerator objects."""
+
+    generator = CCodeGenerator()
+
+    assert generator.lines == []
+    assert generator.variables == []
+    assert generator.temporary_count == 0
+
+
+def test_source() -> None:
+    """Test the source code generated from a simple loop."""
+
+    generator = _generate("{ a = 1; while (a < 3) a = a + 1; }")
+
+    expected_result = "\n".join([
+        "const int tinyc_variable_count = 1;",
+        'const char *tinyc_variables[] = {"a"};',
+        "",
+        "int tinyc_program(long long *values, unsigned char *kinds)",
+        "{",
+        "    long long v0 = 0; unsigned char k0 = 0;",
+        "    {",
+        "        v0 = 1LL; k0 = 1;",
+        "    }",
+        "    for (;;) {",
+        "        if (!k0) goto fault;",
+        "        long long t1 = v0;",
+        "        unsigned char t2 = k0;",
+        "        long long t3;",
+        "        t3 = t1 < 3LL;",
+        "        if (!t3) break;",
+        "        {",
+        "            if (!k0) goto fault;",
+        "            long long t4 = v0;",
+        "            unsigned char t5 = k0;",
+        "            long long t6;",
+        "            if (__builtin_add_overflow(t4, 1LL, &t6)) goto fault;",
+        "            v0 = t6; k0 = 1;",
+        "        }",
+        "    }",
+        "    values[0] = v0; kinds[0] = k0;",
+        "    return 0;",
+        "fault:",
+        "    return 1;",
+        "}",
+        ""
+    ])
+
+    assert generator.source == expected_result
+    assert str(generator) == expected_result
+
+
+@pytest.mark.parametrize(
+    "value, expected_result",
+    [(7, ("7LL", "1")), (True, ("1LL", "2")), (False, ("0LL", "2"))]
+)
+def test_generate_expression_constant(value: int, expected_result: tuple) -> None:
+    """
+    Test the translation of constants, which may be folded booleans.
+
+    Parameters
+    ----------
+    value : int
+        The value of the constant.
+    expected_result : tuple
+        The C value and kind of the constant.
+    """
+
+    generator = CCodeGenerator()
+
+    assert generator.generate_expression(
+        Node(id=1, kind="CST", value=value)
+    ) == expected_result
+
+
+def test_generate_expression_deep_tree() -> None:
+    """Test that expressions deeper than the recursion limit are supported."""
+
+    depth = get_deep_tree_depth()
+
+    generator = CCodeGenerator()
+    value, kind = generator.generate_expression(build_deep_tree(depth))
+
+    # Each `a` takes two temporaries, and each subtraction another one. The
+    # outermost subtraction is computed last, from the first `a`.
+    assert value == f"t{3 * depth}"
+    assert kind == str(CCodeGenerator.integer_kind)
+    assert generator.lines[-1].strip() == (
+        f"if (__builtin_sub_overflow(t1, t{3 * depth - 1}, &{value})) "
+        "goto fault;"
+    )
+
+
+@requires_compiler
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        "{ a = 1; c = 3 < 2; b = c; }",
+        "{ a = 1; b = a + (a = 5); c = (a < b) + (a < b); }",
+        "{ i = 10; if (i < 5) { x = 1; } else { y = 2; } }",
+        "{ i = 1; do { i = i + 10; } while (i < 50); }",
+        """
+        {
+            i = 125;
+            j = 100;
+            while (i - j) {
+                if (i < j) { j = j - i; } else { i = i - j; }
+            }
+        }
+        """,
+        # Overflows 64 bits, so it runs on the virtual machine.
+        "{ a = 4611686018427387904; a = a + a; b = 0 - a - a; }",
+        # A long chain of additions.
+        "{ a = 1; b = a" + " + a" * 5000 + "; }",
+        "{ }"
+    ]
+)
+def test_create_c_function(source_code: str) -> None:
+    """
+    Test that the native code computes the same variables as the VM.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+    """
+
+    vm = create_virtual_machine(source_code)
+    vm.run()
+
+    variables = create_c_function(source_code)()
+
+    assert type(variables) is dict
+    assert variables == vm.variables
+    assert all(
+        type(variables[name]) is type(vm.variables[name]) for name in variables
+    )
+
+
+@requires_compiler
+def test_create_c_function_unset_variable() -> None:
+    """Test that reading an unset variable raises, as in the VM."""
+
+    function = create_c_function("{ a = 1; if (a) b = c; }")
+
+    with pytest.raises(KeyError):
+        function()
+
+
+@requires_compiler
+def test_create_c_function_cache(tmp_path: str, mocker: MockerFixture) -> None:
+    """Test that cached programs skip code generation."""
+
+    source_code = "{ a = 1; b = a + 2; }"
+
+    function = create_c_function(source_code, cache_dir=tmp_path)
+
+    assert len(os.listdir(tmp_path)) == 1
+
+    generate_code = mocker.spy(CCodeGenerator, "generate_code")
+
+    cached_function = create_c_function(source_code, cache_dir=tmp_path)
+
+    generate_code.assert_not_called()
+    assert cached_function() == function() == {"a": 1, "b": 3}
+
+
+def test_create_c_function_without_compiler(mocker: MockerFixture) -> None:
+    """Test that the VM runs the program if there is no C compiler."""
+
+    mocker.patch("src.c_code_generator.find_c_compiler", return_value=None)
+    generate_code = mocker.spy(CCodeGenerator, "generate_code")
+
+    function = create_c_function("{ a = 1; b = a < 2; }")
+
+    variables = function()
+
+    generate_code.assert_not_called()
+    assert type(variables) is dict
+    assert variables == {"a": 1, "b": True}
+
+
+def test_create_c_function_compiler_error(tmp_path: str) -> None:
+    """Test that the VM runs the program if it fails to compile."""
+
+    function = create_c_function(
+        "{ a = 1; }", cache_dir=tmp_path, compiler="false"
+    )
+
+    assert function() == {"a": 1}
+    assert os.listdir(tmp_path) == []
+
+
+def test_create_c_function_recursion_error(
+    tmp_path: str, mocker: MockerFixture
+) -> None:
+    """Test that the VM runs the program if generating code recurses too deep."""
+
+    mocker.patch.object(
+        CCodeGenerator, "generate_code", side_effect=RecursionError
+    )
+
+    function = create_c_function(
+        "{ a = 1; }", cache_dir=tmp_path, compiler="cc"
+    )
+
+    assert function() == {"a": 1}
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,249 @@
+"""Implement unit tests for the `src.closure_evaluator.ClosureEvaluator` class."""
+
+import pytest
+
+# Just to annotate functions with fixtures.
+from pytest_mock.plugin import MockerFixture
+
+from src.closure_evaluator import ClosureEvaluator
+from src.node import Node
+from tests.unit.helpers import build_deep_tree, get_deep_tree_depth
+
+
+def _node(kind: str, value: object = None, children: list = []) -> Node:
+    """
+    Create a Node with the given children.
+
+    Parameters
+    ----------
+    kind : str
+        The Node kind.
+    value : object, optional (default = None)
+        The value the Node holds.
+    children : list of Node, optional (default = [])
+        The children of the Node.
+
+    Returns
+    -------
+    node : Node
+        The new Node.
+    """
+
+    node = Node(id=1, kind=kind, value=value)
+
+    for child in children:
+        node.add_child(child)
+        child.add_parent(node)
+
+    return node
+
+
+def _assignment(variable: str, expression: Node) -> Node:
+    """
+    Create the statement `variable = expression;`.
+
+    Parameters
+    ----------
+    variable : str
+        The name of the variable to set.
+    expression : Node
+        The expression to assign.
+
+    Returns
+    -------
+    : Node
+        The `EXPR` Node of the statement.
+    """
+
+    return _node(
+        "EXPR", children=[_node("SET", children=[_node("VAR", variable), expression])]
+    )
+
+
+def test_init() -> None:
+    """Test the instantiation of ClosureEvaluator objects."""
+
+    evaluator = ClosureEvaluator(_node("PROG"))
+
+    assert evaluator.variables == {}
+    assert callable(evaluator.program)
+
+
+@pytest.mark.parametrize(
+    "kind, lhs, rhs, expected_result",
+    [
+        ("ADD", _node("VAR", "a"), _node("CST", 2), 7),
+        ("SUB", _node("VAR", "a"), _node("VAR", "b"), 2),
+        ("LT", _node("CST", 2), _node("VAR", "b"), True),
+        ("SUB", _node("CST", 2), _node("ADD", children=[
+            _node("VAR", "a"), _node("VAR", "b")
+        ]), -6)
+    ]
+)
+def test_compile_operation(
+    kind: str, lhs: Node, rhs: Node, expected_result: int
+) -> None:
+    """
+    Test the `ClosureEvaluator.compile_operation` method.
+
+    Parameters
+    ----------
+    kind : str
+        The kind of the operation.
+    lhs : Node
+        The left hand side operand.
+    rhs : Node
+        The right hand side operand.
+    expected_result : int
+        The expected result, with `a = 5` and `b = 3`.
+    """
+
+    evaluator = ClosureEvaluator(_node("PROG"))
+    evaluator.variables.update({"a": 5, "b": 3})
+
+    closure = evaluator.compile(_node(kind, children=[lhs, rhs]))
+
+    assert closure() == expected_result
+
+
+@pytest.mark.parametrize("length", [3, get_deep_tree_depth()])
+def test_compile_operation_chain(length: int) -> None:
+    """
+    Test that chains of operations longer than the recursion limit are
+    supported, and computed from left to right.
+
+    Parameters
+    ----------
+    length : int
+        The number of operations in the chain.
+    """
+
+    evaluator = ClosureEvaluator(_node("PROG"))
+    evaluator.variables.update({"a": 5, "b": 3})
+
+    # (a < b) + a - b + a - b + ... < 7
+    node = _node("LT", children=[_node("VAR", "a"), _node("VAR", "b")])
+    expected_result = False
+
+    for index in range(length):
+        kind = "ADD" if index % 2 else "SUB"
+        node = _node(kind, children=[
+            node, _node("SET", children=[_node("VAR", "b"), _node("CST", index)])
+        ])
+        expected_result = (
+            expected_result + index if kind == "ADD" else expected_result - index
+        )
+
+    node = _node("LT", children=[node, _node("CST", 7)])
+
+    assert evaluator.compile(node)() == (expected_result < 7)
+    assert evaluator.variables == {"a": 5, "b": length - 1}
+
+
+def test_init_deep_tree() -> None:
+    """Test that programs nested deeper than the recursion limit are rejected."""
+
+    program = _node("PROG", children=[_assignment("b", build_deep_tree())])
+
+    with pytest.raises(ValueError, match="Unsupported program"):
+        ClosureEvaluator(program)
+
+
+def test_run_recursion_error(mocker: MockerFixture) -> None:
+    """Test that running out of stack is reported as an unsupported program."""
+
+    evaluator = ClosureEvaluator(_node("PROG"))
+    mocker.patch.object(evaluator, "program", side_effect=RecursionError)
+
+    with pytest.raises(ValueError, match="Unsupported program"):
+        evaluator.run()
+
+
+def test_compile_set_node() -> None:
+    """Test that `SET` closures assign and return the value."""
+
+    evaluator = ClosureEvaluator(_node("PROG"))
+
+    closure = evaluator.compile(
+        _node("SET", children=[_node("VAR", "a"), _node("CST", 4)])
+    )
+
+    assert closure() == 4
+    assert evaluator.variables == {"a": 4}
+
+
+@pytest.mark.parametrize("a, expected_result", [(1, {"b": 1}), (0, {"b": 2})])
+def test_compile_if_else_node(a: int, expected_result: dict) -> None:
+    """
+    Test the `ClosureEvaluator.compile_if_else_node` method.
+
+    Parameters
+    ----------
+    a : int
+        The value of the condition.
+    expected_result : dict
+        The expected variables, besides `a`.
+    """
+
+    evaluator = ClosureEvaluator(
+        _node("IFELSE", children=[
+            _node("VAR", "a"),
+            _assignment("b", _node("CST", 1)),
+            _assignment("b", _node("CST", 2))
+        ])
+    )
+    evaluator.variables["a"] = a
+
+    evaluator.run()
+
+    assert evaluator.variables == {"a": a, **expected_result}
+
+
+def test_compile_loops() -> None:
+    """Test that `WHILE` and `DO` bodies run the expected number of times."""
+
+    def _increment() -> Node:
+        return _assignment(
+            "i", _node("ADD", children=[_node("VAR", "i"), _node("CST", 1)])
+        )
+
+    while_loop = _node("WHILE", children=[
+        _node("LT", children=[_node("VAR", "i"), _node("CST", 3)]),
+        _increment()
+    ])
+
+    # The body of a `do/while` loop runs at least once.
+    do_while_loop = _node("DO", children=[
+        _increment(),
+        _node("LT", children=[_node("VAR", "i"), _node("CST", 0)])
+    ])
+
+    evaluator = ClosureEvaluator(
+        _node("PROG", children=[
+            _assignment("i", _node("CST", 0)),
+            while_loop,
+            do_while_loop
+        ])
+    )
+
+    evaluator.run()
+
+    assert evaluator.variables == {"i": 4}
+
+
+def test_compile_sequence() -> None:
+    """Test that nested sequences are flattened and run in order."""
+
+    sequence = _node("SEQ", children=[
+        _node("SEQ", children=[
+            _node("EMPTY"), _assignment("a", _node("CST", 1))
+        ]),
+        _assignment("a", _node("ADD", children=[
+            _node("VAR", "a"), _node("CST", 1)
+        ]))
+    ])
+
+    evaluator = ClosureEvaluator(_node("PROG", children=[sequence]))
+    evaluator.run()
+
+    assert evaluator.variables == {"a": 2}
@@ -1,5 +1,6 @@
 """Implement unit tests for the `src.cg` module."""
 
+import gc
 from typing import Union
 
 import pytest
@@ -9,6 +10,7 @@ from pytest_mock.plugin import MockerFixture
 
 from src.code_generator import CodeGenerator
 from src.node import Node
+from tests.unit.helpers import build_deep_tree, get_deep_tree_depth
 
 
 def test_init() -> None:
@@ -36,6 +38,318 @@ def test_str() -> None:
 
     assert str(cg) == expected_result
 
+
+def test_str_jump() -> None:
+    """Test the string representation of jump instructions."""
+
+    cg = CodeGenerator()
+    cg.fix(cg.hole("JMP"), 0)
+
+    assert str(cg) == "Instruction: JMP, Target: 0"
+
+
+def test_hole_and_fix() -> None:
+    """Test the `CodeGenerator.hole` and `CodeGenerator.fix` methods."""
+
+    cg = CodeGenerator()
+    cg.generate_code(Node(id=1, kind="CST", value=1))
+
+    address = cg.hole("JZ")
+
+    assert address == 1
+    assert cg.code_collection[address] == ("JZ", None)
+    assert cg.here == 2
+
+    cg.fix(address, 5)
+
+    assert cg.code_collection[address] == ("JZ", 5)
+
+
+def test_hole_and_fix_operands() -> None:
+    """Test jump holes with operands other than their target."""
+
+    lhs = Node(id=1, kind="VAR", value="a")
+    rhs = Node(id=2, kind="VAR", value="b")
+
+    cg = CodeGenerator()
+    address = cg.hole("JGE", (lhs, rhs))
+
+    assert cg.code_collection[address] == ("JGE", (lhs, rhs, None))
+
+    cg.fix(address, 3)
+
+    assert cg.code_collection[address] == ("JGE", (lhs, rhs, 3))
+    assert CodeGenerator.get_target(cg.code_collection[address][1]) == 3
+
+
+def _increment(kind: str, variable: str, constant: object) -> Node:
+    """
+    Create the statement `a = variable + constant;` (or `-`).
+
+    Parameters
+    ----------
+    kind : str
+        The kind of the operation: `ADD` or `SUB`.
+    variable : str
+        The variable of the left hand side of the operation.
+    constant : object
+        The value of the constant of the right hand side of the operation.
+
+    Returns
+    -------
+    : Node
+        The `EXPR` Node.
+    """
+
+    operation = Node(id=4, kind=kind)
+    operation.add_child(Node(id=5, kind="VAR", value=variable))
+    operation.add_child(Node(id=6, kind="CST", value=constant))
+
+    set_node = Node(id=2, kind="SET")
+    set_node.add_child(Node(id=3, kind="VAR", value="a"))
+    set_node.add_child(operation)
+
+    node = Node(id=1, kind="EXPR")
+    node.add_child(set_node)
+
+    return node
+
+
+@pytest.mark.parametrize(
+    "kind, variable, constant, expected_result",
+    [
+        ("ADD", "a", 2, [("INC", ("a", 2))]),
+        ("ADD", "a", True, [("INC", ("a", True))]),
+        ("SUB", "a", 2, [("INC", ("a", -2))]),
+        # Only integer constants are negated.
+        (
+            "SUB", "a", True,
+            [("IFETCH", "a"), ("IPUSH", True), ("ISUB", None), ("ISTORE", "a"),
+             ("IPOP", None)]
+        ),
+        (
+            "ADD", "b", 2,
+            [("IFETCH", "b"), ("IPUSH", 2), ("IADD", None), ("ISTORE", "a"),
+             ("IPOP", None)]
+        )
+    ]
+)
+def test_generate_code_increment(
+    kind: str, variable: str, constant: object, expected_result: list
+) -> None:
+    """
+    Test that increments become `INC` instructions.
+
+    Parameters
+    ----------
+    kind : str
+        The kind of the operation: `ADD` or `SUB`.
+    variable : str
+        The variable of the left hand side of the operation.
+    constant : object
+        The value of the constant of the right hand side of the operation.
+    expected_result : list of tuples
+        The instructions, with the values of the Nodes of their arguments.
+    """
+
+    cg = CodeGenerator(superinstructions=True)
+    cg.generate_code(_increment(kind, variable, constant))
+
+    def _value(argument):
+        if isinstance(argument, tuple):
+            return tuple(_value(element) for element in argument)
+
+        return argument.value
+
+    code_collection = [
+        (instruction, _value(argument))
+        for instruction, argument in cg.code_collection
+    ]
+
+    assert code_collection == expected_result
+    assert [type(value) for _, value in code_collection] == [
+        type(value) for _, value in expected_result
+    ]
+
+
+def test_generate_code_superinstructions() -> None:
+    """Test that `SUBVV` and `JGE` are emitted for conditions and subtractions."""
+
+    lhs = Node(id=2, kind="VAR", value="a")
+    rhs = Node(id=3, kind="VAR", value="b")
+
+    condition = Node(id=1, kind="LT")
+    condition.add_child(lhs)
+    condition.add_child(rhs)
+
+    subtraction = Node(id=5, kind="SUB")
+    subtraction.add_child(Node(id=6, kind="VAR", value="b"))
+    subtraction.add_child(Node(id=7, kind="VAR", value="a"))
+
+    statement = Node(id=4, kind="EXPR")
+    statement.add_child(subtraction)
+
+    node = Node(id=0, kind="WHILE")
+    node.add_child(condition)
+    node.add_child(statement)
+
+    cg = CodeGenerator(superinstructions=True)
+    cg.generate_code(node)
+
+    assert cg.code_collection == [
+        ("JGE", (lhs, rhs, 4)),
+        ("SUBVV", tuple(subtraction.children)),
+        ("IPOP", statement),
+        ("JMP", 0)
+    ]
+
+    cg = CodeGenerator()
+    cg.generate_code(node)
+
+    assert [instruction for instruction, _ in cg.code_collection] == [
+        "IFETCH", "IFETCH", "ILT", "JZ", "IFETCH", "IFETCH", "ISUB", "IPOP",
+        "JMP"
+    ]
+
+
+@pytest.mark.parametrize("superinstructions", [False, True])
+def test_generate_code_loop_inversion(superinstructions: bool) -> None:
+    """
+    Test that `WHILE` loops are tested at the bottom with `loop_inversion`.
+
+    Parameters
+    ----------
+    superinstructions : bool
+        Whether to emit fused instructions.
+    """
+
+    lhs = Node(id=2, kind="VAR", value="a")
+    rhs = Node(id=3, kind="VAR", value="b")
+
+    condition = Node(id=1, kind="LT")
+    condition.add_child(lhs)
+    condition.add_child(rhs)
+
+    statement = Node(id=4, kind="EMPTY")
+
+    node = Node(id=0, kind="WHILE")
+    node.add_child(condition)
+    node.add_child(statement)
+
+    cg = CodeGenerator(
+        superinstructions=superinstructions, loop_inversion=True
+    )
+    cg.generate_code(node)
+
+    if superinstructions:
+        assert cg.code_collection == [
+            ("JGE", (lhs, rhs, 3)),
+            ("EMPTY", statement),
+            ("JLT", (lhs, rhs, 1))
+        ]
+    else:
+        assert cg.code_collection == [
+            ("IFETCH", lhs),
+            ("IFETCH", rhs),
+            ("ILT", condition),
+            ("JZ", 9),
+            ("EMPTY", statement),
+            ("IFETCH", lhs),
+            ("IFETCH", rhs),
+            ("ILT", condition),
+            ("JNZ", 4)
+        ]
+
+
+def test_generate_code_nested_while() -> None:
+    """
+    Test that nested `WHILE` loops jump to their own exits.
+
+    Each loop must exit right after its own backward jump, regardless of how
+    many other loops were generated before it.
+    """
+
+    def _while(node_id: int, statement: Node) -> Node:
+        node = Node(id=node_id, kind="WHILE")
+        node.add_child(Node(id=node_id + 1, kind="VAR", value="a"))
+        node.add_child(statement)
+
+        return node
+
+    inner_loop = _while(3, Node(id=5, kind="EMPTY"))
+    outer_loop = _while(1, inner_loop)
+
+    cg = CodeGenerator()
+    cg.generate_code(outer_loop)
+
+    assert cg.code_collection == [
+        ("IFETCH", outer_loop.children[0]),
+        ("JZ", 7),
+        ("IFETCH", inner_loop.children[0]),
+        ("JZ", 6),
+        ("EMPTY", inner_loop.children[1]),
+        ("JMP", 2),
+        ("JMP", 0)
+    ]
+
+
+def test_generate_code_deep_tree() -> None:
+    """Test that trees deeper than the recursion limit are supported."""
+
+    depth = get_deep_tree_depth()
+    node = build_deep_tree(depth)
+
+    cg = CodeGenerator()
+    cg.generate_code(node)
+
+    first_operand = Node(id=-depth, kind="VAR", value="a")
+    innermost_operand = Node(id=0, kind="CST", value=1)
+
+    assert len(cg.code_collection) == 2 * depth + 1
+    assert cg.code_collection[0] == ("IFETCH", first_operand)
+    assert cg.code_collection[depth] == ("IPUSH", innermost_operand)
+    assert cg.code_collection[-1] == ("ISUB", node)
+
+
+@pytest.mark.parametrize("gc_enabled", [True, False])
+@pytest.mark.parametrize("kind", ["CST", "UNKNOWN"])
+def test_generate_code_restores_gc(gc_enabled: bool, kind: str) -> None:
+    """
+    Test that the garbage collector is left as it was before generating
+    code, even if generating it fails.
+
+    Parameters
+    ----------
+    gc_enabled : bool
+        Whether the garbage collector is enabled before generating code.
+    kind : str
+        The kind of the Node to generate code from. `UNKNOWN` has no handler.
+    """
+
+    gc_was_enabled = gc.isenabled()
+
+    if gc_enabled:
+        gc.enable()
+    else:
+        gc.disable()
+
+    try:
+        node = Node(id=1, kind=kind, value=1)
+
+        if kind == "UNKNOWN":
+            with pytest.raises(KeyError):
+                CodeGenerator().generate_code(node)
+        else:
+            CodeGenerator().generate_code(node)
+
+        assert gc.isenabled() == gc_enabled
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        else:
+            gc.disable()
+
+
 def test_generate_code() -> None:
     """
     Test the `CodeGenerator.generate_code` method.
@@ -286,7 +600,7 @@ def test_generate_code_if_node(mocker: MockerFixture) -> None:
         ("IFETCH", expr_lhs),
         ("IPUSH", expr_rhs),
         ("ILT", expr),
-        ("JZ", if_statement_rhs),
+        ("JZ", 6),
         ("IPUSH", if_statement_rhs),
         ("ISTORE", if_statement_lhs)
     ]
@@ -334,10 +648,10 @@ def test_generate_code_ifelse_node(mocker: MockerFixture) -> None:
         ("IFETCH", expr_lhs),
         ("IPUSH", expr_rhs),
         ("ILT", expr),
-        ("JZ", else_statement_lhs),
+        ("JZ", 7),
         ("IPUSH", if_statement_rhs),
         ("ISTORE", if_statement_lhs),
-        ("JMP", else_statement_rhs),
+        ("JMP", 9),
         ("IPUSH", else_statement_rhs),
         ("ISTORE", else_statement_lhs)
     ]
@@ -372,28 +686,22 @@ def test_generate_code_while_node(mocker: MockerFixture) -> None:
     node.add_child(expr)
     node.add_child(statement)
 
-    _empty_node = Node(id=-1, kind="EMPTY")
-
     cg.generate_code(node)
 
     expected_result = [
         ("IFETCH", expr_lhs),
         ("IPUSH", expr_rhs),
         ("ILT", expr),
-        ("JZ", _empty_node),
+        ("JZ", 8),
         ("IFETCH", statement_lhs),
         ("IPUSH", statement_rhs),
         ("IADD", statement),
-        ("JMP", expr_lhs),
-        ("EMPTY", _empty_node)
+        ("JMP", 0)
     ]
 
-    for result, expected in zip(cg.code_collection, expected_result):
-        expected_instruction, expected_node = result
-        instruction, reference_node = expected
-    
-        assert instruction == expected_instruction
-        assert reference_node == expected_node
+    # In this case, we can check the equality directly because the expected
+    # result uses the exact same `Node` objects.
+    assert cg.code_collection == expected_result
 
     cg.parse_while_node.assert_called()
 
@@ -418,38 +726,43 @@ def test_generate_code_do_while(mocker: MockerFixture) -> None:
     statement_rhs = Node(id=7, kind="CST", value=2)
     statement.add_child(statement_rhs)
 
-    node.add_child(expr)
     node.add_child(statement)
+    node.add_child(expr)
 
     cg.generate_code(node)
 
     expected_result = [
-        ("IFETCH", expr_lhs),
-        ("IPUSH", expr_rhs),
-        ("ILT", expr),
         ("IFETCH", statement_lhs),
         ("IPUSH", statement_rhs),
         ("IADD", statement),
-        ("JNZ", expr_lhs)
+        ("IFETCH", expr_lhs),
+        ("IPUSH", expr_rhs),
+        ("ILT", expr),
+        ("JNZ", 0)
     ]
 
-    for result, expected in zip(cg.code_collection, expected_result):
-        expected_instruction, expected_node = result
-        instruction, reference_node = expected
-    
-        assert instruction == expected_instruction
-        assert reference_node == expected_node
+    # In this case, we can check the equality directly because the expected
+    # result uses the exact same `Node` objects.
+    assert cg.code_collection == expected_result
 
     cg.parse_do_while_node.assert_called()
 
 
-def test_generate_code_sequence(mocker: MockerFixture) -> None:
-    """Test the `CodeGenerator.generate_code` method for `SEQ` nodes."""
+@pytest.mark.parametrize("kind", ["SEQ", "BLOCK"])
+def test_generate_code_sequence(kind: str, mocker: MockerFixture) -> None:
+    """
+    Test the `CodeGenerator.generate_code` method for `SEQ` and `BLOCK` nodes.
+
+    Parameters
+    ----------
+    kind : str
+        The kind of the sequence Node.
+    """
 
     cg = CodeGenerator()
     cg.parse_sequence = mocker.spy(cg, "parse_sequence")
 
-    node = Node(id=1, kind="SEQ")
+    node = Node(id=1, kind=kind)
     statement = Node(id=5, kind="ADD")
     statement_lhs = Node(id=6, kind="VAR", value="b")
     statement.add_child(statement_lhs)
@@ -0,0 +1,250 @@
+"""Implement unit tests for the `src.constant_folder.ConstantFolder` class."""
+
+import pytest
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.constant_folder import ConstantFolder
+from src.lexer import Lexer
+from src.node import Node
+
+
+def _fold(source_code: str) -> tuple[AbstractSyntaxTree, ConstantFolder]:
+    """
+    Build the AST of a source code and fold it.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+
+    Returns
+    -------
+    ast : AbstractSyntaxTree
+        The folded tree.
+    constant_folder : ConstantFolder
+        The pass, after folding the tree.
+    """
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+    ast.build()
+
+    constant_folder = ConstantFolder()
+    constant_folder.fold(ast.root)
+
+    return ast, constant_folder
+
+
+def _render(node: Node) -> str:
+    """
+    Render an expression in a compact, fully parenthesized form.
+
+    Parameters
+    ----------
+    node : Node
+        The expression.
+
+    Returns
+    -------
+    : str
+        The rendered expression.
+    """
+
+    if node.kind == "VAR":
+        return node.value
+
+    if node.kind == "CST":
+        return repr(node.value)
+
+    if node.kind == "SET":
+        variable, expression = node.children
+
+        return f"({variable.value} = {_render(expression)})"
+
+    operators = {"ADD": "+", "SUB": "-", "LT": "<"}
+    lhs, rhs = node.children
+
+    return f"({_render(lhs)} {operators[node.kind]} {_render(rhs)})"
+
+
+def _fold_expression(prefix: str, expression: str) -> str:
+    """
+    Fold the expression of the last statement of a program.
+
+    Parameters
+    ----------
+    prefix : str
+        The statements that run before the expression.
+    expression : str
+        The expression, assigned to the variable `r`.
+
+    Returns
+    -------
+    : str
+        The rendered folded expression.
+    """
+
+    ast, _ = _fold(f"{{ {prefix} r = {expression}; }}")
+
+    (block,) = ast.root.children
+    statement = block.children[-1]
+    (assignment,) = statement.children
+    _, folded_expression = assignment.children
+
+    return _render(folded_expression)
+
+
+def test_init() -> None:
+    """Test the instantiation of ConstantFolder objects."""
+
+    constant_folder = ConstantFolder()
+
+    assert constant_folder.assigned_variables == set()
+    assert constant_folder.folded_count == 0
+
+
+@pytest.mark.parametrize(
+    "expression, expected_result",
+    [
+        ("1 + 2 - 4", "-1"),
+        ("1 < 2", "True"),
+        ("(1 < 2) + 1", "2"),
+        ("a + 1 + 1 + 1", "(a + 3)"),
+        ("a - 1 - 1 + 1", "(a - 1)"),
+        ("1 + a + 1", "(a + 2)"),
+        ("9 - a + 1", "(10 - a)"),
+        ("a + (b + 1) + 1", "((a + b) + 2)"),
+        ("a - (b - 2)", "((a - b) + 2)"),
+        ("a + 2 - 2", "(a + 0)"),
+        ("a + b + 2 - 2", "(a + b)"),
+        ("0 + (a + b)", "(a + b)"),
+        ("(a = 3) - 0", "(a = 3)"),
+        ("a - a", "0"),
+        ("(a + 1) < (a + 1)", "False"),
+        ("a + a", "(a + a)"),
+        ("(c = 1) - (c = 1)", "((c = 1) - (c = 1))")
+    ]
+)
+def test_fold_expression(expression: str, expected_result: str) -> None:
+    """
+    Test folding expressions in which `a` and `b` are set.
+
+    Parameters
+    ----------
+    expression : str
+        The expression to fold.
+    expected_result : str
+        The rendered folded expression.
+    """
+
+    assert _fold_expression("a = 1; b = 2;", expression) == expected_result
+
+
+@pytest.mark.parametrize(
+    "prefix",
+    [
+        "",
+        "if (b) a = 1;",
+        "while (b) a = 1;",
+        "if (b) a = 1; else c = 1;"
+    ]
+)
+def test_fold_unset_variables(prefix: str) -> None:
+    """
+    Test that expressions of variables that may be unset are kept.
+
+    Reading an unset variable raises, and folding `a - a` would hide it.
+
+    Parameters
+    ----------
+    prefix : str
+        The statements that run before the expression.
+    """
+
+    assert _fold_expression(prefix, "a - a") == "(a - a)"
+
+
+@pytest.mark.parametrize(
+    "prefix",
+    [
+        "a = 1;",
+        "b = a;",
+        "if (a) b = 1;",
+        "do a = 1; while (b);",
+        "if (b) a = 1; else a = 2;"
+    ]
+)
+def test_fold_set_variables(prefix: str) -> None:
+    """
+    Test that expressions of variables that are surely set are folded.
+
+    Parameters
+    ----------
+    prefix : str
+        The statements that run before the expression.
+    """
+
+    assert _fold_expression(prefix, "a - a") == "0"
+
+
+def test_fold_keeps_booleans() -> None:
+    """Test that `x + 0` is kept when `x` may be a boolean."""
+
+    assert _fold_expression("a = 1 < 2;", "a + 0") == "(a + 0)"
+    assert _fold_expression("a = 1 < 2;", "(a < 3) - 0") == "((a < 3) - 0)"
+
+
+def test_fold_statements() -> None:
+    """Test that conditions and nested statements are folded too."""
+
+    ast, constant_folder = _fold(
+        "{ i = 0; while (i < 2 + 1) { if (1 < 2) i = i + 1 + 1; } }"
+    )
+
+    (block,) = ast.root.children
+    _, while_statement = block.children
+    condition, body = while_statement.children
+    if_condition, if_statement = body.children[0].children
+    (increment,) = if_statement.children
+
+    assert _render(condition) == "(i < 3)"
+    assert _render(if_condition) == "True"
+    assert _render(increment) == "(i = (i + 2))"
+    assert constant_folder.folded_count == 3
+
+
+def test_fold_deep_tree() -> None:
+    """Test folding a chain longer than the recursion limit."""
+
+    ast, _ = _fold("{ a = 0; a = a" + " + 1" * 5000 + "; }")
+
+    (block,) = ast.root.children
+    (assignment,) = block.children[-1].children
+    _, expression = assignment.children
+
+    assert _render(expression) == "(a + 5000)"
+
+
+@pytest.mark.parametrize(
+    "tree_option, node_class",
+    [("use_arena", "ArenaNode"), ("hash_consing", "SharedNode")]
+)
+def test_fold_unsupported_tree(tree_option: str, node_class: str) -> None:
+    """
+    Test that trees of other Nodes than `Node` objects are rejected.
+
+    Parameters
+    ----------
+    tree_option : str
+        The `AbstractSyntaxTree` option that builds the tree.
+    node_class : str
+        The class of the Nodes of the tree.
+    """
+
+    ast = AbstractSyntaxTree(
+        source_code=Lexer.parse_source_code("{ a = 1 + 2; b = a - a; }"),
+        **{tree_option: True}
+    )
+    ast.build()
+
+    with pytest.raises(ValueError, match=node_class):
+        ConstantFolder().fold(ast.root)
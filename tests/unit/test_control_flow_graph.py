@@ -0,0 +1,224 @@
+"""Implement unit tests for the `src.control_flow_graph` module."""
+
+import pytest
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.control_flow_graph import BasicBlock, ControlFlowGraph
+from src.lexer import Lexer
+from src.node import Node
+from src.virtual_machine import VirtualMachine
+from tests.unit.helpers import build_cfg, build_deep_tree, get_deep_tree_depth
+
+
+def test_init():
+    """Test the instantiation of ControlFlowGraph objects."""
+
+    cfg = ControlFlowGraph()
+
+    assert cfg.blocks == [cfg.entry]
+    assert cfg.entry.terminator == "halt"
+
+
+def test_basic_block_str():
+    """Test the string representation of BasicBlock objects."""
+
+    block = BasicBlock(index=0)
+    block.statements.append(Node(id=1, kind="EXPR"))
+    block.successors.extend([BasicBlock(index=1), BasicBlock(index=2)])
+
+    assert str(block) == "B0: 1 statements, branch B1, B2"
+    assert str(BasicBlock(index=3)) == "B3: 0 statements, halt"
+
+
+@pytest.mark.parametrize(
+    "source_code, expected_result",
+    [
+        ("{ a = 1; b = 2; }", ["B0: 2 statements, halt"]),
+        (
+            "{ a = 1; if (a) b = 1; c = 1; }",
+            [
+                "B0: 1 statements, branch B1, B2",
+                "B1: 1 statements, jump B2",
+                "B2: 1 statements, halt"
+            ]
+        ),
+        (
+            "{ a = 1; if (a) b = 1; else b = 2; }",
+            [
+                "B0: 1 statements, branch B1, B2",
+                "B1: 1 statements, jump B3",
+                "B2: 1 statements, jump B3",
+                "B3: 0 statements, halt"
+            ]
+        ),
+        (
+            "{ i = 0; while (i < 3) i = i + 1; }",
+            [
+                "B0: 1 statements, jump B1",
+                "B1: 0 statements, branch B2, B3",
+                "B2: 1 statements, jump B1",
+                "B3: 0 statements, halt"
+            ]
+        ),
+        (
+            "{ i = 0; do i = i + 1; while (i < 3); }",
+            [
+                "B0: 1 statements, jump B1",
+                "B1: 1 statements, branch B1, B2",
+                "B2: 0 statements, halt"
+            ]
+        )
+    ]
+)
+def test_build(source_code: str, expected_result: list):
+    """
+    Test the blocks built for each statement.
+
+    Parameters
+    ----------
+    source_code : str
+        The program.
+    expected_result : list of str
+        The blocks of its CFG.
+    """
+
+    cfg = build_cfg(source_code)
+
+    assert str(cfg) == "\n".join(expected_result)
+
+
+def test_build_copies_expressions():
+    """Test that the statements of the blocks are copies of the AST's."""
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code("{ a = 1; }"))
+    ast.build()
+
+    cfg = ControlFlowGraph()
+    cfg.build(ast.root)
+
+    statement, = cfg.entry.statements
+    set_node, = statement.children
+
+    assert statement.kind == "EXPR"
+    assert statement is not ast.root.children[0]
+    assert [child.kind for child in set_node.children] == ["VAR", "CST"]
+
+
+@pytest.mark.parametrize("tree_option", ["use_arena", "hash_consing"])
+def test_build_copies_any_tree(tree_option: str):
+    """
+    Test that the expressions of arena and hash-consed trees are copied into
+    `Node` objects.
+
+    Parameters
+    ----------
+    tree_option : str
+        The `AbstractSyntaxTree` option that builds the tree.
+    """
+
+    source_code = "{ i = 0; while (i < 3) i = i + 1; a = i + 1; }"
+
+    ast = AbstractSyntaxTree(
+        source_code=Lexer.parse_source_code(source_code), **{tree_option: True}
+    )
+    ast.build()
+
+    cfg = ControlFlowGraph()
+    cfg.build(ast.root)
+
+    assert str(cfg) == str(build_cfg(source_code))
+    assert all(
+        type(node) is Node
+        for block in cfg.blocks
+        for statement in block.statements
+        for node in ControlFlowGraph.get_evaluation_order(statement)
+    )
+
+
+def test_compute_dominators():
+    """Test the dominators and the dominance frontiers of the blocks."""
+
+    cfg = build_cfg("{ i = 0; while (i < 3) { if (i) a = 1; i = i + 1; } }")
+    cfg.compute_dominators()
+
+    # B0 -> B1 (header) -> B2 (if) -> B3 (then) -> B4 (join) -> B1, B1 -> B5
+    entry, header, branch, then, join, exit_ = cfg.blocks
+
+    assert [block.immediate_dominator for block in cfg.blocks] == [
+        entry, entry, header, branch, branch, header
+    ]
+    assert then.dominance_frontier == {join}
+    assert join.dominance_frontier == {header}
+    assert header.dominance_frontier == {header}
+    assert cfg.dominator_tree()[header] == [branch, exit_]
+
+
+def test_reverse_postorder():
+    """Test that blocks come before their successors, but on back edges."""
+
+    cfg = build_cfg("{ i = 0; while (i < 3) i = i + 1; a = 1; }")
+
+    entry, header, body, exit_ = cfg.blocks
+
+    assert cfg.reverse_postorder() in [
+        [entry, header, body, exit_], [entry, header, exit_, body]
+    ]
+
+
+@pytest.mark.parametrize(
+    "superinstructions, expected_loop",
+    [
+        (
+            False,
+            [
+                "IFETCH", "IFETCH", "ILT", "JZ",
+                "IFETCH", "IPUSH", "IADD", "ISTORE", "IPOP",
+                "IFETCH", "IFETCH", "ILT", "JNZ"
+            ]
+        ),
+        (True, ["JGE", "INC", "JLT"])
+    ]
+)
+def test_generate_code(superinstructions: bool, expected_loop: list):
+    """
+    Test that the generated code tests the loop condition at the bottom.
+
+    Parameters
+    ----------
+    superinstructions : bool
+        Whether to emit fused instructions.
+    expected_loop : list of str
+        The instructions of the loop, with its guard.
+    """
+
+    cfg = build_cfg("{ i = 0; n = 10; while (i < n) i = i + 1; }")
+    code_collection = cfg.generate_code(superinstructions=superinstructions)
+
+    assert [instruction for instruction, _ in code_collection] == [
+        "IPUSH", "ISTORE", "IPOP", "IPUSH", "ISTORE", "IPOP",
+        *expected_loop,
+        "HALT"
+    ]
+
+    vm = VirtualMachine(code_collection=code_collection)
+    vm.run()
+
+    assert vm.variables == {"i": 10, "n": 10}
+
+
+def test_generate_code_deep_tree():
+    """Test that expressions deeper than the recursion limit are supported."""
+
+    depth = get_deep_tree_depth()
+
+    cfg = build_cfg("{ a = 1; b = 0; }")
+    cfg.entry.statements[1].children[0].children[1].replace(
+        build_deep_tree(depth)
+    )
+
+    vm = VirtualMachine(
+        code_collection=cfg.generate_code(), stack_size=depth + 2
+    )
+    vm.run()
+
+    assert vm.variables == {"a": 1, "b": 1 - depth % 2}
@@ -0,0 +1,142 @@
+"""Implement unit tests for the `src.dataflow_analysis` module."""
+
+import pytest
+
+from src.dataflow_analysis import (
+    AvailableCopies,
+    DataflowAnalysis,
+    Liveness,
+    ReachingDefinitions
+)
+from tests.unit.helpers import build_cfg
+
+
+def test_init():
+    """Test the instantiation of DataflowAnalysis objects."""
+
+    cfg = build_cfg("{ a = 1; b = a + c; }")
+    analysis = DataflowAnalysis(cfg)
+
+    assert analysis.cfg is cfg
+    assert analysis.is_forward
+    assert analysis.variables == {"a", "b", "c"}
+    assert analysis.inputs == analysis.outputs == {}
+
+
+def test_transfer_not_implemented():
+    """Test that the base class has no transfer function."""
+
+    cfg = build_cfg("{ a = 1; }")
+
+    with pytest.raises(NotImplementedError):
+        DataflowAnalysis(cfg).solve()
+
+
+def test_reaching_definitions():
+    """Test the assignments that reach the end of a loop, and after it."""
+
+    cfg = build_cfg("{ i = 0; while (i < 3) i = i + 1; a = i; }")
+    entry, header, body, exit_ = cfg.blocks
+
+    reaching_definitions = ReachingDefinitions(cfg)
+    reaching_definitions.solve()
+
+    initial = id(entry.statements[0].children[0])
+    increment = id(body.statements[0].children[0])
+
+    # Both assignments of `i` reach the condition, and `a` is not set yet.
+    assert reaching_definitions.inputs[header] == {
+        ("i", initial), ("i", increment), ("a", None)
+    }
+    assert ("a", id(exit_.statements[0].children[0])) in (
+        reaching_definitions.outputs[exit_]
+    )
+
+
+def test_reaching_definitions_unset_reads():
+    """Test that the reads of variables that may not be set are found."""
+
+    cfg = build_cfg("{ a = 1; if (a < 2) b = 1; c = b + a; }")
+
+    reaching_definitions = ReachingDefinitions(cfg)
+    reaching_definitions.solve()
+
+    unset_reads = reaching_definitions.get_unset_reads()
+    exit_ = cfg.blocks[-1]
+    b, a = exit_.statements[0].children[0].children[1].children
+
+    assert unset_reads == {id(b)}
+    assert id(a) not in unset_reads
+
+
+def test_liveness():
+    """Test the variables read after each point of a loop."""
+
+    cfg = build_cfg("{ i = 0; t = 5; while (i < 3) { t = i; i = i + 1; } }")
+    entry, header, body, _ = cfg.blocks
+
+    liveness = Liveness(cfg)
+    liveness.solve()
+
+    # The facts flow backward: the inputs are at the end of each block. The
+    # end of the program reads every variable, and `t = i` may reach it.
+    assert liveness.inputs[body] == {"i", "t"}
+
+    # `t` is set before it is read in the body, and neither is read before
+    # they are set.
+    assert liveness.outputs[body] == {"i"}
+    assert liveness.outputs[header] == {"i", "t"}
+    assert liveness.outputs[entry] == set()
+
+
+def test_liveness_temporaries():
+    """Test that the end of the program doesn't read hidden temporaries."""
+
+    cfg = build_cfg("{ a = 1; }")
+    cfg.entry.statements[0].children[0].children[0].value = "$0"
+
+    liveness = Liveness(cfg)
+    liveness.solve()
+
+    assert liveness.outputs[cfg.entry] == set()
+
+
+def test_liveness_unset_reads():
+    """Test that the reads that may raise read every variable."""
+
+    cfg = build_cfg("{ x = 1; y = z; x = 2; }")
+
+    reaching_definitions = ReachingDefinitions(cfg)
+    reaching_definitions.solve()
+
+    liveness = Liveness(cfg, reaching_definitions.get_unset_reads())
+    liveness.solve()
+
+    facts = {
+        id(node): live_variables
+        for _, node, live_variables in liveness.get_node_facts(cfg.entry)
+    }
+
+    # `x = 1` is read if the program stops at `z`.
+    assert "x" in facts[id(cfg.entry.statements[0].children[0])]
+
+
+def test_available_copies():
+    """Test the copies that are available on every path."""
+
+    cfg = build_cfg(
+        "{ a = 1; c = a; if (a < 2) b = c; else a = 2; d = c; e = 1; f = e; }"
+    )
+    entry, then, else_, exit_ = cfg.blocks
+
+    available_copies = AvailableCopies(cfg)
+    available_copies.solve()
+
+    copy = id(entry.statements[1].children[0])
+
+    assert available_copies.copies[copy] == ("c", "a")
+    assert copy in available_copies.outputs[then]
+
+    # `a` is set again on one of the paths.
+    assert copy not in available_copies.outputs[else_]
+    assert copy not in available_copies.inputs[exit_]
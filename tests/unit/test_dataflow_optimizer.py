@@ -0,0 +1,212 @@
+"""Implement unit tests for the `src.dataflow_optimizer` module."""
+
+import pytest
+
+from src.control_flow_graph import ControlFlowGraph
+from src.dataflow_optimizer import DataflowOptimizer
+from src.virtual_machine import VirtualMachine
+from tests.unit.helpers import build_cfg, build_deep_tree, check_cfg_pass
+
+
+def _optimize(
+    source_code: str, superinstructions: bool = False
+) -> tuple[DataflowOptimizer, ControlFlowGraph]:
+    """
+    Optimize a Tiny-C program, and check that it computes the same values
+    (and types), in as many instructions or fewer.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+    superinstructions : bool, optional (default = False)
+        Whether to emit fused instructions.
+
+    Returns
+    -------
+    dataflow_optimizer : DataflowOptimizer
+        The pass, after running on the CFG of the program.
+    cfg : ControlFlowGraph
+        The CFG.
+    """
+
+    dataflow_optimizer = DataflowOptimizer(superinstructions=superinstructions)
+
+    cfg, vm, optimized_vm = check_cfg_pass(
+        source_code, dataflow_optimizer.optimize, superinstructions
+    )
+
+    assert optimized_vm.instruction_count <= vm.instruction_count
+
+    if dataflow_optimizer.removed_store_count:
+        assert optimized_vm.instruction_count < vm.instruction_count
+
+    return dataflow_optimizer, cfg
+
+
+def test_init():
+    """Test the instantiation of DataflowOptimizer objects."""
+
+    dataflow_optimizer = DataflowOptimizer()
+
+    assert not dataflow_optimizer.superinstructions
+    assert dataflow_optimizer.propagated_copy_count == 0
+    assert dataflow_optimizer.removed_store_count == 0
+
+
+@pytest.mark.parametrize("superinstructions", [False, True])
+def test_eliminate_dead_stores(superinstructions: bool):
+    """
+    Test that assignments overwritten before they are read are removed.
+
+    Parameters
+    ----------
+    superinstructions : bool
+        Whether to emit fused instructions.
+    """
+
+    dataflow_optimizer, cfg = _optimize(
+        "{ a = 1; b = a + 1; a = 2; b = (a = 3) + a; }",
+        superinstructions=superinstructions
+    )
+
+    # `b` and `a` are set again before they are read, so only the last
+    # statement is left (`a = 3` is read after it).
+    assert dataflow_optimizer.removed_store_count == 3
+    assert len(cfg.entry.statements) == 1
+
+
+def test_eliminate_dead_stores_nested():
+    """Test that assignments in expressions are replaced with their values."""
+
+    dataflow_optimizer, cfg = _optimize("{ b = (a = 1) + 1; a = b; }")
+
+    assert dataflow_optimizer.removed_store_count == 1
+
+    first_statement = cfg.entry.statements[0].children[0]
+
+    assert [child.kind for child in first_statement.children[1].children] == [
+        "CST", "CST"
+    ]
+
+
+def test_eliminate_dead_stores_loop():
+    """Test that stores read by later iterations, or after the loop, stay."""
+
+    dataflow_optimizer, _ = _optimize(
+        "{ i = 0; p = 0; while (i < 5) { t = p; p = i; i = i + 1; } }"
+    )
+
+    assert dataflow_optimizer.removed_store_count == 0
+
+
+def test_eliminate_dead_stores_cascade():
+    """Test that stores only read by dead stores are removed as well."""
+
+    dataflow_optimizer, cfg = _optimize("{ a = 1; b = a; c = b; c = 2; b = 3; }")
+
+    assert dataflow_optimizer.removed_store_count == 2
+    assert len(cfg.entry.statements) == 3
+
+
+@pytest.mark.parametrize(
+    "source_code, variables",
+    [
+        # `z` may not be set, so reading it may stop the program.
+        ("{ i = 0; x = 1; if (i) z = 3; y = z; x = 2; }", {"i": 0, "x": 1}),
+        # Reading it is kept, even if `y` is overwritten.
+        ("{ i = 0; if (i) z = 3; y = z; y = 2; }", {"i": 0})
+    ]
+)
+def test_eliminate_dead_stores_unset_variable(
+    source_code: str, variables: dict
+):
+    """
+    Test that the variables are the same when a read raises.
+
+    Parameters
+    ----------
+    source_code : str
+        The program.
+    variables : dict
+        The variables when it stops.
+    """
+
+    cfg = build_cfg(source_code)
+    DataflowOptimizer().optimize(cfg)
+
+    vm = VirtualMachine(code_collection=cfg.generate_code())
+
+    with pytest.raises(KeyError, match="z"):
+        vm.run()
+
+    assert vm.variables == variables
+
+
+def test_propagate_copies():
+    """Test that reads of copies read the copied variable instead."""
+
+    dataflow_optimizer, cfg = _optimize("{ a = 1; c = a; b = c + 1; c = 5; }")
+
+    assert dataflow_optimizer.propagated_copy_count == 1
+    assert dataflow_optimizer.removed_store_count == 1
+
+    _, increment, _ = cfg.entry.statements
+
+    assert increment.children[0].children[1].children[0].value == "a"
+
+
+def test_propagate_copies_fibonacci():
+    """Test that `b = c + a` reads `b` after `a = b` in the Fibonacci loop."""
+
+    dataflow_optimizer, cfg = _optimize(
+        "{ i = 1; a = 0; b = 1; while (i < 10) "
+        "{ c = a; a = b; b = c + a; i = i + 1; } }"
+    )
+
+    assert dataflow_optimizer.propagated_copy_count == 1
+
+    _, _, body, _ = cfg.blocks
+    addition = body.statements[2].children[0].children[1]
+
+    assert [child.value for child in addition.children] == ["c", "b"]
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        # `a` is set after the copy.
+        "{ a = 1; c = a; a = 2; b = c + 1; }",
+        # The copy doesn't run on every path.
+        "{ a = 1; if (a < 2) c = a; else c = 3; b = c + 1; }",
+        # `c` is set along the loop.
+        "{ i = 0; c = i; while (i < 3) { b = c; c = i; i = i + 1; } }"
+    ]
+)
+def test_propagate_copies_not_available(source_code: str):
+    """
+    Test that copies that may not hold are not propagated.
+
+    Parameters
+    ----------
+    source_code : str
+        The program.
+    """
+
+    dataflow_optimizer, _ = _optimize(source_code)
+
+    assert dataflow_optimizer.propagated_copy_count == 0
+
+
+def test_optimize_deep_tree():
+    """Test that expressions deeper than the recursion limit are supported."""
+
+    # b = a - (a - (a - ... (a - 1)))
+    cfg = build_cfg("{ a = 1; b = 0; b = 2; }")
+    cfg.entry.statements[1].children[0].children[1].replace(build_deep_tree())
+
+    dataflow_optimizer = DataflowOptimizer()
+    dataflow_optimizer.optimize(cfg)
+
+    assert dataflow_optimizer.removed_store_count == 1
+    assert len(cfg.entry.statements) == 2
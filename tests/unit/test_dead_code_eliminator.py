@@ -0,0 +1,204 @@
+"""Implement unit tests for the `src.dead_code_eliminator` module."""
+
+import pytest
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.constant_folder import ConstantFolder
+from src.dead_code_eliminator import DeadCodeEliminator
+from src.lexer import Lexer
+from src.node import Node
+
+
+EXPRESSION_KINDS = ["VAR", "CST", "ADD", "SUB", "LT", "SET"]
+
+
+def _eliminate(source_code: str) -> tuple[Node, DeadCodeEliminator]:
+    """
+    Build the AST of a source code, fold it and remove its dead code.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+
+    Returns
+    -------
+    root : Node
+        The root of the tree.
+    dead_code_eliminator : DeadCodeEliminator
+        The pass, after running on the tree.
+    """
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+    ast.build()
+
+    ConstantFolder().fold(ast.root)
+
+    dead_code_eliminator = DeadCodeEliminator()
+    dead_code_eliminator.eliminate(ast.root)
+
+    return ast.root, dead_code_eliminator
+
+
+def _render(node: Node) -> str:
+    """
+    Render the statements of a tree in a compact form.
+
+    Parameters
+    ----------
+    node : Node
+        The root of the tree.
+
+    Returns
+    -------
+    : str
+        The kinds of the statements, with their nested statements between
+        parenthesis. Expressions are rendered as `x`.
+    """
+
+    if node.kind in EXPRESSION_KINDS:
+        return "x"
+
+    return f"{node.kind}({', '.join(_render(child) for child in node.children)})"
+
+
+def test_init() -> None:
+    """Test the instantiation of DeadCodeEliminator objects."""
+
+    dead_code_eliminator = DeadCodeEliminator()
+
+    assert dead_code_eliminator.diverging_statements == {}
+    assert dead_code_eliminator.removed_count == 0
+
+
+@pytest.mark.parametrize(
+    "source_code, expected_result",
+    [
+        # Constant conditions.
+        ("{ if (1 < 2) a = 1; }", "PROG(BLOCK(EXPR(x)))"),
+        ("{ if (2 < 1) a = 1; b = 1; }", "PROG(BLOCK(EXPR(x)))"),
+        ("{ if (1) a = 1; else b = 1; }", "PROG(BLOCK(EXPR(x)))"),
+        ("{ if (1 - 1) { a = 1; } else { } }", "PROG()"),
+        ("{ while (0) a = 1; }", "PROG()"),
+        ("{ do { a = 1; } while (1 < 0); }", "PROG(BLOCK(BLOCK(EXPR(x))))"),
+        # Constant conditions of nested statements.
+        (
+            "{ while (a) if (0) b = 1; }",
+            "PROG(BLOCK(WHILE(x, BLOCK())))"
+        ),
+        # Statements that do nothing.
+        ("{ ; {} 1 < 2; a = 1; { ; } }", "PROG(BLOCK(EXPR(x)))"),
+        ("{ if (a) ; }", "PROG(BLOCK(EXPR(x)))"),
+        ("{ if (a) ; else ; }", "PROG(BLOCK(EXPR(x)))"),
+        ("{ if (a) b = 1; else ; }", "PROG(BLOCK(IF(x, EXPR(x))))"),
+        ("{ if (a) ; else b = 1; }", "PROG(BLOCK(IFELSE(x, BLOCK(), EXPR(x))))"),
+        ("{ while (a) ; }", "PROG(BLOCK(WHILE(x, BLOCK())))"),
+        # Code after loops that never end.
+        (
+            "{ a = 1; while (1) a = a + 1; b = 1; c = 1; }",
+            "PROG(BLOCK(EXPR(x), WHILE(x, EXPR(x))))"
+        ),
+        (
+            "{ { do a = 1; while (0 < 1); b = 1; } c = 1; }",
+            "PROG(BLOCK(BLOCK(DO(EXPR(x), x))))"
+        ),
+        (
+            "{ if (a) while (1) ; else while (1) ; b = 1; }",
+            "PROG(BLOCK(IFELSE(x, WHILE(x, BLOCK()), WHILE(x, BLOCK()))))"
+        ),
+        # Loops that may end.
+        (
+            "{ if (a) while (1) ; b = 1; }",
+            "PROG(BLOCK(IF(x, WHILE(x, BLOCK())), EXPR(x)))"
+        ),
+        (
+            "{ while (a) while (1) ; b = 1; }",
+            "PROG(BLOCK(WHILE(x, WHILE(x, BLOCK())), EXPR(x)))"
+        )
+    ]
+)
+def test_eliminate(source_code: str, expected_result: str) -> None:
+    """
+    Test removing dead code.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+    expected_result : str
+        The rendered tree, after removing its dead code.
+    """
+
+    root, _ = _eliminate(source_code)
+
+    assert _render(root) == expected_result
+
+
+def test_eliminate_sequence() -> None:
+    """Test that `SEQ` wrappers around a single statement are removed."""
+
+    def _statement(node_id: int) -> Node:
+        statement = Node(id=node_id, kind="EXPR")
+        statement.add_child(Node(id=-node_id, kind="VAR", value="a"))
+
+        return statement
+
+    root = Node(id=0, kind="PROG")
+    outer_sequence = Node(id=1, kind="SEQ")
+    inner_sequence = Node(id=2, kind="SEQ")
+
+    root.add_child(outer_sequence)
+    outer_sequence.add_child(inner_sequence)
+    outer_sequence.add_child(_statement(3))
+    inner_sequence.add_child(Node(id=4, kind="EMPTY"))
+    inner_sequence.add_child(_statement(5))
+
+    dead_code_eliminator = DeadCodeEliminator()
+    dead_code_eliminator.eliminate(root)
+
+    assert _render(root) == "PROG(SEQ(EXPR(x), EXPR(x)))"
+    assert dead_code_eliminator.removed_count == 2
+
+
+def test_eliminate_deep_tree() -> None:
+    """Test removing dead code from blocks nested beyond the recursion limit."""
+
+    root = Node(id=0, kind="PROG")
+    node = root
+
+    for node_id in range(1, 5001):
+        block = Node(id=node_id, kind="BLOCK")
+        node.add_child(block)
+        node = block
+
+    node.add_child(Node(id=5001, kind="EMPTY"))
+
+    DeadCodeEliminator().eliminate(root)
+
+    assert _render(root) == "PROG()"
+
+
+@pytest.mark.parametrize(
+    "tree_option, node_class",
+    [("use_arena", "ArenaNode"), ("hash_consing", "SharedNode")]
+)
+def test_eliminate_unsupported_tree(tree_option: str, node_class: str) -> None:
+    """
+    Test that trees of other Nodes than `Node` objects are rejected.
+
+    Parameters
+    ----------
+    tree_option : str
+        The `AbstractSyntaxTree` option that builds the tree.
+    node_class : str
+        The class of the Nodes of the tree.
+    """
+
+    ast = AbstractSyntaxTree(
+        source_code=Lexer.parse_source_code("{ if (0) a = 1; ; }"),
+        **{tree_option: True}
+    )
+    ast.build()
+
+    with pytest.raises(ValueError, match=node_class):
+        DeadCodeEliminator().eliminate(ast.root)
@@ -1,9 +1,14 @@
 """Implement unit tests for the `src.interpreter` module."""
 
+import pytest
+
 from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.bytecode import Bytecode
+from src.closure_evaluator import ClosureEvaluator
 from src.code_generator import CodeGenerator
 from src.interpreter import create_virtual_machine
 from src.lexer import Lexer
+from src.register_virtual_machine import RegisterVirtualMachine
 
 
 def test_create_virtual_machine():
@@ -34,13 +39,56 @@ def test_create_virtual_machine():
     code_generator = CodeGenerator()
     code_generator.generate_code(expected_ast.root)
 
-    for expected, tested in zip(code_generator.code_collection, vm.code_collection):
-        expected_instruction, expected_node = expected
-        tested_instruction, tested_node = tested
-
-        assert expected_instruction == tested_instruction
-        assert expected_node == tested_node
+    assert vm.bytecode == Bytecode.assemble(code_generator.code_collection)
 
     vm.run()
 
     assert vm.variables == {"a": 1, "b": 2, "c": 2, "d": 9}
+
+
+def test_create_virtual_machine_closure_engine():
+    """Test the `create_virtual_machine` function with the `closure` engine."""
+
+    vm = create_virtual_machine("{ a = 1; b = a + 1; }", engine="closure")
+
+    assert isinstance(vm, ClosureEvaluator)
+
+    vm.run()
+
+    assert vm.variables == {"a": 1, "b": 2}
+
+
+def test_create_virtual_machine_register_engine():
+    """Test the `create_virtual_machine` function with the `register` engine."""
+
+    vm = create_virtual_machine("{ a = 1; b = a + 1; }", engine="register")
+
+    assert isinstance(vm, RegisterVirtualMachine)
+    assert len(vm.code_collection) == 3
+
+    vm.run()
+
+    assert vm.variables == {"a": 1, "b": 2}
+
+
+def test_create_virtual_machine_unsupported_engine():
+    """Test that `create_virtual_machine` rejects unknown engines."""
+
+    with pytest.raises(ValueError):
+        create_virtual_machine("{ a = 1; }", engine="unknown")
+
+
+def test_create_virtual_machine_optimize():
+    """Test that `create_virtual_machine` folds constants if requested."""
+
+    source_code = "{ a = 1; b = a + 1 + 1 + 1; }"
+
+    vm = create_virtual_machine(source_code)
+    optimized_vm = create_virtual_machine(source_code, optimize=True)
+
+    assert len(optimized_vm.bytecode.code) < len(vm.bytecode.code)
+
+    vm.run()
+    optimized_vm.run()
+
+    assert optimized_vm.variables == vm.variables == {"a": 1, "b": 4}
@@ -184,3 +184,107 @@ def test_preprocess_source_code():
 
     assert Lexer.preprocess_source_code(source_code) == expected_preprocessed_code
 
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        "{ a = 1; }",
+        "{a=1;}",
+        "\t{\r\n  a =\t1 ;\r\n}\r\n",
+        "\n\n{ a\n=\n1\n;\n}"
+    ]
+)
+def test_parse_source_code_whitespace(source_code: str) -> None:
+    """
+    Test that any whitespace separates lexemes, and that it is optional.
+
+    Parameters
+    ----------
+    source_code : str
+        The source code to parse.
+    """
+
+    expected_parsed_code = [
+        ("LBRA", None),
+        ("ID", "a"),
+        ("EQUAL", None),
+        ("INT", 1),
+        ("SEMI", None),
+        ("RBRA", None)
+    ]
+
+    assert list(Lexer.parse_source_code(source_code)) == expected_parsed_code
+
+
+@pytest.mark.parametrize(
+    "source_code, expected_parsed_code",
+    [
+        ("9876543210123456789", [("INT", 9876543210123456789)]),
+        ("while(i<10)", [
+            ("WHILE_SYM", None),
+            ("LPAR", None),
+            ("ID", "i"),
+            ("LESS", None),
+            ("INT", 10),
+            ("RPAR", None)
+        ]),
+        ("do{}", [("DO_SYM", None), ("LBRA", None), ("RBRA", None)])
+    ]
+)
+def test_parse_source_code_lexemes(
+    source_code: str, expected_parsed_code: list
+) -> None:
+    """
+    Test lexemes that are not separated by whitespace.
+
+    Parameters
+    ----------
+    source_code : str
+        The source code to parse.
+    expected_parsed_code : list
+        The expected symbols.
+    """
+
+    assert list(Lexer.parse_source_code(source_code)) == expected_parsed_code
+
+
+def test_parse_source_code_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that lexemes are not split between chunks."""
+
+    monkeypatch.setattr(Lexer, "chunk_size", 3)
+
+    source_code = "{ i = 12345; while (i < 678) i = i + 1; }"
+
+    expected_parsed_code = [
+        Lexer.parse_word(word)
+        for word in Lexer.preprocess_source_code(source_code)
+    ]
+
+    assert list(Lexer.parse_source_code(source_code)) == expected_parsed_code
+
+
+def test_parse_source_code_is_lazy() -> None:
+    """Test that symbols are yielded before the whole source is scanned."""
+
+    symbols = Lexer.parse_source_code("{ a = 1; } $")
+
+    assert next(symbols) == ("LBRA", None)
+
+    with pytest.raises(SyntaxError):
+        list(symbols)
+
+
+@pytest.mark.parametrize("source_code", ["abc", "a * b", "A", "_"])
+def test_parse_source_code_unsupported(source_code: str) -> None:
+    """
+    Test that unsupported words and characters raise a `SyntaxError`.
+
+    Parameters
+    ----------
+    source_code : str
+        The source code to parse.
+    """
+
+    with pytest.raises(SyntaxError):
+        list(Lexer.parse_source_code(source_code))
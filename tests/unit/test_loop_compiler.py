@@ -0,0 +1,233 @@
+"""Implement unit tests for the `src.loop_compiler.LoopCompiler` class."""
+
+import pytest
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.code_generator import CodeGenerator
+from src.lexer import Lexer
+from src.loop_compiler import CompiledLoop, LoopCompiler
+from src.variable_slots import VariableSlots
+from src.virtual_machine import VirtualMachine
+from tests.unit.helpers import (
+    allocate_slots,
+    build_deep_tree,
+    decode_program,
+    get_deep_tree_depth
+)
+
+
+SLOTS = CodeGenerator.variable_slots
+
+
+# while (i < 3) { s = s + i; i = i + 1; }
+WHILE_LOOP = decode_program([
+    ("IFETCH", "i"),
+    ("IPUSH", 3),
+    ("ILT", None),
+    ("JZ", 15),
+    ("IFETCH", "s"),
+    ("IFETCH", "i"),
+    ("IADD", None),
+    ("ISTORE", "s"),
+    ("IPOP", None),
+    ("IFETCH", "i"),
+    ("IPUSH", 1),
+    ("IADD", None),
+    ("ISTORE", "i"),
+    ("IPOP", None),
+    ("JMP", 0),
+    ("HALT", None)
+])
+
+
+def test_init() -> None:
+    """Test the instantiation of LoopCompiler objects."""
+
+    loop_compiler = LoopCompiler(program=WHILE_LOOP)
+
+    assert loop_compiler.program is WHILE_LOOP
+
+
+def test_compile() -> None:
+    """Test compiling a `while` loop and running it from its header."""
+
+    compiled_loop = LoopCompiler(program=WHILE_LOOP).compile(0, 14)
+
+    assert isinstance(compiled_loop, CompiledLoop)
+    assert compiled_loop.read_variables == [SLOTS["i"], SLOTS["s"]]
+
+    slots = allocate_slots(i=0, s=0)
+    exit_index, executed = compiled_loop.function(slots)
+
+    # Three iterations of 15 instructions, and the test that exits the loop.
+    assert VariableSlots(slots) == {"i": 3, "s": 3}
+    assert exit_index == 15
+    assert executed == 3 * 15 + 4
+
+
+def test_compile_keeps_stored_values() -> None:
+    """Test that values on the stack are computed before a variable changes."""
+
+    # do { a = b + (b = a); } while (a < 10);
+    program = decode_program([
+        ("IFETCH", "b"),
+        ("IFETCH", "a"),
+        ("ISTORE", "b"),
+        ("IADD", None),
+        ("ISTORE", "a"),
+        ("IPOP", None),
+        ("IFETCH", "a"),
+        ("IPUSH", 10),
+        ("ILT", None),
+        ("JNZ", 0),
+        ("HALT", None)
+    ])
+
+    compiled_loop = LoopCompiler(program=program).compile(0, 9)
+
+    slots = allocate_slots(a=1, b=2)
+    compiled_loop.function(slots)
+
+    assert VariableSlots(slots) == {"a": 11, "b": 7}
+
+
+def test_compile_fused_instructions() -> None:
+    """Test compiling a loop with fused instructions."""
+
+    # while (i < n) { s = s + (n - i); i = i + 1; }
+    program = decode_program([
+        ("JGE", ("i", "n", 8)),
+        ("IFETCH", "s"),
+        ("SUBVV", ("n", "i")),
+        ("IADD", None),
+        ("ISTORE", "s"),
+        ("IPOP", None),
+        ("INC", ("i", 1)),
+        ("JMP", 0),
+        ("HALT", None)
+    ])
+
+    compiled_loop = LoopCompiler(program=program).compile(0, 7)
+
+    assert compiled_loop.read_variables == [SLOTS["i"], SLOTS["n"], SLOTS["s"]]
+
+    slots = allocate_slots(i=0, n=3, s=0)
+    exit_index, executed = compiled_loop.function(slots)
+
+    assert VariableSlots(slots) == {"i": 3, "n": 3, "s": 6}
+    assert exit_index == 8
+    assert executed == 3 * 8 + 1
+
+
+def test_compile_inverted_loop() -> None:
+    """Test compiling a loop tested at its bottom by a `JLT` instruction."""
+
+    # if (i < n) do i = i + 2; while (i < n);
+    program = decode_program([
+        ("JGE", ("i", "n", 3)),
+        ("INC", ("i", 2)),
+        ("JLT", ("i", "n", 1)),
+        ("HALT", None)
+    ])
+
+    compiled_loop = LoopCompiler(program=program).compile(1, 2)
+
+    slots = allocate_slots(i=0, n=5)
+    exit_index, executed = compiled_loop.function(slots)
+
+    assert VariableSlots(slots) == {"i": 6, "n": 5}
+    assert exit_index == 3
+    assert executed == 3 * 2
+
+
+@pytest.mark.parametrize(
+    "program, back_jump",
+    [
+        # The loop halts the VM.
+        (decode_program([("HALT", None), ("JMP", 0)]), 1),
+        # The loop leaves a value on the stack.
+        (decode_program([("IPUSH", 1), ("JMP", 0)]), 1)
+    ]
+)
+def test_compile_unsupported(program: list, back_jump: int) -> None:
+    """
+    Test that loops that can't be compiled are rejected.
+
+    Parameters
+    ----------
+    program : list
+        The decoded program.
+    back_jump : int
+        The index of the backward jump of the loop.
+    """
+
+    assert LoopCompiler(program=program).compile(0, back_jump) is None
+
+
+def test_compile_long_expression() -> None:
+    """Test that loops whose code Python can't compile are rejected."""
+
+    # while (i < 3) { b = a + a + ... + a; i = i + 1; }
+    instructions = [
+        ("IFETCH", "i"),
+        ("IPUSH", 3),
+        ("ILT", None),
+        ("JZ", None),
+        ("IFETCH", "a"),
+        *[("IFETCH", "a"), ("IADD", None)] * 249,
+        ("ISTORE", "b"),
+        ("IPOP", None),
+        ("IFETCH", "i"),
+        ("IPUSH", 1),
+        ("IADD", None),
+        ("ISTORE", "i"),
+        ("IPOP", None),
+        ("JMP", 0),
+        ("HALT", None)
+    ]
+    instructions[3] = ("JZ", len(instructions) - 1)
+
+    program = decode_program(instructions)
+
+    assert LoopCompiler(program=program).compile(0, len(program) - 2) is None
+
+
+def test_run_deep_tree() -> None:
+    """
+    Test that a hot loop with an expression deeper than the recursion limit
+    keeps being interpreted.
+    """
+
+    depth = get_deep_tree_depth()
+
+    # while (i < 3) { b = a - (a - (a - ... (a - 1))); i = i + 1; }
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(
+        "{ a = 1; i = 0; while (i < 3) { b = 0; i = i + 1; } }"
+    ))
+    ast.build()
+
+    (block,) = ast.root.children
+    body = block.children[2].children[1]
+    body.children[0].children[0].children[1].replace(build_deep_tree(depth))
+
+    code_generator = CodeGenerator()
+    code_generator.generate_code(ast.root)
+
+    vm = VirtualMachine(
+        code_collection=code_generator.code_collection,
+        stack_size=depth + 2,
+        hot_loop_threshold=1
+    )
+    vm.run()
+
+    assert vm.variables == {"a": 1, "b": (depth + 1) % 2, "i": 3}
+    assert list(vm.compiled_loops.values()) == [None]
+
+
+def test_can_enter() -> None:
+    """Test that loops only run when the variables they read are set."""
+
+    compiled_loop = LoopCompiler(program=WHILE_LOOP).compile(0, 14)
+
+    assert compiled_loop.can_enter(allocate_slots(i=0, s=0))
+    assert not compiled_loop.can_enter(allocate_slots(i=0))
@@ -0,0 +1,221 @@
+"""Implement unit tests for the `src.loop_invariant_hoister` module."""
+
+import pytest
+
+from src.control_flow_graph import ControlFlowGraph
+from src.loop_invariant_hoister import LoopInvariantHoister
+from src.ssa_optimizer import SSAOptimizer
+from tests.unit.helpers import (
+    build_cfg,
+    build_deep_tree,
+    check_cfg_pass,
+    run_cfg
+)
+
+
+def _hoist(
+    source_code: str, superinstructions: bool = False
+) -> tuple[LoopInvariantHoister, ControlFlowGraph]:
+    """
+    Move the loop invariants of a Tiny-C program out of their loops, and
+    check that it computes the same values, in fewer instructions.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+    superinstructions : bool, optional (default = False)
+        Whether to emit fused instructions.
+
+    Returns
+    -------
+    loop_invariant_hoister : LoopInvariantHoister
+        The pass, after running on the CFG of the program.
+    cfg : ControlFlowGraph
+        The CFG.
+    """
+
+    loop_invariant_hoister = LoopInvariantHoister(
+        superinstructions=superinstructions
+    )
+
+    cfg, vm, hoisted_vm = check_cfg_pass(
+        source_code, loop_invariant_hoister.hoist, superinstructions
+    )
+
+    if loop_invariant_hoister.hoisted_count:
+        assert hoisted_vm.instruction_count < vm.instruction_count
+
+    return loop_invariant_hoister, cfg
+
+
+def test_init():
+    """Test the instantiation of LoopInvariantHoister objects."""
+
+    loop_invariant_hoister = LoopInvariantHoister()
+
+    assert not loop_invariant_hoister.superinstructions
+    assert loop_invariant_hoister.temporaries == []
+    assert loop_invariant_hoister.hoisted_count == 0
+
+
+@pytest.mark.parametrize("superinstructions", [False, True])
+def test_hoist_while(superinstructions: bool):
+    """
+    Test that invariants are computed before a `while` loop.
+
+    Parameters
+    ----------
+    superinstructions : bool
+        Whether to emit fused instructions.
+    """
+
+    loop_invariant_hoister, cfg = _hoist(
+        "{ n = 10; i = 0; while (i < n - 1) i = i + 1; }",
+        superinstructions=superinstructions
+    )
+
+    assert loop_invariant_hoister.temporaries == ["$0"]
+    assert loop_invariant_hoister.hoisted_count == 1
+
+    entry, header, _, _ = cfg.blocks
+    set_node = entry.statements[-1].children[0]
+    temporary, operation = set_node.children
+
+    assert temporary.value == "$0"
+    assert operation.kind == "SUB"
+    assert [child.value for child in header.condition.children] == ["i", "$0"]
+
+    # `i < $0` is a single `JGE` (and `JLT`) instruction.
+    instructions = [
+        instruction
+        for instruction, _ in cfg.generate_code(superinstructions=True)
+    ]
+
+    assert "JGE" in instructions
+    assert "JLT" in instructions
+
+
+def test_hoist_do_while():
+    """Test that invariants are computed before a `do` loop, once."""
+
+    loop_invariant_hoister, cfg = _hoist(
+        "{ n = 10; i = 0; s = 0; "
+        "do { s = s + (n + n); t = n + n; i = i + 1; } while (i < 5); }"
+    )
+
+    assert loop_invariant_hoister.temporaries == ["$0"]
+    assert loop_invariant_hoister.hoisted_count == 2
+    assert len(cfg.entry.statements) == 4
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        # `n` is set in the loop.
+        "{ n = 10; i = 0; while (i < n - 1) { n = n - 1; i = i + 1; } }",
+        # So is `n`, in the condition.
+        "{ n = 10; i = 0; while (i < (n = n - 1) + 1) i = i + 1; }",
+        # `m` may not be set before the loop.
+        (
+            "{ i = 0; while (i < 3) { if (i) m = 1; i = i + 1; } "
+            "j = 0; while (j < 2) { s = m + 1; j = j + 1; } }"
+        ),
+        # It is not, and the loop never runs.
+        "{ i = 0; while (i < 0) { s = m + 1; i = i + 1; } }",
+        # The loop has no invariants.
+        "{ i = 0; while (i < 10) i = i + 1; }"
+    ]
+)
+def test_hoist_not_invariant(source_code: str):
+    """
+    Test that operations that may change, or raise, are kept in the loop.
+
+    Parameters
+    ----------
+    source_code : str
+        The program.
+    """
+
+    loop_invariant_hoister, _ = _hoist(source_code)
+
+    assert loop_invariant_hoister.hoisted_count == 0
+
+
+@pytest.mark.parametrize("superinstructions", [False, True])
+def test_hoist_shorter_code(superinstructions: bool):
+    """
+    Test that invariants are only moved if it shortens the loop.
+
+    Parameters
+    ----------
+    superinstructions : bool
+        Whether to emit fused instructions.
+    """
+
+    loop_invariant_hoister, _ = _hoist(
+        "{ a = 5; b = 2; i = 0; while (i < 3) { s = a - b; i = i + 1; } }",
+        superinstructions=superinstructions
+    )
+
+    # `a - b` is a single `SUBVV` instruction.
+    assert loop_invariant_hoister.hoisted_count == (
+        0 if superinstructions else 1
+    )
+
+
+def test_hoist_nested_loops():
+    """Test that invariants of outer loops are computed before them."""
+
+    loop_invariant_hoister, cfg = _hoist(
+        "{ n = 3; i = 0; while (i < n) { j = 0; k = i + i; "
+        "while (j < n + n) { s = k + 1; j = j + 1; } i = i + 1; } }"
+    )
+
+    assert loop_invariant_hoister.temporaries == ["$0", "$1"]
+
+    # `n + n` before the outer loop, and `k + 1` before the inner one.
+    outer_preheader = cfg.blocks[0]
+    inner_preheader = cfg.blocks[2]
+
+    assert outer_preheader.statements[-1].children[0].children[0].value == "$0"
+    assert inner_preheader.statements[-1].children[0].children[0].value == "$1"
+
+
+def test_hoist_temporaries():
+    """Test that the temporaries already in the CFG are not reused."""
+
+    cfg = build_cfg(
+        "{ i = 1000; j = 3; n = 0; do n = n + 1; while (n < 5); "
+        "while (i - j) { if (i < j) j = j - i; else i = i - j; s = n + n; } }"
+    )
+
+    ssa_optimizer = SSAOptimizer()
+    ssa_optimizer.optimize(cfg)
+
+    loop_invariant_hoister = LoopInvariantHoister()
+    loop_invariant_hoister.hoist(cfg)
+
+    assert ssa_optimizer.temporaries == ["$0"]
+    assert loop_invariant_hoister.temporaries == ["$1"]
+    assert run_cfg(cfg).variables == {
+        "i": 1, "j": 1, "n": 5, "s": 10
+    }
+
+
+def test_hoist_deep_tree():
+    """Test that expressions deeper than the recursion limit are supported."""
+
+    node = build_deep_tree()
+
+    # do i = i + (a - (a - (a - ... (a - 1)))); while (i < 3);
+    cfg = build_cfg("{ a = 1; i = 0; do i = i + 1; while (i < 3); }")
+
+    _, body, _ = cfg.blocks
+    body.statements[0].children[0].children[1].children[1].replace(node)
+
+    loop_invariant_hoister = LoopInvariantHoister()
+    loop_invariant_hoister.hoist(cfg)
+
+    assert loop_invariant_hoister.hoisted_count == 1
+    assert cfg.entry.statements[-1].children[0].children[1] is node
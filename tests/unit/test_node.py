@@ -1,5 +1,7 @@
 """Implement unit tests for the `src.node.Node` class."""
 
+import pytest
+
 from src.node import Node
 
 
@@ -80,3 +82,162 @@ def test_add_parent():
     child_node.add_parent(parent_node)
 
     assert parent_node == child_node.parent
+
+
+def _parent_with_children(child_count: int) -> tuple[Node, list[Node]]:
+    """
+    Create a Node with `child_count` children.
+
+    Parameters
+    ----------
+    child_count : int
+        The number of children.
+
+    Returns
+    -------
+    parent_node : Node
+        The parent Node.
+    children : list of Node
+        The children, in order.
+    """
+
+    parent_node = Node(id=0, kind="BLOCK")
+    children = [Node(id=i + 1, kind="EMPTY") for i in range(child_count)]
+
+    for child in children:
+        parent_node.add_child(child)
+
+    return parent_node, children
+
+
+def test_add_child_sets_parent():
+    """Test that `Node.add_child` keeps `parent` and `children` consistent."""
+
+    old_parent, (child_node,) = _parent_with_children(1)
+    new_parent = Node(id=5, kind="TEST")
+
+    new_parent.add_child(child_node)
+
+    assert child_node.parent is new_parent
+    assert new_parent.children == [child_node]
+    assert old_parent.children == []
+
+
+def test_remove_child():
+    """Test that `Node.remove_child` compares Nodes by identity."""
+
+    parent_node, children = _parent_with_children(3)
+
+    # Equal to the first child, but a different Node.
+    parent_node.remove_child(Node(id=1, kind="EMPTY"))
+
+    assert parent_node.children == children
+
+    parent_node.remove_child(children[1])
+
+    assert parent_node.children == [children[0], children[2]]
+    assert children[1].parent is None
+
+
+@pytest.mark.parametrize("index", [0, 1, 2])
+def test_detach(index: int):
+    """
+    Test the `Node.detach` method.
+
+    Parameters
+    ----------
+    index : int
+        The index of the child to detach.
+    """
+
+    parent_node, children = _parent_with_children(3)
+    grandchild = Node(id=4, kind="VAR")
+    children[index].add_child(grandchild)
+
+    children[index].detach()
+
+    assert parent_node.children == children[:index] + children[index + 1:]
+    assert children[index].parent is None
+    assert children[index].children == [grandchild]
+
+    # Detaching a detached Node does nothing.
+    children[index].detach()
+
+    assert children[index].parent is None
+
+
+def test_replace():
+    """Test the `Node.replace` method."""
+
+    parent_node, children = _parent_with_children(3)
+    new_node = Node(id=4, kind="VAR")
+
+    children[1].replace(new_node)
+
+    assert parent_node.children == [children[0], new_node, children[2]]
+    assert new_node.parent is parent_node
+    assert children[1].parent is None
+
+    with pytest.raises(ValueError):
+        children[1].replace(Node(id=5, kind="VAR"))
+
+
+def test_splice():
+    """Test replacing a Node with its children with `Node.splice`."""
+
+    parent_node, (first, block, last) = _parent_with_children(3)
+    _, statements = _parent_with_children(2)
+
+    for statement in statements:
+        block.add_child(statement)
+
+    block.splice(block.children)
+
+    assert parent_node.children == [first, *statements, last]
+    assert all(statement.parent is parent_node for statement in statements)
+    assert block.parent is None
+    assert block.children == []
+
+    last.splice([])
+
+    assert parent_node.children == [first, *statements]
+
+
+def test_mutations_scale_linearly():
+    """Test that mutating every child of a large Node is not quadratic."""
+
+    parent_node, children = _parent_with_children(200000)
+
+    for child in children[::2]:
+        child.detach()
+
+    for child in children[1::2]:
+        child.replace(Node(id=-1, kind="VAR"))
+
+    assert len(parent_node.children) == 100000
+    assert all(child.kind == "VAR" for child in parent_node.children)
+
+
+def test_merge():
+    """Test the `Node.merge` method."""
+
+    parent_node, (first, second) = _parent_with_children(2)
+    _, children = _parent_with_children(2)
+
+    for child in children:
+        second.add_child(child)
+
+    first.merge(second, {"parent_children_first": False})
+
+    assert parent_node.children == [first]
+    assert first.children == children
+    assert all(child.parent is first for child in children)
+
+
+def test_slots():
+    """Test that Nodes do not hold a `__dict__`."""
+
+    node = Node(id=1, kind="TEST")
+
+    with pytest.raises(AttributeError):
+        node.unknown_attribute = 1
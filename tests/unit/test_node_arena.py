@@ -0,0 +1,180 @@
+"""Implement unit tests for the `src.node_arena` module."""
+
+import pickle
+
+import pytest
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.certificator import Certificator
+from src.code_generator import CodeGenerator
+from src.lexer import Lexer
+from src.node import Node
+from src.node_arena import ArenaNode, NodeArena
+
+
+SOURCE_CODE = """
+{
+    i = 1;
+    while (i < 100) {
+        if (i < 50) s = s + i; else { s = s - (t = 1); }
+        i = i + 1;
+    }
+    do a = a + 2; while (a < 10);
+    {}
+}
+"""
+
+
+def _build(use_arena: bool) -> AbstractSyntaxTree:
+    """
+    Build the AST of `SOURCE_CODE`.
+
+    Parameters
+    ----------
+    use_arena : bool
+        Whether to store the Nodes in a `NodeArena`.
+
+    Returns
+    -------
+    ast : AbstractSyntaxTree
+        The built tree.
+    """
+
+    ast = AbstractSyntaxTree(
+        source_code=Lexer.parse_source_code(SOURCE_CODE), use_arena=use_arena
+    )
+    ast.build()
+
+    return ast
+
+
+def _dfs(node: Node) -> list[str]:
+    """
+    List the string representations of the Nodes of a tree, in DFS order.
+
+    Parameters
+    ----------
+    node : Node or ArenaNode
+        The root of the tree.
+
+    Returns
+    -------
+    : list of str
+        The representation of each Node.
+    """
+
+    return [str(node), *(line for child in node.children for line in _dfs(child))]
+
+
+def test_init() -> None:
+    """Test the instantiation of NodeArena objects."""
+
+    arena = NodeArena(kinds=AbstractSyntaxTree.node_kinds)
+
+    assert len(arena) == 0
+    assert arena.constants == []
+
+
+def test_add_node() -> None:
+    """Test adding Nodes and linking them."""
+
+    arena = NodeArena(kinds=AbstractSyntaxTree.node_kinds)
+
+    parent = arena.add_node("ADD")
+    first = arena.add_node("VAR", "a")
+    second = arena.add_node("CST", 1)
+    third = arena.add_node("VAR", "a")
+
+    for child in [first, second, third]:
+        arena.append_child(parent, child)
+
+    assert len(arena) == 4
+    assert arena.children(parent) == [first, second, third]
+    assert arena.children(first) == []
+    assert arena.parent[second] == parent
+    assert arena.parent[parent] == NodeArena.none
+    assert arena.get_value(parent) is None
+    assert arena.get_value(third) == "a"
+
+    # Values are stored only once.
+    assert arena.constants == ["a", 1]
+
+
+def test_values_keep_their_types() -> None:
+    """Test that values that compare equal but differ in type are kept apart."""
+
+    arena = NodeArena(kinds=AbstractSyntaxTree.node_kinds)
+
+    integer = arena.add_node("CST", 1)
+    boolean = arena.add_node("CST", True)
+
+    assert type(arena.get_value(integer)) is int
+    assert arena.get_value(boolean) is True
+
+
+def test_arena_node() -> None:
+    """Test that ArenaNode implements the interface of Node."""
+
+    arena = NodeArena(kinds=AbstractSyntaxTree.node_kinds)
+
+    parent = arena.node(arena.add_node("IF"))
+    child = arena.node(arena.add_node("VAR", "a"))
+
+    child.add_parent(parent)
+    parent.add_child(child)
+
+    assert isinstance(child, ArenaNode)
+    assert child == Node(id=1, kind="VAR", value="a")
+    assert child.parent == parent
+    assert parent.children == [child]
+    assert parent.parent is None
+    assert child.position_in_tree is None
+
+    parent.set_kind("IFELSE")
+    child.set_position_in_tree(7)
+
+    assert parent.get_kind() == "IFELSE"
+    assert str(child) == (
+        "ID: 1, Kind: VAR, Value: a, Parent ID: 0, Position in Tree: 7"
+    )
+
+    with pytest.raises(AttributeError):
+        child.kind_code = 0
+
+
+def test_code_generator() -> None:
+    """Test that the code generated from an arena matches the Node tree's."""
+
+    node_code_generator = CodeGenerator()
+    node_code_generator.generate_code(_build(use_arena=False).root)
+
+    arena_code_generator = CodeGenerator()
+    arena_code_generator.generate_code(_build(use_arena=True).root)
+
+    assert str(arena_code_generator) == str(node_code_generator)
+    assert (
+        arena_code_generator.code_collection
+        == node_code_generator.code_collection
+    )
+
+
+def test_certificator() -> None:
+    """Test that the positions annotated on an arena match the Node tree's."""
+
+    node_ast = _build(use_arena=False)
+    arena_ast = _build(use_arena=True)
+
+    Certificator(frontend_code=node_ast, backend_code=[]).traverse_ast()
+    Certificator(frontend_code=arena_ast, backend_code=[]).traverse_ast()
+
+    assert _dfs(arena_ast.root) == _dfs(node_ast.root)
+
+
+def test_pickle() -> None:
+    """Test that an arena can be serialized and loaded back."""
+
+    ast = _build(use_arena=True)
+
+    arena = pickle.loads(pickle.dumps(ast.arena))
+
+    assert _dfs(arena.node(0)) == _dfs(ast.root)
@@ -0,0 +1,329 @@
+"""Implement unit tests for the `src.peephole_optimizer` module."""
+
+import pytest
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.code_generator import CodeGenerator
+from src.lexer import Lexer
+from src.node import Node
+from src.peephole_optimizer import PeepholeOptimizer
+
+
+def _generate(source_code: str) -> list:
+    """
+    Generate the code of a Tiny-C program.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+
+    Returns
+    -------
+    : list
+        The `code_collection` of the program.
+    """
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+    ast.build()
+
+    generator = CodeGenerator()
+    generator.generate_code(node=ast.root)
+
+    return generator.code_collection
+
+
+def _render(code_collection: list) -> list:
+    """
+    Render a `code_collection` in a compact form.
+
+    Parameters
+    ----------
+    code_collection : list
+        The instructions.
+
+    Returns
+    -------
+    : list
+        The instructions, with the value of their Node (or their target, or
+        `None`) as argument.
+    """
+
+    return [
+        (instruction, getattr(argument, "value", argument))
+        for instruction, argument in code_collection
+    ]
+
+
+def _code(*instructions: tuple) -> list:
+    """
+    Build a `code_collection`, with a Node for each non-jump argument.
+
+    Parameters
+    ----------
+    instructions : tuple
+        The (`instruction`, `argument`) tuples, where `argument` is the value
+        of the Node, or the target of a jump.
+
+    Returns
+    -------
+    : list
+        The `code_collection`.
+    """
+
+    return [
+        (
+            instruction,
+            argument
+            if instruction in CodeGenerator.jump_instructions
+            else Node(id=index, kind="VAR", value=argument)
+        )
+        for index, (instruction, argument) in enumerate(instructions)
+    ]
+
+
+def test_init():
+    """Test the instantiation of PeepholeOptimizer objects."""
+
+    peephole_optimizer = PeepholeOptimizer()
+
+    assert peephole_optimizer.removed_count == 0
+
+
+def test_optimize_empty():
+    """Test that `EMPTY` instructions are removed, and jumps remapped."""
+
+    code_collection = _code(
+        ("EMPTY", None),
+        ("IFETCH", "a"),
+        ("JZ", 5),
+        ("IFETCH", "b"),
+        ("IPOP", None),
+        ("EMPTY", None),
+        ("HALT", None)
+    )
+
+    peephole_optimizer = PeepholeOptimizer()
+
+    assert _render(peephole_optimizer.optimize(code_collection)) == [
+        ("IFETCH", "a"),
+        ("JZ", 4),
+        ("IFETCH", "b"),
+        ("IPOP", None),
+        ("HALT", None)
+    ]
+    assert peephole_optimizer.removed_count == 2
+
+
+def test_optimize_store_and_fetch():
+    """Test that `ISTORE x; IPOP; IFETCH x` becomes `ISTORE x`."""
+
+    code_collection = _generate("{ a = 1; b = a + 1; }")
+
+    assert _render(PeepholeOptimizer().optimize(code_collection)) == [
+        ("IPUSH", 1),
+        ("ISTORE", "a"),
+        ("IPUSH", 1),
+        ("IADD", None),
+        ("ISTORE", "b"),
+        ("IPOP", None),
+        ("HALT", None)
+    ]
+
+
+def test_optimize_store_and_fetch_other_variable():
+    """Test that stores followed by a fetch of another variable are kept."""
+
+    code_collection = _generate("{ a = 1; b; }")
+
+    assert _render(PeepholeOptimizer().optimize(code_collection)) == [
+        ("IPUSH", 1),
+        ("ISTORE", "a"),
+        ("IPOP", None),
+        ("IFETCH", "b"),
+        ("IPOP", None),
+        ("HALT", None)
+    ]
+
+
+def test_optimize_push_and_pop():
+    """Test that `IPUSH c; IPOP` pairs are removed."""
+
+    code_collection = _generate("{ 1; a = 2; 3; }")
+
+    assert _render(PeepholeOptimizer().optimize(code_collection)) == [
+        ("IPUSH", 2),
+        ("ISTORE", "a"),
+        ("IPOP", None),
+        ("HALT", None)
+    ]
+
+
+def test_optimize_jump_target():
+    """Test that instructions that are jumped to are not merged."""
+
+    code_collection = _generate("{ a = 1; do a = a + 1; while (a < 3); }")
+
+    # `IFETCH a` starts the loop, so it is kept after `ISTORE a; IPOP`.
+    assert _render(PeepholeOptimizer().optimize(code_collection)) == [
+        ("IPUSH", 1),
+        ("ISTORE", "a"),
+        ("IPOP", None),
+        ("IFETCH", "a"),
+        ("IPUSH", 1),
+        ("IADD", None),
+        ("ISTORE", "a"),
+        ("IPUSH", 3),
+        ("ILT", None),
+        ("JNZ", 3),
+        ("HALT", None)
+    ]
+
+
+def test_optimize_jump_to_jump():
+    """Test that jumps to `JMP` instructions are threaded."""
+
+    code_collection = _code(
+        ("IFETCH", "a"),
+        ("JZ", 4),
+        ("IFETCH", "b"),
+        ("IPOP", None),
+        ("JMP", 6),
+        ("HALT", None),
+        ("JMP", 5)
+    )
+
+    assert _render(PeepholeOptimizer().optimize(code_collection)) == [
+        ("IFETCH", "a"),
+        ("JZ", 4),
+        ("IFETCH", "b"),
+        ("IPOP", None),
+        ("HALT", None)
+    ]
+
+
+def test_optimize_fused_jump():
+    """Test that the targets of `JGE` instructions are threaded and remapped."""
+
+    a = Node(id=0, kind="VAR", value="a")
+
+    code_collection = [
+        ("EMPTY", None),
+        ("JGE", (a, a, 4)),
+        ("INC", (a, Node(id=1, kind="CST", value=1))),
+        ("JMP", 1),
+        ("JMP", 5),
+        ("HALT", None)
+    ]
+
+    assert PeepholeOptimizer().optimize(code_collection) == [
+        ("JGE", (a, a, 3)),
+        ("INC", (a, Node(id=1, kind="CST", value=1))),
+        ("JMP", 0),
+        ("HALT", None)
+    ]
+
+
+def test_optimize_jump_to_next():
+    """Test that jumps to the next instruction are removed."""
+
+    code_collection = _code(
+        ("JMP", 1),
+        ("IFETCH", "a"),
+        ("JZ", 3),
+        ("IFETCH", "b"),
+        ("JNZ", 5),
+        ("HALT", None)
+    )
+
+    assert _render(PeepholeOptimizer().optimize(code_collection)) == [
+        ("IFETCH", "a"),
+        ("IPOP", None),
+        ("IFETCH", "b"),
+        ("IPOP", None),
+        ("HALT", None)
+    ]
+
+
+def test_optimize_unreachable_code():
+    """Test that the code after a `JMP` is removed up to a jump target."""
+
+    code_collection = _code(
+        ("IFETCH", "a"),
+        ("JNZ", 5),
+        ("JMP", 7),
+        ("IFETCH", "b"),
+        ("IPOP", None),
+        ("IFETCH", "c"),
+        ("IPOP", None),
+        ("HALT", None)
+    )
+
+    assert _render(PeepholeOptimizer().optimize(code_collection)) == [
+        ("IFETCH", "a"),
+        ("JNZ", 3),
+        ("JMP", 5),
+        ("IFETCH", "c"),
+        ("IPOP", None),
+        ("HALT", None)
+    ]
+
+
+def test_optimize_infinite_loop():
+    """Test that jumps to themselves are kept."""
+
+    code_collection = _code(("JMP", 1), ("JMP", 0), ("HALT", None))
+
+    assert _render(PeepholeOptimizer().optimize(code_collection)) == [
+        ("JMP", 0)
+    ]
+
+
+def test_optimize_program():
+    """Test that the optimized code of a program is verified."""
+
+    code_collection = _generate(
+        """
+        {
+            i = 0;
+            while (i < 10) {
+                if (i < 5) ; else { 1; }
+                i = i + 1;
+            }
+        }
+        """
+    )
+
+    optimized_code = PeepholeOptimizer().optimize(code_collection)
+
+    assert len(optimized_code) < len(code_collection)
+    assert "EMPTY" not in [instruction for instruction, _ in optimized_code]
+
+    PeepholeOptimizer.verify(optimized_code)
+
+
+def test_verify():
+    """Test that the generated code is verified."""
+
+    PeepholeOptimizer.verify(
+        _generate("{ i = 0; while (i < 3) { if (i) ; else i = 1; i = i + 1; } }")
+    )
+
+
+@pytest.mark.parametrize(
+    "code_collection",
+    [
+        _code(("IPOP", None), ("HALT", None)),
+        _code(("IPUSH", 1), ("IADD", None), ("HALT", None)),
+        _code(("JMP", 3), ("HALT", None)),
+        _code(("JMP", None)),
+        _code(("IFETCH", "a"), ("JZ", 3), ("IPUSH", 1), ("HALT", None)),
+        _code(("IPUSH", 1), ("JMP", 0)),
+        _code(("NOP", None))
+    ]
+)
+def test_verify_invalid(code_collection):
+    """Test that invalid code is rejected."""
+
+    with pytest.raises(ValueError):
+        PeepholeOptimizer.verify(code_collection)
@@ -0,0 +1,228 @@
+"""Implement unit tests for the `src.python_code_generator` module."""
+
+import os
+
+import pytest
+
+# Just to annotate functions with fixtures.
+from pytest_mock.plugin import MockerFixture
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.interpreter import create_virtual_machine
+from src.lexer import Lexer
+from src.node import Node
+from src.python_code_generator import PythonCodeGenerator, create_python_function
+from tests.unit.helpers import build_deep_tree, get_deep_tree_depth
+
+
+def _generate(source_code: str) -> PythonCodeGenerator:
+    """
+    Generate Python code from a Tiny-C source code.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+
+    Returns
+    -------
+    generator : PythonCodeGenerator
+        The code generator, after generating code from the source code.
+    """
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+    ast.build()
+
+    generator = PythonCodeGenerator()
+    generator.generate_code(ast.root)
+
+    return generator
+
+
+def test_init() -> None:
+    """Test the instantiation of PythonCodeGenerator objects."""
+
+    generator = PythonCodeGenerator()
+
+    assert generator.lines == []
+    assert generator.variables == []
+
+
+def test_source() -> None:
+    """Test the source code generated from a program with all statements."""
+
+    generator = _generate("""
+    {
+        i = 1;
+        do { i = i + 1; } while (i < 3);
+        while (i - 5) {
+            if (i < 4) j = (a = 2) + (1 < i);
+            else ;
+        }
+        if (j) {}
+        j - (i - 1);
+    }
+    """)
+
+    expected_result = "\n".join([
+        "def tinyc_program():",
+        "    i = 1",
+        "    while True:",
+        "        i = i + 1",
+        "        if not (i < 3):",
+        "            break",
+        "    while i - 5:",
+        "        if i < 4:",
+        "            j = (a := 2) + (1 < i)",
+        "        else:",
+        "            pass",
+        "    if j:",
+        "        pass",
+        "    j - (i - 1)",
+        "    _locals = locals()",
+        "    return {",
+        "        name: _locals[name]",
+        "        for name in ('i', 'j', 'a')",
+        "        if name in _locals",
+        "    }",
+        ""
+    ])
+
+    assert generator.source == expected_result
+    assert str(generator) == expected_result
+
+
+@pytest.mark.parametrize(
+    "kind, lhs_kind, rhs_kind, expected_result",
+    [
+        ("ADD", "SUB", "SUB", "a - b + (a - b)"),
+        ("SUB", "ADD", "LT", "a + b - (a < b)"),
+        ("LT", "LT", "LT", "(a < b) < (a < b)"),
+        ("LT", "ADD", "SUB", "a + b < a - b")
+    ]
+)
+def test_generate_expression_parenthesis(
+    kind: str, lhs_kind: str, rhs_kind: str, expected_result: str
+) -> None:
+    """
+    Test that operands are parenthesized only when needed.
+
+    Parameters
+    ----------
+    kind : str
+        The kind of the operation Node.
+    lhs_kind : str
+        The kind of the operation on the left hand side.
+    rhs_kind : str
+        The kind of the operation on the right hand side.
+    expected_result : str
+        The expected Python expression.
+    """
+
+    def _operation(kind: str) -> Node:
+        node = Node(id=1, kind=kind)
+        node.add_child(Node(id=2, kind="VAR", value="a"))
+        node.add_child(Node(id=3, kind="VAR", value="b"))
+
+        return node
+
+    node = Node(id=0, kind=kind)
+    node.add_child(_operation(lhs_kind))
+    node.add_child(_operation(rhs_kind))
+
+    assert PythonCodeGenerator().generate_expression(node) == expected_result
+
+
+def test_generate_expression_deep_tree() -> None:
+    """Test that expressions deeper than the recursion limit are supported."""
+
+    depth = get_deep_tree_depth()
+    expression = PythonCodeGenerator().generate_expression(build_deep_tree(depth))
+
+    assert expression == "a - (" * (depth - 1) + "a - 1" + ")" * (depth - 1)
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        "{ a = 1; c = 3 < 2; b = c; }",
+        "{ i = 10; if (i < 5) { x = 1; } else { y = 2; } }",
+        "{ i = 1; do { i = i + 10; } while (i < 50); }",
+        """
+        {
+            i = 125;
+            j = 100;
+            while (i - j) {
+                if (i < j) { j = j - i; } else { i = i - j; }
+            }
+        }
+        """,
+        # Too long, or too deeply nested, for Python to compile: the program
+        # runs on the virtual machine.
+        "{ a = 1; b = a" + " + a" * 5000 + "; }",
+        "{ i = 0;" + " while (i < 1)" * 25 + " i = i + 1; }"
+    ]
+)
+def test_create_python_function(source_code: str) -> None:
+    """
+    Test that the Python function computes the same variables as the VM.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+    """
+
+    vm = create_virtual_machine(source_code)
+    vm.run()
+
+    variables = create_python_function(source_code)()
+
+    assert type(variables) is dict
+    assert variables == vm.variables
+    assert all(
+        type(variables[name]) is type(vm.variables[name]) for name in variables
+    )
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        "{ a = c - c; }",
+        "{ a = 1; if (a) b = c; }",
+        "{ a = 1; if (a < 0) c = 1; b = c; }"
+    ]
+)
+def test_create_python_function_unset_variable(source_code: str) -> None:
+    """
+    Test that reading an unset variable raises a `KeyError`, as in the VM.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+    """
+
+    function = create_python_function(source_code)
+
+    with pytest.raises(KeyError, match="c"):
+        function()
+
+
+def test_create_python_function_cache(
+    tmp_path: str, mocker: MockerFixture
+) -> None:
+    """Test that cached programs skip code generation."""
+
+    source_code = "{ a = 1; b = a + 2; }"
+
+    function = create_python_function(source_code, cache_dir=tmp_path)
+
+    assert len(os.listdir(tmp_path)) == 1
+
+    generate_code = mocker.spy(PythonCodeGenerator, "generate_code")
+
+    cached_function = create_python_function(source_code, cache_dir=tmp_path)
+
+    generate_code.assert_not_called()
+    assert cached_function() == function() == {"a": 1, "b": 3}
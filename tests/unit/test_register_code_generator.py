@@ -0,0 +1,191 @@
+"""Implement unit tests for the `src.register_code_generator` module."""
+
+import pytest
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.lexer import Lexer
+from src.register_code_generator import RegisterCodeGenerator
+from tests.unit.helpers import build_deep_tree, get_deep_tree_depth
+
+
+def _generate(source_code: str) -> RegisterCodeGenerator:
+    """
+    Generate the three address code of a Tiny-C program.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+
+    Returns
+    -------
+    : RegisterCodeGenerator
+        The generator, after generating the code of the program.
+    """
+
+    ast = AbstractSyntaxTree(source_code=Lexer.parse_source_code(source_code))
+    ast.build()
+
+    generator = RegisterCodeGenerator()
+    generator.generate_code(node=ast.root)
+
+    return generator
+
+
+# The registers of some variables, and of the first temporary.
+A, B, C, I, S = 0, 1, 2, 8, 18
+T = 26
+
+
+def test_init():
+    """Test the instantiation of RegisterCodeGenerator objects."""
+
+    generator = RegisterCodeGenerator()
+
+    assert generator.code_collection == []
+    assert generator.register_count == 26
+    assert generator.variable_registers["a"] == 0
+    assert generator.variable_registers["z"] == 25
+
+
+def test_str():
+    """Test the string representation of RegisterCodeGenerator objects."""
+
+    generator = _generate("{ a = 1; b = a + 2; }")
+
+    assert str(generator) == "\n".join([
+        "     0 LOADK 0, 1",
+        "     1 ADDK 1, 0, 2",
+        "     2 HALT"
+    ])
+
+
+@pytest.mark.parametrize(
+    "source_code, expected_result",
+    [
+        # The operation writes to the register of the variable directly.
+        ("{ b = 1; c = 2; a = b + c; }", [("ADD", A, B, C)]),
+        ("{ b = 1; a = b - 3; }", [("SUBK", A, B, 3)]),
+        ("{ b = 1; a = 3 + b; }", [("ADDK", A, B, 3)]),
+        ("{ b = 1; a = 3 - b; }", [("LOADK", T, 3), ("SUB", A, T, B)]),
+        ("{ b = 1; a = b < 2; }", [("LTK", A, B, 2)]),
+        ("{ b = 1; a = b; }", [("MOV", A, B)]),
+        ("{ b = 1; a = (b = 2); }", [("LOADK", B, 2), ("MOV", A, B)]),
+        # Subexpressions are held in temporaries.
+        (
+            "{ b = 1; c = 2; a = (b - c) + (c - b); }",
+            [("SUB", T, B, C), ("SUB", T + 1, C, B), ("ADD", A, T, T + 1)]
+        ),
+        # The value of `b` is kept before it is set.
+        (
+            "{ b = 1; a = b + (b = 2); }",
+            [("MOV", T, B), ("LOADK", B, 2), ("ADD", A, T, B)]
+        )
+    ]
+)
+def test_generate_code_expression(source_code: str, expected_result: list):
+    """
+    Test the code generated for expressions.
+
+    Parameters
+    ----------
+    source_code : str
+        The program. Its last statement is the one tested.
+    expected_result : list of tuples
+        The instructions of its last statement.
+    """
+
+    generator = _generate(source_code)
+    code_collection = generator.code_collection
+
+    assert code_collection[-1] == ("HALT",)
+    assert code_collection[-1 - len(expected_result):-1] == expected_result
+
+
+def test_generate_code_while():
+    """Test the code generated for a `while` loop."""
+
+    generator = _generate(
+        "{ i = 0; s = 0; while (i < 10) { s = s + i; i = i + 1; } }"
+    )
+
+    assert generator.code_collection == [
+        ("LOADK", I, 0),
+        ("LOADK", S, 0),
+        ("JGEK", I, 10, 6),
+        ("ADD", S, S, I),
+        ("ADDK", I, I, 1),
+        ("JMP", 2),
+        ("HALT",)
+    ]
+
+
+def test_generate_code_control_flow():
+    """Test the code generated for `if`, `else` and `do` statements."""
+
+    generator = _generate(
+        "{ a = 1; b = 2; if (a) c = 1; else c = 2; do a = a - 1; while (a); "
+        "if (a < b) c = 3; }"
+    )
+
+    assert generator.code_collection == [
+        ("LOADK", A, 1),
+        ("LOADK", B, 2),
+        ("JZ", A, 5),
+        ("LOADK", C, 1),
+        ("JMP", 6),
+        ("LOADK", C, 2),
+        ("SUBK", A, A, 1),
+        ("JNZ", A, 6),
+        ("JGE", A, B, 10),
+        ("LOADK", C, 3),
+        ("HALT",)
+    ]
+
+
+@pytest.mark.parametrize(
+    "source_code, expected_checks",
+    [
+        ("{ a = b; }", [B]),
+        ("{ a = 1; b = a; }", []),
+        ("{ a; b = a; }", [A]),
+        ("{ if (1) a = 1; b = a; }", [A]),
+        ("{ if (1) a = 1; else a = 2; b = a; }", []),
+        ("{ while (0) a = 1; b = a; }", [A]),
+        ("{ do a = 1; while (0); b = a; }", []),
+        ("{ i = 0; while (i < 2) { a = 1; i = i + 1; } b = a; }", [A])
+    ]
+)
+def test_generate_code_check(source_code: str, expected_checks: list):
+    """
+    Test that only reads of variables that may not be set are checked.
+
+    Parameters
+    ----------
+    source_code : str
+        The program.
+    expected_checks : list of int
+        The registers checked, in order.
+    """
+
+    generator = _generate(source_code)
+
+    assert [
+        instruction[1]
+        for instruction in generator.code_collection
+        if instruction[0] == "CHECK"
+    ] == expected_checks
+
+
+def test_generate_code_deep_tree():
+    """Test that trees deeper than the recursion limit are supported."""
+
+    depth = get_deep_tree_depth()
+
+    generator = RegisterCodeGenerator()
+    generator.generate_code(build_deep_tree(depth))
+
+    assert len(generator.code_collection) == depth + 1
+
+    # Each result is released before the next one is allocated.
+    assert generator.register_count == 27
@@ -0,0 +1,118 @@
+"""Implement unit tests for the `src.register_virtual_machine` module."""
+
+import pytest
+
+from src.register_virtual_machine import RegisterVirtualMachine
+
+
+def test_init():
+    """Test the instantiation of RegisterVirtualMachine objects."""
+
+    vm = RegisterVirtualMachine(code_collection=[("HALT",)], register_count=30)
+
+    assert len(vm.registers) == 30
+    assert vm.variables == {}
+    assert vm.program_counter == vm.instruction_count == 0
+
+
+@pytest.mark.parametrize(
+    "instruction, expected_value",
+    [
+        (("MOV", 2, 0), 5),
+        (("LOADK", 2, True), True),
+        (("ADD", 2, 0, 1), 7),
+        (("ADDK", 2, 0, 3), 8),
+        (("SUB", 2, 0, 1), 3),
+        (("SUBK", 2, 0, 3), 2),
+        (("LT", 2, 0, 1), False),
+        (("LTK", 2, 0, 6), True)
+    ]
+)
+def test_run_operation(instruction: tuple, expected_value: object):
+    """
+    Test the instructions that write to a register.
+
+    Parameters
+    ----------
+    instruction : tuple
+        The instruction to run, with `a = 5` and `b = 2`.
+    expected_value : object
+        The value of `c` after running it.
+    """
+
+    vm = RegisterVirtualMachine(
+        code_collection=[("LOADK", 0, 5), ("LOADK", 1, 2), instruction, ("HALT",)]
+    )
+    vm.run()
+
+    assert vm.variables == {"a": 5, "b": 2, "c": expected_value}
+    assert type(vm.variables["c"]) is type(expected_value)
+    assert vm.instruction_count == 3
+    assert vm.program_counter == 3
+
+
+@pytest.mark.parametrize(
+    "jump, is_taken",
+    [
+        (("JMP", 5), True),
+        (("JZ", 0, 5), False),
+        (("JZ", 2, 5), True),
+        (("JNZ", 0, 5), True),
+        (("JNZ", 2, 5), False),
+        (("JGE", 0, 1, 5), True),
+        (("JGE", 1, 0, 5), False),
+        (("JGEK", 0, 5, 5), True),
+        (("JGEK", 0, 6, 5), False)
+    ]
+)
+def test_run_jump(jump: tuple, is_taken: bool):
+    """
+    Test the jump instructions.
+
+    Parameters
+    ----------
+    jump : tuple
+        The jump to run, with `a = 5`, `b = 2` and `c = 0`.
+    is_taken : bool
+        Whether the jump skips the instruction that sets `d`.
+    """
+
+    vm = RegisterVirtualMachine(
+        code_collection=[
+            ("LOADK", 0, 5),
+            ("LOADK", 1, 2),
+            ("LOADK", 2, 0),
+            jump,
+            ("LOADK", 3, 1),
+            ("HALT",)
+        ]
+    )
+    vm.run()
+
+    assert ("d" not in vm.variables) == is_taken
+
+
+def test_run_check():
+    """Test that reading a variable that is not set raises a `KeyError`."""
+
+    vm = RegisterVirtualMachine(
+        code_collection=[("LOADK", 0, 1), ("CHECK", 0), ("CHECK", 1), ("HALT",)]
+    )
+
+    with pytest.raises(KeyError, match="b"):
+        vm.run()
+
+    assert vm.variables == {"a": 1}
+    assert vm.program_counter == 3
+
+
+def test_variables_excludes_temporaries():
+    """Test that the temporaries are not variables."""
+
+    vm = RegisterVirtualMachine(
+        code_collection=[("LOADK", 26, 1), ("ADDK", 25, 26, 1), ("HALT",)],
+        register_count=27
+    )
+    vm.run()
+
+    assert vm.variables == {"z": 2}
@@ -0,0 +1,177 @@
+"""Implement unit tests for the `src.shared_node` module."""
+
+import pytest
+
+from src.abstract_syntax_tree import AbstractSyntaxTree
+from src.code_generator import CodeGenerator
+from src.lexer import Lexer
+from src.node import Node
+from src.shared_node import NodeTable, SharedNode
+
+
+def _build(source_code: str, hash_consing: bool) -> AbstractSyntaxTree:
+    """
+    Build the AST of a source code.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+    hash_consing : bool
+        Whether to intern identical pure expressions.
+
+    Returns
+    -------
+    ast : AbstractSyntaxTree
+        The built tree.
+    """
+
+    ast = AbstractSyntaxTree(
+        source_code=Lexer.parse_source_code(source_code),
+        hash_consing=hash_consing
+    )
+    ast.build()
+
+    return ast
+
+
+def test_init() -> None:
+    """Test the instantiation of SharedNode objects."""
+
+    node = SharedNode(id=1, kind="VAR", value="a")
+
+    assert node == Node(id=1, kind="VAR", value="a")
+    assert node.parent is None
+    assert node.children == []
+    assert not node.is_interned
+
+
+def test_add_parent() -> None:
+    """Test that a shared Node keeps its first parent."""
+
+    first_parent = SharedNode(id=1, kind="ADD")
+    second_parent = SharedNode(id=2, kind="SUB")
+    child = SharedNode(id=3, kind="VAR", value="a")
+
+    for parent in [first_parent, second_parent]:
+        child.add_parent(parent)
+        parent.add_child(child)
+
+    assert child.parent is first_parent
+    assert second_parent.children == [child]
+
+
+def test_intern() -> None:
+    """Test that identical pure subtrees are interned once."""
+
+    table = NodeTable()
+
+    def _sum(node_id: int, value: int) -> SharedNode:
+        sum_node = SharedNode(id=node_id, kind="ADD")
+
+        for child in [
+            table.lookup("VAR", "a")
+            or table.intern(SharedNode(id=-node_id, kind="VAR", value="a")),
+            table.intern(SharedNode(id=node_id + 1, kind="CST", value=value))
+        ]:
+            sum_node.add_child(child)
+
+        return table.intern(sum_node)
+
+    first, second, other = _sum(10, 1), _sum(20, 1), _sum(30, 2)
+
+    assert first.is_same_subtree(second)
+    assert not first.is_same_subtree(other)
+    assert first.structural_hash == second.structural_hash
+    assert first.children[0] is other.children[0]
+
+    # The constants 1 and 2, the variable and two sums.
+    assert len(table) == 5
+
+
+def test_intern_keeps_value_types() -> None:
+    """Test that values that compare equal but differ in type are kept apart."""
+
+    table = NodeTable()
+
+    integer = table.intern(SharedNode(id=1, kind="CST", value=1))
+    boolean = table.intern(SharedNode(id=2, kind="CST", value=True))
+
+    assert integer is not boolean
+
+
+@pytest.mark.parametrize("kind", ["SET", "EXPR"])
+def test_intern_impure(kind: str) -> None:
+    """
+    Test that Nodes other than pure expressions are not interned.
+
+    Parameters
+    ----------
+    kind : str
+        The Node kind.
+    """
+
+    node = SharedNode(id=1, kind=kind)
+
+    assert NodeTable().intern(node) is node
+    assert not node.is_interned
+
+
+def test_build() -> None:
+    """Test that the AST shares repeated expressions."""
+
+    ast = _build("{ a = i + 1; b = (i + 1) < c; i = i + 1; }", True)
+
+    first, second, third = ast.root.children[0].children
+    first_sum = first.children[0].children[1]
+    comparison = second.children[0].children[1]
+    third_variable, third_sum = third.children[0].children
+
+    assert first_sum is comparison.children[0] is third_sum
+    assert third_variable is first_sum.children[0]
+
+    # Assignments are not pure, so their parents are not interned.
+    assert not first.children[0].is_interned
+
+
+def test_build_impure_operand() -> None:
+    """Test that sums with assignments are not shared."""
+
+    ast = _build("{ a = (b = 1) + 1; a = (b = 1) + 1; }", True)
+
+    first, second = ast.root.children[0].children
+
+    assert first.children[0].children[1] is not second.children[0].children[1]
+
+
+def test_build_arena() -> None:
+    """Test that a NodeArena can not hold a hash-consed tree."""
+
+    with pytest.raises(ValueError):
+        AbstractSyntaxTree(source_code=[], use_arena=True, hash_consing=True)
+
+
+def test_code_generator() -> None:
+    """Test that the code generated from a shared tree matches the Node's."""
+
+    source_code = """
+    {
+        i = 0;
+        while (i < 9) { s = s + (i + 1); i = i + 1; }
+        if (s - (i + 1) < 3) s = s + (i + 1);
+    }
+    """
+
+    code_collections = []
+
+    for hash_consing in [False, True]:
+        code_generator = CodeGenerator()
+        code_generator.generate_code(_build(source_code, hash_consing).root)
+
+        code_collections.append([
+            (instruction, getattr(argument, "kind", argument),
+             getattr(argument, "value", None))
+            for instruction, argument in code_generator.code_collection
+        ])
+
+    assert code_collections[0] == code_collections[1]
@@ -0,0 +1,299 @@
+"""Implement unit tests for the `src.ssa_optimizer` module."""
+
+import pytest
+
+from src.ssa_optimizer import SSAOptimizer
+from src.virtual_machine import VirtualMachine
+from tests.unit.helpers import (
+    build_cfg,
+    build_deep_tree,
+    check_cfg_pass,
+    run_cfg
+)
+
+
+GCD = "{ i = 1000; j = 3; while (i - j) if (i < j) j = j - i; else i = i - j; }"
+
+
+def _optimize(
+    source_code: str, superinstructions: bool = False
+) -> tuple[SSAOptimizer, VirtualMachine, VirtualMachine]:
+    """
+    Optimize a Tiny-C program, and run it before and after.
+
+    Parameters
+    ----------
+    source_code : str
+        The Tiny-C source code.
+    superinstructions : bool, optional (default = False)
+        Whether to emit fused instructions.
+
+    Returns
+    -------
+    ssa_optimizer : SSAOptimizer
+        The pass, after running on the CFG of the program.
+    vm : VirtualMachine
+        The Virtual Machine that ran the original program.
+    optimized_vm : VirtualMachine
+        The Virtual Machine that ran the optimized program.
+    """
+
+    ssa_optimizer = SSAOptimizer(superinstructions=superinstructions)
+
+    _, vm, optimized_vm = check_cfg_pass(
+        source_code, ssa_optimizer.optimize, superinstructions
+    )
+
+    return ssa_optimizer, vm, optimized_vm
+
+
+def test_init():
+    """Test the instantiation of SSAOptimizer objects."""
+
+    ssa_optimizer = SSAOptimizer()
+
+    assert not ssa_optimizer.superinstructions
+    assert ssa_optimizer.temporaries == []
+    assert ssa_optimizer.removed_branch_count == 0
+    assert ssa_optimizer.folded_count == 0
+    assert ssa_optimizer.reused_count == 0
+
+
+def test_build_ssa_form():
+    """Test the versions read and set by each Node, and the phi functions."""
+
+    cfg = build_cfg("{ i = 0; while (i < 3) i = i + 1; a = i; }")
+    cfg.compute_dominators()
+
+    ssa_optimizer = SSAOptimizer()
+    ssa_optimizer._build_ssa_form(cfg)
+
+    entry, header, body, exit_ = cfg.blocks
+    phi = ssa_optimizer.phis[header]["i"]
+
+    assert list(ssa_optimizer.phis[body]) == list(ssa_optimizer.phis[exit_]) == []
+
+    # `i` is set to 0 before the loop, and to `i + 1` in its body.
+    initial_version = ssa_optimizer.definitions[id(entry.statements[0].children[0])]
+    increment = body.statements[0].children[0]
+    incremented_version = ssa_optimizer.definitions[id(increment)]
+
+    assert ssa_optimizer.phi_operands[phi] == [
+        (entry, initial_version), (body, incremented_version)
+    ]
+
+    # The condition, the increment and `a = i` read the phi function.
+    condition_variable = header.condition.children[0]
+    increment_variable = increment.children[1].children[0]
+    copied_variable = exit_.statements[0].children[0].children[1]
+
+    assert [
+        ssa_optimizer.uses[id(node)]
+        for node in [condition_variable, increment_variable, copied_variable]
+    ] == [phi, phi, phi]
+
+
+@pytest.mark.parametrize(
+    "source_code, expected_variables",
+    [
+        # The branch that never runs is removed, and `b` is known after it.
+        (
+            "{ a = 1; if (a < 2) b = a + 1; else b = 3; c = b + 1; }",
+            {"a": 1, "b": 2, "c": 3}
+        ),
+        # `x` is set before it is read on every iteration.
+        (
+            "{ i = 0; do { x = 5; i = i + 1; } while (i < 3); y = x + 1; }",
+            {"i": 3, "x": 5, "y": 6}
+        ),
+        # `True + 0` is an integer.
+        ("{ a = 1 < 2; b = a + 0; }", {"a": True, "b": 1})
+    ]
+)
+def test_propagate_constants(source_code: str, expected_variables: dict):
+    """
+    Test that constants are propagated across blocks.
+
+    Parameters
+    ----------
+    source_code : str
+        The program.
+    expected_variables : dict
+        Its variables, after running it.
+    """
+
+    ssa_optimizer, vm, optimized_vm = _optimize(source_code)
+
+    assert optimized_vm.variables == expected_variables
+    assert ssa_optimizer.folded_count > 0
+    assert optimized_vm.instruction_count < vm.instruction_count
+
+
+def test_propagate_constants_branch():
+    """Test that branches on constants become jumps."""
+
+    cfg = build_cfg("{ a = 1; if (a < 2) b = 1; else b = 2; while (b < 1) b = 3; }")
+
+    ssa_optimizer = SSAOptimizer()
+    ssa_optimizer.optimize(cfg)
+
+    assert ssa_optimizer.removed_branch_count == 2
+    assert all(block.terminator != "branch" for block in cfg.blocks)
+    assert run_cfg(cfg).variables == {"a": 1, "b": 1}
+
+
+def test_propagate_constants_branch_assignment():
+    """Test that assignments in constant conditions are kept."""
+
+    ssa_optimizer, _, optimized_vm = _optimize("{ if ((a = 2)) b = a; }")
+
+    assert ssa_optimizer.removed_branch_count == 1
+    assert optimized_vm.variables == {"a": 2, "b": 2}
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        # The variables of a loop change.
+        "{ i = 0; while (i < 3) { j = i + 1; i = i + 1; } }",
+        # Both values may reach `b`.
+        "{ i = 0; do { a = i < 1; i = i + 1; } while (i < 2); b = a + 1; }",
+        # `b` may not be set, and reading it raises.
+        (
+            "{ i = 0; do { if (i) b = 1; i = i + 1; } while (i < 2); "
+            "c = (b - b) + 1; }"
+        )
+    ]
+)
+def test_propagate_constants_not_constant(source_code: str):
+    """
+    Test that values that are not constant are not folded.
+
+    Parameters
+    ----------
+    source_code : str
+        The program.
+    """
+
+    cfg = build_cfg(source_code)
+
+    ssa_optimizer = SSAOptimizer()
+    ssa_optimizer.optimize(cfg)
+
+    assert ssa_optimizer.folded_count == 0
+
+
+def test_propagate_constants_unset_variable():
+    """Test that reading an unset variable still raises."""
+
+    cfg = build_cfg("{ a = 1; if (a < 1) b = 1; c = b - b; }")
+    SSAOptimizer().optimize(cfg)
+
+    vm = VirtualMachine(code_collection=cfg.generate_code())
+
+    with pytest.raises(KeyError, match="b"):
+        vm.run()
+
+
+@pytest.mark.parametrize("superinstructions", [False, True])
+def test_propagate_constants_increment(superinstructions: bool):
+    """
+    Test that increments are only folded if it shortens the code.
+
+    Parameters
+    ----------
+    superinstructions : bool
+        Whether to emit fused instructions.
+    """
+
+    ssa_optimizer, _, _ = _optimize(
+        "{ a = 1; a = a + 1; }", superinstructions=superinstructions
+    )
+
+    # `a = a + 1;` is a single `INC` instruction.
+    assert ssa_optimizer.folded_count == (0 if superinstructions else 1)
+
+
+def test_number_values():
+    """Test that `i - j` is computed once per iteration of the GCD loop."""
+
+    ssa_optimizer, vm, optimized_vm = _optimize(GCD)
+
+    assert ssa_optimizer.temporaries == ["$0"]
+    assert ssa_optimizer.reused_count == 1
+    assert optimized_vm.variables == {"i": 1, "j": 1}
+    assert optimized_vm.instruction_count < vm.instruction_count
+
+
+def test_number_values_superinstructions():
+    """Test that values are not reused if it makes the code longer."""
+
+    # `i - j` is a single `SUBVV` instruction.
+    ssa_optimizer, _, _ = _optimize(GCD, superinstructions=True)
+
+    assert ssa_optimizer.temporaries == []
+
+
+@pytest.mark.parametrize(
+    "source_code, expected_reused_count",
+    [
+        # The first computation dominates the second one.
+        (
+            "{ i = 0; do { d = i + i + 1; if (i < 2) c = i + i + 1; "
+            "i = i + 1; } while (i < 5); }",
+            1
+        ),
+        # It doesn't.
+        (
+            "{ i = 0; do { if (i < 2) c = i + i + 1; d = i + i + 1; "
+            "i = i + 1; } while (i < 5); }",
+            0
+        ),
+        # `i` is set in between.
+        (
+            "{ i = 0; do { d = i + i + 1; i = i + 1; c = i + i + 1; } "
+            "while (i < 5); }",
+            0
+        ),
+        # Additions commute.
+        (
+            "{ i = 0; do { d = i + 3 + i; c = i + (i + 3); i = i + 1; } "
+            "while (i < 5); }",
+            1
+        ),
+        # Assignments must run.
+        (
+            "{ i = 0; do { d = i + i + 1; c = (i = i) + i + 1; i = i + 1; } "
+            "while (i < 5); }",
+            0
+        )
+    ]
+)
+def test_number_values_dominance(source_code: str, expected_reused_count: int):
+    """
+    Test that only the values computed on every path are reused.
+
+    Parameters
+    ----------
+    source_code : str
+        The program.
+    expected_reused_count : int
+        The number of computations replaced with a temporary.
+    """
+
+    ssa_optimizer, _, _ = _optimize(source_code)
+
+    assert ssa_optimizer.reused_count == expected_reused_count
+
+
+def test_optimize_deep_tree():
+    """Test that expressions deeper than the recursion limit are supported."""
+
+    cfg = build_cfg("{ 0; }")
+    cfg.entry.statements[0].children[0].replace(build_deep_tree())
+
+    ssa_optimizer = SSAOptimizer()
+    ssa_optimizer.optimize(cfg)
+
+    assert cfg.entry.statements[0].children[0].kind == "SUB"
+    assert ssa_optimizer.folded_count == 0
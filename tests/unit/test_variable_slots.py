@@ -0,0 +1,60 @@
+"""Implement unit tests for the `src.variable_slots` module."""
+
+import pytest
+
+from src.variable_slots import VariableSlots
+
+
+def test_allocate():
+    """Test allocating slots with no variable set."""
+
+    assert VariableSlots.allocate() == [VariableSlots.unset] * 26
+    assert len(VariableSlots.allocate(30)) == 30
+
+
+def test_view():
+    """Test that the view reads and writes the slots by variable name."""
+
+    slots = VariableSlots.allocate(27)
+    variables = VariableSlots(slots)
+
+    variables["b"] = 2
+    variables.update(a=True)
+    slots[25] = 26
+
+    # The slots after the 26th are not variables.
+    slots[26] = 27
+
+    assert variables == {"a": True, "b": 2, "z": 26}
+    assert list(variables) == ["a", "b", "z"]
+    assert len(variables) == 3
+    assert repr(variables) == "{'a': True, 'b': 2, 'z': 26}"
+    assert slots[:2] == [True, 2]
+
+    del variables["b"]
+
+    assert slots[1] is VariableSlots.unset
+    assert "b" not in variables
+
+
+@pytest.mark.parametrize("variable", ["b", "A", 0])
+def test_view_missing(variable: object):
+    """
+    Test that variables that are not set, or do not exist, raise a `KeyError`.
+
+    Parameters
+    ----------
+    variable : object
+        The key looked up.
+    """
+
+    variables = VariableSlots(VariableSlots.allocate())
+    variables["a"] = 1
+
+    with pytest.raises(KeyError):
+        variables[variable]
+
+    with pytest.raises(KeyError):
+        del variables[variable]
+
+    assert variables.get(variable) is None
@@ -1,30 +1,83 @@
 """Implement unit tests for the `src.virtual_machine.VirtualMachine` class."""
 
+import pytest
+
 # Just to annotate functions with fixtures.
 from pytest_mock.plugin import MockerFixture
 
+from src.bytecode import Bytecode
 from src.node import Node
 from src.virtual_machine import VirtualMachine
 
 
+def _execute(vm: VirtualMachine, mode: str) -> None:
+    """
+    Execute the program loaded on `vm` until it halts.
+
+    Parameters
+    ----------
+    vm : VirtualMachine
+        The Virtual Machine to execute.
+    mode : str
+        Either `run`, to use `VirtualMachine.run`, or `step`, to call
+        `VirtualMachine.step` until the program halts.
+    """
+
+    if mode == "run":
+        vm.run()
+    else:
+        while vm.step():
+            pass
+
+
+def _stack(vm: VirtualMachine) -> list:
+    """
+    Get the live elements of the stack of `vm`, from bottom to top.
+
+    Parameters
+    ----------
+    vm : VirtualMachine
+        The Virtual Machine to inspect.
+
+    Returns
+    -------
+    : list
+        The elements below the stack pointer.
+    """
+
+    return vm.stack[:vm.stack_pointer]
+
+
 def test_init() -> None:
     """Test the instantiation of VirtualMachine objects."""
 
-    code_collection = [("IFETCH", Node(id=1, kind="VAR", value=0))]
+    code_collection = [("IFETCH", Node(id=1, kind="VAR", value="a"))]
     stack_size = 10
 
     vm = VirtualMachine(code_collection=code_collection, stack_size=stack_size)
 
     assert len(vm.stack) == stack_size
     assert not any(vm.stack)
-    assert all(code in vm.code_collection for code in code_collection)
-    assert vm.stack_pointer == vm.program_counter == 0
+    assert len(vm.slots) == 26
+    assert vm.variables == {}
+    assert vm.bytecode == Bytecode.assemble(code_collection)
+    assert vm.stack_pointer == vm.program_counter == vm.instruction_count == 0
+
+
+def test_init_bytecode() -> None:
+    """Test the instantiation of VirtualMachine objects from a Bytecode."""
+
+    bytecode = Bytecode.assemble([("IFETCH", Node(id=1, kind="VAR", value="a"))])
+
+    vm = VirtualMachine(code_collection=bytecode)
+
+    assert vm.bytecode is bytecode
 
 
 def test_run() -> None:
     """
     Test the `VirtualMachine.run` method.
-    
+
     This test is omitted because all of its possibilities are covered by the
     following `test_run_...` tests.
     """
@@ -32,11 +85,12 @@ def test_run() -> None:
     ...
 
 
-def test_run_ifetch(mocker: MockerFixture) -> None:
-    """Test `VirtualMachine.ifetch` through the `run` method."""
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_ifetch(mode: str) -> None:
+    """Test the `IFETCH` instruction."""
 
     test_value = 23
-    test_node = Node(id=1, kind="VAR", value=0)
+    test_node = Node(id=1, kind="VAR", value="a")
 
     vm = VirtualMachine(
         code_collection=[
@@ -45,18 +99,16 @@ def test_run_ifetch(mocker: MockerFixture) -> None:
         ],
         stack_size=1
     )
-    vm.variables[0] = test_value
+    vm.variables["a"] = test_value
 
-    vm.ifetch = mocker.spy(vm, "ifetch")
-    vm.run()
+    _execute(vm, mode)
 
-    # Assert the method was called and the `stack` has the expected value
-    vm.ifetch.assert_called_once_with(test_node)
-    assert vm.stack == [test_value]
+    assert _stack(vm) == [test_value]
 
 
-def test_run_ipush(mocker: MockerFixture) -> None:
-    """Test `VirtualMachine.ipush` through the `run` method."""
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_ipush(mode: str) -> None:
+    """Test the `IPUSH` instruction."""
 
     test_value = 23
     test_node = Node(id=1, kind="CST", value=test_value)
@@ -69,324 +121,650 @@ def test_run_ipush(mocker: MockerFixture) -> None:
         stack_size=1
     )
 
-    vm.ipush = mocker.spy(vm, "ipush")
-    vm.run()
+    _execute(vm, mode)
 
-    # Assert the method was called and the `stack` has the expected value
-    vm.ipush.assert_called_once_with(test_node)
-    assert vm.stack == [test_value]
+    assert _stack(vm) == [test_value]
 
 
-def test_run_istore(mocker: MockerFixture) -> None:
-    """Test `VirtualMachine.istore` through the `run` method."""
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_istore(mode: str) -> None:
+    """Test the `ISTORE` instruction."""
 
     test_value = 23
-    test_node = Node(id=1, kind="VAR", value=0)
+    test_node = Node(id=1, kind="VAR", value="a")
 
     vm = VirtualMachine(
         code_collection=[
+            ("IPUSH", Node(id=2, kind="CST", value=test_value)),
             ("ISTORE", test_node),
             ("HALT", None)
         ],
         stack_size=1
     )
 
-    vm.stack = [test_value]
-    vm.istore = mocker.spy(vm, "istore")
-    vm.run()
+    _execute(vm, mode)
+
+    # The stored value is kept on the stack.
+    assert vm.variables["a"] == test_value
+    assert _stack(vm) == [test_value]
+
 
-    # Assert the method was called and the `variables` has the expected value
-    vm.istore.assert_called_once_with(test_node)
-    assert vm.variables[0] == test_value
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_temporary(mode: str) -> None:
+    """Test that hidden temporaries are held in slots after the variables."""
 
+    vm = VirtualMachine(
+        code_collection=[
+            ("IPUSH", Node(id=1, kind="CST", value=2)),
+            ("ISTORE", Node(id=2, kind="VAR", value="$0")),
+            ("INC", (
+                Node(id=3, kind="VAR", value="$0"),
+                Node(id=4, kind="CST", value=1)
+            )),
+            ("IFETCH", Node(id=5, kind="VAR", value="$0")),
+            ("ISTORE", Node(id=6, kind="VAR", value="z")),
+            ("HALT", None)
+        ],
+        stack_size=2
+    )
 
-def test_run_ipop(mocker: MockerFixture) -> None:
-    """Test `VirtualMachine.ipop` through the `run` method."""
+    _execute(vm, mode)
+
+    assert vm.variable_slots["$0"] == 26
+    assert vm.slots[26] == 3
+    assert vm.variables == {"z": 3}
+
+
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_ipop(mode: str) -> None:
+    """Test the `IPOP` instruction."""
 
     test_value = 23
 
     vm = VirtualMachine(
         code_collection=[
+            ("IPUSH", Node(id=1, kind="CST", value=test_value)),
             ("IPOP", None),
             ("HALT", None)
         ],
         stack_size=1
     )
 
-    # Mock the stack to only contain the `test_value`
-    vm.stack.append(test_value)
-    vm.stack_pointer = 1
-    vm.ipop = mocker.spy(vm, "ipop")
-    vm.run()
+    _execute(vm, mode)
 
-    # Assert the method was called and the `test_value` has been removed from
-    # the stack
-    vm.ipop.assert_called_once()
     assert vm.stack_pointer == 0
-    assert test_value not in vm.stack
-
-
-def test_run_iadd(mocker: MockerFixture) -> None:
-    """Test `VirtualMachine.iadd` through the `run` method."""
 
-    lhs_value = 23
-    lhs = Node(id=1, kind="CST", value=lhs_value)
 
-    rhs_value = 35
-    rhs = Node(id=2, kind="CST", value=rhs_value)
+@pytest.mark.parametrize("mode", ["run", "step"])
+@pytest.mark.parametrize(
+    "instruction, expected_result",
+    [
+        ("IADD", 23 + 35),
+        ("ISUB", 23 - 35),
+        ("ILT", 23 < 35)
+    ]
+)
+def test_run_binary_operation(
+    instruction: str, expected_result: int, mode: str
+) -> None:
+    """
+    Test the `IADD`, `ISUB` and `ILT` instructions.
+
+    Parameters
+    ----------
+    instruction : str
+        The instruction to test.
+    expected_result : int
+        The expected result of the operation between 23 and 35.
+    """
 
     vm = VirtualMachine(
         code_collection=[
-            ("IPUSH", lhs),
-            ("IPUSH", rhs),
-            ("IADD", None),
+            ("IPUSH", Node(id=1, kind="CST", value=23)),
+            ("IPUSH", Node(id=2, kind="CST", value=35)),
+            (instruction, None),
             ("HALT", None)
         ],
         stack_size=2
     )
 
-    vm.iadd = mocker.spy(vm, "iadd")
-    vm.run()
-
-    vm.iadd.assert_called_once()
-    assert vm.stack == [lhs_value + rhs_value, rhs_value]
+    _execute(vm, mode)
 
+    assert _stack(vm) == [expected_result]
 
-def test_run_isub(mocker: MockerFixture) -> None:
-    """Test `VirtualMachine.isub` through the `run` method."""
 
-    lhs_value = 23
-    lhs = Node(id=1, kind="CST", value=lhs_value)
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_jmp(mode: str) -> None:
+    """Test the `JMP` instruction."""
 
-    rhs_value = 35
-    rhs = Node(id=2, kind="CST", value=rhs_value)
+    node_to_run = Node(id=1, kind="CST", value=23)
+    node_to_ignore = Node(id=2, kind="CST", value=35)
+    another_node_to_run = Node(id=3, kind="CST", value=13)
 
     vm = VirtualMachine(
         code_collection=[
-            ("IPUSH", lhs),
-            ("IPUSH", rhs),
-            ("ISUB", None),
+            ("IPUSH", node_to_run),
+            ("JMP", 3),
+            ("IPUSH", node_to_ignore),
+            ("IPUSH", another_node_to_run),
             ("HALT", None)
         ],
-        stack_size=2
+        stack_size=3
     )
 
-    vm.isub = mocker.spy(vm, "isub")
-    vm.run()
-
-    vm.isub.assert_called_once()
-    assert vm.stack == [lhs_value - rhs_value, rhs_value]
+    _execute(vm, mode)
 
+    assert _stack(vm) == [node_to_run.value, another_node_to_run.value]
 
-def test_run_ilt(mocker: MockerFixture) -> None:
-    """Test `VirtualMachine.ilt` through the `run` method."""
 
-    lhs_value = 23
-    lhs = Node(id=1, kind="CST", value=lhs_value)
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_jmp_backwards(mode: str) -> None:
+    """Test that jumps can target a previous address."""
 
-    rhs_value = 35
-    rhs = Node(id=2, kind="CST", value=rhs_value)
+    counter = Node(id=1, kind="VAR", value="i")
+    limit = Node(id=2, kind="CST", value=3)
+    increment = Node(id=3, kind="CST", value=1)
 
+    # i = i + 1 while i < 3
     vm = VirtualMachine(
         code_collection=[
-            ("IPUSH", lhs),
-            ("IPUSH", rhs),
+            ("IFETCH", counter),
+            ("IPUSH", increment),
+            ("IADD", None),
+            ("ISTORE", counter),
+            ("IPOP", None),
+            ("IFETCH", counter),
+            ("IPUSH", limit),
             ("ILT", None),
+            ("JNZ", 0),
             ("HALT", None)
         ],
-        stack_size=2
+        stack_size=3
     )
+    vm.variables["i"] = 0
 
-    vm.ilt = mocker.spy(vm, "ilt")
-    vm.run()
+    _execute(vm, mode)
+
+    assert vm.variables["i"] == 3
+    assert vm.stack_pointer == 0
+    assert vm.instruction_count == 27
+
+
+@pytest.mark.parametrize("mode", ["run", "step"])
+@pytest.mark.parametrize(
+    "instruction, condition, expected_stack",
+    [
+        # The condition is always popped. Jumping skips the push of 35.
+        ("JZ", True, [35, 13]),
+        ("JZ", False, [13]),
+        ("JNZ", True, [13]),
+        ("JNZ", False, [35, 13])
+    ]
+)
+def test_run_conditional_jump(
+    instruction: str, condition: bool, expected_stack: list, mode: str
+) -> None:
+    """
+    Test the `JZ` and `JNZ` instructions.
+
+    Parameters
+    ----------
+    instruction : str
+        The jump instruction to test.
+    condition : bool
+        The value at the top of the stack when the jump is reached.
+    expected_stack : list
+        The expected live elements of the stack at the end of the program.
+    """
+
+    vm = VirtualMachine(
+        code_collection = [
+            ("IPUSH", Node(id=1, kind="CST", value=condition)),
+            (instruction, 3),
+            ("IPUSH", Node(id=2, kind="CST", value=35)),
+            ("IPUSH", Node(id=3, kind="CST", value=13)),
+            ("HALT", None)
+        ],
+        stack_size=3
+    )
 
-    vm.ilt.assert_called_once()
-    assert vm.stack == [lhs_value < rhs_value, rhs_value]
+    _execute(vm, mode)
 
+    assert _stack(vm) == expected_stack
 
-def test_run_jmp(mocker: MockerFixture) -> None:
-    """Test `VirtualMachine.jmp` through the `run` method."""
 
-    node_to_run = Node(id=1, kind="CST", value=23)
-    node_to_ignore = Node(id=2, kind="CST", value=35)
-    another_node_to_run = Node(id=3, kind="CST", value=13)
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_inc(mode: str) -> None:
+    """Test the `INC` instruction."""
 
     vm = VirtualMachine(
         code_collection=[
-            ("IPUSH", node_to_run),
-            ("JMP", another_node_to_run),
-            ("IPUSH", node_to_ignore),
-            ("IPUSH", another_node_to_run),
+            ("INC", (
+                Node(id=1, kind="VAR", value="a"),
+                Node(id=2, kind="CST", value=-2)
+            )),
             ("HALT", None)
         ],
-        stack_size=3
+        stack_size=1
     )
+    vm.variables["a"] = True
 
-    vm.jmp = mocker.spy(vm, "jmp")
+    _execute(vm, mode)
 
-    vm.run()
+    assert vm.variables == {"a": -1}
+    assert vm.stack_pointer == 0
 
-    vm.jmp.assert_called_once()
-    assert vm.stack == [node_to_run.value, another_node_to_run.value, None]
 
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_subvv(mode: str) -> None:
+    """Test the `SUBVV` instruction."""
 
-def test_run_jz_true(mocker: MockerFixture) -> None:
-    """
-    Test `VirtualMachine.jz` through the `run` method.
+    vm = VirtualMachine(
+        code_collection=[
+            ("IPUSH", Node(id=1, kind="CST", value=1)),
+            ("SUBVV", (
+                Node(id=2, kind="VAR", value="a"),
+                Node(id=3, kind="VAR", value="b")
+            )),
+            ("HALT", None)
+        ],
+        stack_size=2
+    )
+    vm.variables.update(a=3, b=5)
 
-    In this test, assert that the `jz` method correctly handles `True`
-    conditions.
-    """
+    _execute(vm, mode)
+
+    assert _stack(vm) == [1, -2]
 
-    condition_node = Node(id=1, kind="CST", value=True)
-    node_not_to_ignore = Node(id=2, kind="CST", value=35)
-    another_node_to_run = Node(id=3, kind="CST", value=13)
+
+@pytest.mark.parametrize("mode", ["run", "step"])
+@pytest.mark.parametrize(
+    "instruction, a, b, expected_stack",
+    [
+        ("JGE", 1, 2, [35, 13]),
+        ("JGE", 2, 2, [13]),
+        ("JGE", 3, 2, [13]),
+        ("JLT", 1, 2, [13]),
+        ("JLT", 2, 2, [35, 13]),
+        ("JLT", 3, 2, [35, 13])
+    ]
+)
+def test_run_compare_jump(
+    instruction: str, a: int, b: int, expected_stack: list, mode: str
+) -> None:
+    """
+    Test the `JGE` and `JLT` instructions.
+
+    Parameters
+    ----------
+    instruction : str
+        The jump to run.
+    a : int
+        The value of the left hand side variable.
+    b : int
+        The value of the right hand side variable.
+    expected_stack : list
+        The expected live elements of the stack at the end of the program.
+    """
 
     vm = VirtualMachine(
-        code_collection = [
-            ("IPUSH", condition_node),
-            ("JZ", another_node_to_run),
-            ("IPUSH", node_not_to_ignore),
-            ("IPUSH", another_node_to_run),
+        code_collection=[
+            (instruction, (
+                Node(id=1, kind="VAR", value="a"),
+                Node(id=2, kind="VAR", value="b"),
+                2
+            )),
+            ("IPUSH", Node(id=3, kind="CST", value=35)),
+            ("IPUSH", Node(id=4, kind="CST", value=13)),
             ("HALT", None)
         ],
         stack_size=3
     )
+    vm.variables.update(a=a, b=b)
 
-    vm.jz = mocker.spy(vm, "jz")
+    _execute(vm, mode)
 
-    vm.run()
+    assert _stack(vm) == expected_stack
 
-    vm.jz.assert_called_once()
 
-    assert vm.stack == [
-        condition_node.value,
-        node_not_to_ignore.value,
-        another_node_to_run.value
-    ]
+@pytest.mark.parametrize("mode", ["run", "step"])
+def test_run_empty(mode: str) -> None:
+    """Test the `EMPTY` instruction."""
 
+    vm = VirtualMachine(
+        code_collection=[
+            ("EMPTY", Node(id=1, kind="EMPTY")),
+            ("HALT", None)
+        ],
+        stack_size=1
+    )
 
-def test_run_jz_false(mocker: MockerFixture) -> None:
-    """
-    Test `VirtualMachine.jz` through the `run` method.
+    _execute(vm, mode)
 
-    In this test, assert that the `jz` method correctly handles `False`
-    conditions.
-    """
+    assert vm.stack_pointer == 0
+    assert vm.program_counter == 1
+    assert vm.instruction_count == 1
 
-    condition_node = Node(id=1, kind="CST", value=False)
-    node_to_ignore = Node(id=2, kind="CST", value=35)
-    another_node_to_run = Node(id=3, kind="CST", value=13)
+
+def test_run_resumes_state() -> None:
+    """Test that `run` resumes from the state left by `step`."""
 
     vm = VirtualMachine(
-        code_collection = [
-            ("IPUSH", condition_node),
-            ("JZ", another_node_to_run),
-            ("IPUSH", node_to_ignore),
-            ("IPUSH", another_node_to_run),
+        code_collection=[
+            ("IPUSH", Node(id=1, kind="CST", value=1)),
+            ("IPUSH", Node(id=2, kind="CST", value=2)),
+            ("IADD", None),
             ("HALT", None)
         ],
-        stack_size=3
+        stack_size=2
     )
 
-    vm.jz = mocker.spy(vm, "jz")
-
+    vm.step()
     vm.run()
 
-    vm.jz.assert_called_once()    
-    assert vm.stack == [
-        condition_node.value,
-        another_node_to_run.value,
-        None
-    ]
+    assert _stack(vm) == [3]
+    assert vm.instruction_count == 3
 
 
-def test_run_jnz_true(mocker: MockerFixture) -> None:
-    """
-    Test `VirtualMachine.jnz` through the `run` method.
+def test_run_flushes_state_on_error() -> None:
+    """Test that the state of the VM is kept if the program raises."""
+
+    vm = VirtualMachine(
+        code_collection=[
+            ("IPUSH", Node(id=1, kind="CST", value=1)),
+            ("IFETCH", Node(id=2, kind="VAR", value="a")),
+            ("HALT", None)
+        ],
+        stack_size=2
+    )
 
-    In this test, assert that the `jnz` method correctly handles `True`
-    conditions.
+    with pytest.raises(KeyError):
+        vm.run()
+
+    # As in `step`, the program counter points past the faulty instruction.
+    assert _stack(vm) == [1]
+    assert vm.program_counter == 4
+
+
+@pytest.mark.parametrize("mode", ["run", "step"])
+@pytest.mark.parametrize(
+    "instruction, variables",
+    [
+        ("IFETCH", ["b"]),
+        ("INC", ["b", 1]),
+        ("SUBVV", ["a", "b"]),
+        ("SUBVV", ["b", "a"]),
+        ("JGE", ["a", "b", 1]),
+        ("JGE", ["b", "a", 1]),
+        ("JLT", ["a", "b", 1]),
+        ("JLT", ["b", "a", 1])
+    ]
+)
+def test_run_unset_variable(instruction: str, variables: list, mode: str) -> None:
+    """
+    Test that reading a variable that is not set raises a `KeyError`.
+
+    Parameters
+    ----------
+    instruction : str
+        The instruction that reads the variables.
+    variables : list
+        Its operands: the variable names, the constant and the jump target.
     """
 
-    condition_node = Node(id=1, kind="CST", value=True)
-    node_to_ignore = Node(id=2, kind="CST", value=35)
-    another_node_to_run = Node(id=3, kind="CST", value=13)
+    operands = tuple(
+        Node(id=index, kind="VAR", value=operand)
+        if isinstance(operand, str)
+        else operand
+        for index, operand in enumerate(variables)
+    )
+
+    if instruction == "INC":
+        operands = (operands[0], Node(id=2, kind="CST", value=operands[1]))
 
     vm = VirtualMachine(
-        code_collection = [
-            ("IPUSH", condition_node),
-            ("JNZ", another_node_to_run),
-            ("IPUSH", node_to_ignore),
-            ("IPUSH", another_node_to_run),
+        code_collection=[
+            (instruction, operands if len(operands) > 1 else operands[0]),
             ("HALT", None)
         ],
+        stack_size=1
+    )
+    vm.variables["a"] = 1
+
+    with pytest.raises(KeyError, match="b"):
+        _execute(vm, mode)
+
+    assert vm.variables == {"a": 1}
+
+
+@pytest.mark.parametrize(
+    "instruction, argument, handler, expected_operands",
+    [
+        ("IFETCH", Node(id=1, kind="VAR", value="a"), "ifetch", (0,)),
+        ("IPUSH", Node(id=1, kind="CST", value=1), "ipush", (0,)),
+        ("ISTORE", Node(id=1, kind="VAR", value="a"), "istore", (0,)),
+        ("IPOP", None, "ipop", ()),
+        ("IADD", None, "iadd", ()),
+        ("ISUB", None, "isub", ()),
+        ("ILT", None, "ilt", ()),
+        ("JMP", 1, "jmp", (2,)),
+        ("JZ", 1, "jz", (2,)),
+        ("JNZ", 1, "jnz", (2,)),
+        (
+            "INC",
+            (
+                Node(id=1, kind="VAR", value="a"),
+                Node(id=2, kind="CST", value=1)
+            ),
+            "inc",
+            (0, 0)
+        ),
+        (
+            "JGE",
+            (
+                Node(id=1, kind="VAR", value="a"),
+                Node(id=2, kind="VAR", value="a"),
+                1
+            ),
+            "jge",
+            (0, 0, 4)
+        ),
+        (
+            "SUBVV",
+            (
+                Node(id=1, kind="VAR", value="a"),
+                Node(id=2, kind="VAR", value="a")
+            ),
+            "subvv",
+            (0, 0)
+        ),
+        (
+            "JLT",
+            (
+                Node(id=1, kind="VAR", value="a"),
+                Node(id=2, kind="VAR", value="a"),
+                1
+            ),
+            "jlt",
+            (0, 0, 4)
+        ),
+        ("EMPTY", None, "empty", ())
+    ]
+)
+def test_step(
+    instruction: str,
+    argument: object,
+    handler: str,
+    expected_operands: tuple,
+    mocker: MockerFixture
+) -> None:
+    """
+    Test that `VirtualMachine.step` dispatches instructions to their handlers.
+
+    Parameters
+    ----------
+    instruction : str
+        The instruction to run.
+    argument : object
+        The argument of the instruction in the `code_collection`.
+    handler : str
+        The name of the method that handles the instruction.
+    expected_operands : tuple
+        The raw operands the handler must be called with.
+    """
+
+    vm = VirtualMachine(
+        code_collection=[(instruction, argument), ("HALT", None)],
         stack_size=3
     )
 
-    vm.jnz = mocker.spy(vm, "jnz")
+    # Provide operands for the instructions that need them.
+    vm.variables["a"] = 1
+    vm.stack[:2] = [1, 2]
+    vm.stack_pointer = 2
 
-    vm.run()
+    spy = mocker.patch.object(vm, handler)
 
-    vm.jnz.assert_called_once()    
-    assert vm.stack == [
-        condition_node.value,
-        another_node_to_run.value,
-        None
-    ]
+    assert vm.step()
+    spy.assert_called_once_with(*expected_operands)
+
+
+def test_step_halt() -> None:
+    """Test that `VirtualMachine.step` does not run past `HALT`."""
 
+    vm = VirtualMachine(code_collection=[("HALT", None)], stack_size=1)
 
-def test_run_jnz_false(mocker: MockerFixture) -> None:
+    assert not vm.step()
+    assert vm.program_counter == 0
+    assert vm.instruction_count == 0
+
+
+@pytest.mark.parametrize("hot_loop_threshold", [1, 2, None])
+def test_run_hot_loop(hot_loop_threshold: int) -> None:
     """
-    Test `VirtualMachine.jnz` through the `run` method.
+    Test that hot loops are compiled without changing the results.
 
-    In this test, assert that the `jnz` method correctly handles `False`
-    conditions.
+    Parameters
+    ----------
+    hot_loop_threshold : int or None
+        The number of backward jumps that makes a loop hot.
     """
 
-    condition_node = Node(id=1, kind="CST", value=False)
-    node_not_to_ignore = Node(id=2, kind="CST", value=35)
-    another_node_to_run = Node(id=3, kind="CST", value=13)
+    counter = Node(id=1, kind="VAR", value="i")
 
+    # i = i + 1 while i < 5
     vm = VirtualMachine(
-        code_collection = [
-            ("IPUSH", condition_node),
-            ("JNZ", another_node_to_run),
-            ("IPUSH", node_not_to_ignore),
-            ("IPUSH", another_node_to_run),
+        code_collection=[
+            ("IFETCH", counter),
+            ("IPUSH", Node(id=2, kind="CST", value=1)),
+            ("IADD", None),
+            ("ISTORE", counter),
+            ("IPOP", None),
+            ("IFETCH", counter),
+            ("IPUSH", Node(id=3, kind="CST", value=5)),
+            ("ILT", None),
+            ("JNZ", 0),
             ("HALT", None)
         ],
-        stack_size=3
+        stack_size=3,
+        hot_loop_threshold=hot_loop_threshold
     )
-
-    vm.jnz = mocker.spy(vm, "jnz")
+    vm.variables["i"] = 0
 
     vm.run()
 
-    vm.jnz.assert_called_once()
+    assert vm.variables["i"] == 5
+    assert vm.stack_pointer == 0
+    assert vm.program_counter == len(vm.bytecode) - 1
+    assert vm.instruction_count == 45
+    assert bool(vm.compiled_loops) == (hot_loop_threshold is not None)
 
-    assert vm.stack == [
-        condition_node.value,
-        node_not_to_ignore.value,
-        another_node_to_run.value
-    ]
 
+def test_run_hot_loop_unset_variable() -> None:
+    """Test that a hot loop is interpreted while it reads unset variables."""
 
-def test_run_empty(mocker: MockerFixture) -> None:
-    """Test `VirtualMachine.jnz` through the `run` method."""
+    counter = Node(id=1, kind="VAR", value="i")
+    flag = Node(id=2, kind="VAR", value="f")
 
+    # do { if (i) f; i = i + 1; } while (i < 5)
     vm = VirtualMachine(
         code_collection=[
-            ("EMPTY", Node(id=-1, kind="EMPTY")),
+            ("IFETCH", counter),
+            ("JZ", 4),
+            ("IFETCH", flag),
+            ("IPOP", None),
+            ("IFETCH", counter),
+            ("IPUSH", Node(id=3, kind="CST", value=1)),
+            ("IADD", None),
+            ("ISTORE", counter),
+            ("IPOP", None),
+            ("IFETCH", counter),
+            ("IPUSH", Node(id=4, kind="CST", value=5)),
+            ("ILT", None),
+            ("JNZ", 0),
             ("HALT", None)
         ],
-        stack_size=1
+        stack_size=3,
+        hot_loop_threshold=1
     )
+    vm.variables["i"] = 0
 
-    vm.empty = mocker.spy(vm, "empty")
+    # The loop is compiled, but `f` is only read once `i` reaches 1.
+    with pytest.raises(KeyError):
+        vm.run()
+
+    assert vm.variables["i"] == 1
+    assert vm.compiled_loops[0] is not None
+
+
+def test_run_hot_loop_unsupported() -> None:
+    """Test that loops that can't be compiled keep being interpreted."""
+
+    counter = Node(id=1, kind="VAR", value="i")
+
+    # Each iteration leaves the old value of `i` on the stack.
+    vm = VirtualMachine(
+        code_collection=[
+            ("IFETCH", counter),
+            ("IFETCH", counter),
+            ("IPUSH", Node(id=2, kind="CST", value=1)),
+            ("IADD", None),
+            ("ISTORE", counter),
+            ("IPUSH", Node(id=3, kind="CST", value=3)),
+            ("ILT", None),
+            ("JNZ", 0),
+            ("HALT", None)
+        ],
+        stack_size=4,
+        hot_loop_threshold=1
+    )
+    vm.variables["i"] = 0
 
     vm.run()
 
-    vm.empty.assert_called_once()
-    assert vm.stack == [None]
+    assert _stack(vm) == [0, 1, 2]
+    assert vm.compiled_loops == {0: None}
+
+
+def test_run_hot_loop_affine() -> None:
+    """Test that hot affine loops skip their iterations."""
+
+    counter = Node(id=1, kind="VAR", value="i")
+
+    # do i = i + 1; while (i < 1000000)
+    vm = VirtualMachine(
+        code_collection=[
+            ("INC", (counter, Node(id=2, kind="CST", value=1))),
+            ("JLT", (counter, Node(id=3, kind="VAR", value="n"), 0)),
+            ("HALT", None)
+        ],
+        hot_loop_threshold=1
+    )
+    vm.variables["i"] = 0
+    vm.variables["n"] = 1000000
+
+    vm.run()
 
+    assert vm.variables == {"i": 1000000, "n": 1000000}
+    assert vm.instruction_count == 2 * 1000000
+    assert vm.compiled_loops[0].function.__name__ == "accelerated_loop"